@@ -10,6 +10,7 @@ import re
 
 from fastapi import HTTPException
 
+from app.core.config import settings
 from app.core.openai_client import OPENAI_MAX_TOKENS, openai_client
 from app.prompts.content_generation_prompts import (
     get_bullet_from_keywords_prompt,
@@ -21,10 +22,35 @@ from app.prompts.content_generation_prompts import (
     get_summary_prompt,
     get_work_experience_prompt,
 )
+from app.services.bullet_batcher import bullet_batcher
 
 logger = logging.getLogger(__name__)
 
 
+def _parse_bullet_list(raw_content: str) -> list:
+    """Bullets from a completion: a JSON array, a fenced JSON array, or one per line."""
+    # Try to parse as JSON
+    try:
+        bullets = json.loads(raw_content)
+        if not isinstance(bullets, list):
+            bullets = [bullets]
+    except json.JSONDecodeError:
+        # Try to extract JSON from markdown
+        json_match = re.search(
+            r"```json\s*(\[.*?\])\s*```", raw_content, re.DOTALL
+        )
+        if json_match:
+            bullets = json.loads(json_match.group(1))
+        else:
+            # Fallback: split by lines
+            bullets = [
+                line.strip()
+                for line in raw_content.split("\n")
+                if line.strip() and not line.strip().startswith(("#", "-"))
+            ]
+    return bullets
+
+
 class ContentGenerationAgent:
     """Agent for generating resume content."""
 
@@ -236,6 +262,26 @@ class ContentGenerationAgent:
             # Optimize max_tokens based on model - gpt-4o needs less tokens for bullets
             model = self.openai_client["model"]
             max_tokens = 400 if "gpt-4o" in model and "mini" not in model else 600
+            data = {
+                "model": model,
+                "messages": [
+                    {
+                        "role": "system",
+                        "content": "You are a professional resume writer. Create compelling, keyword-optimized bullet points that highlight achievements.",
+                    },
+                    {"role": "user", "content": prompt},
+                ],
+                "max_tokens": max_tokens,
+                "temperature": 0.6,
+            }
+
+            if settings.enable_bullet_batching:
+                completion = await bullet_batcher.complete(data)
+                return {
+                    "success": True,
+                    "bullets": _parse_bullet_list(completion.content),
+                    "tokens_used": completion.tokens_used,
+                }
 
             # Use async httpx client for better performance
             httpx_client = self.openai_client.get("httpx_client")
@@ -243,18 +289,7 @@ class ContentGenerationAgent:
                 response = await httpx_client.post(
                     "https://api.openai.com/v1/chat/completions",
                     headers=headers,
-                    json={
-                        "model": model,
-                        "messages": [
-                            {
-                                "role": "system",
-                                "content": "You are a professional resume writer. Create compelling, keyword-optimized bullet points that highlight achievements.",
-                            },
-                            {"role": "user", "content": prompt},
-                        ],
-                        "max_tokens": max_tokens,
-                        "temperature": 0.6,
-                    },
+                    json=data,
                     timeout=30.0,
                 )
             else:
@@ -269,18 +304,7 @@ class ContentGenerationAgent:
                         self.openai_client["requests"].post,
                         "https://api.openai.com/v1/chat/completions",
                         headers=headers,
-                        json={
-                            "model": model,
-                            "messages": [
-                                {
-                                    "role": "system",
-                                    "content": "You are a professional resume writer. Create compelling, keyword-optimized bullet points that highlight achievements.",
-                                },
-                                {"role": "user", "content": prompt},
-                            ],
-                            "max_tokens": max_tokens,
-                            "temperature": 0.6,
-                        },
+                        json=data,
                         timeout=30,
                     )
                 )
@@ -294,29 +318,9 @@ class ContentGenerationAgent:
             result = response.json()
             raw_content = result["choices"][0]["message"]["content"].strip()
 
-            # Try to parse as JSON
-            try:
-                bullets = json.loads(raw_content)
-                if not isinstance(bullets, list):
-                    bullets = [bullets]
-            except json.JSONDecodeError:
-                # Try to extract JSON from markdown
-                json_match = re.search(
-                    r"```json\s*(\[.*?\])\s*```", raw_content, re.DOTALL
-                )
-                if json_match:
-                    bullets = json.loads(json_match.group(1))
-                else:
-                    # Fallback: split by lines
-                    bullets = [
-                        line.strip()
-                        for line in raw_content.split("\n")
-                        if line.strip() and not line.strip().startswith(("#", "-"))
-                    ]
-
             return {
                 "success": True,
-                "bullets": bullets,
+                "bullets": _parse_bullet_list(raw_content),
                 "tokens_used": result.get("usage", {}).get("total_tokens", 0),
             }
 
@@ -360,6 +364,26 @@ class ContentGenerationAgent:
             # Optimize max_tokens based on model
             model = self.openai_client["model"]
             max_tokens = 150 if "gpt-4o" in model and "mini" not in model else 200
+            data = {
+                "model": model,
+                "messages": [
+                    {
+                        "role": "system",
+                        "content": "You are a professional resume writer specializing in keyword optimization and impactful bullet points.",
+                    },
+                    {"role": "user", "content": prompt},
+                ],
+                "max_tokens": max_tokens,
+                "temperature": 0.6,
+            }
+
+            if settings.enable_bullet_batching:
+                completion = await bullet_batcher.complete(data)
+                return {
+                    "success": True,
+                    "improved_bullet": completion.content,
+                    "tokens_used": completion.tokens_used,
+                }
 
             # Use async httpx client for better performance
             httpx_client = self.openai_client.get("httpx_client")
@@ -367,18 +391,7 @@ class ContentGenerationAgent:
                 response = await httpx_client.post(
                     "https://api.openai.com/v1/chat/completions",
                     headers=headers,
-                    json={
-                        "model": model,
-                        "messages": [
-                            {
-                                "role": "system",
-                                "content": "You are a professional resume writer specializing in keyword optimization and impactful bullet points.",
-                            },
-                            {"role": "user", "content": prompt},
-                        ],
-                        "max_tokens": max_tokens,
-                        "temperature": 0.6,
-                    },
+                    json=data,
                     timeout=30.0,
                 )
             else:
@@ -393,18 +406,7 @@ class ContentGenerationAgent:
                         self.openai_client["requests"].post,
                         "https://api.openai.com/v1/chat/completions",
                         headers=headers,
-                        json={
-                            "model": model,
-                            "messages": [
-                                {
-                                    "role": "system",
-                                    "content": "You are a professional resume writer specializing in keyword optimization and impactful bullet points.",
-                                },
-                                {"role": "user", "content": prompt},
-                            ],
-                            "max_tokens": max_tokens,
-                            "temperature": 0.6,
-                        },
+                        json=data,
                         timeout=30,
                     )
                 )
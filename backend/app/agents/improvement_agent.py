@@ -9,11 +9,15 @@ import logging
 
 from fastapi import HTTPException
 
+from app.core.config import settings
 from app.core.openai_client import openai_client
 from app.prompts.improvement_prompts import (
     get_ats_improvement_prompt,
     get_improve_bullet_prompt,
+    get_scoped_ats_improvement_prompt,
 )
+from app.services.bullet_batcher import bullet_batcher
+from app.services.model_router import model_router
 
 logger = logging.getLogger(__name__)
 
@@ -53,6 +57,22 @@ class ImprovementAgent:
                 "temperature": 0.5,  # Lower temperature = faster, more deterministic
             }
 
+            local = await model_router.complete_locally("bullet_polish", data)
+            if local is not None:
+                return {
+                    "success": True,
+                    "improved_bullet": local.content,
+                    "tokens_used": local.tokens_used,
+                }
+
+            if settings.enable_bullet_batching:
+                completion = await bullet_batcher.complete(data)
+                return {
+                    "success": True,
+                    "improved_bullet": completion.content,
+                    "tokens_used": completion.tokens_used,
+                }
+
             # Use async httpx client for better performance
             httpx_client = self.openai_client.get("httpx_client")
             if httpx_client:
@@ -190,3 +210,97 @@ class ImprovementAgent:
                 "error": str(e),
             }
 
+    async def apply_scoped_ats_improvement(
+        self,
+        improvement_title: str,
+        improvement_description: str,
+        specific_suggestion: str,
+        scope: dict,
+        job_description: str | None = None,
+    ) -> dict:
+        """Apply an ATS improvement to one part of a resume (see ats_improvement_planner)."""
+        if not self.openai_client:
+            raise HTTPException(
+                status_code=503, detail="OpenAI service not available"
+            )
+
+        try:
+            prompt = get_scoped_ats_improvement_prompt(
+                improvement_title=improvement_title,
+                improvement_description=improvement_description,
+                specific_suggestion=specific_suggestion,
+                scope_json=json.dumps(scope, ensure_ascii=False),
+                job_description=job_description,
+            )
+
+            headers = {
+                "Authorization": f"Bearer {self.openai_client['api_key']}",
+                "Content-Type": "application/json",
+            }
+            data = {
+                "model": self.openai_client["model"],
+                "messages": [
+                    {
+                        "role": "system",
+                        "content": "You are an expert resume writer specializing in ATS optimization. Apply improvements while maintaining professional quality.",
+                    },
+                    {"role": "user", "content": prompt},
+                ],
+                "max_tokens": 2000,
+                "temperature": 0.6,
+                "response_format": {"type": "json_object"},
+            }
+
+            # Concurrent improvements need the async client; threads are the fallback
+            httpx_client = self.openai_client.get("httpx_client")
+            if httpx_client:
+                response = await httpx_client.post(
+                    "https://api.openai.com/v1/chat/completions",
+                    headers=headers,
+                    json=data,
+                    timeout=30.0,
+                )
+            else:
+                loop = asyncio.get_running_loop()
+                response = await loop.run_in_executor(
+                    None,
+                    functools.partial(
+                        self.openai_client["requests"].post,
+                        "https://api.openai.com/v1/chat/completions",
+                        headers=headers,
+                        json=data,
+                        timeout=30,
+                    )
+                )
+
+            if response.status_code != 200:
+                logger.warning(f"OpenAI API error for improvement: {improvement_title}")
+                return {
+                    "success": False,
+                    "error": f"OpenAI API error: {response.status_code}",
+                }
+
+            result = response.json()
+            improved_content = result["choices"][0]["message"]["content"].strip()
+            try:
+                patch = json.loads(improved_content)
+            except json.JSONDecodeError:
+                patch = None
+            if not isinstance(patch, dict):
+                logger.warning(f"Could not parse improved excerpt for: {improvement_title}")
+                return {
+                    "success": False,
+                    "error": "Could not parse improved resume",
+                }
+            return {
+                "success": True,
+                "patch": patch,
+                "tokens_used": result.get("usage", {}).get("total_tokens", 0),
+            }
+
+        except Exception as e:
+            logger.error(f"Error applying improvement {improvement_title}: {str(e)}")
+            return {
+                "success": False,
+                "error": str(e),
+            }
@@ -7,9 +7,10 @@ from typing import Any
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.core.db import get_db
+from app.core.db import get_async_db, get_db
 from app.models import User
 from app.services.usage_service import (
     check_trial_eligibility,
@@ -73,21 +74,24 @@ class TrialStatusResponse(BaseModel):
 async def get_usage_limits(
     request: Request,
     session_id: str | None = Query(None, description="Guest session ID"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Get current usage limits for the user."""
-    user = get_user_from_request(request, db)
-    plan_tier = get_plan_tier(user, db)
-
     from app.services.usage_service import USAGE_LIMITS, is_premium_mode_enabled
 
-    limits = USAGE_LIMITS.get(plan_tier, USAGE_LIMITS["free"])
+    def load(session: Session) -> tuple[str, bool, bool]:
+        user = get_user_from_request(request, session)
+        plan_tier = get_plan_tier(user, session)
+        if not user:
+            return plan_tier, False, False
+        return (
+            plan_tier,
+            check_trial_eligibility(user.id, session),
+            is_trial_active(user.id, session),
+        )
 
-    trial_eligible = False
-    trial_active = False
-    if user:
-        trial_eligible = check_trial_eligibility(user.id, db)
-        trial_active = is_trial_active(user.id, db)
+    plan_tier, trial_eligible, trial_active = await db.run_sync(load)
+    limits = USAGE_LIMITS.get(plan_tier, USAGE_LIMITS["free"])
 
     return UsageLimitsResponse(
         plan_tier=plan_tier,
@@ -102,18 +106,19 @@ async def get_usage_limits(
 async def get_usage_statistics(
     request: Request,
     session_id: str | None = Query(None, description="Guest session ID"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Get current usage statistics for the user."""
-    user = get_user_from_request(request, db)
-    plan_tier = get_plan_tier(user, db)
 
-    user_id = user.id if user else None
-    stats = get_usage_stats(user_id, plan_tier, session_id, db)
+    def load(session: Session) -> tuple[str, dict[str, Any], bool]:
+        user = get_user_from_request(request, session)
+        plan_tier = get_plan_tier(user, session)
+        user_id = user.id if user else None
+        stats = get_usage_stats(user_id, plan_tier, session_id, session)
+        trial_active = is_trial_active(user.id, session) if user else False
+        return plan_tier, stats, trial_active
 
-    trial_active = False
-    if user:
-        trial_active = is_trial_active(user.id, db)
+    plan_tier, stats, trial_active = await db.run_sync(load)
 
     return UsageStatsResponse(
         plan_tier=plan_tier,
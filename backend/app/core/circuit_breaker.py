@@ -0,0 +1,280 @@
+"""Circuit breakers for OpenAI calls.
+
+When OpenAI is slow or down every AI route used to wait out its own timeout
+(20-60 s) before falling back, tying up workers for the whole outage. Each
+(endpoint, model) pair now has a breaker shared by every caller: after
+``openai_breaker_failure_threshold`` consecutive failures (transport errors,
+timeouts, 5xx or 429 responses, or calls cancelled after running longer than
+``openai_breaker_slow_call_seconds``) it opens and calls fail immediately
+with ``CircuitOpenError``, which the routes already handle through their
+deterministic fallbacks. After ``openai_breaker_reset_seconds`` a single
+probe is let through; its success closes the breaker, its failure reopens it.
+
+The breakers sit below the existing call sites: ``BreakerTransport`` wraps
+the shared httpx client's transport and ``BreakerRequests`` stands in for
+the ``requests`` module in ``openai_client``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import re
+import threading
+import time
+from typing import Any
+from urllib.parse import urlsplit
+
+import httpx
+import requests
+
+from app.core.config import settings
+from app.core.deadline import deadline_budget
+
+logger = logging.getLogger(__name__)
+
+OPENAI_HOST = "api.openai.com"
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# The model is among the first keys of every payload; the body may carry megabytes of images
+_MODEL_RE = re.compile(rb'"model"\s*:\s*"([^"]+)"')
+MODEL_SCAN_BYTES = 1024
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling OpenAI while the breaker for the call is open."""
+
+    def __init__(self, endpoint: str, model: str, retry_in: float):
+        super().__init__(
+            f"OpenAI circuit open for {model} {endpoint}; retry in {retry_in:.0f}s"
+        )
+        self.endpoint = endpoint
+        self.model = model
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """Closed/open/half-open breaker for one endpoint and model."""
+
+    def __init__(
+        self,
+        endpoint: str,
+        model: str,
+        failure_threshold: int,
+        reset_seconds: float,
+        clock=time.monotonic,
+    ):
+        self.endpoint = endpoint
+        self.model = model
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_seconds = reset_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self._probe_in_flight = False
+        self.stats = {"calls": 0, "failures": 0, "rejected": 0, "opened": 0}
+
+    def before_call(self) -> None:
+        """Admit a call or raise ``CircuitOpenError``; admitted calls must report an outcome."""
+        with self._lock:
+            if self.state == OPEN:
+                retry_in = self.opened_at + self.reset_seconds - self._clock()
+                if retry_in > 0:
+                    self.stats["rejected"] += 1
+                    raise CircuitOpenError(self.endpoint, self.model, retry_in)
+                self.state = HALF_OPEN
+            if self.state == HALF_OPEN:
+                if self._probe_in_flight:
+                    self.stats["rejected"] += 1
+                    raise CircuitOpenError(self.endpoint, self.model, 0)
+                self._probe_in_flight = True
+            self.stats["calls"] += 1
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self.state != CLOSED:
+                logger.info(f"OpenAI circuit closed for {self.model} {self.endpoint}")
+            self.state = CLOSED
+            self.consecutive_failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.stats["failures"] += 1
+            self.consecutive_failures += 1
+            self._probe_in_flight = False
+            if self.state == HALF_OPEN or (
+                self.state == CLOSED and self.consecutive_failures >= self.failure_threshold
+            ):
+                if self.state == CLOSED:
+                    logger.warning(
+                        f"OpenAI circuit opened for {self.model} {self.endpoint} "
+                        f"after {self.consecutive_failures} consecutive failures"
+                    )
+                self.state = OPEN
+                self.opened_at = self._clock()
+                self.stats["opened"] += 1
+
+    def abandon(self) -> None:
+        """The call ended without an outcome (e.g. cancelled); free the probe slot."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def rejecting(self) -> bool:
+        """Whether a call made now would be rejected, without taking the probe slot."""
+        with self._lock:
+            if self.state == OPEN:
+                return self.opened_at + self.reset_seconds > self._clock()
+            return self.state == HALF_OPEN and self._probe_in_flight
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            retry_in = 0.0
+            if self.state == OPEN:
+                retry_in = max(0.0, self.opened_at + self.reset_seconds - self._clock())
+            return {
+                "endpoint": self.endpoint,
+                "model": self.model,
+                "state": self.state,
+                "consecutive_failures": self.consecutive_failures,
+                "retry_in_seconds": round(retry_in, 1),
+                **self.stats,
+            }
+
+
+class BreakerRegistry:
+    """One shared breaker per (endpoint path, model)."""
+
+    def __init__(self, failure_threshold: int, reset_seconds: float, slow_call_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.slow_call_seconds = slow_call_seconds
+        self._lock = threading.Lock()
+        self._breakers: dict[tuple[str, str], CircuitBreaker] = {}
+
+    def get(self, endpoint: str, model: str | None) -> CircuitBreaker:
+        key = (endpoint, model or "unknown")
+        with self._lock:
+            breaker = self._breakers.get(key)
+            if breaker is None:
+                breaker = CircuitBreaker(*key, self.failure_threshold, self.reset_seconds)
+                self._breakers[key] = breaker
+            return breaker
+
+    def rejecting(self, model: str | None, endpoint: str = "/v1/chat/completions") -> bool:
+        """Whether calls to ``model`` would fail fast right now; lets callers skip straight to a fallback."""
+        with self._lock:
+            breaker = self._breakers.get((endpoint, model or "unknown"))
+        return breaker is not None and breaker.rejecting()
+
+    def snapshot(self) -> list[dict[str, Any]]:
+        with self._lock:
+            breakers = list(self._breakers.values())
+        return [breaker.snapshot() for breaker in breakers]
+
+    def record_abandoned(self, breaker: CircuitBreaker, started: float) -> None:
+        """A cancelled call counts as a failure once it has run longer than a healthy call would."""
+        if time.monotonic() - started >= self.slow_call_seconds:
+            breaker.record_failure()
+        else:
+            breaker.abandon()
+
+
+def is_failure_status(status_code: int) -> bool:
+    return status_code >= 500 or status_code == 429
+
+
+def model_from_body(body: bytes) -> str | None:
+    match = _MODEL_RE.search(body[:MODEL_SCAN_BYTES])
+    return match.group(1).decode("utf-8", "replace") if match else None
+
+
+class BreakerTransport(httpx.AsyncBaseTransport):
+    """httpx transport that routes OpenAI requests through their breaker."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, breakers: BreakerRegistry):
+        self._transport = transport
+        self._breakers = breakers
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if request.url.host != OPENAI_HOST:
+            return await self._transport.handle_async_request(request)
+
+        body = request.content if isinstance(request.stream, httpx.ByteStream) else b""
+        breaker = self._breakers.get(request.url.path, model_from_body(body))
+        breaker.before_call()
+        started = time.monotonic()
+        try:
+            response = await self._transport.handle_async_request(request)
+        except httpx.TransportError:
+            breaker.record_failure()
+            raise
+        except (asyncio.CancelledError, Exception):
+            self._breakers.record_abandoned(breaker, started)
+            raise
+        if is_failure_status(response.status_code):
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+class BreakerRequests:
+    """Stands in for the ``requests`` module, routing OpenAI posts through their breaker."""
+
+    def __init__(self, breakers: BreakerRegistry):
+        self._breakers = breakers
+
+    def post(self, url: str, *args, **kwargs) -> requests.Response:
+        parts = urlsplit(url)
+        if parts.hostname != OPENAI_HOST:
+            return requests.post(url, *args, **kwargs)
+
+        timeout = kwargs.get("timeout")
+        cut_by_deadline = False
+        if isinstance(timeout, (int, float)):
+            kwargs["timeout"] = deadline_budget(timeout)
+            cut_by_deadline = kwargs["timeout"] < timeout
+        payload = kwargs.get("json")
+        model = payload.get("model") if isinstance(payload, dict) else None
+        breaker = self._breakers.get(parts.path, model)
+        breaker.before_call()
+        started = time.monotonic()
+        try:
+            response = requests.post(url, *args, **kwargs)
+        except requests.Timeout:
+            # Running out of request deadline says nothing about OpenAI's health
+            if cut_by_deadline:
+                self._breakers.record_abandoned(breaker, started)
+            else:
+                breaker.record_failure()
+            raise
+        except requests.RequestException:
+            breaker.record_failure()
+            raise
+        except BaseException:
+            self._breakers.record_abandoned(breaker, started)
+            raise
+        if is_failure_status(response.status_code):
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        return response
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(requests, name)
+
+
+openai_breakers = BreakerRegistry(
+    failure_threshold=settings.openai_breaker_failure_threshold,
+    reset_seconds=settings.openai_breaker_reset_seconds,
+    slow_call_seconds=settings.openai_breaker_slow_call_seconds,
+)
@@ -28,6 +28,8 @@ class Settings(BaseSettings):
     openai_max_tokens: int = Field(default=2000, env="OPENAI_MAX_TOKENS")
 
     database_url: str | None = Field(default=None, env="DATABASE_URL")
+    async_db_pool_size: int = Field(default=10, env="ASYNC_DB_POOL_SIZE")
+    async_db_max_overflow: int = Field(default=20, env="ASYNC_DB_MAX_OVERFLOW")
 
     additional_cors_origins: str | list[str] = Field(
         default="", env="ADDITIONAL_CORS_ORIGINS"
@@ -74,6 +76,111 @@ class Settings(BaseSettings):
     openai_model_vision: str = Field(default="gpt-4o", env="OPENAI_MODEL_VISION")
     max_parsing_time_seconds: int = Field(default=60, env="MAX_PARSING_TIME_SECONDS")
     enable_legacy_parser: bool = Field(default=True, env="ENABLE_LEGACY_PARSER")
+    prefer_pymupdf_fonts: bool = Field(default=False, env="PREFER_PYMUPDF_FONTS")
+    structured_parse_mode: str = Field(default="single_pass", env="STRUCTURED_PARSE_MODE")
+    enable_hybrid_parsing: bool = Field(default=True, env="ENABLE_HYBRID_PARSING")
+    hybrid_region_min_confidence: float = Field(default=0.6, env="HYBRID_REGION_MIN_CONFIDENCE")
+    enable_speculative_parsing: bool = Field(default=True, env="ENABLE_SPECULATIVE_PARSING")
+    speculation_band_low: float = Field(default=0.2, env="SPECULATION_BAND_LOW")
+    speculation_band_high: float = Field(default=0.45, env="SPECULATION_BAND_HIGH")
+    speculation_latency_slo_seconds: float = Field(default=20.0, env="SPECULATION_LATENCY_SLO_SECONDS")
+    speculation_min_legacy_confidence: float = Field(
+        default=0.5, env="SPECULATION_MIN_LEGACY_CONFIDENCE"
+    )
+    speculation_budget_per_minute: int = Field(default=30, env="SPECULATION_BUDGET_PER_MINUTE")
+    vision_image_format: str = Field(default="jpeg", env="VISION_IMAGE_FORMAT")
+    vision_image_max_bytes: int = Field(default=350_000, env="VISION_IMAGE_MAX_BYTES")
+    vision_grayscale: bool = Field(default=True, env="VISION_GRAYSCALE")
+    vision_render_workers: int = Field(default=2, env="VISION_RENDER_WORKERS")
+    enable_parse_cache: bool = Field(default=True, env="ENABLE_PARSE_CACHE")
+    parse_cache_ttl_seconds: int = Field(default=86400, env="PARSE_CACHE_TTL_SECONDS")
+    parse_cache_max_entries: int = Field(default=256, env="PARSE_CACHE_MAX_ENTRIES")
+
+    # Background resume parse jobs
+    parse_job_backend: str = Field(default="memory", env="PARSE_JOB_BACKEND")
+    parse_job_workers: int = Field(default=2, env="PARSE_JOB_WORKERS")
+    parse_job_max_pending: int = Field(default=100, env="PARSE_JOB_MAX_PENDING")
+    parse_job_ttl_seconds: int = Field(default=3600, env="PARSE_JOB_TTL_SECONDS")
+
+    # Batch resume import
+    batch_parse_max_files: int = Field(default=50, env="BATCH_PARSE_MAX_FILES")
+    batch_parse_max_total_bytes: int = Field(default=100 * 1024 * 1024, env="BATCH_PARSE_MAX_TOTAL_BYTES")
+    batch_parse_ai_concurrency: int = Field(default=4, env="BATCH_PARSE_AI_CONCURRENCY")
+    batch_parse_extraction_workers: int = Field(default=2, env="BATCH_PARSE_EXTRACTION_WORKERS")
+
+    # Deferred ATS semantic adjustment
+    defer_semantic_adjustment: bool = Field(default=True, env="DEFER_SEMANTIC_ADJUSTMENT")
+    semantic_adjustment_ttl_seconds: int = Field(default=3600, env="SEMANTIC_ADJUSTMENT_TTL_SECONDS")
+    semantic_adjustment_max_entries: int = Field(default=1024, env="SEMANTIC_ADJUSTMENT_MAX_ENTRIES")
+    semantic_adjustment_max_in_flight: int = Field(default=16, env="SEMANTIC_ADJUSTMENT_MAX_IN_FLIGHT")
+
+    # Job description keyword cache
+    jd_keyword_cache_max_entries: int = Field(default=2048, env="JD_KEYWORD_CACHE_MAX_ENTRIES")
+    jd_keyword_cache_ttl_seconds: int = Field(default=604800, env="JD_KEYWORD_CACHE_TTL_SECONDS")
+    jd_keyword_near_duplicate_distance: int = Field(default=3, env="JD_KEYWORD_NEAR_DUPLICATE_DISTANCE")
+    jd_keyword_local_policy: str = Field(default="low_value", env="JD_KEYWORD_LOCAL_POLICY")
+    jd_keyword_min_llm_words: int = Field(default=60, env="JD_KEYWORD_MIN_LLM_WORDS")
+
+    # Bullet generation micro-batching
+    enable_bullet_batching: bool = Field(default=False, env="ENABLE_BULLET_BATCHING")
+    bullet_batch_window_ms: float = Field(default=30.0, env="BULLET_BATCH_WINDOW_MS")
+    bullet_batch_max_items: int = Field(default=8, env="BULLET_BATCH_MAX_ITEMS")
+
+    # OpenAI circuit breaker
+    openai_breaker_failure_threshold: int = Field(default=5, env="OPENAI_BREAKER_FAILURE_THRESHOLD")
+    openai_breaker_reset_seconds: float = Field(default=30.0, env="OPENAI_BREAKER_RESET_SECONDS")
+    openai_breaker_slow_call_seconds: float = Field(default=20.0, env="OPENAI_BREAKER_SLOW_CALL_SECONDS")
+
+    # Local inference tier (Ollama-compatible endpoint)
+    local_inference_tasks: str = Field(default="", env="LOCAL_INFERENCE_TASKS")
+    ollama_base_url: str = Field(default="http://localhost:11434", env="OLLAMA_BASE_URL")
+    ollama_model: str = Field(default="llama3.2:3b", env="OLLAMA_MODEL")
+    ollama_timeout_seconds: float = Field(default=20.0, env="OLLAMA_TIMEOUT_SECONDS")
+    ollama_health_ttl_seconds: float = Field(default=30.0, env="OLLAMA_HEALTH_TTL_SECONDS")
+    ollama_num_ctx: int = Field(default=8192, env="OLLAMA_NUM_CTX")
+
+    # Request deadlines (X-Request-Deadline can only shorten them)
+    ai_request_deadline_seconds: float = Field(default=60.0, env="AI_REQUEST_DEADLINE_SECONDS")
+    parse_request_deadline_seconds: float = Field(default=120.0, env="PARSE_REQUEST_DEADLINE_SECONDS")
+
+    # Stop AI and parsing work (and its usage record) when the client disconnects
+    cancel_on_disconnect: bool = Field(default=True, env="CANCEL_ON_DISCONNECT")
+
+    # Job URL scraping
+    scraper_timeout_seconds: float = Field(default=30.0, env="SCRAPER_TIMEOUT_SECONDS")
+    scraper_max_page_bytes: int = Field(default=3_000_000, env="SCRAPER_MAX_PAGE_BYTES")
+    scraper_max_connections: int = Field(default=20, env="SCRAPER_MAX_CONNECTIONS")
+    scraper_per_domain_concurrency: int = Field(default=2, env="SCRAPER_PER_DOMAIN_CONCURRENCY")
+    scraper_cache_ttl_seconds: float = Field(default=300.0, env="SCRAPER_CACHE_TTL_SECONDS")
+    scraper_cache_max_entries: int = Field(default=256, env="SCRAPER_CACHE_MAX_ENTRIES")
+
+    # Usage metering
+    usage_meter_cache_ttl_seconds: float = Field(default=30.0, env="USAGE_METER_CACHE_TTL_SECONDS")
+    usage_meter_flush_interval_seconds: float = Field(
+        default=1.0, env="USAGE_METER_FLUSH_INTERVAL_SECONDS"
+    )
+    usage_meter_max_pending_events: int = Field(
+        default=10_000, env="USAGE_METER_MAX_PENDING_EVENTS"
+    )
+
+    # Dashboard rollups
+    enable_dashboard_rollups: bool = Field(default=True, env="ENABLE_DASHBOARD_ROLLUPS")
+    dashboard_rollup_interval_seconds: int = Field(
+        default=300, env="DASHBOARD_ROLLUP_INTERVAL_SECONDS"
+    )
+    dashboard_rollup_full_refresh_hours: int = Field(
+        default=24, env="DASHBOARD_ROLLUP_FULL_REFRESH_HOURS"
+    )
+    dashboard_rollup_retention_days: int = Field(
+        default=90, env="DASHBOARD_ROLLUP_RETENTION_DAYS"
+    )
+
+    # Analytics partitions (visitor_analytics, page_engagement_events)
+    analytics_retention_months: int = Field(default=13, env="ANALYTICS_RETENTION_MONTHS")
+    analytics_retention_action: str = Field(default="detach", env="ANALYTICS_RETENTION_ACTION")
+    analytics_partition_months_ahead: int = Field(
+        default=3, env="ANALYTICS_PARTITION_MONTHS_AHEAD"
+    )
 
     model_config = SettingsConfigDict(
         case_sensitive=False,
@@ -2,17 +2,29 @@
 
 from __future__ import annotations
 
+import logging
 import os
-from collections.abc import Generator
+import ssl
+from collections.abc import AsyncGenerator, Generator
 from contextlib import contextmanager
-
-from sqlalchemy import create_engine, text
-from sqlalchemy.engine import Engine
+from functools import lru_cache
+from typing import Any
+
+from sqlalchemy import create_engine, make_url, text
+from sqlalchemy.engine import URL, Engine
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import Session, sessionmaker
 
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
+
 
 def _parse_database_url(database_url: str | None) -> str:
     if not database_url:
@@ -81,6 +93,96 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
+def _async_ssl(sslmode: str | None, rootcert: str | None, cert: str | None, key: str | None) -> Any:
+    """asyncpg's ``ssl`` argument for libpq-style SSL settings.
+
+    asyncpg understands the ``sslmode`` names itself; certificate files need
+    an ``SSLContext``. As with libpq, a root certificate makes ``require``
+    verify the server certificate.
+    """
+    if sslmode == "disable" or not (rootcert or cert):
+        return sslmode
+    context = ssl.create_default_context(cafile=rootcert)
+    context.check_hostname = sslmode == "verify-full"
+    if not rootcert and sslmode not in ("verify-ca", "verify-full"):
+        context.verify_mode = ssl.CERT_NONE
+    if cert:
+        context.load_cert_chain(cert, key)
+    return context
+
+
+def _to_async_url(database_url: str) -> tuple[URL, dict[str, Any]]:
+    """Switch a PostgreSQL URL to the asyncpg driver; returns the URL and ``connect_args``.
+
+    asyncpg rejects libpq query parameters such as ``sslmode`` as connect
+    keywords, so they are translated into its own arguments.
+    """
+    url = make_url(database_url)
+    if not url.drivername.startswith("postgresql"):
+        return url, {}
+
+    query = dict(url.query)
+    sslmode = query.pop("sslmode", None)
+    rootcert = query.pop("sslrootcert", None)
+    cert = query.pop("sslcert", None)
+    key = query.pop("sslkey", None)
+    connect_args: dict[str, Any] = {}
+    ssl_arg = _async_ssl(sslmode, rootcert, cert, key)
+    if ssl_arg is not None:
+        connect_args["ssl"] = ssl_arg
+    if "connect_timeout" in query:
+        connect_args["timeout"] = float(query.pop("connect_timeout"))
+    if "application_name" in query:
+        connect_args["server_settings"] = {"application_name": query.pop("application_name")}
+    return url.set(drivername="postgresql+asyncpg", query=query), connect_args
+
+
+@lru_cache
+def get_async_engine() -> AsyncEngine:
+    """Return the asyncpg engine, created on first use.
+
+    Creation is deferred so importing this module does not require asyncpg
+    when only the synchronous session is used (scripts, tests).
+    """
+    try:
+        async_url, connect_args = _to_async_url(DATABASE_URL)
+        return create_async_engine(
+            async_url,
+            connect_args=connect_args,
+            pool_pre_ping=True,
+            pool_recycle=300,
+            pool_size=settings.async_db_pool_size,
+            max_overflow=settings.async_db_max_overflow,
+            pool_timeout=30,
+            echo=False,
+        )
+    except Exception as exc:  # pragma: no cover - startup safety net
+        raise RuntimeError(f"Error creating async database engine: {exc}") from exc
+
+
+@lru_cache
+def get_async_sessionmaker() -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(
+        get_async_engine(), autoflush=False, expire_on_commit=False
+    )
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """Non-blocking counterpart of ``get_db`` for ``async def`` routes.
+
+    Legacy synchronous helpers can be reused without blocking the event loop
+    through ``await db.run_sync(helper)``, which hands them a ``Session``
+    bound to the same asyncpg connection.
+    """
+    async with get_async_sessionmaker()() as db:
+        yield db
+
+
+async def dispose_async_engine() -> None:
+    if get_async_engine.cache_info().currsize:
+        await get_async_engine().dispose()
+
+
 def create_tables() -> None:
     from app import models  # noqa: F401  # Ensure model metadata is registered
 
@@ -95,15 +197,46 @@ def migrate_schema() -> None:
         return
 
     from app.models.analytics import VisitorAnalytics  # noqa: WPS433
+    from app.models.dashboard import (  # noqa: WPS433
+        DashboardDailyRollup,
+        DashboardHourlyCountryVisits,
+        DashboardRollupState,
+        DashboardUserActivity,
+    )
     from app.models.job import JobCoverLetter, JobResumeVersion  # noqa: WPS433
-    from app.models.usage import AIUsage, TrialPeriod  # noqa: WPS433
+    from app.models.parse_job import ResumeParseJob  # noqa: WPS433
+    from app.models.usage import AIUsage, AIUsageCounter, TrialPeriod  # noqa: WPS433
 
     # Ensure auxiliary tables exist
     JobResumeVersion.__table__.create(bind=engine, checkfirst=True)
     JobCoverLetter.__table__.create(bind=engine, checkfirst=True)
     VisitorAnalytics.__table__.create(bind=engine, checkfirst=True)
     AIUsage.__table__.create(bind=engine, checkfirst=True)
+    AIUsageCounter.__table__.create(bind=engine, checkfirst=True)
     TrialPeriod.__table__.create(bind=engine, checkfirst=True)
+    DashboardDailyRollup.__table__.create(bind=engine, checkfirst=True)
+    DashboardHourlyCountryVisits.__table__.create(bind=engine, checkfirst=True)
+    DashboardUserActivity.__table__.create(bind=engine, checkfirst=True)
+    DashboardRollupState.__table__.create(bind=engine, checkfirst=True)
+    ResumeParseJob.__table__.create(bind=engine, checkfirst=True)
+
+    # Seed the AI usage counters from ai_usage so quotas carry over (no-op once populated)
+    from app.services.usage_metering import backfill_counters  # noqa: WPS433
+
+    with session_scope() as session:
+        try:
+            backfill_counters(session)
+        except Exception as e:
+            session.rollback()
+            logger.warning(f"AI usage counter backfill failed: {e}")
+
+    # Monthly partitions for the analytics tables (no-op until they are partitioned)
+    from app.services.analytics_partitions import maintain_partitions  # noqa: WPS433
+
+    try:
+        maintain_partitions(engine)
+    except Exception as e:
+        logger.warning(f"Analytics partition maintenance failed: {e}")
 
     with engine.connect() as conn:
         # Check and fix job_descriptions.user_id nullability
@@ -201,6 +334,11 @@ def migrate_schema() -> None:
             conn.commit()
 
         column_additions = {
+            "dashboard_rollup_state": {
+                "undated_users": "INTEGER NOT NULL DEFAULT 0",
+                "undated_subscriptions": "INTEGER NOT NULL DEFAULT 0",
+                "undated_tokens": "INTEGER NOT NULL DEFAULT 0",
+            },
             "job_descriptions": {
                 "easy_apply_url": "TEXT",
                 "location": "VARCHAR",
@@ -283,8 +421,18 @@ def migrate_schema() -> None:
             ("idx_users_premium_created", "users", "is_premium, created_at"),
             ("idx_resumes_created_at", "resumes", "created_at"),
             ("idx_resume_versions_created_at", "resume_versions", "created_at"),
+            (
+                "idx_job_descriptions_user_created_nulls_last",
+                "job_descriptions",
+                "user_id, created_at DESC NULLS LAST, id DESC",
+            ),
         ]
 
+        # Superseded by idx_job_descriptions_user_created_nulls_last: sorted NULLs first,
+        # so it never matched the job board's ORDER BY
+        conn.execute(text("DROP INDEX IF EXISTS idx_job_descriptions_user_created_id"))
+        conn.commit()
+
         for index_name, table_name, column_expr in indexes_to_create:
             result = conn.execute(
                 text(
@@ -0,0 +1,147 @@
+"""Request deadlines shared by the AI and parsing pipelines.
+
+Each layer used to apply its own hardcoded timeout (60 s around parsing,
+45 s around the structured parser, 45 s per call, 90 s for vision), so a
+fallback started after one timeout could run long after the client had
+given up. ``RequestDeadlineMiddleware`` now opens a ``deadline_scope`` for
+every request that carries an ``X-Request-Deadline`` header or matches a
+per-route default, and the steps below it size their timeouts with
+``deadline_budget``: the step's own limit, cut to what is left of the
+request. ``can_finish`` lets a fallback be skipped when it could not
+complete in time, and ``DeadlineTransport`` caps every call made with the
+shared OpenAI httpx client.
+
+The deadline lives in a context variable, so it follows the request into
+the tasks it awaits. Background work spawned by a request that must outlive
+it is started with ``without_deadline``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Awaitable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from typing import TypeVar
+
+import httpx
+
+from app.core.config import settings
+
+DEADLINE_HEADER = "X-Request-Deadline"
+
+T = TypeVar("T")
+
+# Absolute deadline as a time.monotonic() value
+_deadline: ContextVar[float | None] = ContextVar("request_deadline", default=None)
+
+
+class DeadlineExceeded(TimeoutError):
+    """The request deadline passed; a ``TimeoutError`` so existing timeout handling applies."""
+
+
+def time_left() -> float | None:
+    """Seconds until the current deadline, or ``None`` outside any deadline."""
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def deadline_budget(default: float) -> float:
+    """``default`` seconds cut to what is left of the deadline; raises ``DeadlineExceeded`` if nothing is."""
+    left = time_left()
+    if left is None:
+        return default
+    if left <= 0:
+        raise DeadlineExceeded("Request deadline exceeded")
+    return min(default, left)
+
+
+def can_finish(seconds: float) -> bool:
+    """Whether a step needing ``seconds`` fits in what is left of the deadline."""
+    left = time_left()
+    return left is None or left >= seconds
+
+
+@contextmanager
+def deadline_scope(seconds: float | None) -> Iterator[None]:
+    """Run the block with a deadline ``seconds`` from now; an outer, earlier deadline still wins."""
+    if seconds is None:
+        yield
+        return
+    deadline = time.monotonic() + seconds
+    outer = _deadline.get()
+    token = _deadline.set(deadline if outer is None else min(outer, deadline))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+async def without_deadline(awaitable: Awaitable[T]) -> T:
+    """Await ``awaitable`` free of the deadline; wrap coroutines handed to ``create_task``."""
+    _deadline.set(None)
+    return await awaitable
+
+
+def parse_deadline_header(value: str, now: float | None = None) -> float | None:
+    """
+    Seconds left until the deadline in an ``X-Request-Deadline`` value.
+
+    Accepts an absolute time as Unix seconds, Unix milliseconds or ISO 8601
+    (``2026-01-01T12:00:00Z``); returns ``None`` for anything else.
+    """
+    now = time.time() if now is None else now
+    value = value.strip()
+    try:
+        timestamp = float(value)
+    except ValueError:
+        try:
+            timestamp = datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+        except ValueError:
+            return None
+    else:
+        if timestamp > 1e12:
+            timestamp /= 1000
+    return timestamp - now
+
+
+def route_deadline_seconds(path: str) -> float | None:
+    """Default deadline for requests to ``path`` that do not send one."""
+    if path.startswith(("/api/resume/upload", "/api/resume/parse-file")):
+        return settings.parse_request_deadline_seconds
+    if path.startswith(("/api/ai/", "/api/openai/")):
+        return settings.ai_request_deadline_seconds
+    return None
+
+
+def request_deadline_seconds(path: str, header: str | None) -> float | None:
+    """The request's deadline in seconds: the header or the route default, whichever is sooner."""
+    seconds = route_deadline_seconds(path)
+    if header:
+        from_header = parse_deadline_header(header)
+        if from_header is not None:
+            seconds = from_header if seconds is None else min(seconds, from_header)
+    return seconds
+
+
+class DeadlineTransport(httpx.AsyncBaseTransport):
+    """httpx transport that abandons a request when the request deadline passes."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport):
+        self._transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        left = time_left()
+        if left is None:
+            return await self._transport.handle_async_request(request)
+        if left <= 0:
+            raise DeadlineExceeded(f"Request deadline exceeded before calling {request.url.host}")
+        try:
+            return await asyncio.wait_for(self._transport.handle_async_request(request), timeout=left)
+        except TimeoutError as e:
+            raise DeadlineExceeded(f"Request deadline exceeded waiting for {request.url.host}") from e
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
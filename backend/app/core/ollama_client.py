@@ -2,9 +2,12 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
+import time
+from typing import Any
 
-import requests
+import httpx
 
 from app.core.config import settings
 
@@ -13,89 +16,124 @@ logger = logging.getLogger(__name__)
 # Ollama Configuration
 OLLAMA_BASE_URL = settings.ollama_base_url
 OLLAMA_MODEL = settings.ollama_model
-USE_OLLAMA_FOR_PARSING = settings.use_ollama_for_parsing
-
-# Initialize Ollama client
-ollama_client: dict | None = None
-ollama_available: bool = False
-
-def check_ollama_availability() -> bool:
-    """Check if Ollama is running and accessible."""
-    global ollama_available
-    try:
-        response = requests.get(
-            f"{OLLAMA_BASE_URL}/api/tags",
-            timeout=5
-        )
-        if response.status_code == 200:
-            ollama_available = True
-            logger.info(f"Ollama is available at {OLLAMA_BASE_URL}")
-            return True
-        else:
-            ollama_available = False
-            logger.warning(f"Ollama API returned status {response.status_code}")
-            return False
-    except requests.exceptions.RequestException as e:
-        ollama_available = False
-        logger.warning(f"Ollama is not available: {e}")
-        return False
-
-def check_model_availability(model: str = None) -> bool:
-    """Check if the specified model is available."""
-    model_to_check = model or OLLAMA_MODEL
-    try:
-        response = requests.get(
-            f"{OLLAMA_BASE_URL}/api/tags",
-            timeout=5
-        )
-        if response.status_code == 200:
-            models = response.json().get("models", [])
-            model_names = [m.get("name", "") for m in models]
-            # Check if model exists (with or without tag)
-            model_available = any(
-                model_to_check in name or name.startswith(model_to_check)
-                for name in model_names
-            )
-            if model_available:
-                logger.info(f"Model {model_to_check} is available")
-            else:
-                logger.warning(f"Model {model_to_check} is not available. Available models: {model_names}")
-            return model_available
-        return False
-    except requests.exceptions.RequestException as e:
-        logger.warning(f"Could not check model availability: {e}")
-        return False
-
-if USE_OLLAMA_FOR_PARSING:
-    try:
-        if check_ollama_availability():
-            if check_model_availability():
-                ollama_client = {
-                    "base_url": OLLAMA_BASE_URL,
-                    "model": OLLAMA_MODEL,
-                    "available": True,
-                }
-                logger.info(
-                    f"Ollama client initialized successfully with model: {OLLAMA_MODEL}"
-                )
-            else:
-                logger.warning(
-                    f"Ollama model {OLLAMA_MODEL} is not available. "
-                    "Please pull it using: ollama pull {OLLAMA_MODEL}"
-                )
-                ollama_client = None
-        else:
-            logger.warning(
-                f"Ollama is not running at {OLLAMA_BASE_URL}. "
-                "Resume parsing will fallback to OpenAI or regex parser."
+
+
+class OllamaClient:
+    """Async client for an Ollama-compatible endpoint (``/api/tags`` and ``/api/chat``).
+
+    Availability is checked with ``GET /api/tags`` and cached for
+    ``health_ttl`` seconds, whether the server answered or not, so a stopped
+    server costs one failed check per TTL rather than one per request.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        model: str,
+        timeout: float = 20.0,
+        health_ttl: float = 30.0,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.model = model
+        self.timeout = timeout
+        self.health_ttl = health_ttl
+        self._client: httpx.AsyncClient | None = None
+        self._models: frozenset[str] = frozenset()
+        self._available = False
+        self._checked_at: float | None = None
+        self._check_lock: asyncio.Lock | None = None
+
+    def _http(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=httpx.Timeout(self.timeout, connect=2.0),
+                limits=httpx.Limits(max_keepalive_connections=10, max_connections=20),
             )
-            ollama_client = None
-    except Exception as e:
-        logger.error(f"Failed to initialize Ollama client: {e}")
-        logger.warning(
-            "Ollama features will be disabled due to client initialization error"
-        )
-        ollama_client = None
-else:
-    logger.info("Ollama parsing is disabled via USE_OLLAMA_FOR_PARSING flag")
+        return self._client
+
+    async def check_health(self) -> bool:
+        """Query the server for its models; records availability either way."""
+        try:
+            response = await self._http().get("/api/tags", timeout=5.0)
+            response.raise_for_status()
+            models = response.json().get("models", [])
+            self._models = frozenset(m.get("name", "") for m in models)
+            if not self._available:
+                logger.info(f"Ollama is available at {self.base_url} with {len(self._models)} models")
+            self._available = True
+        except (httpx.HTTPError, ValueError) as e:
+            if self._available or self._checked_at is None:
+                logger.warning(f"Ollama is not available at {self.base_url}: {e}")
+            self._available = False
+            self._models = frozenset()
+        self._checked_at = time.monotonic()
+        return self._available
+
+    async def is_available(self, model: str | None = None) -> bool:
+        """Cached availability of the server and, if given, of ``model``."""
+        stale = self._checked_at is None or time.monotonic() - self._checked_at >= self.health_ttl
+        if stale:
+            if self._check_lock is None:
+                self._check_lock = asyncio.Lock()
+            async with self._check_lock:
+                if self._checked_at is None or time.monotonic() - self._checked_at >= self.health_ttl:
+                    await self.check_health()
+        return self._available and (model is None or self.has_model(model))
+
+    def has_model(self, model: str) -> bool:
+        # Accept the model with or without a tag ("llama3.2" matches "llama3.2:3b")
+        return any(name == model or name.startswith(f"{model}:") for name in self._models)
+
+    def mark_unavailable(self) -> None:
+        """Skip the server until the next health check after a failed call."""
+        self._available = False
+        self._checked_at = time.monotonic()
+
+    async def chat(
+        self,
+        messages: list[dict[str, str]],
+        model: str | None = None,
+        temperature: float = 0.3,
+        max_tokens: int = 500,
+        json_mode: bool = False,
+        num_ctx: int | None = None,
+    ) -> dict[str, Any]:
+        """Non-streaming ``POST /api/chat``; returns the response JSON."""
+        options: dict[str, Any] = {"temperature": temperature, "num_predict": max_tokens}
+        if num_ctx:
+            options["num_ctx"] = num_ctx
+        payload: dict[str, Any] = {
+            "model": model or self.model,
+            "messages": messages,
+            "stream": False,
+            "options": options,
+        }
+        if json_mode:
+            payload["format"] = "json"
+        response = await self._http().post("/api/chat", json=payload)
+        response.raise_for_status()
+        return response.json()
+
+    def status(self) -> dict[str, Any]:
+        return {
+            "base_url": self.base_url,
+            "available": self._available,
+            "models": sorted(self._models),
+            "checked_seconds_ago": (
+                None if self._checked_at is None else round(time.monotonic() - self._checked_at, 1)
+            ),
+        }
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
 
+ollama_client = OllamaClient(
+    OLLAMA_BASE_URL,
+    OLLAMA_MODEL,
+    timeout=settings.ollama_timeout_seconds,
+    health_ttl=settings.ollama_health_ttl_seconds,
+)
@@ -6,9 +6,10 @@ import logging
 import os
 
 import httpx
-import requests
 
+from app.core.circuit_breaker import BreakerRequests, BreakerTransport, openai_breakers
 from app.core.config import settings
+from app.core.deadline import DeadlineTransport
 
 logger = logging.getLogger(__name__)
 
@@ -25,9 +26,13 @@ def get_httpx_client() -> httpx.AsyncClient | None:
     """Get or create async HTTP client with connection pooling."""
     global _httpx_client
     if _httpx_client is None:
+        # A custom transport ignores the client's limits, so they are set on the pool itself
+        transport = httpx.AsyncHTTPTransport(
+            limits=httpx.Limits(max_keepalive_connections=30, max_connections=150),  # Increased for better concurrency
+        )
         _httpx_client = httpx.AsyncClient(
             timeout=httpx.Timeout(20.0, connect=5.0),  # Reduced timeouts for faster failures
-            limits=httpx.Limits(max_keepalive_connections=30, max_connections=150),  # Increased for better concurrency
+            transport=DeadlineTransport(BreakerTransport(transport, openai_breakers)),
         )
     return _httpx_client
 
@@ -38,7 +43,7 @@ if OPENAI_API_KEY and OPENAI_API_KEY != "sk-your-openai-api-key-here":
         openai_client = {
             "api_key": OPENAI_API_KEY,
             "model": OPENAI_MODEL,
-            "requests": requests,  # Keep for backward compatibility
+            "requests": BreakerRequests(openai_breakers),  # Keep for backward compatibility
             "httpx_client": get_httpx_client(),  # Add async client
         }
         logger.info(
@@ -12,6 +12,7 @@ import asyncio
 import logging
 
 from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.api.models import (
@@ -27,23 +28,30 @@ from app.api.models import (
     ScrapeJobUrlPayload,
     WorkExperienceRequest,
 )
-from app.core.db import get_db
-from app.core.openai_client import OPENAI_MAX_TOKENS, OPENAI_MODEL, openai_client
+from app.core.circuit_breaker import openai_breakers
+from app.core.db import get_async_db, get_db
+from app.core.deadline import deadline_budget
+from app.core.openai_client import OPENAI_MAX_TOKENS, OPENAI_MODEL, get_httpx_client, openai_client
 from app.core.service_factory import (
     get_ai_improvement_engine_service,
+    get_ats_scoring_agent_service,
+    get_ats_service,
     get_content_generation_agent_service,
     get_cover_letter_agent_service,
+    get_enhanced_ats_service,
     get_improvement_agent_service,
     get_job_matching_agent_service,
     get_keyword_extractor_service,
 )
 from app.models import JobMatch, Resume, User
+from app.prompts.prompt_budget import PromptPart, assemble_prompt
 from app.services.ai_improvement_engine import ImprovementStrategy
-from app.services.url_scraper import URLScraper
+from app.services.ats_improvement_planner import apply_improvement_plan
+from app.services.url_scraper import url_scraper
+from app.services.usage_metering import current_usage_hold
 from app.services.usage_service import (
-    check_usage_limit,
+    consume_ai_usage,
     get_plan_tier,
-    record_ai_usage,
 )
 
 logger = logging.getLogger(__name__)
@@ -67,7 +75,7 @@ def get_user_from_request(request: Request, db: Session):
 
 async def check_and_record_ai_usage(
     request: Request,
-    db: Session,
+    db: AsyncSession,
     feature_type: str,
     session_id: str | None = None,
 ) -> tuple[bool, dict]:
@@ -75,35 +83,41 @@ async def check_and_record_ai_usage(
     Check if user can use AI feature and record usage if allowed.
     Returns (allowed, info_dict)
     """
-    user = get_user_from_request(request, db)
-    user_id = user.id if user else None
+    # Captured here: run_sync may run in a greenlet without this request's context
+    hold = current_usage_hold()
 
-    plan_tier = get_plan_tier(user, db)
+    def consume(session: Session) -> tuple[bool, dict]:
+        user = get_user_from_request(request, session)
+        user_id = user.id if user else None
 
-    allowed, info = check_usage_limit(user_id, feature_type, plan_tier, session_id, db)
+        plan_tier = get_plan_tier(user, session)
 
-    if allowed:
-        # Record usage
-        try:
-            record_ai_usage(user_id, feature_type, session_id, db)
-        except Exception as e:
-            logger.warning(f"Failed to record AI usage: {e}")
+        return consume_ai_usage(user_id, feature_type, plan_tier, session_id, session, hold)
 
-    return allowed, info
+    return await db.run_sync(consume)
 
 
 @router.get("/health")
 async def health_check():
-    """Check health status of AI services"""
+    """Check health status of AI services and the OpenAI circuit breakers"""
+    breakers = openai_breakers.snapshot()
+    try:
+        enhanced_ats_available = get_enhanced_ats_service() is not None
+    except Exception:
+        # The checker raises instead of returning None when its NLTK data is missing
+        enhanced_ats_available = False
     return {
-        "job_matching_agent": job_matching_agent is not None,
-        "ats_checker": ats_checker is not None,
-        "enhanced_ats_checker": enhanced_ats_checker is not None,
-        "ai_improvement_engine": ai_improvement_engine is not None,
-        "ats_scoring_agent": ats_scoring_agent is not None,
-        "content_generation_agent": content_generation_agent is not None,
-        "cover_letter_agent": cover_letter_agent is not None,
-        "improvement_agent": improvement_agent is not None,
+        "openai_configured": openai_client is not None,
+        "openai_circuit": "open" if any(b["state"] != "closed" for b in breakers) else "closed",
+        "circuit_breakers": breakers,
+        "job_matching_agent": get_job_matching_agent_service() is not None,
+        "ats_checker": get_ats_service() is not None,
+        "enhanced_ats_checker": enhanced_ats_available,
+        "ai_improvement_engine": get_ai_improvement_engine_service() is not None,
+        "ats_scoring_agent": get_ats_scoring_agent_service() is not None,
+        "content_generation_agent": get_content_generation_agent_service() is not None,
+        "cover_letter_agent": get_cover_letter_agent_service() is not None,
+        "improvement_agent": get_improvement_agent_service() is not None,
     }
 
 
@@ -176,7 +190,7 @@ async def get_openai_status():
 async def get_ai_improvement_suggestions(
     payload: AIImprovementPayload,
     request: Request,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     session_id: str | None = None,
     ai_improvement_engine_service = Depends(get_ai_improvement_engine_service),
 ):
@@ -338,7 +352,7 @@ Return ONLY a JSON array of numbers like [1, 3, 5, 7, ...], no other text."""
 async def generate_cover_letter(
     payload: CoverLetterPayload,
     request: Request,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     session_id: str | None = None,
     cover_letter_agent_service = Depends(get_cover_letter_agent_service),
 ):
@@ -583,8 +597,7 @@ async def scrape_job_url(payload: ScrapeJobUrlPayload):
                 detail="URL cannot be empty"
             )
 
-        url_scraper = URLScraper()
-        scrape_result = url_scraper.scrape_url(payload.url.strip())
+        scrape_result = await url_scraper.scrape_url(payload.url.strip())
 
         if not scrape_result.get("success") or not scrape_result.get("content"):
             raise HTTPException(
@@ -655,7 +668,12 @@ async def scrape_job_url(payload: ScrapeJobUrlPayload):
 
 @router.post("/extract_keywords_llm")
 async def extract_keywords_llm(payload: ExtractKeywordsPayload):
-    """Extract keywords from job description using LLM (pure AI approach)"""
+    """Extract keywords from job description using LLM (pure AI approach)
+
+    Repeated and near-duplicate job descriptions are served from
+    ``jd_keyword_cache``; low-value ones use the local extractor according to
+    ``jd_keyword_local_policy``.
+    """
     try:
         if not payload.job_description or not payload.job_description.strip():
             raise HTTPException(
@@ -663,29 +681,80 @@ async def extract_keywords_llm(payload: ExtractKeywordsPayload):
                 detail="Job description cannot be empty"
             )
 
-        if not openai_client:
-            raise HTTPException(
-                status_code=503,
-                detail="OpenAI service not available"
+        from app.services.jd_keyword_cache import (
+            build_keyword_response,
+            fingerprint_job_description,
+            jd_keyword_cache,
+            local_keyword_data,
+            use_local_extraction,
+        )
+
+        fingerprint = fingerprint_job_description(payload.job_description)
+
+        if use_local_extraction(fingerprint):
+            jd_keyword_cache.record_local()
+            keywords_data = local_keyword_data(
+                get_keyword_extractor_service(), payload.job_description
             )
+            return {
+                "success": True,
+                "method": "local",
+                **build_keyword_response(keywords_data, payload.job_description),
+                "cache": {"match": "skipped"},
+            }
+
+        cached = jd_keyword_cache.lookup(fingerprint)
+        if cached is not None:
+            return {
+                "success": True,
+                "method": "llm",
+                **build_keyword_response(cached.keywords_data, payload.job_description),
+                "cache": {
+                    "match": cached.match,
+                    "distance": cached.distance,
+                    "tokens_saved": cached.tokens_saved,
+                },
+            }
+
+        import json
 
         from app.prompts.content_generation_prompts import get_llm_keyword_extraction_prompt
+        from app.services.model_router import model_router
 
         prompt = get_llm_keyword_extraction_prompt(payload.job_description)
 
-        headers = {
-            "Authorization": f"Bearer {openai_client['api_key']}",
-            "Content-Type": "application/json",
-        }
-
         data = {
-            "model": openai_client["model"],
+            "model": openai_client["model"] if openai_client else OPENAI_MODEL,
             "messages": [{"role": "user", "content": prompt}],
             "max_tokens": 800,  # Enough for 50-100 keywords
             "temperature": 0.3,  # Lower for more consistent extraction
             "response_format": {"type": "json_object"},  # Force JSON response
         }
 
+        local = await model_router.complete_locally("keyword_extraction", data)
+        if local is not None:
+            keywords_data = json.loads(local.content)
+            # Not cached: near-duplicates would be served these as OpenAI keywords
+            jd_keyword_cache.record_local_model()
+            return {
+                "success": True,
+                "method": "local_llm",
+                "model": local.model,
+                **build_keyword_response(keywords_data, payload.job_description),
+                "cache": {"match": "miss", "tokens_used": 0},
+            }
+
+        if not openai_client:
+            raise HTTPException(
+                status_code=503,
+                detail="OpenAI service not available"
+            )
+
+        headers = {
+            "Authorization": f"Bearer {openai_client['api_key']}",
+            "Content-Type": "application/json",
+        }
+
         # Use async httpx client
         httpx_client = openai_client.get("httpx_client")
         if not httpx_client:
@@ -714,76 +783,15 @@ async def extract_keywords_llm(payload: ExtractKeywordsPayload):
             content = result["choices"][0]["message"]["content"].strip()
 
             # Parse JSON response
-            import json
             keywords_data = json.loads(content)
-
-            # Validate keywords against job description content
-            jd_lower = payload.job_description.lower()
-
-            def keyword_in_text(keyword: str) -> bool:
-                """Check if keyword appears in job description text"""
-                if not keyword:
-                    return False
-                kw_lower = keyword.lower().strip()
-                # Check exact match or as part of a word/phrase
-                return kw_lower in jd_lower
-
-            # Filter keywords to only those present in JD
-            technical_keywords = [
-                kw for kw in keywords_data.get("technical_keywords", [])
-                if keyword_in_text(kw)
-            ]
-            soft_skills = [
-                kw for kw in keywords_data.get("soft_skills", [])
-                if keyword_in_text(kw)
-            ]
-            general_keywords = [
-                kw for kw in keywords_data.get("general_keywords", [])
-                if keyword_in_text(kw)
-            ]
-            priority_keywords = [
-                kw for kw in keywords_data.get("priority_keywords", [])
-                if keyword_in_text(kw)
-            ]
-            education_keywords = [
-                kw for kw in keywords_data.get("education", [])
-                if keyword_in_text(kw)
-            ]
-            experience_keywords = [
-                kw for kw in keywords_data.get("experience", [])
-                if keyword_in_text(kw)
-            ]
-
-            # Create high_frequency_keywords format
-            high_frequency_keywords = [
-                {
-                    "keyword": kw,
-                    "frequency": len(priority_keywords) - idx,  # Higher frequency for earlier keywords
-                    "importance": "high" if idx < 5 else "medium" if idx < 10 else "low"
-                }
-                for idx, kw in enumerate(priority_keywords[:20])
-            ]
-
-            # Combine all keywords for total count
-            all_keywords = (
-                technical_keywords +
-                general_keywords +
-                soft_skills +
-                education_keywords +
-                experience_keywords
-            )
+            tokens_used = int((result.get("usage") or {}).get("total_tokens") or 0)
+            jd_keyword_cache.store(fingerprint, keywords_data, tokens_used)
 
             return {
                 "success": True,
                 "method": "llm",
-                "technical_keywords": technical_keywords,
-                "soft_skills": soft_skills,
-                "general_keywords": general_keywords,
-                "priority_keywords": priority_keywords,
-                "high_frequency_keywords": high_frequency_keywords,
-                "education_keywords": education_keywords,
-                "experience_keywords": experience_keywords,
-                "total_keywords": len(set(all_keywords)),  # Unique count
+                **build_keyword_response(keywords_data, payload.job_description),
+                "cache": {"match": "miss", "tokens_used": tokens_used},
             }
 
         except json.JSONDecodeError as e:
@@ -809,6 +817,32 @@ async def extract_keywords_llm(payload: ExtractKeywordsPayload):
         )
 
 
+@router.get("/extract_keywords_llm/stats")
+async def extract_keywords_llm_stats():
+    """Hit rate and token savings of the job description keyword cache"""
+    from app.services.jd_keyword_cache import jd_keyword_cache
+
+    return {"success": True, **jd_keyword_cache.stats()}
+
+
+@router.get("/prompt_budget/stats")
+async def prompt_budget_stats_endpoint():
+    """Prompt tokens sent and saved by the token budgets, per feature"""
+    from app.prompts.prompt_budget import PROMPT_TOKEN_BUDGETS, prompt_budget_stats
+
+    return {"success": True, "budgets": PROMPT_TOKEN_BUDGETS, "features": prompt_budget_stats()}
+
+
+@router.get("/model_router/stats")
+async def model_router_stats():
+    """Local inference routing rules, server status and per-task latency and savings"""
+    from app.services.model_router import model_router
+
+    if model_router.rules:
+        await model_router.client.is_available()
+    return {"success": True, **model_router.stats()}
+
+
 # Content Generation Endpoints
 @router.post("/generate_bullet_points")
 async def generate_bullet_points(payload: GenerateBulletPointsPayload):
@@ -1030,9 +1064,9 @@ async def generate_bullet_from_keywords(
             raise HTTPException(status_code=400, detail="Keywords are required")
 
         keywords_str = ", ".join(keywords_list)
-        # Limit context size to prevent slow API calls
-        jd_excerpt = job_description[:500] if job_description else ""  # Reduced from 800
-        resume_excerpt = resume_context[:500] if resume_context else ""  # Reduced from 800
+        # The prompt builders fit these into their token budgets
+        jd_excerpt = job_description
+        resume_excerpt = resume_context
         count = max(
             1, min(int(requested_count) if isinstance(requested_count, int) else 3, 5)
         )
@@ -1127,7 +1161,7 @@ async def analyze_keywords_for_bullet(
         result = await content_generation_agent_service.analyze_relevant_keywords_for_bullet(
             current_bullet=current_bullet,
             available_keywords=available_keywords,
-            job_description_excerpt=job_description[:500] if job_description else None,
+            job_description_excerpt=job_description or None,
         )
 
         return result
@@ -1169,7 +1203,7 @@ async def generate_bullets_from_keywords(
             keywords_str=keywords_str,
             company_title=company_title,
             job_title=job_title,
-            jd_excerpt=job_description[:500] if job_description else None,
+            jd_excerpt=job_description or None,
             resume_excerpt=None,
             count=max(3, min(len(keywords_list), 5)),
             missing_keywords=None,  # Don't use missing keywords - only use selected keywords
@@ -1531,8 +1565,6 @@ async def generate_summary_from_experience(payload: dict):
             skills_text = "\n".join(skills_entries_list).strip()
 
         job_description_excerpt = job_description.strip()
-        if len(job_description_excerpt) > 2000:
-            job_description_excerpt = job_description_excerpt[:2000] + "..."
 
         def build_fallback_summary() -> str:
             headline = title or "Experienced professional"
@@ -1594,24 +1626,25 @@ CRITICAL: NEVER mention or reference the company name "{company_name}" or any co
 The summary should be generic and applicable to any role, not specific to any particular company.
 """
 
-        context = f"""Analyze this professional's work experience and create a compelling ATS-optimized professional summary.
+        def render_summary_prompt(parts: dict[str, str]) -> str:
+            return f"""Analyze this professional's work experience and create a compelling ATS-optimized professional summary.
 
 Professional Title: {title if title else 'Not specified'}
 
 Work Experience:
-{work_experience_text if work_experience_text else 'Limited information provided'}
+{parts['work_experience']}
 
 Skills:
-{skills_text if skills_text else 'To be extracted from experience'}
+{parts['skills']}
 
  Target Job Description Keywords (blend these naturally into the narrative - MAXIMUM 8 keywords total):
-{keyword_guidance}
+{parts['keyword_guidance']}
 {company_warning}
  Job Description Snapshot (for context):
-{job_description_excerpt if job_description_excerpt else 'Not provided'}
+{parts['job_description']}
 
  Existing Summary (for reference only – produce a new, improved summary):
-{existing_summary if existing_summary else 'No existing summary provided'}
+{parts['existing_summary']}
 
 Requirements for the Professional Summary:
 1. Length: 4-7 sentences (minimum 4 sentences, maximum 7 sentences, approximately 80-120 words)
@@ -1633,6 +1666,27 @@ Requirements for the Professional Summary:
 
 Return ONLY the professional summary paragraph, no labels, explanations, or formatting markers."""
 
+        context = assemble_prompt(
+            "summary_from_experience",
+            [
+                PromptPart("keyword_guidance", keyword_guidance, priority=1),
+                PromptPart(
+                    "work_experience", work_experience_text, priority=2,
+                    placeholder="Limited information provided",
+                ),
+                PromptPart(
+                    "skills", skills_text, priority=2, max_tokens=250,
+                    placeholder="To be extracted from experience",
+                ),
+                PromptPart("job_description", job_description_excerpt, priority=3, max_tokens=500),
+                PromptPart(
+                    "existing_summary", existing_summary, priority=4, max_tokens=200,
+                    placeholder="No existing summary provided",
+                ),
+            ],
+            render_summary_prompt,
+        )
+
         summary_text = ""
         tokens_used = 0
         fallback_error: str | None = None
@@ -1652,15 +1706,8 @@ Return ONLY the professional summary paragraph, no labels, explanations, or form
 
             logger.info(f"Generating summary from experience for: {name}")
 
-            # Use async HTTP client with proper timeout handling
-            httpx_client = openai_client.get("httpx_client")
-            if not httpx_client:
-                # Fallback to creating a new client if not available
-                import httpx
-                httpx_client = httpx.AsyncClient(
-                    timeout=httpx.Timeout(35.0, connect=5.0),
-                    limits=httpx.Limits(max_keepalive_connections=10, max_connections=50),
-                )
+            # Use the shared async HTTP client so the OpenAI circuit breaker applies
+            httpx_client = openai_client.get("httpx_client") or get_httpx_client()
 
             async def make_request():
                 response = await httpx_client.post(
@@ -1675,7 +1722,7 @@ Return ONLY the professional summary paragraph, no labels, explanations, or form
                 return response.json()
 
             # Use asyncio.wait_for for proper timeout handling
-            result = await asyncio.wait_for(make_request(), timeout=35.0)
+            result = await asyncio.wait_for(make_request(), timeout=deadline_budget(35.0))
             summary_text = result["choices"][0]["message"]["content"].strip()
             tokens_used = result.get("usage", {}).get("total_tokens", 0)
         except TimeoutError:
@@ -1836,7 +1883,12 @@ async def generate_resume_content(
 
 
 @router.post("/improve_ats_score")
-async def improve_ats_score_bulk(payload: EnhancedATSPayload):
+async def improve_ats_score_bulk(
+    payload: EnhancedATSPayload,
+    enhanced_ats_checker = Depends(get_enhanced_ats_service),
+    ai_improvement_engine = Depends(get_ai_improvement_engine_service),
+    improvement_agent = Depends(get_improvement_agent_service),
+):
     """Apply multiple AI improvements to boost ATS score"""
     try:
         logger.info("Processing bulk ATS score improvement request")
@@ -1893,61 +1945,36 @@ async def improve_ats_score_bulk(payload: EnhancedATSPayload):
             reverse=True,
         )
 
-        # Apply top improvements (limit to 5 to avoid overwhelming changes)
+        # Apply top improvements (limit to 5 to avoid overwhelming changes).
+        # Improvements touching different sections run concurrently, each on
+        # its own section's JSON; overlapping ones run in later waves.
         applied_improvements = []
-        improved_resume = resume_data.copy()
-
-        for improvement in improvements[:5]:
-            try:
-                # Map category to strategy
-                strategy_mapping = {
-                    "professional_summary": "summary",
-                    "quantified_achievements": "achievements",
-                    "job_alignment": "keywords",
-                    "career_transition": "experience",
-                    "content_audit": "content",
-                    "modern_format": "format",
-                    "skills_enhancement": "skills",
-                    "leadership_emphasis": "leadership",
-                    "contact_optimization": "contact",
-                    "ats_compatibility": "ats",
-                }
-
-                strategy = strategy_mapping.get(
-                    improvement.get("category", "").lower().replace(" ", "_"), "content"
+        improvement_conflicts = []
+        improvement_waves = 0
+        improved_resume = resume_data
+
+        if openai_client:
+            job_context = payload.job_description or None
+
+            async def apply_improvement(improvement: dict, scope: dict) -> dict | None:
+                result = await improvement_agent.apply_scoped_ats_improvement(
+                    improvement_title=improvement.get("title", ""),
+                    improvement_description=improvement.get("description", ""),
+                    specific_suggestion=improvement.get("specific_suggestion", ""),
+                    scope=scope,
+                    job_description=job_context,
                 )
+                if not result.get("success"):
+                    raise ValueError(result.get("error", "Unknown error"))
+                return result.get("patch")
 
-                # Generate improvement using AI improvement agent
-                if openai_client:
-                    result = await improvement_agent.apply_ats_improvement(
-                        improvement_title=improvement.get("title", ""),
-                        improvement_description=improvement.get("description", ""),
-                        specific_suggestion=improvement.get("specific_suggestion", ""),
-                        improved_resume=str(improved_resume)[:2000],
-                        job_description=payload.job_description[:500]
-                        if payload.job_description
-                        else None,
-                    )
-
-                    if result.get("success"):
-                        updated_resume = result.get("improved_resume")
-                        if updated_resume:
-                            improved_resume = updated_resume
-                            applied_improvements.append(improvement)
-                            logger.info(
-                                f"Applied improvement: {improvement.get('title', '')}"
-                            )
-                    else:
-                        logger.warning(
-                            f"Failed to apply improvement: {improvement.get('title', '')} - {result.get('error', 'Unknown error')}"
-                        )
-                        continue
-
-            except Exception as e:
-                logger.error(
-                    f"Error applying improvement {improvement.get('title', '')}: {str(e)}"
-                )
-                continue
+            plan_result = await apply_improvement_plan(
+                resume_data, improvements[:5], apply_improvement
+            )
+            improved_resume = plan_result["resume"]
+            applied_improvements = plan_result["applied"]
+            improvement_conflicts = plan_result["conflicts"]
+            improvement_waves = plan_result["waves"]
 
         # Calculate new ATS score
         # Automatically use industry-standard TF-IDF when job description is provided
@@ -1970,6 +1997,8 @@ async def improve_ats_score_bulk(payload: EnhancedATSPayload):
             "score_improvement": score_improvement,
             "applied_improvements": applied_improvements,
             "remaining_improvements": len(improvements) - len(applied_improvements),
+            "improvement_waves": improvement_waves,
+            "conflicts": improvement_conflicts,
         }
 
     except Exception as e:
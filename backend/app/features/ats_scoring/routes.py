@@ -146,7 +146,7 @@ async def get_enhanced_ats_score(
         try:
             user = get_user_from_request(request, db)
             user_id = user.id if user else None
-            record_ai_usage(user_id, "ats_enhanced", session_id, db)
+            record_ai_usage(user_id, "ats_enhanced", session_id)
         except Exception as e:
             logger.warning(f"Failed to record ATS usage: {e}")
 
@@ -247,6 +247,7 @@ async def get_enhanced_ats_score(
             "details": result.get("details", {}),
             "ai_improvements": result.get("ai_improvements", []),
             "method": result.get("method", "comprehensive"),
+            "semantic_pending": result.get("semantic_pending"),
             "message": f"Enhanced ATS compatibility score: {result.get('score', 0)}/100",
         }
 
@@ -261,3 +262,44 @@ async def get_enhanced_ats_score(
             "error": str(e),
         }
 
+
+@router.get("/semantic_adjustment/{token}")
+async def get_semantic_adjustment(token: str, wait: float = 0.0):
+    """Deferred semantic adjustment for a score that returned ``semantic_pending``.
+
+    ``wait`` (seconds, max 30) long-polls until the analysis finishes.
+    """
+    from app.services.ats.semantic_adjustment import semantic_adjustments
+
+    entry = await semantic_adjustments.wait(token, timeout=min(max(wait, 0.0), 30.0))
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Semantic adjustment not found or expired")
+    return {"token": token, **entry}
+
+
+@router.get("/semantic_adjustment/{token}/events")
+async def stream_semantic_adjustment(token: str):
+    """Server-sent event with the semantic adjustment once it is ready"""
+    import json
+
+    from fastapi.responses import StreamingResponse
+
+    from app.services.ats.semantic_adjustment import semantic_adjustments
+
+    if semantic_adjustments.get(token) is None:
+        raise HTTPException(status_code=404, detail="Semantic adjustment not found or expired")
+
+    async def events():
+        while True:
+            entry = await semantic_adjustments.wait(token, timeout=15.0)
+            if entry is None or entry["status"] != "pending":
+                status = entry["status"] if entry else "expired"
+                yield f"event: {status}\ndata: {json.dumps({'token': token, **(entry or {})}, default=str)}\n\n"
+                return
+            yield ": keepalive\n\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
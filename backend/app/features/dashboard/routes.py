@@ -9,21 +9,27 @@ from __future__ import annotations
 import logging
 from datetime import datetime, timedelta
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy import case, extract, func, text
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.core.db import get_db
+from app.core.db import get_async_db, get_db
 from app.core.firebase_admin import verify_id_token
 from app.models import (
     BillingEvent,
+    DashboardDailyRollup,
+    DashboardHourlyCountryVisits,
+    DashboardRollupState,
+    DashboardUserActivity,
     PageEngagementEvent,
     Resume,
     ResumeVersion,
     User,
     VisitorAnalytics,
 )
+from app.services.dashboard_rollups import RollupsNotReady, rollup_state
 
 logger = logging.getLogger(__name__)
 
@@ -53,45 +59,64 @@ def verify_admin_token(
     return decoded_token
 
 
+def _rollup_state(db: Session) -> DashboardRollupState:
+    """The rollups' refresh state, or a 503 until the background task has built them"""
+    try:
+        return rollup_state(db)
+    except RollupsNotReady:
+        raise HTTPException(
+            status_code=503,
+            detail="Dashboard data is still being prepared",
+            headers={"Retry-After": "30"},
+        ) from None
+
+
 @router.get("/stats")
 async def get_dashboard_stats(
-    db: Session = Depends(get_db),
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
     token: dict = Depends(verify_admin_token),
 ):
-    """Get dashboard statistics from PostgreSQL - Optimized with single queries"""
+    """Get dashboard statistics from the daily rollups (windows aligned to UTC days)"""
     try:
-        # Calculate date ranges once
-        thirty_days_ago = datetime.utcnow() - timedelta(days=30)
-        sixty_days_ago = datetime.utcnow() - timedelta(days=60)
+        state = await db.run_sync(_rollup_state)
+        data_as_of = state.refreshed_at
+        response.headers["X-Data-As-Of"] = data_as_of.isoformat()
 
-        # Optimize: Use raw SQL for maximum performance - single query for all user stats
-        # This reduces 6 queries to 1 query
-        user_stats_query = """
+        # Last 30 days = the 30 most recent rollup days, previous 30 = the 30 before
+        today = data_as_of.date()
+        thirty_days_ago = today - timedelta(days=30)
+        sixty_days_ago = today - timedelta(days=60)
+
+        stats_query = """
             SELECT 
-                COUNT(*) as total_users,
-                COUNT(*) FILTER (WHERE is_premium = true) as total_subscriptions,
-                COUNT(*) FILTER (WHERE created_at >= :thirty_days_ago) as users_last_30,
-                COUNT(*) FILTER (WHERE created_at >= :sixty_days_ago AND created_at < :thirty_days_ago) as users_previous_30,
-                COUNT(*) FILTER (WHERE is_premium = true AND COALESCE(premium_purchased_at, created_at) >= :thirty_days_ago) as subscriptions_last_30,
-                COUNT(*) FILTER (WHERE is_premium = true AND COALESCE(premium_purchased_at, created_at) >= :sixty_days_ago AND COALESCE(premium_purchased_at, created_at) < :thirty_days_ago) as subscriptions_previous_30
-            FROM users
+                COALESCE(SUM(new_users), 0) as total_users,
+                COALESCE(SUM(new_subscriptions), 0) as total_subscriptions,
+                COALESCE(SUM(new_users) FILTER (WHERE day > :thirty_days_ago), 0) as users_last_30,
+                COALESCE(SUM(new_users) FILTER (WHERE day > :sixty_days_ago AND day <= :thirty_days_ago), 0) as users_previous_30,
+                COALESCE(SUM(new_subscriptions) FILTER (WHERE day > :thirty_days_ago), 0) as subscriptions_last_30,
+                COALESCE(SUM(new_subscriptions) FILTER (WHERE day > :sixty_days_ago AND day <= :thirty_days_ago), 0) as subscriptions_previous_30,
+                COALESCE(SUM(tokens_used), 0) as total_tokens,
+                COALESCE(SUM(tokens_used) FILTER (WHERE day > :thirty_days_ago), 0) as tokens_last_30,
+                COALESCE(SUM(tokens_used) FILTER (WHERE day > :sixty_days_ago AND day <= :thirty_days_ago), 0) as tokens_previous_30
+            FROM dashboard_daily_rollups
         """
-        user_stats_result = db.execute(
-            text(user_stats_query),
+        stats_result = (await db.execute(
+            text(stats_query),
             {
                 "thirty_days_ago": thirty_days_ago,
                 "sixty_days_ago": sixty_days_ago
             }
-        ).first()
+        )).first()
 
-        total_users = user_stats_result.total_users or 0
-        total_subscriptions = user_stats_result.total_subscriptions or 0
+        total_users = (stats_result.total_users or 0) + state.undated_users
+        total_subscriptions = (stats_result.total_subscriptions or 0) + state.undated_subscriptions
         total_free_users = total_users - total_subscriptions
-        users_last_30 = user_stats_result.users_last_30 or 0
-        users_previous_30 = user_stats_result.users_previous_30 or 0
+        users_last_30 = stats_result.users_last_30 or 0
+        users_previous_30 = stats_result.users_previous_30 or 0
         users_change = users_last_30 - users_previous_30
-        subscriptions_last_30 = user_stats_result.subscriptions_last_30 or 0
-        subscriptions_previous_30 = user_stats_result.subscriptions_previous_30 or 0
+        subscriptions_last_30 = stats_result.subscriptions_last_30 or 0
+        subscriptions_previous_30 = stats_result.subscriptions_previous_30 or 0
         subscriptions_change = subscriptions_last_30 - subscriptions_previous_30
         free_users_change = users_change - subscriptions_change
 
@@ -99,35 +124,10 @@ async def get_dashboard_stats(
         total_income = 0
         income_change = 0
 
-        # Optimize: Single query for resume counts
-        resume_stats_query = """
-            SELECT 
-                COUNT(*) as total_resumes,
-                COUNT(*) FILTER (WHERE created_at >= :thirty_days_ago) as resumes_last_30,
-                COUNT(*) FILTER (WHERE created_at >= :sixty_days_ago AND created_at < :thirty_days_ago) as resumes_previous_30
-            FROM resumes
-        """
-        resume_stats_result = db.execute(
-            text(resume_stats_query),
-            {
-                "thirty_days_ago": thirty_days_ago,
-                "sixty_days_ago": sixty_days_ago
-            }
-        ).first()
-
-        total_resumes = resume_stats_result.total_resumes or 0
-        resumes_last_30 = resume_stats_result.resumes_last_30 or 0
-        resumes_previous_30 = resume_stats_result.resumes_previous_30 or 0
-
         # Expense calculation (OpenAI API costs) - Use actual token usage from database
-        total_tokens = db.query(func.sum(ResumeVersion.tokens_used)).scalar() or 0
-        tokens_last_30 = db.query(func.sum(ResumeVersion.tokens_used)).filter(
-            ResumeVersion.created_at >= thirty_days_ago
-        ).scalar() or 0
-        tokens_previous_30 = db.query(func.sum(ResumeVersion.tokens_used)).filter(
-            ResumeVersion.created_at >= sixty_days_ago,
-            ResumeVersion.created_at < thirty_days_ago
-        ).scalar() or 0
+        total_tokens = (stats_result.total_tokens or 0) + state.undated_tokens
+        tokens_last_30 = stats_result.tokens_last_30 or 0
+        tokens_previous_30 = stats_result.tokens_previous_30 or 0
 
         total_expense = round(total_tokens * 0.0003 / 1000, 2)
         expense_last_30 = round(tokens_last_30 * 0.0003 / 1000, 2)
@@ -145,7 +145,10 @@ async def get_dashboard_stats(
             "freeUsersChange": free_users_change,
             "incomeChange": income_change,
             "expenseChange": expense_change,
+            "data_as_of": data_as_of.isoformat(),
         }
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching dashboard stats: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail="Failed to fetch dashboard stats")
@@ -153,34 +156,29 @@ async def get_dashboard_stats(
 
 @router.get("/sales")
 async def get_sales_data(
+    response: Response,
     db: Session = Depends(get_db),
     token: dict = Depends(verify_admin_token),
 ):
-    """Get sales statistics by month - Uses actual purchase dates"""
+    """Get sales statistics by month - Uses actual purchase dates (from the daily rollups)"""
     try:
-        current_year = datetime.utcnow().year
+        data_as_of = _rollup_state(db).refreshed_at
+        response.headers["X-Data-As-Of"] = data_as_of.isoformat()
+        current_year = data_as_of.year
 
-        # Use premium_purchased_at if available, fallback to created_at for legacy data
         sales_data = db.query(
-            extract('month',
-                func.coalesce(User.premium_purchased_at, User.created_at)
-            ).label('month'),
-            func.count(User.id).label('premium_count')
+            extract('month', DashboardDailyRollup.day).label('month'),
+            func.sum(DashboardDailyRollup.new_subscriptions).label('premium_count')
         ).filter(
-            User.is_premium == True,
-            extract('year',
-                func.coalesce(User.premium_purchased_at, User.created_at)
-            ) == current_year
+            extract('year', DashboardDailyRollup.day) == current_year
         ).group_by(
-            extract('month',
-                func.coalesce(User.premium_purchased_at, User.created_at)
-            )
+            extract('month', DashboardDailyRollup.day)
         ).all()
 
         months = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
 
         # Create a dictionary for quick lookup
-        sales_dict = {int(row.month): row.premium_count for row in sales_data}
+        sales_dict = {int(row.month): row.premium_count or 0 for row in sales_data}
 
         # Build result array for all 12 months
         sales_by_month = []
@@ -196,6 +194,8 @@ async def get_sales_data(
             })
 
         return sales_by_month
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching sales data: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail="Failed to fetch sales data")
@@ -203,77 +203,86 @@ async def get_sales_data(
 
 @router.get("/subscribers")
 async def get_subscriber_data(
+    response: Response,
     db: Session = Depends(get_db),
     token: dict = Depends(verify_admin_token),
 ):
-    """Get subscriber statistics by day of week - Optimized with single GROUP BY query"""
+    """Get subscriber statistics by month - single GROUP BY over the daily rollups"""
     try:
-        # Get total subscriptions
-        total_subscriptions = db.query(func.count(User.id)).filter(
-            User.is_premium == True
-        ).scalar() or 0
+        state = _rollup_state(db)
+        data_as_of = state.refreshed_at
+        response.headers["X-Data-As-Of"] = data_as_of.isoformat()
 
         # Calculate changes (last 30 days vs previous 30 days) in a single query
-        now = datetime.utcnow()
-        thirty_days_ago = now - timedelta(days=30)
-        sixty_days_ago = now - timedelta(days=60)
-
-        purchase_date_col = func.coalesce(User.premium_purchased_at, User.created_at)
-        subscription_changes = db.query(
-            func.count(case((purchase_date_col >= thirty_days_ago, 1))).label('subscriptions_last_30'),
-            func.count(case((
-                (purchase_date_col >= sixty_days_ago) & (purchase_date_col < thirty_days_ago), 1
-            ))).label('subscriptions_previous_30')
-        ).filter(
-            User.is_premium == True
+        today = data_as_of.date()
+        thirty_days_ago = today - timedelta(days=30)
+        sixty_days_ago = today - timedelta(days=60)
+
+        subscription_totals = db.query(
+            func.coalesce(func.sum(DashboardDailyRollup.new_subscriptions), 0).label('total_subscriptions'),
+            func.coalesce(func.sum(case(
+                (DashboardDailyRollup.day > thirty_days_ago, DashboardDailyRollup.new_subscriptions),
+                else_=0,
+            )), 0).label('subscriptions_last_30'),
+            func.coalesce(func.sum(case(
+                (
+                    (DashboardDailyRollup.day > sixty_days_ago) & (DashboardDailyRollup.day <= thirty_days_ago),
+                    DashboardDailyRollup.new_subscriptions,
+                ),
+                else_=0,
+            )), 0).label('subscriptions_previous_30'),
         ).first()
 
-        subscriptions_last_30 = subscription_changes.subscriptions_last_30 or 0
-        subscriptions_previous_30 = subscription_changes.subscriptions_previous_30 or 0
+        total_subscriptions = (subscription_totals.total_subscriptions or 0) + state.undated_subscriptions
+        subscriptions_last_30 = subscription_totals.subscriptions_last_30 or 0
+        subscriptions_previous_30 = subscription_totals.subscriptions_previous_30 or 0
         subscriptions_change = subscriptions_last_30 - subscriptions_previous_30
 
         # Get premium users grouped by month (last 12 months)
         months = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
-        current_year = datetime.utcnow().year
-        current_month = datetime.utcnow().month
+        current_year = today.year
+        current_month = today.month
 
-        subscriber_by_month = []
-        # Get last 12 months (from current month backward)
-        for i in range(12):
-            # Calculate month and year
+        # Calculate the (year, month) pairs from 11 months ago up to the current month
+        month_keys = []
+        for i in range(11, -1, -1):
             month_num = current_month - i
             year = current_year
             while month_num <= 0:
                 month_num += 12
                 year -= 1
+            month_keys.append((year, month_num))
 
-            month_start = datetime(year, month_num, 1)
-            if month_num == 12:
-                month_end = datetime(year + 1, 1, 1)
-            else:
-                month_end = datetime(year, month_num + 1, 1)
-
-            # Count premium users purchased in this month
-            purchase_date_col = func.coalesce(User.premium_purchased_at, User.created_at)
-            count = db.query(func.count(User.id)).filter(
-                User.is_premium == True,
-                purchase_date_col >= month_start,
-                purchase_date_col < month_end
-            ).scalar() or 0
+        first_year, first_month = month_keys[0]
+        monthly_rows = db.query(
+            extract('year', DashboardDailyRollup.day).label('year'),
+            extract('month', DashboardDailyRollup.day).label('month'),
+            func.sum(DashboardDailyRollup.new_subscriptions).label('count')
+        ).filter(
+            DashboardDailyRollup.day >= datetime(first_year, first_month, 1).date()
+        ).group_by(
+            extract('year', DashboardDailyRollup.day),
+            extract('month', DashboardDailyRollup.day)
+        ).all()
+        monthly_counts = {(int(row.year), int(row.month)): row.count or 0 for row in monthly_rows}
 
-            subscriber_by_month.append({
+        # Oldest first
+        subscriber_by_month = [
+            {
                 "date": months[month_num - 1],
-                "count": count
-            })
-
-        # Reverse to show oldest first (Jan to Dec)
-        subscriber_by_month.reverse()
+                "count": monthly_counts.get((year, month_num), 0)
+            }
+            for year, month_num in month_keys
+        ]
 
         return {
             "data": subscriber_by_month,
             "totalSubscriptions": total_subscriptions,
             "subscriptionsChange": subscriptions_change,
+            "data_as_of": data_as_of.isoformat(),
         }
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching subscriber data: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail="Failed to fetch subscriber data")
@@ -368,26 +377,24 @@ async def get_latest_subscribers(
 
 @router.get("/top-performers")
 async def get_top_performers(
+    response: Response,
     db: Session = Depends(get_db),
     token: dict = Depends(verify_admin_token),
 ):
-    """Get top performing users (by resume count - proxy for token usage)"""
+    """Get top performing users (by resume version count - proxy for token usage)"""
     try:
-        # Get users with most resumes (proxy for token/API usage)
+        data_as_of = _rollup_state(db).refreshed_at
+        response.headers["X-Data-As-Of"] = data_as_of.isoformat()
+
         users_with_resumes = db.query(
             User.id,
             User.name,
             User.email,
-            func.count(Resume.id).label("resume_count"),
-            func.count(ResumeVersion.id).label("version_count")
-        ).join(
-            Resume, User.id == Resume.user_id, isouter=True
+            DashboardUserActivity.version_count,
         ).join(
-            ResumeVersion, Resume.id == ResumeVersion.resume_id, isouter=True
-        ).group_by(
-            User.id, User.name, User.email
+            DashboardUserActivity, DashboardUserActivity.user_id == User.id
         ).order_by(
-            func.count(ResumeVersion.id).desc()  # Order by version count (proxy for token usage)
+            DashboardUserActivity.version_count.desc()  # Version count as proxy for token usage
         ).limit(10).all()
 
         return [
@@ -399,8 +406,10 @@ async def get_top_performers(
                 "revenue": version_count or 0,  # Version count as proxy for token usage
                 "status": "active",
             }
-            for user_id, name, email, resume_count, version_count in users_with_resumes
+            for user_id, name, email, version_count in users_with_resumes
         ]
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching top performers: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail="Failed to fetch top performers")
@@ -408,15 +417,15 @@ async def get_top_performers(
 
 @router.get("/top-countries")
 async def get_top_countries(
+    response: Response,
     db: Session = Depends(get_db),
     token: dict = Depends(verify_admin_token),
     period: str = "monthly",  # daily, weekly, monthly
 ):
-    """Get top countries by visitor count"""
+    """Get top countries by visitor count (from the hourly visitor rollups)"""
     try:
-        from datetime import datetime, timedelta
-
-        from app.models.analytics import VisitorAnalytics
+        data_as_of = _rollup_state(db).refreshed_at
+        response.headers["X-Data-As-Of"] = data_as_of.isoformat()
 
         # Calculate date range based on period
         now = datetime.utcnow()
@@ -426,21 +435,21 @@ async def get_top_countries(
             start_date = now - timedelta(days=7)
         else:  # monthly
             start_date = now - timedelta(days=30)
+        start_hour = start_date.replace(minute=0, second=0, microsecond=0)
 
         # Get country statistics
+        visitor_count = func.sum(DashboardHourlyCountryVisits.visitors)
         country_stats = db.query(
-            VisitorAnalytics.country,
-            VisitorAnalytics.country_code,
-            func.count(VisitorAnalytics.id).label('visitor_count')
+            DashboardHourlyCountryVisits.country,
+            DashboardHourlyCountryVisits.country_code,
+            visitor_count.label('visitor_count')
         ).filter(
-            VisitorAnalytics.created_at >= start_date,
-            VisitorAnalytics.country.isnot(None),
-            VisitorAnalytics.country != "Local"
+            DashboardHourlyCountryVisits.hour_start >= start_hour
         ).group_by(
-            VisitorAnalytics.country,
-            VisitorAnalytics.country_code
+            DashboardHourlyCountryVisits.country,
+            DashboardHourlyCountryVisits.country_code
         ).order_by(
-            func.count(VisitorAnalytics.id).desc()
+            visitor_count.desc()
         ).limit(10).all()
 
         if not country_stats:
@@ -493,6 +502,8 @@ async def get_top_countries(
             })
 
         return result
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching top countries: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail="Failed to fetch top countries")
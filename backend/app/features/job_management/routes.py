@@ -12,6 +12,7 @@ from datetime import datetime
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.api.models import (
@@ -20,7 +21,7 @@ from app.api.models import (
     JobDescriptionUpdate,
     MatchCreate,
 )
-from app.core.db import get_db
+from app.core.db import get_async_db, get_db
 from app.models import (
     JobResumeVersion,
     MatchSession,
@@ -29,12 +30,16 @@ from app.models import (
     User,
 )
 from app.services.job_service import (
+    JOB_LIST_PAGE_DEFAULT,
+    JOB_LIST_PAGE_MAX,
     create_cover_letter,
     create_or_update_job_description,
     delete_cover_letter,
     get_job_description_detail,
+    get_job_description_keywords,
     list_cover_letters,
-    list_user_job_descriptions,
+    list_user_job_descriptions_async,
+    list_user_job_descriptions_page,
     update_cover_letter,
 )
 from app.utils.job_helpers import safe_get_job_description
@@ -90,13 +95,26 @@ async def create_job_description(
 async def list_job_descriptions(
     request: Request,
     user_email: str | None = Query(None),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """List job descriptions for a user"""
     # Extract user email from Firebase auth or query parameter
     email = get_user_email_from_request(request, user_email)
     logger.info(f"GET /api/job-descriptions - query param: {user_email}, extracted email: {email}, firebase_user: {getattr(request.state, 'firebase_user', None)}")
-    return list_user_job_descriptions(email, db)
+    return await list_user_job_descriptions_async(email, db)
+
+
+@router.get("/page")
+async def list_job_descriptions_page(
+    request: Request,
+    user_email: str | None = Query(None),
+    cursor: str | None = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(JOB_LIST_PAGE_DEFAULT, ge=1, le=JOB_LIST_PAGE_MAX),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """List job descriptions one keyset page at a time (list-view columns only)"""
+    email = get_user_email_from_request(request, user_email)
+    return await list_user_job_descriptions_page(email, db, cursor=cursor, limit=limit)
 
 
 @router.get("/{jd_id}")
@@ -112,6 +130,18 @@ async def get_job_description(
     return get_job_description_detail(jd_id, email, db)
 
 
+@router.get("/{jd_id}/keywords")
+async def get_job_description_keyword_detail(
+    jd_id: int,
+    request: Request,
+    user_email: str | None = Query(None),
+    db: Session = Depends(get_db),
+):
+    """Full keyword arrays for a job, loaded on demand by the job board"""
+    email = get_user_email_from_request(request, user_email)
+    return get_job_description_keywords(jd_id, email, db)
+
+
 @router.delete("/{jd_id}")
 async def delete_job_description(
     jd_id: int,
@@ -6,17 +6,19 @@ for better feature isolation and organization.
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import os
 from datetime import datetime, timedelta
 
 from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, UploadFile
 from fastapi.responses import Response
-from sqlalchemy import func
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.api.models import ExportPayload, ResumePayload, SaveResumePayload
-from app.core.db import get_db
+from app.core.db import get_async_db, get_db
 from app.models import (
     ExportAnalytics,
     JobMatch,
@@ -65,8 +67,16 @@ async def get_templates():
 
 
 @router.post("/parse-file")
-async def parse_file(file: UploadFile = File(...)):
-    """Industry-standard resume parsing with multiple extraction methods"""
+async def parse_file(
+    file: UploadFile = File(...),
+    refresh: bool = Query(False, description="Re-parse even if a cached result exists"),
+):
+    """Industry-standard resume parsing with multiple extraction methods
+
+    Results are cached by file content like ``/upload``; ``refresh`` re-parses.
+    """
+    from app.services.resume_parsing.cache import cache_key, parse_cache
+
     try:
         logger.info(f"Parsing file: {file.filename}, size: {file.size}")
 
@@ -87,18 +97,25 @@ async def parse_file(file: UploadFile = File(...)):
         # Read file content
         file_content = await file.read()
 
+        key = cache_key(file_content, variant="parse-file")
+        if not refresh:
+            cached = parse_cache.get(key)
+            if cached is not None:
+                logger.info(f"Parse cache hit for {file.filename}")
+                return {**cached, "cached": True}
+
         # Extract text using multiple methods for reliability
         text = ""
         extraction_methods = []
 
         if file_extension == "pdf":
-            text, methods = extract_pdf_text(file_content)
+            text, methods = await asyncio.to_thread(extract_pdf_text, file_content)
             extraction_methods.extend(methods)
         elif file_extension == "docx":
-            text, methods = extract_docx_text(file_content)
+            text, methods = await asyncio.to_thread(extract_docx_text, file_content)
             extraction_methods.extend(methods)
         elif file_extension == "doc":
-            text, methods = extract_doc_text(file_content)
+            text, methods = await asyncio.to_thread(extract_doc_text, file_content)
             extraction_methods.extend(methods)
         elif file_extension == "txt":
             try:
@@ -130,15 +147,17 @@ async def parse_file(file: UploadFile = File(...)):
         logger.info(
             f"Parsing {len(text)} characters with regex parser using methods: {', '.join(extraction_methods)}"
         )
-        parsed_data = parse_resume_with_regex(text)
+        parsed_data = await asyncio.to_thread(parse_resume_with_regex, text)
 
-        return {
+        result = {
             "success": True,
             "data": parsed_data,
             "raw_text": text[:500],  # First 500 chars for debugging
             "extraction_methods": extraction_methods,
             "message": f"Resume parsed successfully using {len(extraction_methods)} method(s) - {len(parsed_data.get('sections', []))} sections extracted",
         }
+        parse_cache.set(key, result)
+        return result
 
     except Exception as e:
         logger.error(f"File parsing error: {str(e)}")
@@ -293,7 +312,10 @@ async def export_docx(
 
 
 @router.post("/upload")
-async def upload_resume(file: UploadFile = File(...)):
+async def upload_resume(
+    file: UploadFile = File(...),
+    refresh: bool = Query(False, description="Re-parse even if a cached result exists"),
+):
     """Upload and parse resume file"""
     from app.services.resume_parsing import parse_resume
     from fastapi.responses import JSONResponse
@@ -302,7 +324,7 @@ async def upload_resume(file: UploadFile = File(...)):
         contents = await file.read()
         filename = file.filename or "unknown"
         
-        result = await parse_resume(contents, filename)
+        result = await parse_resume(contents, filename, bypass_cache=refresh)
         
         if not result.get('success'):
             return JSONResponse(
@@ -384,6 +406,101 @@ async def upload_resume(file: UploadFile = File(...)):
     )
 
 
+@router.post("/parse-batch")
+async def parse_batch_upload(
+    files: list[UploadFile] = File(...),
+    refresh: bool = Query(False, description="Re-parse even if a cached result exists"),
+):
+    """Parse many resumes (files and/or zip archives), streaming NDJSON results as they finish"""
+    import asyncio
+
+    from fastapi.responses import StreamingResponse
+
+    from app.core.config import settings
+    from app.services.resume_parsing.batch import (
+        BatchTooLarge,
+        expand_uploads,
+        iter_ndjson,
+        parse_batch,
+    )
+
+    # The spooled upload files are read in the worker thread only as far as the limits allow
+    uploads = [(file.filename or "unknown", file.file) for file in files]
+    try:
+        batch_files = await asyncio.to_thread(
+            expand_uploads,
+            uploads,
+            settings.batch_parse_max_files,
+            settings.batch_parse_max_total_bytes,
+        )
+    except BatchTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e)) from None
+    if not batch_files:
+        raise HTTPException(status_code=400, detail="No resumes found in upload")
+
+    return StreamingResponse(
+        iter_ndjson(parse_batch(batch_files, bypass_cache=refresh)),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.post("/parse-jobs", status_code=202)
+async def create_parse_job(
+    file: UploadFile = File(...),
+    refresh: bool = Query(False, description="Re-parse even if a cached result exists"),
+):
+    """Queue a resume parse and return its job id immediately"""
+    from app.services.parse_jobs import ParseQueueFull, get_parse_job_queue
+
+    if not file.filename:
+        raise HTTPException(status_code=400, detail="No filename provided")
+    contents = await file.read()
+    if len(contents) > 10 * 1024 * 1024:  # 10MB limit
+        raise HTTPException(status_code=413, detail="File too large. Maximum size is 10MB")
+
+    try:
+        job = await get_parse_job_queue().submit(file.filename, contents, bypass_cache=refresh)
+    except ParseQueueFull:
+        raise HTTPException(
+            status_code=503, detail="Parse queue is full, please retry shortly"
+        ) from None
+
+    return {
+        **job,
+        "status_url": f"/api/resume/parse-jobs/{job['job_id']}",
+        "events_url": f"/api/resume/parse-jobs/{job['job_id']}/events",
+    }
+
+
+@router.get("/parse-jobs/{job_id}")
+async def get_parse_job(job_id: str):
+    """Status, stage history and (once done) result of a parse job"""
+    from app.services.parse_jobs import get_parse_job_queue
+
+    job = await get_parse_job_queue().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Parse job not found or expired")
+    return job
+
+
+@router.get("/parse-jobs/{job_id}/events")
+async def stream_parse_job_events(job_id: str):
+    """Server-sent events with each parse stage, then the final job"""
+    from fastapi.responses import StreamingResponse
+
+    from app.services.parse_jobs import get_parse_job_queue
+
+    queue = get_parse_job_queue()
+    if await queue.get(job_id) is None:
+        raise HTTPException(status_code=404, detail="Parse job not found or expired")
+    return StreamingResponse(
+        queue.events(job_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.post("/export/html-to-pdf")
 async def export_html_to_pdf(payload: dict):
     """Export HTML content to PDF"""
@@ -1181,7 +1298,7 @@ async def delete_shared_resume_comment(
 # It's included here for organization but registered separately in main.py
 async def list_user_resumes(
     user_email: str = Query(..., description="User email for authentication"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Get all resumes for a user"""
     try:
@@ -1190,36 +1307,43 @@ async def list_user_resumes(
         if not user_email:
             raise HTTPException(status_code=400, detail="user_email is required")
 
-        user = db.query(User).filter(User.email == user_email).first()
-        if not user:
+        user_id = await db.scalar(select(User.id).where(User.email == user_email))
+        if user_id is None:
             logger.error(f"list_user_resumes: User not found for email {user_email}")
             raise HTTPException(status_code=404, detail="User not found")
 
-        logger.info(f"list_user_resumes: User found with id {user.id}")
+        logger.info(f"list_user_resumes: User found with id {user_id}")
 
         resumes = (
-            db.query(Resume)
-            .filter(Resume.user_id == user.id)
-            .order_by(Resume.updated_at.desc())
-            .all()
-        )
+            await db.execute(
+                select(
+                    Resume.id,
+                    Resume.name,
+                    Resume.title,
+                    Resume.template,
+                    Resume.created_at,
+                    Resume.updated_at,
+                )
+                .where(Resume.user_id == user_id)
+                .order_by(Resume.updated_at.desc())
+            )
+        ).all()
         logger.info(
-            f"list_user_resumes: Found {len(resumes)} resumes for user {user.id}"
+            f"list_user_resumes: Found {len(resumes)} resumes for user {user_id}"
         )
 
         resume_ids = [r.id for r in resumes]
         version_info_map = {}
         if resume_ids:
-            version_info_query = (
-                db.query(
+            version_info_query = await db.execute(
+                select(
                     ResumeVersion.resume_id,
                     func.count(ResumeVersion.id).label('count'),
                     func.max(ResumeVersion.id).label('latest_version_id'),
                     func.max(ResumeVersion.version_number).label('latest_version_number')
                 )
-                .filter(ResumeVersion.resume_id.in_(resume_ids))
+                .where(ResumeVersion.resume_id.in_(resume_ids))
                 .group_by(ResumeVersion.resume_id)
-                .all()
             )
             version_info_map = {
                 rv.resume_id: {
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import os
 from time import perf_counter
@@ -57,7 +58,9 @@ from app.features.job_management import router as job_management_router
 from app.features.job_management.routes import create_match, get_match
 from app.features.resume_management import router as resume_management_router
 from app.features.user_management import router as user_management_router
+from app.middleware.cancel_on_disconnect import CancelOnDisconnectMiddleware
 from app.middleware.firebase_auth import FirebaseAuthMiddleware
+from app.middleware.request_deadline import RequestDeadlineMiddleware
 from app.middleware.visitor_tracking import VisitorTrackingMiddleware
 
 # Initialize logging
@@ -71,6 +74,12 @@ if os.getenv("SKIP_DB_INIT") != "1":
 # Create FastAPI app
 app = FastAPI(title=settings.app_name, version=settings.version)
 
+# Cancel abandoned AI and parsing work (innermost: only the handler is cancelled)
+app.add_middleware(CancelOnDisconnectMiddleware)
+
+# Request deadlines (inside tracking, so tracking tasks do not inherit them)
+app.add_middleware(RequestDeadlineMiddleware)
+
 # Add Visitor Tracking Middleware (track before auth)
 app.add_middleware(VisitorTrackingMiddleware)
 
@@ -414,3 +423,40 @@ async def startup_event():
         logger.info("Database connection pool warmed up")
     except Exception as e:
         logger.warning(f"Failed to warm up database connection: {e}")
+
+    if settings.enable_dashboard_rollups:
+        from app.services.dashboard_rollups import run_rollup_scheduler
+
+        app.state.dashboard_rollup_task = asyncio.create_task(run_rollup_scheduler())
+
+    from app.services.analytics_partitions import run_partition_scheduler
+
+    app.state.analytics_partition_task = asyncio.create_task(run_partition_scheduler())
+
+    from app.services.parse_jobs import get_parse_job_queue
+
+    get_parse_job_queue().start()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop background jobs, flush buffered AI usage events and close pooled connections"""
+    from app.core.db import dispose_async_engine
+    from app.core.ollama_client import ollama_client
+    from app.services.parse_jobs import get_parse_job_queue
+    from app.services.resume_parsing.batch import shutdown_extraction_pool
+    from app.services.resume_parsing.extractors.vision_extractor import shutdown_render_pool
+    from app.services.url_scraper import url_scraper
+    from app.services.usage_metering import usage_meter
+
+    for task_name in ("dashboard_rollup_task", "analytics_partition_task"):
+        task = getattr(app.state, task_name, None)
+        if task is not None:
+            task.cancel()
+    await get_parse_job_queue().stop()
+    usage_meter.stop()
+    shutdown_render_pool()
+    shutdown_extraction_pool()
+    await ollama_client.aclose()
+    await url_scraper.aclose()
+    await dispose_async_engine()
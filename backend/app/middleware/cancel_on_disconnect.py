@@ -0,0 +1,136 @@
+"""Middleware that stops a request's work when its client disconnects.
+
+Starlette keeps running an endpoint after the client has gone away, so an
+abandoned resume parse or AI generation still spent its OpenAI tokens and
+executor time and was billed to the user. For the AI and parsing routes this
+middleware reads the ASGI receive channel itself and cancels the handler's
+task as soon as ``http.disconnect`` arrives before the response has started.
+Cancellation reaches everything the handler awaits: in-flight httpx calls,
+queued bullet batches, speculative parses and pending vision render jobs.
+A synchronous step already running in a worker thread finishes, but nothing
+is scheduled after it.
+
+Usage recorded by the request is held (see ``UsageHold``) and only persisted
+when the handler completes without a server error.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.services.usage_metering import UsageHold, usage_hold_scope, usage_meter
+
+logger = logging.getLogger(__name__)
+
+CANCELLABLE_PREFIXES = (
+    "/api/ai/",
+    "/api/openai/",
+    "/api/resume/upload",
+    "/api/resume/parse-file",
+)
+
+# Request body read ahead of the handler. The receive loop keeps reading while
+# the handler has not consumed the body, so it still sees ``http.disconnect``;
+# past this many unconsumed bytes it waits for the handler to catch up.
+READ_AHEAD_BYTES = 16 * 1024 * 1024
+
+
+class CancelOnDisconnectMiddleware:
+    """Cancel AI and parsing handlers whose client disconnects before the response starts."""
+
+    def __init__(self, app: ASGIApp, meter: Any = None, enabled: bool | None = None):
+        self.app = app
+        self.meter = meter or usage_meter
+        self.enabled = settings.cancel_on_disconnect if enabled is None else enabled
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or not self.enabled
+            or not scope["path"].startswith(CANCELLABLE_PREFIXES)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        messages: asyncio.Queue[Message] = asyncio.Queue()
+        disconnected = asyncio.Event()
+        drained = asyncio.Event()
+        drained.set()
+        buffered = 0
+        status: list[int] = []
+
+        async def pump() -> None:
+            nonlocal buffered
+            while True:
+                await drained.wait()
+                message = await receive()
+                if message["type"] == "http.disconnect":
+                    disconnected.set()
+                    return
+                messages.put_nowait(message)
+                buffered += len(message.get("body", b""))
+                if buffered > READ_AHEAD_BYTES:
+                    drained.clear()
+
+        def consumed(message: Message) -> Message:
+            nonlocal buffered
+            buffered -= len(message.get("body", b""))
+            if buffered <= READ_AHEAD_BYTES:
+                drained.set()
+            return message
+
+        async def queued_receive() -> Message:
+            if not messages.empty():
+                return consumed(messages.get_nowait())
+            if disconnected.is_set():
+                return {"type": "http.disconnect"}
+            get = asyncio.ensure_future(messages.get())
+            wait = asyncio.ensure_future(disconnected.wait())
+            try:
+                await asyncio.wait({get, wait}, return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                wait.cancel()
+                if not get.done():
+                    get.cancel()
+            if get.done() and not get.cancelled():
+                return consumed(get.result())
+            return {"type": "http.disconnect"}
+
+        async def tracked_send(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                status.append(message["status"])
+            await send(message)
+
+        hold = UsageHold()
+        with usage_hold_scope(hold):
+            handler = asyncio.ensure_future(self.app(scope, queued_receive, tracked_send))
+        reader = asyncio.ensure_future(pump())
+        watcher = asyncio.ensure_future(disconnected.wait())
+        completed = False
+        try:
+            await asyncio.wait({handler, watcher}, return_when=asyncio.FIRST_COMPLETED)
+            abandoned = not handler.done() and not status
+            if abandoned:
+                logger.info(
+                    f"Client disconnected from {scope['method']} {scope['path']}; cancelling its work"
+                )
+                handler.cancel()
+            try:
+                await handler
+            except asyncio.CancelledError:
+                if abandoned:
+                    return
+                raise
+            completed = bool(status) and status[0] < 500
+        finally:
+            for task in (handler, reader, watcher):
+                task.cancel()
+            if completed:
+                self.meter.commit_hold(hold)
+            else:
+                self.meter.release_hold(hold)
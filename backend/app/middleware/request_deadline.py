@@ -0,0 +1,38 @@
+"""Middleware that gives each request its deadline."""
+
+from __future__ import annotations
+
+import logging
+
+from fastapi import Request
+from fastapi.responses import JSONResponse
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.core.deadline import (
+    DEADLINE_HEADER,
+    DeadlineExceeded,
+    deadline_scope,
+    request_deadline_seconds,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class RequestDeadlineMiddleware(BaseHTTPMiddleware):
+    """Run the request inside its ``X-Request-Deadline`` or per-route default deadline."""
+
+    async def dispatch(self, request: Request, call_next):
+        path = request.url.path
+        seconds = request_deadline_seconds(path, request.headers.get(DEADLINE_HEADER))
+        if seconds is None:
+            return await call_next(request)
+        if seconds <= 0:
+            logger.info(f"Rejecting {request.method} {path}: deadline already passed")
+            return JSONResponse(status_code=504, content={"detail": "Request deadline already passed"})
+
+        with deadline_scope(seconds):
+            try:
+                return await call_next(request)
+            except DeadlineExceeded as e:
+                logger.warning(f"{request.method} {path} stopped at its {seconds:.1f}s deadline: {e}")
+                return JSONResponse(status_code=504, content={"detail": "Request deadline exceeded"})
@@ -6,6 +6,12 @@ from app.models.analytics import (
     PageEngagementEvent,
     VisitorAnalytics,
 )
+from app.models.dashboard import (
+    DashboardDailyRollup,
+    DashboardHourlyCountryVisits,
+    DashboardRollupState,
+    DashboardUserActivity,
+)
 from app.models.feedback import Feedback
 from app.models.job import (
     Job,
@@ -16,9 +22,10 @@ from app.models.job import (
     ResumeGeneration,
 )
 from app.models.match import JobMatch
+from app.models.parse_job import ResumeParseJob
 from app.models.resume import Resume, ResumeVersion
 from app.models.sharing import ResumeView, SharedResume, SharedResumeComment
-from app.models.usage import AIUsage, TrialPeriod
+from app.models.usage import AIUsage, AIUsageCounter, TrialPeriod
 from app.models.user import User
 
 __all__ = [
@@ -29,6 +36,10 @@ __all__ = [
     "VisitorAnalytics",
     "BillingEvent",
     "PageEngagementEvent",
+    "DashboardDailyRollup",
+    "DashboardHourlyCountryVisits",
+    "DashboardUserActivity",
+    "DashboardRollupState",
     "JobDescription",
     "JobResumeVersion",
     "JobCoverLetter",
@@ -40,6 +51,8 @@ __all__ = [
     "Job",
     "ResumeGeneration",
     "Feedback",
+    "ResumeParseJob",
     "AIUsage",
+    "AIUsageCounter",
     "TrialPeriod",
 ]
@@ -4,7 +4,7 @@ from __future__ import annotations
 
 from datetime import datetime
 
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Index, Integer, String, Text, text
 from sqlalchemy.orm import relationship
 
 from app.core.db import Base
@@ -29,21 +29,36 @@ class ExportAnalytics(Base):
 
 
 class VisitorAnalytics(Base):
-    """Track visitor analytics including country, IP, and page views."""
-    __tablename__ = "visitor_analytics"
+    """Track visitor analytics including country, IP, and page views.
 
-    id = Column(Integer, primary_key=True, index=True)
-    ip_address = Column(String, nullable=True, index=True)
+    Range-partitioned by month on ``created_at`` (see
+    ``app.services.analytics_partitions``), so ``created_at`` is part of the
+    primary key. Only the indexes the dashboard queries use are kept.
+    """
+    __tablename__ = "visitor_analytics"
+    __table_args__ = (
+        Index("ix_visitor_analytics_created_brin", "created_at", postgresql_using="brin"),
+        Index(
+            "ix_visitor_analytics_user_created",
+            "user_id",
+            "created_at",
+            postgresql_where=text("user_id IS NOT NULL"),
+        ),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    ip_address = Column(String, nullable=True)
     user_agent = Column(Text, nullable=True)
-    country = Column(String, nullable=True, index=True)
-    country_code = Column(String, nullable=True, index=True)
+    country = Column(String, nullable=True)
+    country_code = Column(String, nullable=True)
     city = Column(String, nullable=True)
     region = Column(String, nullable=True)
     referrer = Column(Text, nullable=True)
-    path = Column(String, nullable=True, index=True)
-    user_id = Column(Integer, nullable=True, index=True)  # If logged in user
-    session_id = Column(String, nullable=True, index=True)
-    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+    path = Column(String, nullable=True)
+    user_id = Column(Integer, nullable=True)  # If logged in user
+    session_id = Column(String, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, primary_key=True)
 
     def __repr__(self):
         return f"<VisitorAnalytics(id={self.id}, country={self.country}, path={self.path})>"
@@ -81,19 +96,39 @@ class BillingEvent(Base):
 
 
 class PageEngagementEvent(Base):
-    """Track per-page engagement such as time-on-page and scroll depth."""
-    __tablename__ = "page_engagement_events"
+    """Track per-page engagement such as time-on-page and scroll depth.
 
-    id = Column(Integer, primary_key=True, index=True)
-    uid = Column(String, nullable=True, index=True)  # Firebase UID
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=True, index=True)
-    session_id = Column(String, nullable=True, index=True)
-    path = Column(String, nullable=True, index=True)
+    Partitioned like ``VisitorAnalytics``; the dashboard only reads
+    ``page_exit`` events per user, which the partial indexes cover.
+    """
+    __tablename__ = "page_engagement_events"
+    __table_args__ = (
+        Index("ix_page_engagement_events_created_brin", "created_at", postgresql_using="brin"),
+        Index(
+            "ix_page_engagement_events_user_exit",
+            "user_id",
+            "created_at",
+            postgresql_where=text("event_type = 'page_exit'"),
+        ),
+        Index(
+            "ix_page_engagement_events_uid_exit",
+            "uid",
+            "created_at",
+            postgresql_where=text("event_type = 'page_exit'"),
+        ),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    uid = Column(String, nullable=True)  # Firebase UID
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
+    session_id = Column(String, nullable=True)
+    path = Column(String, nullable=True)
     referrer = Column(Text, nullable=True)
-    event_type = Column(String, nullable=False, index=True)  # page_view, page_exit
+    event_type = Column(String, nullable=False)  # page_view, page_exit
     duration_ms = Column(Integer, nullable=True)
     scroll_depth = Column(Integer, nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+    created_at = Column(DateTime, default=datetime.utcnow, primary_key=True)
 
     user = relationship("User", backref="page_engagement_events")
 
@@ -0,0 +1,80 @@
+"""Pre-aggregated rollups that back the admin dashboard."""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import Column, Date, DateTime, Integer, String, UniqueConstraint
+
+from app.core.db import Base
+
+
+class DashboardDailyRollup(Base):
+    """Per-day user, subscription, resume and token totals.
+
+    ``new_subscriptions`` counts currently-premium users by purchase day
+    (``premium_purchased_at`` falling back to ``created_at``), matching the
+    live dashboard queries it replaces.
+    """
+    __tablename__ = "dashboard_daily_rollups"
+
+    day = Column(Date, primary_key=True)
+    new_users = Column(Integer, nullable=False, default=0)
+    new_subscriptions = Column(Integer, nullable=False, default=0)
+    new_resumes = Column(Integer, nullable=False, default=0)
+    tokens_used = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+class DashboardHourlyCountryVisits(Base):
+    """Visitor counts per hour and country, rolled up from visitor_analytics.
+
+    ``country_code`` uses an empty string instead of NULL so the unique
+    constraint holds.
+    """
+    __tablename__ = "dashboard_hourly_country_visits"
+    __table_args__ = (
+        UniqueConstraint(
+            "hour_start", "country", "country_code", name="uq_dashboard_hourly_country_visits"
+        ),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    hour_start = Column(DateTime, nullable=False, index=True)
+    country = Column(String, nullable=False)
+    country_code = Column(String, nullable=False, default="")
+    visitors = Column(Integer, nullable=False, default=0)
+
+
+class DashboardUserActivity(Base):
+    """Resume and version counts per user for the top performers list."""
+    __tablename__ = "dashboard_user_activity"
+
+    user_id = Column(Integer, primary_key=True)
+    resume_count = Column(Integer, nullable=False, default=0)
+    version_count = Column(Integer, nullable=False, default=0, index=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+class DashboardRollupState(Base):
+    """Refresh bookkeeping for the dashboard rollups.
+
+    The ``undated_*`` counts cover rows with a NULL ``created_at``, which no
+    daily bucket holds but the all-time totals still include.
+    """
+    __tablename__ = "dashboard_rollup_state"
+
+    name = Column(String, primary_key=True)
+    refreshed_at = Column(DateTime, nullable=True)
+    full_refreshed_at = Column(DateTime, nullable=True)
+    undated_users = Column(Integer, nullable=False, default=0)
+    undated_subscriptions = Column(Integer, nullable=False, default=0)
+    undated_tokens = Column(Integer, nullable=False, default=0)
+
+
+__all__ = [
+    "DashboardDailyRollup",
+    "DashboardHourlyCountryVisits",
+    "DashboardUserActivity",
+    "DashboardRollupState",
+]
@@ -0,0 +1,34 @@
+"""Queued resume parses for the database-backed parse job queue."""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import JSON, Boolean, Column, DateTime, Index, LargeBinary, String, Text
+
+from app.core.db import Base
+
+
+class ResumeParseJob(Base):
+    """One uploaded file waiting for, running or finished with ``parse_resume``.
+
+    ``file_bytes`` is cleared once the job finishes; ``stages`` holds the
+    ``{'stage', 'at'}`` progress events in order.
+    """
+    __tablename__ = "resume_parse_jobs"
+    __table_args__ = (
+        Index("idx_resume_parse_jobs_status_created", "status", "created_at"),
+    )
+
+    id = Column(String(36), primary_key=True)
+    status = Column(String, nullable=False, default="queued")  # queued, running, done, failed
+    stage = Column(String, nullable=False, default="queued")
+    stages = Column(JSON, nullable=False, default=list)
+    filename = Column(String, nullable=False)
+    file_bytes = Column(LargeBinary, nullable=True)
+    bypass_cache = Column(Boolean, nullable=False, default=False)
+    result = Column(JSON, nullable=True)
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    expires_at = Column(DateTime, nullable=False, index=True)
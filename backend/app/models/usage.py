@@ -4,7 +4,15 @@ from __future__ import annotations
 
 from datetime import datetime, timedelta
 
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, String
+from sqlalchemy import (
+    Boolean,
+    Column,
+    DateTime,
+    ForeignKey,
+    Integer,
+    String,
+    UniqueConstraint,
+)
 from sqlalchemy.orm import relationship
 
 from app.core.db import Base
@@ -26,6 +34,40 @@ class AIUsage(Base):
         return f"<AIUsage(id={self.id}, user_id={self.user_id}, feature_type={self.feature_type})>"
 
 
+class AIUsageCounter(Base):
+    """Pre-aggregated AI usage per subject, feature and time bucket.
+
+    ``subject_key`` is ``user:<id>`` or ``session:<id>``; ``granularity`` is
+    ``hour``, ``day`` or ``month`` and ``bucket_start`` is the truncated
+    timestamp of the bucket. Rows are maintained with an atomic upsert so a
+    limit check is a single unique-index lookup instead of a COUNT(*).
+    """
+    __tablename__ = "ai_usage_counters"
+    __table_args__ = (
+        UniqueConstraint(
+            "subject_key",
+            "feature_type",
+            "granularity",
+            "bucket_start",
+            name="uq_ai_usage_counters_bucket",
+        ),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    subject_key = Column(String, nullable=False)
+    feature_type = Column(String, nullable=False)
+    granularity = Column(String, nullable=False)
+    bucket_start = Column(DateTime, nullable=False)
+    count = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return (
+            f"<AIUsageCounter(subject_key={self.subject_key}, feature_type={self.feature_type}, "
+            f"granularity={self.granularity}, count={self.count})>"
+        )
+
+
 class TrialPeriod(Base):
     """Track 3-day free trial periods for users."""
     __tablename__ = "trial_periods"
@@ -53,5 +95,5 @@ class TrialPeriod(Base):
         return f"<TrialPeriod(id={self.id}, user_id={self.user_id}, is_active={self.is_active})>"
 
 
-__all__ = ["AIUsage", "TrialPeriod"]
+__all__ = ["AIUsage", "AIUsageCounter", "TrialPeriod"]
 
@@ -1,8 +1,11 @@
 """Content generation prompts for resumes."""
 
 from __future__ import annotations
+
 import re
 
+from app.prompts.prompt_budget import PromptPart, assemble_prompt
+
 
 def get_bullet_points_prompt(
     role: str, company: str, skills: str, count: int, tone: str
@@ -75,18 +78,19 @@ def get_bullet_from_keywords_prompt(
     # Count keywords for distribution guidance
     keyword_count = len([kw.strip() for kw in keywords_str.split(',') if kw.strip()])
 
-    return f"""You are crafting high-impact resume bullet points.
+    def render(parts: dict[str, str]) -> str:
+        return f"""You are crafting high-impact resume bullet points.
 
 Company: {company_title or 'Not specified'}
 Role: {job_title or 'Not specified'}
 Job Description Context:
-{jd_excerpt if jd_excerpt else 'Not provided'}
+{parts['job_description']}
 
 SELECTED KEYWORDS (MUST use these - user selected these specific keywords):
-{keywords_str}
+{parts['keywords']}
 
 Resume context (useful achievements or tools):
-{resume_excerpt if resume_excerpt else 'Limited additional context provided'}
+{parts['resume_excerpt']}
 
 CRITICAL REQUIREMENTS:
 - Generate {count} distinct professional resume bullet points
@@ -105,6 +109,19 @@ IMPORTANT: Before returning, verify that ALL {keyword_count} selected keywords h
 
 Return ONLY a valid JSON array of plain strings, e.g. ["Bullet 1", "Bullet 2"]."""
 
+    return assemble_prompt(
+        "bullet_from_keywords",
+        [
+            PromptPart("keywords", keywords_str, priority=1),
+            PromptPart("job_description", jd_excerpt, priority=3, max_tokens=250),
+            PromptPart(
+                "resume_excerpt", resume_excerpt, priority=2, max_tokens=250,
+                placeholder="Limited additional context provided",
+            ),
+        ],
+        render,
+    )
+
 
 def get_bullets_from_keywords_prompt(
     current_bullet: str,
@@ -128,16 +145,17 @@ These keywords are currently MISSING from your resume and are HIGH PRIORITY for
 Ensure the improved bullet includes these missing keywords naturally.
 """
 
-    return f"""Improve this resume bullet to maximize impact and include the specified keywords naturally.
+    def render(parts: dict[str, str]) -> str:
+        return f"""Improve this resume bullet to maximize impact and include the specified keywords naturally.
 
 Current bullet: "{current_bullet}"
 
-Keywords to integrate: {keywords_str}
+Keywords to integrate: {parts['keywords']}
 {missing_kw_note}
 Company: {company_title or 'Not specified'}
 Role: {job_title or 'Not specified'}
 Job Description Context:
-{jd_excerpt if jd_excerpt else 'Not provided'}
+{parts['job_description']}
 
 Requirements:
 - Enhance the bullet with the keywords naturally woven in
@@ -149,6 +167,15 @@ Requirements:
 
 Return ONLY the improved bullet point text, no explanations."""
 
+    return assemble_prompt(
+        "bullets_from_keywords",
+        [
+            PromptPart("keywords", keywords_str, priority=1, max_tokens=150),
+            PromptPart("job_description", jd_excerpt, priority=3, max_tokens=250, min_tokens=60),
+        ],
+        render,
+    )
+
 
 def get_summary_from_experience_prompt(
     title: str | None,
@@ -181,25 +208,26 @@ CRITICAL: NEVER mention or reference the company name "{company_name}" or any co
 The summary should be generic and applicable to any role, not specific to any particular company.
 """
 
-    return f"""Analyze this professional's work experience and create a compelling ATS-optimized professional summary.
+    def render(parts: dict[str, str]) -> str:
+        return f"""Analyze this professional's work experience and create a compelling ATS-optimized professional summary.
 
 Professional Title: {title if title else 'Not specified'}
 
 Work Experience:
-{work_experience_text if work_experience_text else 'Limited information provided'}
+{parts['work_experience']}
 
 Skills:
-{skills_text if skills_text else 'To be extracted from experience'}
+{parts['skills']}
 
  Target Job Description Keywords (blend these naturally into the narrative):
-{keyword_guidance}
+{parts['keyword_guidance']}
 {missing_kw_section}
 {company_warning}
  Job Description Snapshot (for context):
-{job_description_excerpt if job_description_excerpt else 'Not provided'}
+{parts['job_description']}
 
  Existing Summary (for reference only – produce a new, improved summary):
-{existing_summary if existing_summary else 'No existing summary provided'}
+{parts['existing_summary']}
 
 Requirements for the Professional Summary:
 1. Length: 4-7 sentences (minimum 4 sentences, maximum 7 sentences, approximately 80-120 words)
@@ -222,6 +250,27 @@ Requirements for the Professional Summary:
 
 Return ONLY the professional summary paragraph, no labels, explanations, or formatting markers."""
 
+    return assemble_prompt(
+        "summary_from_experience",
+        [
+            PromptPart("keyword_guidance", keyword_guidance, priority=1),
+            PromptPart(
+                "work_experience", work_experience_text, priority=2,
+                placeholder="Limited information provided",
+            ),
+            PromptPart(
+                "skills", skills_text, priority=2, max_tokens=250,
+                placeholder="To be extracted from experience",
+            ),
+            PromptPart("job_description", job_description_excerpt, priority=3, max_tokens=500),
+            PromptPart(
+                "existing_summary", existing_summary, priority=4, max_tokens=200,
+                placeholder="No existing summary provided",
+            ),
+        ],
+        render,
+    )
+
 
 def get_resume_content_prompt(
     content_type: str,
@@ -362,15 +411,16 @@ def get_work_experience_prompt(
 
     tone_instruction = tone_instructions.get(tone, tone_instructions["professional"])
 
-    bullets_text = "\n".join([f"- {b}" for b in current_bullets]) if current_bullets else "None"
+    bullets_text = "\n".join([f"- {b}" for b in current_bullets]) if current_bullets else ""
     skills_text = f"\nSkills/Experience Description: {skills}" if skills else ""
     projects_text = f"\nProjects Worked On: {projects}" if projects else ""
 
-    jd_section = ""
-    if job_description:
-        jd_section = f"""
+    def jd_section(job_description_text: str) -> str:
+        if not job_description:
+            return ""
+        return f"""
 TARGET JOB DESCRIPTION (CRITICAL - Match keywords and requirements from this):
-{job_description[:2000]}
+{job_description_text}
 
 IMPORTANT: Your generated bullet points MUST:
 - Include keywords and technologies mentioned in the job description
@@ -389,14 +439,15 @@ These keywords are missing from your resume. Prioritize naturally incorporating
 them into the bullet points to maximize ATS score. Include them in at least 2-3 bullets.
 """
 
-    return f"""Generate professional resume bullet points for this work experience entry:
+    def render(parts: dict[str, str]) -> str:
+        return f"""Generate professional resume bullet points for this work experience entry:
 
 Role: {role}
 Company: {company}
 Date Range: {date_range}
 Current Bullets:
-{bullets_text}
-{skills_text}{projects_text}{jd_section}{missing_kw_section}
+{parts['bullets']}
+{skills_text}{projects_text}{jd_section(parts['job_description'])}{missing_kw_section}
 
 Requirements:
 - Generate 4-6 professional bullet points
@@ -412,6 +463,15 @@ Requirements:
 
 Return ONLY a JSON array of bullet point strings, e.g. ["Bullet 1", "Bullet 2"]."""
 
+    return assemble_prompt(
+        "work_experience",
+        [
+            PromptPart("bullets", bullets_text, priority=2, placeholder="None"),
+            PromptPart("job_description", job_description, priority=3, max_tokens=500),
+        ],
+        render,
+    )
+
 
 def get_llm_keyword_extraction_prompt(job_description: str) -> str:
     """Generate prompt for LLM-based keyword extraction from job description."""
@@ -530,7 +590,8 @@ def get_relevant_keywords_for_bullet_prompt(
         if terms_parts:
             terms_section = f"\n\nKEY TERMS EXTRACTED FROM BULLET:\n" + "\n".join(f"- {part}" for part in terms_parts) + "\n\nUse these terms to guide your keyword selection - keywords should relate to these extracted terms.\n"
     
-    return f"""CRITICAL TASK: Analyze THIS SPECIFIC bullet point and identify AT LEAST 5 keywords that match THIS bullet's UNIQUE content.
+    def render(parts: dict[str, str]) -> str:
+        return f"""CRITICAL TASK: Analyze THIS SPECIFIC bullet point and identify AT LEAST 5 keywords that match THIS bullet's UNIQUE content.
 
 ═══════════════════════════════════════════════════════════════════
 BULLET POINT TO ANALYZE (THIS IS THE PRIMARY FOCUS):
@@ -578,10 +639,10 @@ Keywords: ["security", "compliance", "policies", "governance", "audit", "vulnera
 See how each bullet gets DIFFERENT keywords based on its content!
 
 Available Keywords from Job Description (MUST select from this list):
-{keywords_str}
+{parts['keywords']}
 
 Job Description Context (for additional relevance):
-{job_description_excerpt[:500] if job_description_excerpt else 'Not provided'}
+{parts['job_description']}
 
 REQUIREMENTS:
 1. Return AT LEAST 5 keywords (minimum 5, up to 8)
@@ -599,3 +660,32 @@ Format: ["keyword1", "keyword2", "keyword3", "keyword4", "keyword5", ...]
 
 REMEMBER: Different bullet points = Different keywords. Match keywords to THIS bullet's content!"""
 
+    return assemble_prompt(
+        "bullet_keywords_analysis",
+        [
+            PromptPart("keywords", keywords_str, priority=1, max_tokens=350),
+            PromptPart("job_description", job_description_excerpt, priority=3, max_tokens=150, min_tokens=100),
+        ],
+        render,
+    )
+
+
+
+def get_batched_bullet_tasks_prompt(tasks_json: str) -> str:
+    """Answer several independent bullet tasks in one response prompt."""
+    return f"""You will receive several independent resume-writing tasks as JSON. Each task has an "id" and "instructions".
+
+Tasks:
+{tasks_json}
+
+Requirements:
+- Complete every task on its own, exactly as its instructions ask; never let one task influence another
+- The "output" of a task is precisely the text its instructions ask you to return (if a task asks for a JSON array, put that array in "output")
+- Include every task id exactly once
+
+Return ONLY a valid JSON object with this exact structure:
+{{
+  "results": [
+    {{"id": "<task id>", "output": "<the task's answer>"}}
+  ]
+}}"""
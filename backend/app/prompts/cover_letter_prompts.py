@@ -4,6 +4,8 @@ from __future__ import annotations
 
 from datetime import datetime
 
+from app.prompts.prompt_budget import PromptPart, assemble_prompt
+
 
 def get_cover_letter_prompt(
     company_name: str,
@@ -29,23 +31,24 @@ def get_cover_letter_prompt(
 
     # Use selected sentences if provided
     jd_text = job_description
+    jd_label = "Job Description"
     if selected_sentences and len(selected_sentences) > 0:
         jd_text = "\n".join(selected_sentences)
-        jd_context = "Selected Key Points from Job Description:\n" + jd_text
-    else:
-        jd_context = f"Job Description:\n{job_description[:2000]}"
+        jd_label = "Selected Key Points from Job Description"
 
     current_date = datetime.now().strftime("%B %d, %Y")
 
-    return f"""Generate a professional, well-formatted cover letter for this job application.
+    def render(parts: dict[str, str]) -> str:
+        return f"""Generate a professional, well-formatted cover letter for this job application.
 
 Job Details:
 - Company: {company_name}
 - Position: {position_title}
-{jd_context}
+{jd_label}:
+{parts['job_description']}
 
 Candidate Information (extract contact details from this):
-{resume_text[:2000]}
+{parts['resume_text']}
 
 CRITICAL REQUIREMENTS:
 - DO NOT use ANY placeholders in brackets like [Company Address], [Hiring Manager], [Date], [Your Name], etc.
@@ -105,3 +108,12 @@ Structure the response as JSON with these EXACT fields:
 
 Return ONLY valid JSON, no markdown formatting."""
 
+    return assemble_prompt(
+        "cover_letter",
+        [
+            PromptPart("job_description", jd_text, priority=1, max_tokens=800),
+            PromptPart("resume_text", resume_text, priority=2, max_tokens=800),
+        ],
+        render,
+    )
+
@@ -4,6 +4,8 @@ from __future__ import annotations
 
 import random
 
+from app.prompts.prompt_budget import PromptPart, assemble_prompt
+
 
 def get_improve_bullet_prompt(
     bullet: str, context: str | None, tone: str
@@ -78,17 +80,18 @@ def get_ats_improvement_prompt(
     job_description: str | None,
 ) -> str:
     """Apply specific ATS improvement to resume prompt."""
-    return f"""Apply this specific ATS improvement to the resume:
+    def render(parts: dict[str, str]) -> str:
+        return f"""Apply this specific ATS improvement to the resume:
 
 Improvement: {improvement_title}
 Description: {improvement_description}
 Suggestion: {specific_suggestion}
 
 Current Resume Data:
-{improved_resume[:2000]}
+{parts['resume']}
 
 Job Description Context:
-{job_description[:500] if job_description else 'Not provided'}
+{parts['job_description']}
 
 Requirements:
 - Apply the improvement naturally and professionally
@@ -98,3 +101,51 @@ Requirements:
 
 Return ONLY the updated resume JSON, no explanations."""
 
+    return assemble_prompt(
+        "ats_improvement",
+        [
+            PromptPart("resume", improved_resume, priority=1, max_tokens=700),
+            PromptPart("job_description", job_description, priority=2, max_tokens=200),
+        ],
+        render,
+    )
+
+
+
+def get_scoped_ats_improvement_prompt(
+    improvement_title: str,
+    improvement_description: str,
+    specific_suggestion: str,
+    scope_json: str,
+    job_description: str | None,
+) -> str:
+    """Apply an ATS improvement to part of a resume prompt."""
+    def render(parts: dict[str, str]) -> str:
+        return f"""Apply this specific ATS improvement to the resume excerpt below:
+
+Improvement: {improvement_title}
+Description: {improvement_description}
+Suggestion: {specific_suggestion}
+
+Resume Excerpt (JSON):
+{scope_json}
+
+Job Description Context:
+{parts['job_description']}
+
+Requirements:
+- Apply the improvement naturally and professionally
+- Change only what the improvement calls for; keep every "id" as it is
+- If the excerpt has a "sections" list and the improvement adds a section, append it to that list with an empty "id"
+- Ensure ATS compatibility
+- Return the updated excerpt as a JSON object with exactly the same top-level keys
+
+Return ONLY the updated JSON object, no explanations."""
+
+    return assemble_prompt(
+        "scoped_ats_improvement",
+        [
+            PromptPart("job_description", job_description, priority=2, max_tokens=200),
+        ],
+        render,
+    )
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+from app.prompts.prompt_budget import PromptPart, assemble_prompt
+
 
 def get_job_match_improvement_prompt(
     job_description: str,
@@ -10,13 +12,14 @@ def get_job_match_improvement_prompt(
     missing_keywords: list[str],
 ) -> str:
     """Generate improvement suggestions based on job-resume match."""
-    return f"""As an expert resume strategist, analyze this job-resume match and provide specific, actionable improvements.
+    def render(parts: dict[str, str]) -> str:
+        return f"""As an expert resume strategist, analyze this job-resume match and provide specific, actionable improvements.
 
 Job Description:
-{job_description[:1500]}
+{parts['job_description']}
 
 Resume Content:
-{resume_text[:1500]}
+{parts['resume_text']}
 
 Analysis:
 - Matched Keywords: {', '.join(matched_keywords[:20])}
@@ -40,3 +43,12 @@ Return as JSON with fields:
 
 Return ONLY valid JSON, no markdown formatting."""
 
+    return assemble_prompt(
+        "job_match_improvement",
+        [
+            PromptPart("job_description", job_description, priority=1, max_tokens=500),
+            PromptPart("resume_text", resume_text, priority=2, max_tokens=500),
+        ],
+        render,
+    )
+
@@ -0,0 +1,226 @@
+"""Token budgets for the variable parts of agent prompts.
+
+Prompts used to cap their inputs with character slices (``job_description[:500]``),
+which cut the most relevant content as readily as boilerplate. ``assemble_prompt``
+instead counts tokens with a local tokenizer (tiktoken's ``o200k_base``, the
+GPT-4o encoding; roughly four characters per token without tiktoken), subtracts
+the fixed instructions from the feature's budget in ``PROMPT_TOKEN_BUDGETS`` and
+hands the rest to the prompt parts in priority order. Low-priority parts are
+compressed first (lines of only stopwords or punctuation are dropped and
+repeated bullets deduplicated) and a part that still does not fit is truncated
+on a token boundary. Tokens saved are logged per call and accumulated per
+feature in ``prompt_budget_stats()``.
+"""
+
+from __future__ import annotations
+
+import functools
+import logging
+import re
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+logger = logging.getLogger(__name__)
+
+CHARS_PER_TOKEN = 4
+
+# Input tokens per call, instructions included
+PROMPT_TOKEN_BUDGETS = {
+    "ats_improvement": 1000,
+    "bullet_from_keywords": 1000,
+    "bullet_keywords_analysis": 1300,
+    "bullets_from_keywords": 600,
+    "cover_letter": 2800,
+    "job_match_improvement": 1300,
+    "scoped_ats_improvement": 3000,
+    "summary_from_experience": 2800,
+    "work_experience": 1300,
+}
+
+# Parts with this priority or lower (a higher number) are compressed; priority 1 is kept verbatim
+COMPRESS_FROM_PRIORITY = 2
+
+_STOPWORD_TEXT = (
+    "a about above after again all also am an and any are as at be because been before being "
+    "below between both but by can could did do does doing down during each etc few for from "
+    "further had has have having he her here hers him his how i if in into is it its itself "
+    "just me more most my no nor not now of off on once only or other our ours out over own "
+    "per same she should so some such than that the their theirs them then there these they "
+    "this those through to too under until up us very via was we were what when where which "
+    "while who whom why will with would you your yours"
+)
+STOPWORDS = frozenset(_STOPWORD_TEXT.split())
+
+_WORD_RE = re.compile(r"[A-Za-z0-9][A-Za-z0-9+#.'-]*")
+_BULLET_PREFIX_RE = re.compile(r"^\s*(?:[-*•·▪◦‣]+|\d+[.)])\s*")
+
+
+@dataclass
+class PromptPart:
+    name: str
+    text: str | None
+    priority: int                   # 1 is kept first
+    max_tokens: int | None = None   # cap even when the budget has room
+    placeholder: str = "Not provided"
+    min_tokens: int = 0             # held back from higher-priority parts
+
+
+@functools.lru_cache(maxsize=1)
+def _encoding():
+    """The tokenizer, loaded on first use; ``None`` falls back to the character estimate."""
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.get_encoding("o200k_base")
+    except Exception as e:  # the encoding file is fetched on first use and may be unreachable
+        logger.warning(f"tiktoken encoding unavailable, estimating tokens from characters: {e}")
+        return None
+
+
+def count_tokens(text: str) -> int:
+    if not text:
+        return 0
+    encoding = _encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """The longest prefix of ``text`` within ``max_tokens``, ending on a word boundary."""
+    if max_tokens <= 0:
+        return ""
+    if count_tokens(text) <= max_tokens:
+        return text
+    encoding = _encoding()
+    if encoding is not None:
+        prefix = encoding.decode(encoding.encode(text, disallowed_special=())[:max_tokens])
+    else:
+        prefix = text[:max_tokens * CHARS_PER_TOKEN]
+    cut = max(prefix.rfind("\n"), prefix.rfind(" "))
+    if cut > len(prefix) // 2:
+        prefix = prefix[:cut]
+    return prefix.rstrip() + "..."
+
+
+def compress_text(text: str) -> str:
+    """Drop lines with only stopwords or punctuation and repeated bullets; collapse blank runs."""
+    lines: list[str] = []
+    seen: set[str] = set()
+    for line in text.splitlines():
+        if not line.strip():
+            if lines and lines[-1]:
+                lines.append("")
+            continue
+        words = [word.lower() for word in _WORD_RE.findall(line)]
+        if not any(word not in STOPWORDS for word in words):
+            continue
+        key = " ".join(_BULLET_PREFIX_RE.sub("", line).lower().split())
+        if key in seen:
+            continue
+        seen.add(key)
+        lines.append(line.rstrip())
+    return "\n".join(lines).strip()
+
+
+class _BudgetStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._features: dict[str, dict[str, int]] = {}
+
+    def record(self, feature: str, full_tokens: int, prompt_tokens: int, compressed: int) -> None:
+        with self._lock:
+            stats = self._features.setdefault(
+                feature,
+                {"calls": 0, "full_tokens": 0, "prompt_tokens": 0, "tokens_saved": 0, "compression_saved": 0},
+            )
+            stats["calls"] += 1
+            stats["full_tokens"] += full_tokens
+            stats["prompt_tokens"] += prompt_tokens
+            stats["tokens_saved"] += max(0, full_tokens - prompt_tokens)
+            stats["compression_saved"] += compressed
+
+    def snapshot(self) -> dict[str, dict[str, int]]:
+        with self._lock:
+            return {feature: dict(stats) for feature, stats in self._features.items()}
+
+
+_stats = _BudgetStats()
+
+
+def prompt_budget_stats() -> dict[str, dict[str, int]]:
+    """Per feature: calls, tokens the uncut prompts would have used, tokens sent and saved."""
+    return _stats.snapshot()
+
+
+def allocate(parts: list[PromptPart], available: int) -> tuple[dict[str, str], int]:
+    """
+    Fit ``parts`` into ``available`` tokens by priority; returns texts and tokens saved by compression.
+
+    A part with ``min_tokens`` keeps that many tokens out of the reach of the
+    parts served before it, so a long high-priority list cannot squeeze it out.
+    """
+    texts: dict[str, str] = {}
+    compressed_saved = 0
+    ordered = sorted(parts, key=lambda p: p.priority)
+    reserved = [0] * (len(ordered) + 1)
+    for i in range(len(ordered) - 1, -1, -1):
+        part = ordered[i]
+        reserved[i] = reserved[i + 1] + (part.min_tokens if (part.text or "").strip() else 0)
+    for i, part in enumerate(ordered):
+        text = (part.text or "").strip()
+        if not text:
+            texts[part.name] = part.placeholder
+            continue
+        tokens = count_tokens(text)
+        limit = max(0, available - reserved[i + 1])
+        if part.max_tokens is not None:
+            limit = min(limit, part.max_tokens)
+        if part.priority >= COMPRESS_FROM_PRIORITY and tokens > 0:
+            compressed = compress_text(text)
+            compressed_tokens = count_tokens(compressed)
+            if compressed and compressed_tokens < tokens:
+                compressed_saved += tokens - compressed_tokens
+                text, tokens = compressed, compressed_tokens
+        if tokens > limit:
+            text = truncate_to_tokens(text, limit)
+            tokens = count_tokens(text)
+        texts[part.name] = text or part.placeholder
+        available = max(0, available - tokens)
+    return texts, compressed_saved
+
+
+def assemble_prompt(
+    feature: str,
+    parts: list[PromptPart],
+    render: Callable[[dict[str, str]], str],
+    budget: int | None = None,
+) -> str:
+    """
+    Render a prompt whose parts fit the feature's token budget.
+
+    ``render`` receives the fitted text of every part by name and returns the
+    prompt; it is also called once with empty parts to measure the fixed
+    instructions, which are never cut.
+    """
+    budget = budget if budget is not None else PROMPT_TOKEN_BUDGETS[feature]
+    instructions = count_tokens(render({part.name: "" for part in parts}))
+    texts, compressed_saved = allocate(parts, max(0, budget - instructions))
+    prompt = render(texts)
+
+    full_tokens = instructions + sum(count_tokens(part.text or "") for part in parts)
+    prompt_tokens = count_tokens(prompt)
+    _stats.record(feature, full_tokens, prompt_tokens, compressed_saved)
+    if full_tokens > prompt_tokens:
+        logger.info(
+            f"Prompt budget {feature}: {prompt_tokens}/{budget} tokens, "
+            f"saved {full_tokens - prompt_tokens} ({compressed_saved} by compression)"
+        )
+    return prompt
+
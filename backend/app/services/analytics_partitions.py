@@ -0,0 +1,213 @@
+"""Monthly partitions and retention for the append-only analytics tables.
+
+``visitor_analytics`` and ``page_engagement_events`` are range-partitioned on
+``created_at`` with one partition per calendar month plus a ``*_default``
+partition that catches anything outside the pre-created range, so inserts
+never fail. ``maintain_partitions`` runs from ``migrate_schema`` on startup
+and periodically from ``run_partition_scheduler``:
+
+* partitions are created for the current month and the next
+  ``analytics_partition_months_ahead`` months;
+* partitions older than ``analytics_retention_months`` are detached (kept as
+  standalone tables for archiving) or dropped, per
+  ``analytics_retention_action``.
+
+Existing non-partitioned tables are converted once with
+``run_analytics_partitioning_migration.py``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import re
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+PARTITIONED_TABLES = ("visitor_analytics", "page_engagement_events")
+RETENTION_ACTIONS = ("detach", "drop")
+MAINTENANCE_INTERVAL = timedelta(hours=6)
+
+
+def month_start(moment: date | datetime) -> date:
+    return date(moment.year, moment.month, 1)
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    return f"{table}_p{month:%Y_%m}"
+
+
+def parse_partition_month(table: str, name: str) -> date | None:
+    match = re.fullmatch(rf"{re.escape(table)}_p(\d{{4}})_(\d{{2}})", name)
+    if not match:
+        return None
+    return date(int(match.group(1)), int(match.group(2)), 1)
+
+
+def partitions_to_retire(
+    table: str, names: list[str], now: datetime, retention_months: int
+) -> list[str]:
+    """Monthly partitions that lie entirely before the retention window.
+
+    ``retention_months <= 0`` keeps everything.
+    """
+    if retention_months <= 0:
+        return []
+    cutoff = add_months(month_start(now), -retention_months)
+    expired = []
+    for name in names:
+        month = parse_partition_month(table, name)
+        if month is not None and month < cutoff:
+            expired.append(name)
+    return sorted(expired)
+
+
+def is_partitioned(conn: Connection, table: str) -> bool:
+    result = conn.execute(
+        text(
+            """
+            SELECT 1 FROM pg_partitioned_table pt
+            JOIN pg_class c ON c.oid = pt.partrelid
+            WHERE c.relname = :table
+            """
+        ),
+        {"table": table},
+    )
+    return result.fetchone() is not None
+
+
+def list_partitions(conn: Connection, table: str) -> list[str]:
+    result = conn.execute(
+        text(
+            """
+            SELECT child.relname FROM pg_inherits i
+            JOIN pg_class parent ON parent.oid = i.inhparent
+            JOIN pg_class child ON child.oid = i.inhrelid
+            WHERE parent.relname = :table
+            """
+        ),
+        {"table": table},
+    )
+    return [row[0] for row in result]
+
+
+def create_partition(conn: Connection, table: str, month: date) -> int:
+    """Create ``month``'s partition, moving its rows out of the default partition.
+
+    Postgres refuses ``CREATE TABLE ... PARTITION OF`` while the default
+    partition holds rows for the new range, so in that case the partition is
+    built as a standalone table, the rows are moved into it and it is then
+    attached. Returns the number of rows moved.
+    """
+    name = partition_name(table, month)
+    bounds = {"start": month, "end": add_months(month, 1)}
+    in_range = "created_at >= :start AND created_at < :end"
+    stranded = conn.execute(
+        text(f"SELECT EXISTS (SELECT 1 FROM {table}_default WHERE {in_range})"), bounds
+    ).scalar()
+    range_sql = (
+        f"FOR VALUES FROM ('{bounds['start'].isoformat()}') TO ('{bounds['end'].isoformat()}')"
+    )
+    if not stranded:
+        conn.execute(text(f"CREATE TABLE {name} PARTITION OF {table} {range_sql}"))
+        return 0
+    conn.execute(
+        text(f"CREATE TABLE {name} (LIKE {table} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)")
+    )
+    moved = conn.execute(
+        text(
+            f"WITH moved AS (DELETE FROM {table}_default WHERE {in_range} RETURNING *) "
+            f"INSERT INTO {name} SELECT * FROM moved"
+        ),
+        bounds,
+    ).rowcount
+    conn.execute(text(f"ALTER TABLE {table} ATTACH PARTITION {name} {range_sql}"))
+    return moved
+
+
+def ensure_partitions(conn: Connection, table: str, first_month: date, last_month: date) -> None:
+    """Create the default partition and one partition per month in the range."""
+    conn.execute(text(f"CREATE TABLE IF NOT EXISTS {table}_default PARTITION OF {table} DEFAULT"))
+    existing = set(list_partitions(conn, table))
+    month = first_month
+    while month <= last_month:
+        name = partition_name(table, month)
+        if name not in existing:
+            # A savepoint keeps one failure from aborting the remaining months
+            # and rolls back a half-done move out of the default partition
+            try:
+                with conn.begin_nested():
+                    moved = create_partition(conn, table, month)
+                if moved:
+                    logger.info(
+                        f"Created partition {name}; moved {moved} rows from {table}_default"
+                    )
+                else:
+                    logger.info(f"Created partition {name}")
+            except Exception as exc:
+                logger.error(f"Could not create partition {name}: {exc}")
+        month = add_months(month, 1)
+
+
+def retire_partitions(
+    conn: Connection, table: str, now: datetime, retention_months: int, action: str
+) -> list[str]:
+    if action not in RETENTION_ACTIONS:
+        raise ValueError(f"Unknown analytics retention action: {action}")
+    expired = partitions_to_retire(table, list_partitions(conn, table), now, retention_months)
+    for name in expired:
+        if action == "drop":
+            conn.execute(text(f"DROP TABLE {name}"))
+        else:
+            conn.execute(text(f"ALTER TABLE {table} DETACH PARTITION {name}"))
+        logger.info(f"Retention: {action}ed partition {name}")
+    return expired
+
+
+def maintain_partitions(engine: Engine, now: datetime | None = None) -> None:
+    """Pre-create upcoming monthly partitions and apply the retention policy."""
+    now = now or datetime.utcnow()
+    current = month_start(now)
+    last_month = add_months(current, settings.analytics_partition_months_ahead)
+    for table in PARTITIONED_TABLES:
+        with engine.begin() as conn:
+            if not is_partitioned(conn, table):
+                logger.warning(
+                    f"{table} is not partitioned; run run_analytics_partitioning_migration.py"
+                )
+                continue
+            ensure_partitions(conn, table, current, last_month)
+            retire_partitions(
+                conn,
+                table,
+                now,
+                settings.analytics_retention_months,
+                settings.analytics_retention_action,
+            )
+
+
+def _maintain_safely() -> None:
+    from app.core.db import engine
+
+    try:
+        maintain_partitions(engine)
+    except Exception as exc:
+        logger.warning(f"Analytics partition maintenance failed: {exc}")
+
+
+async def run_partition_scheduler() -> None:
+    """Run ``maintain_partitions`` every few hours."""
+    while True:
+        await asyncio.sleep(MAINTENANCE_INTERVAL.total_seconds())
+        await asyncio.to_thread(_maintain_safely)
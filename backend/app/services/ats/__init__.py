@@ -4,6 +4,7 @@ These modules provide focused, testable components:
 - text_extractor: Extracts text from resume data
 - structure_analyzer: Analyzes resume structure
 - tfidf_calculator: Calculates TF-IDF cosine similarity scores
+- semantic_adjustment: Caches the deferred LLM semantic score adjustment
 """
 
 from app.services.ats.structure_analyzer import analyze_resume_structure
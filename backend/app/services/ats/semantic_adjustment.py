@@ -0,0 +1,158 @@
+"""Deferred semantic-quality adjustment for ATS scores.
+
+``ATSScoringAgent.analyze_semantic_quality`` is an OpenAI round trip, too
+slow for the scoring path the editor calls on every change. With
+``defer_semantic_adjustment`` the deterministic score is returned at once
+with a ``semantic_pending`` token; the analysis runs in the background and
+its weighted adjustment is cached per (resume text hash, job description +
+keywords hash). The next score request for unchanged content applies the
+cached adjustment, and clients can fetch it earlier by token
+(``GET /api/ai/semantic_adjustment/{token}`` or its ``/events`` stream).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from app.core.config import settings
+from app.core.deadline import without_deadline
+
+logger = logging.getLogger(__name__)
+
+# Share of the agent's adjustment applied to the score (prevents over-correction)
+SEMANTIC_WEIGHT = 0.3
+
+
+def semantic_token(
+    resume_text: str, job_description: str | None, extracted_keywords: dict | None
+) -> str:
+    """Cache key for one (resume content, job) pair."""
+    resume_hash = hashlib.sha256(resume_text.encode()).hexdigest()[:24]
+    job = (job_description or "") + json.dumps(extracted_keywords or {}, sort_keys=True, default=str)
+    job_hash = hashlib.sha256(job.encode()).hexdigest()[:24]
+    return f"{resume_hash}.{job_hash}"
+
+
+class SemanticAdjustmentStore:
+    """
+    TTL + LRU map of token to semantic adjustment, plus the analyses in flight.
+
+    Entries look like:
+        {
+            'status': 'pending' | 'ready' | 'failed',
+            'base_score': float,         # score returned without the adjustment
+            'adjustment': float,         # weighted, ready only
+            'score': float,              # base_score + adjustment, ready only
+            'semantic_analysis': dict,   # ready only
+            'error': str                 # failed only
+        }
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_seconds: float,
+        max_in_flight: int,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_in_flight = max_in_flight
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[float, dict[str, Any]]] = OrderedDict()
+        self._tasks: dict[str, asyncio.Task] = {}
+        self._lock = threading.Lock()
+
+    def get(self, token: str) -> dict[str, Any] | None:
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= self._clock():
+                del self._entries[token]
+                return None
+            self._entries.move_to_end(token)
+            return dict(value)
+
+    def _set(self, token: str, value: dict[str, Any]) -> None:
+        with self._lock:
+            self._entries[token] = (self._clock() + self.ttl_seconds, value)
+            self._entries.move_to_end(token)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def schedule(
+        self,
+        token: str,
+        base_score: float,
+        analyze: Callable[[], Awaitable[dict[str, Any]]],
+    ) -> bool:
+        """Start ``analyze`` in the background unless it is running or done.
+
+        Returns False when the token cannot be delivered (too many analyses in
+        flight), so the caller should not hand it out.
+        """
+        if token in self._tasks:
+            return True
+        existing = self.get(token)
+        if existing is not None and existing['status'] == 'ready':
+            return True
+        if self.max_entries <= 0 or len(self._tasks) >= self.max_in_flight:
+            logger.info("Semantic adjustment skipped: too many analyses in flight")
+            return False
+
+        self._set(token, {'status': 'pending', 'base_score': base_score})
+        # The analysis outlives the scoring request, so it must not inherit its deadline
+        task = asyncio.get_running_loop().create_task(
+            without_deadline(self._run(token, base_score, analyze))
+        )
+        self._tasks[token] = task
+        task.add_done_callback(lambda _: self._tasks.pop(token, None))
+        return True
+
+    async def _run(
+        self,
+        token: str,
+        base_score: float,
+        analyze: Callable[[], Awaitable[dict[str, Any]]],
+    ) -> None:
+        try:
+            semantic_analysis = await analyze()
+        except asyncio.CancelledError:
+            self._set(token, {'status': 'failed', 'base_score': base_score, 'error': 'cancelled'})
+            raise
+        except Exception as e:
+            logger.warning(f"Deferred semantic analysis failed: {e}")
+            self._set(token, {'status': 'failed', 'base_score': base_score, 'error': str(e)})
+            return
+        adjustment = semantic_analysis.get("adjustment", 0) * SEMANTIC_WEIGHT
+        self._set(token, {
+            'status': 'ready',
+            'base_score': base_score,
+            'adjustment': adjustment,
+            'score': round(max(0, min(100, base_score + adjustment)), 1),
+            'semantic_analysis': semantic_analysis,
+        })
+
+    async def wait(self, token: str, timeout: float) -> dict[str, Any] | None:
+        """The entry for ``token`` once its analysis finishes (or ``timeout`` passes)."""
+        task = self._tasks.get(token)
+        if task is not None:
+            await asyncio.wait({task}, timeout=timeout)
+        return self.get(token)
+
+
+semantic_adjustments = SemanticAdjustmentStore(
+    max_entries=settings.semantic_adjustment_max_entries,
+    ttl_seconds=settings.semantic_adjustment_ttl_seconds,
+    max_in_flight=settings.semantic_adjustment_max_in_flight,
+)
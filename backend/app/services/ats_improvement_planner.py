@@ -0,0 +1,256 @@
+"""Plan and apply ATS improvements section by section, concurrently where safe.
+
+Each improvement is mapped to the parts of the resume it touches (its
+targets): ``summary``, ``contact``, ``section:<id>`` for existing sections,
+or ``new:<kind>`` for a section the improvement adds. Improvements are
+grouped into waves; an improvement goes one wave after the last earlier
+(higher priority) improvement it overlaps, so disjoint improvements run
+together and overlapping ones still see each other's edits. Every call gets
+only its targets' JSON, and patches are merged back in priority order,
+keeping only the keys inside the improvement's targets.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import copy
+import logging
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+CONTACT_FIELDS = ("name", "email", "phone", "location")
+EXPERIENCE_TITLE_HINTS = ("experience", "employment", "work history", "project")
+SKILLS_TITLE_HINTS = ("skill", "technolog", "competenc")
+
+ApplyFn = Callable[[dict[str, Any], dict[str, Any]], Awaitable[dict[str, Any] | None]]
+
+
+@dataclass
+class PlannedImprovement:
+    improvement: dict[str, Any]
+    targets: frozenset[str]
+    wave: int
+
+
+def _section_ids(resume: dict[str, Any], hints: tuple[str, ...]) -> set[str]:
+    return {
+        f"section:{section.get('id')}"
+        for section in resume.get("sections", [])
+        if any(hint in section.get("title", "").lower() for hint in hints)
+    }
+
+
+def improvement_targets(improvement: dict[str, Any], resume: dict[str, Any]) -> frozenset[str]:
+    """Resume parts an improvement edits, from its category."""
+    category = improvement.get("category", "").lower()
+    every_section = {f"section:{section.get('id')}" for section in resume.get("sections", [])}
+    experience = _section_ids(resume, EXPERIENCE_TITLE_HINTS) or every_section
+    skills = _section_ids(resume, SKILLS_TITLE_HINTS) or {"new:skills"}
+
+    if category == "summary":
+        targets = {"summary"}
+    elif category == "contact":
+        targets = {"contact"}
+    elif category == "skills":
+        targets = skills
+    elif category == "keywords":
+        targets = {"summary"} | skills
+    elif category in ("achievements", "experience", "leadership"):
+        targets = experience
+    elif category == "content":
+        targets = {"summary"} | experience
+    else:
+        # Format and unknown categories can touch anything
+        targets = {"summary", "contact"} | every_section
+    return frozenset(targets)
+
+
+def plan_improvements(
+    improvements: list[dict[str, Any]], resume: dict[str, Any]
+) -> list[list[PlannedImprovement]]:
+    """Group improvements (already in priority order) into waves of disjoint targets."""
+    planned: list[PlannedImprovement] = []
+    for improvement in improvements:
+        targets = improvement_targets(improvement, resume)
+        wave = 1 + max(
+            (earlier.wave for earlier in planned if earlier.targets & targets), default=-1
+        )
+        planned.append(PlannedImprovement(improvement, targets, wave))
+
+    waves: list[list[PlannedImprovement]] = []
+    for item in planned:
+        if item.wave == len(waves):
+            waves.append([])
+        waves[item.wave].append(item)
+    return waves
+
+
+def _target_sections(targets: frozenset[str]) -> tuple[set[str], list[str]]:
+    """(existing section ids, ids for sections to add) named by ``targets``.
+
+    An added section gets the id ``ats-<kind>``, so a later improvement
+    targeting ``new:<kind>`` edits it instead of adding a second one.
+    """
+    existing = {target.split(":", 1)[1] for target in targets if target.startswith("section:")}
+    new = sorted(f"ats-{target.split(':', 1)[1]}" for target in targets if target.startswith("new:"))
+    return existing, new
+
+
+def scope_payload(resume: dict[str, Any], targets: frozenset[str]) -> dict[str, Any]:
+    """The JSON an improvement call sees: only its targets."""
+    payload: dict[str, Any] = {}
+    if "summary" in targets:
+        payload["summary"] = resume.get("summary", "")
+    if "contact" in targets:
+        payload.update({name: resume.get(name, "") for name in CONTACT_FIELDS})
+    existing, new = _target_sections(targets)
+    section_ids = existing | set(new)
+    if section_ids:
+        payload["sections"] = [
+            section
+            for section in resume.get("sections", [])
+            if str(section.get("id")) in section_ids
+        ]
+    return payload
+
+
+def _normalize_section(
+    section: dict[str, Any], original: dict[str, Any] | None, section_id: str
+) -> dict[str, Any]:
+    original_bullets = (original or {}).get("bullets", [])
+    bullets = []
+    for index, bullet in enumerate(section.get("bullets") or []):
+        if isinstance(bullet, str):
+            bullet = {"text": bullet}
+        if not isinstance(bullet, dict) or not str(bullet.get("text", "")).strip():
+            continue
+        fallback = original_bullets[index] if index < len(original_bullets) else {}
+        bullets.append({
+            "id": str(bullet.get("id") or fallback.get("id") or f"{section_id}-{index}"),
+            "text": str(bullet["text"]),
+            "params": bullet.get("params") or fallback.get("params") or {},
+        })
+    return {
+        "id": section_id,
+        "title": str(section.get("title") or (original or {}).get("title", "")),
+        "bullets": bullets,
+    }
+
+
+def merge_patch(
+    resume: dict[str, Any],
+    targets: frozenset[str],
+    patch: dict[str, Any],
+    touched: set[str],
+    label: str,
+) -> tuple[bool, list[str]]:
+    """
+    Merge ``patch`` into ``resume`` in place, limited to ``targets``.
+
+    ``touched`` holds the targets already merged in the current wave; a
+    patch that would write one of them is rejected. Returns whether the
+    patch was merged and the conflicts found (out-of-scope keys are
+    discarded, not merged).
+    """
+    conflicts = []
+    overlap = targets & touched
+    if overlap:
+        return False, [f"{label}: overlaps {sorted(overlap)} already changed in this wave"]
+
+    allowed = set()
+    if "summary" in targets:
+        allowed.add("summary")
+    if "contact" in targets:
+        allowed.update(CONTACT_FIELDS)
+    existing, new = _target_sections(targets)
+    section_ids = existing | set(new)
+    if section_ids:
+        allowed.add("sections")
+
+    stray = sorted(set(patch) - allowed)
+    if stray:
+        conflicts.append(f"{label}: ignored changes outside its scope: {stray}")
+
+    for key in allowed - {"sections"}:
+        value = patch.get(key)
+        if isinstance(value, str):
+            resume[key] = value
+
+    sections = patch.get("sections")
+    if "sections" in allowed and isinstance(sections, list):
+        by_id = {
+            str(section.get("id")): index for index, section in enumerate(resume.get("sections", []))
+        }
+        to_add = [section_id for section_id in new if section_id not in by_id]
+        for section in sections:
+            if not isinstance(section, dict):
+                continue
+            section_id = str(section.get("id") or "")
+            if section_id in section_ids and section_id in by_id:
+                index = by_id[section_id]
+                resume["sections"][index] = _normalize_section(
+                    section, resume["sections"][index], section_id
+                )
+            elif section_id not in by_id and to_add:
+                new_id = to_add.pop(0)
+                resume.setdefault("sections", []).append(_normalize_section(section, None, new_id))
+                by_id[new_id] = len(resume["sections"]) - 1
+            else:
+                conflicts.append(f"{label}: ignored changes to section {section_id!r} outside its scope")
+
+    touched.update(targets)
+    return True, conflicts
+
+
+async def apply_improvement_plan(
+    resume: dict[str, Any],
+    improvements: list[dict[str, Any]],
+    apply: ApplyFn,
+) -> dict[str, Any]:
+    """
+    Run ``apply(improvement, scope_json)`` for every improvement, wave by
+    wave, and merge the returned patches.
+
+    Returns:
+        {
+            'resume': dict,          # merged copy; the input is not modified
+            'applied': [dict],       # improvements whose patch was merged
+            'failed': [dict],        # improvements whose call failed or returned nothing
+            'conflicts': [str],
+            'waves': int
+        }
+    """
+    merged = copy.deepcopy(resume)
+    waves = plan_improvements(improvements, merged)
+    applied: list[dict[str, Any]] = []
+    failed: list[dict[str, Any]] = []
+    conflicts: list[str] = []
+
+    for wave in waves:
+        results = await asyncio.gather(
+            *(apply(item.improvement, scope_payload(merged, item.targets)) for item in wave),
+            return_exceptions=True,
+        )
+        touched: set[str] = set()
+        for item, patch in zip(wave, results, strict=True):
+            title = item.improvement.get("title", "")
+            if isinstance(patch, Exception) or not isinstance(patch, dict):
+                logger.warning(f"Failed to apply improvement: {title} - {patch}")
+                failed.append(item.improvement)
+                continue
+            merged_ok, item_conflicts = merge_patch(merged, item.targets, patch, touched, title)
+            conflicts.extend(item_conflicts)
+            if merged_ok:
+                applied.append(item.improvement)
+                logger.info(f"Applied improvement: {title}")
+
+    return {
+        "resume": merged,
+        "applied": applied,
+        "failed": failed,
+        "conflicts": conflicts,
+        "waves": len(waves),
+    }
@@ -0,0 +1,223 @@
+"""Opt-in micro-batching of bullet-level LLM calls.
+
+Bullet generation and improvement send one small prompt per request, and at
+peak dozens of them are in flight, each paying full round-trip latency and
+request overhead. With ``enable_bullet_batching`` the agents hand their chat
+completion payload to ``bullet_batcher``, which collects the payloads that
+arrive within ``bullet_batch_window_ms`` (up to ``bullet_batch_max_items``,
+per model and temperature) and sends them as one JSON-mode completion listing
+every task under an id. The response is fanned back out to the waiting
+callers by id. An item missing or malformed in the batch response is retried
+alone, as is every item of a batch whose call fails; a window that collects
+a single request sends it unchanged.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import json
+import logging
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any
+
+from fastapi import HTTPException
+
+from app.core.config import settings
+from app.core.deadline import without_deadline
+from app.core.openai_client import openai_client
+from app.prompts.content_generation_prompts import get_batched_bullet_tasks_prompt
+
+logger = logging.getLogger(__name__)
+
+# Extra completion tokens per task for the ids and JSON wrapping
+BATCH_ITEM_OVERHEAD_TOKENS = 40
+
+SendFn = Callable[[dict[str, Any]], Awaitable[dict[str, Any]]]
+
+
+@dataclass
+class BulletCompletion:
+    content: str
+    tokens_used: int
+    batch_size: int     # 1 when the request was sent alone
+
+
+async def post_chat_completion(data: dict[str, Any], timeout: float = 30.0) -> dict[str, Any]:
+    """Send one chat completion with the shared OpenAI client and return the response JSON."""
+    if not openai_client:
+        raise HTTPException(status_code=503, detail="OpenAI service not available")
+
+    headers = {
+        "Authorization": f"Bearer {openai_client['api_key']}",
+        "Content-Type": "application/json",
+    }
+    httpx_client = openai_client.get("httpx_client")
+    if httpx_client:
+        response = await httpx_client.post(
+            "https://api.openai.com/v1/chat/completions",
+            headers=headers,
+            json=data,
+            timeout=timeout,
+        )
+    else:
+        loop = asyncio.get_running_loop()
+        response = await loop.run_in_executor(
+            None,
+            functools.partial(
+                openai_client["requests"].post,
+                "https://api.openai.com/v1/chat/completions",
+                headers=headers,
+                json=data,
+                timeout=timeout,
+            )
+        )
+
+    if response.status_code != 200:
+        logger.error(f"OpenAI API error: {response.status_code} - {response.text}")
+        raise HTTPException(status_code=500, detail=f"OpenAI API error: {response.status_code}")
+    return response.json()
+
+
+def _message_content(result: dict[str, Any]) -> str:
+    return result["choices"][0]["message"]["content"].strip()
+
+
+def _total_tokens(result: dict[str, Any]) -> int:
+    return int((result.get("usage") or {}).get("total_tokens") or 0)
+
+
+def batch_payload(items: list[dict[str, Any]], ids: list[str]) -> dict[str, Any]:
+    """One JSON-mode completion answering every payload in ``items``."""
+    tasks = [
+        {
+            "id": item_id,
+            "instructions": "\n\n".join(message["content"] for message in item["messages"]),
+        }
+        for item_id, item in zip(ids, items, strict=True)
+    ]
+    prompt = get_batched_bullet_tasks_prompt(json.dumps(tasks, ensure_ascii=False))
+    return {
+        "model": items[0]["model"],
+        "messages": [{"role": "user", "content": prompt}],
+        "max_tokens": sum(
+            item.get("max_tokens", 200) + BATCH_ITEM_OVERHEAD_TOKENS for item in items
+        ),
+        "temperature": items[0].get("temperature", 0.6),
+        "response_format": {"type": "json_object"},
+    }
+
+
+def parse_batch_outputs(content: str, ids: list[str]) -> dict[str, str]:
+    """Map task id to its output; ids missing or malformed in ``content`` are left out."""
+    try:
+        results = json.loads(content).get("results")
+    except (json.JSONDecodeError, AttributeError):
+        return {}
+    if not isinstance(results, list):
+        return {}
+
+    outputs: dict[str, str] = {}
+    for entry in results:
+        if not isinstance(entry, dict):
+            continue
+        item_id, output = entry.get("id"), entry.get("output")
+        if item_id not in ids or item_id in outputs:
+            continue
+        if isinstance(output, (list, dict)) and output:
+            outputs[item_id] = json.dumps(output, ensure_ascii=False)
+        elif isinstance(output, str) and output.strip():
+            outputs[item_id] = output.strip()
+    return outputs
+
+
+class BulletBatcher:
+    """Collects bullet-level completions for a short window and sends them together."""
+
+    def __init__(self, send: SendFn, window_ms: float, max_items: int):
+        self.send = send
+        self.window_ms = window_ms
+        self.max_items = max(1, max_items)
+        self._pending: dict[tuple[str, float], list[tuple[dict[str, Any], asyncio.Future]]] = {}
+        self._timers: dict[tuple[str, float], asyncio.TimerHandle] = {}
+        self._tasks: set[asyncio.Task] = set()
+        self.stats = {"requests": 0, "batches": 0, "batched_items": 0, "fallbacks": 0}
+
+    async def complete(self, data: dict[str, Any]) -> BulletCompletion:
+        """Answer one chat completion payload, batched with its neighbours."""
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future = loop.create_future()
+        key = (data["model"], data.get("temperature", 0.6))
+        group = self._pending.setdefault(key, [])
+        group.append((data, future))
+        self.stats["requests"] += 1
+
+        if len(group) >= self.max_items:
+            self._flush(key)
+        elif len(group) == 1:
+            self._timers[key] = loop.call_later(self.window_ms / 1000, self._flush, key)
+        return await future
+
+    def _flush(self, key: tuple[str, float]) -> None:
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+        items = self._pending.pop(key, [])
+        if items:
+            # A batch serves several requests; it must not inherit the deadline of the one that flushed it
+            task = asyncio.get_running_loop().create_task(without_deadline(self._run(items)))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _single(self, data: dict[str, Any], future: asyncio.Future) -> None:
+        if future.done():
+            # The caller was cancelled (e.g. its client disconnected) while queued
+            return
+        try:
+            result = await self.send(data)
+            completion = BulletCompletion(_message_content(result), _total_tokens(result), 1)
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+            return
+        if not future.done():
+            future.set_result(completion)
+
+    async def _run(self, items: list[tuple[dict[str, Any], asyncio.Future]]) -> None:
+        live = [(data, future) for data, future in items if not future.done()]
+        if len(live) <= 1:
+            for data, future in live:
+                await self._single(data, future)
+            return
+
+        self.stats["batches"] += 1
+        self.stats["batched_items"] += len(live)
+        ids = [f"b{index}" for index in range(len(live))]
+        try:
+            result = await self.send(batch_payload([data for data, _ in live], ids))
+            outputs = parse_batch_outputs(_message_content(result), ids)
+            tokens_each = _total_tokens(result) // len(live)
+        except Exception as e:
+            logger.warning(f"Bullet batch of {len(live)} failed, sending items alone: {e}")
+            outputs, tokens_each = {}, 0
+
+        retry = []
+        for item_id, (data, future) in zip(ids, live, strict=True):
+            content = outputs.get(item_id)
+            if future.done():
+                continue
+            if content is None:
+                retry.append((data, future))
+            else:
+                future.set_result(BulletCompletion(content, tokens_each, len(live)))
+        if retry:
+            self.stats["fallbacks"] += len(retry)
+            await asyncio.gather(*(self._single(data, future) for data, future in retry))
+
+
+bullet_batcher = BulletBatcher(
+    post_chat_completion,
+    window_ms=settings.bullet_batch_window_ms,
+    max_items=settings.bullet_batch_max_items,
+)
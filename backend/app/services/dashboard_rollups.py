@@ -0,0 +1,240 @@
+"""Incremental maintenance of the admin dashboard rollups.
+
+The dashboard endpoints used to run full-table COUNT/SUM aggregations over
+``users``, ``resumes``, ``resume_versions`` and ``visitor_analytics`` on every
+page load. They now read the ``dashboard_*`` rollup tables, which this module
+keeps up to date:
+
+* each refresh recomputes only the buckets touched since the previous refresh
+  (plus a small overlap for late writes) with ``INSERT ... SELECT`` statements;
+* a full rebuild runs every ``dashboard_rollup_full_refresh_hours`` to pick up
+  deletes and premium status changes on older rows;
+* a Postgres advisory lock keeps concurrent workers from refreshing at once.
+
+Refreshes run only in the background task; requests never build the rollups.
+``refreshed_at`` on the state row is exposed to clients as ``data_as_of``, and
+until the first refresh has committed ``rollup_state`` raises
+``RollupsNotReady`` instead of serving empty tables as current. Rows without a
+``created_at`` have no day bucket, so their counts are kept on the state row
+(``undated_*``) and added to the all-time totals.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models import DashboardRollupState
+
+logger = logging.getLogger(__name__)
+
+STATE_NAME = "dashboard"
+ADVISORY_LOCK_KEY = 7_311_028
+REFRESH_OVERLAP = timedelta(hours=1)
+
+_DAILY_ROLLUP_SQL = """
+    INSERT INTO dashboard_daily_rollups
+        (day, new_users, new_subscriptions, new_resumes, tokens_used, updated_at)
+    SELECT
+        d.day,
+        COALESCE(u.new_users, 0),
+        COALESCE(p.new_subscriptions, 0),
+        COALESCE(r.new_resumes, 0),
+        COALESCE(v.tokens_used, 0),
+        :now
+    FROM (
+        SELECT CAST(gs AS date) AS day
+        FROM generate_series(CAST(:start_day AS date), CAST(:end_day AS date), interval '1 day') AS gs
+    ) d
+    LEFT JOIN (
+        SELECT CAST(created_at AS date) AS day, COUNT(*) AS new_users
+        FROM users WHERE created_at >= :start_day GROUP BY 1
+    ) u ON u.day = d.day
+    LEFT JOIN (
+        SELECT CAST(COALESCE(premium_purchased_at, created_at) AS date) AS day,
+               COUNT(*) AS new_subscriptions
+        FROM users
+        WHERE is_premium = true AND COALESCE(premium_purchased_at, created_at) >= :start_day
+        GROUP BY 1
+    ) p ON p.day = d.day
+    LEFT JOIN (
+        SELECT CAST(created_at AS date) AS day, COUNT(*) AS new_resumes
+        FROM resumes WHERE created_at >= :start_day GROUP BY 1
+    ) r ON r.day = d.day
+    LEFT JOIN (
+        SELECT CAST(created_at AS date) AS day, COALESCE(SUM(tokens_used), 0) AS tokens_used
+        FROM resume_versions WHERE created_at >= :start_day GROUP BY 1
+    ) v ON v.day = d.day
+    ON CONFLICT (day) DO UPDATE SET
+        new_users = EXCLUDED.new_users,
+        new_subscriptions = EXCLUDED.new_subscriptions,
+        new_resumes = EXCLUDED.new_resumes,
+        tokens_used = EXCLUDED.tokens_used,
+        updated_at = EXCLUDED.updated_at
+"""
+
+_COUNTRY_VISITS_SQL = """
+    INSERT INTO dashboard_hourly_country_visits (hour_start, country, country_code, visitors)
+    SELECT date_trunc('hour', created_at), country, COALESCE(country_code, ''), COUNT(*)
+    FROM visitor_analytics
+    WHERE created_at >= :start_hour AND country IS NOT NULL AND country != 'Local'
+    GROUP BY 1, 2, 3
+"""
+
+_USER_ACTIVITY_SQL = """
+    INSERT INTO dashboard_user_activity (user_id, resume_count, version_count, updated_at)
+    SELECT r.user_id, COUNT(DISTINCT r.id), COUNT(v.id), :now
+    FROM resumes r
+    LEFT JOIN resume_versions v ON v.resume_id = r.id
+    WHERE r.user_id IS NOT NULL {user_filter}
+    GROUP BY r.user_id
+"""
+
+_UNDATED_TOTALS_SQL = """
+    SELECT
+        (SELECT COUNT(*) FROM users WHERE created_at IS NULL),
+        (SELECT COUNT(*) FROM users
+         WHERE is_premium = true AND premium_purchased_at IS NULL AND created_at IS NULL),
+        (SELECT COALESCE(SUM(tokens_used), 0) FROM resume_versions WHERE created_at IS NULL)
+"""
+
+_CHANGED_USERS_SQL = """
+    SELECT user_id FROM resumes
+    WHERE user_id IS NOT NULL AND (created_at >= :since OR updated_at >= :since)
+    UNION
+    SELECT r.user_id FROM resume_versions v JOIN resumes r ON r.id = v.resume_id
+    WHERE r.user_id IS NOT NULL AND v.created_at >= :since
+"""
+
+
+class RollupsNotReady(Exception):
+    """The rollups have not been built yet; the first background refresh is still pending."""
+
+
+def _earliest_day(db: Session, today: date) -> date:
+    row = db.execute(
+        text(
+            """
+            SELECT LEAST(
+                (SELECT MIN(created_at) FROM users),
+                (SELECT MIN(created_at) FROM resumes),
+                (SELECT MIN(created_at) FROM resume_versions)
+            )
+            """
+        )
+    ).first()
+    earliest = row[0] if row else None
+    return earliest.date() if earliest else today
+
+
+def refresh_rollups(db: Session, full: bool = False, now: datetime | None = None) -> bool:
+    """Bring the dashboard rollups up to date.
+
+    Returns ``False`` if another worker holds the refresh lock.
+    """
+    now = now or datetime.utcnow()
+    locked = db.execute(
+        text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": ADVISORY_LOCK_KEY}
+    ).scalar()
+    if not locked:
+        db.rollback()
+        return False
+
+    state = db.get(DashboardRollupState, STATE_NAME)
+    if state is None:
+        state = DashboardRollupState(name=STATE_NAME)
+        db.add(state)
+
+    full_interval = timedelta(hours=settings.dashboard_rollup_full_refresh_hours)
+    if (
+        full
+        or state.refreshed_at is None
+        or state.full_refreshed_at is None
+        or now - state.full_refreshed_at >= full_interval
+    ):
+        full = True
+        since = None
+    else:
+        since = state.refreshed_at - REFRESH_OVERLAP
+
+    today = now.date()
+    start_day = _earliest_day(db, today) if since is None else since.date()
+    if since is None:
+        db.execute(text("DELETE FROM dashboard_daily_rollups"))
+    db.execute(
+        text(_DAILY_ROLLUP_SQL),
+        {"start_day": start_day, "end_day": today, "now": now},
+    )
+
+    retention_start = now - timedelta(days=settings.dashboard_rollup_retention_days)
+    start_hour = retention_start if since is None else max(since, retention_start)
+    start_hour = start_hour.replace(minute=0, second=0, microsecond=0)
+    db.execute(
+        text("DELETE FROM dashboard_hourly_country_visits WHERE hour_start >= :start_hour OR hour_start < :retention_start"),
+        {"start_hour": start_hour, "retention_start": retention_start},
+    )
+    db.execute(text(_COUNTRY_VISITS_SQL), {"start_hour": start_hour})
+
+    if since is None:
+        db.execute(text("DELETE FROM dashboard_user_activity"))
+        db.execute(text(_USER_ACTIVITY_SQL.format(user_filter="")), {"now": now})
+    else:
+        changed = [row[0] for row in db.execute(text(_CHANGED_USERS_SQL), {"since": since})]
+        if changed:
+            db.execute(
+                text("DELETE FROM dashboard_user_activity WHERE user_id = ANY(:user_ids)"),
+                {"user_ids": changed},
+            )
+            db.execute(
+                text(_USER_ACTIVITY_SQL.format(user_filter="AND r.user_id = ANY(:user_ids)")),
+                {"now": now, "user_ids": changed},
+            )
+
+    undated = db.execute(text(_UNDATED_TOTALS_SQL)).first()
+    state.undated_users, state.undated_subscriptions, state.undated_tokens = (
+        int(value or 0) for value in undated
+    )
+
+    state.refreshed_at = now
+    if full:
+        state.full_refreshed_at = now
+    db.commit()
+    logger.info(f"Dashboard rollups refreshed ({'full' if full else 'incremental'}) as of {now}")
+    return True
+
+
+def rollup_state(db: Session) -> DashboardRollupState:
+    """The committed refresh state; ``refreshed_at`` is the dashboard's ``data_as_of``.
+
+    Raises ``RollupsNotReady`` before the first refresh has completed.
+    """
+    state = db.get(DashboardRollupState, STATE_NAME)
+    if state is None or state.refreshed_at is None:
+        raise RollupsNotReady()
+    return state
+
+
+def _refresh_in_new_session(full: bool = False) -> None:
+    from app.core.db import SessionLocal
+
+    db = SessionLocal()
+    try:
+        refresh_rollups(db, full=full)
+    except Exception as exc:
+        db.rollback()
+        logger.warning(f"Dashboard rollup refresh failed: {exc}")
+    finally:
+        db.close()
+
+
+async def run_rollup_scheduler() -> None:
+    """Refresh the rollups every ``dashboard_rollup_interval_seconds``."""
+    interval = settings.dashboard_rollup_interval_seconds
+    while True:
+        await asyncio.to_thread(_refresh_in_new_session)
+        await asyncio.sleep(interval)
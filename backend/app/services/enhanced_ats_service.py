@@ -1,10 +1,17 @@
 import asyncio
+import functools
 import logging
 import math
 import re
 from dataclasses import dataclass
 from typing import Any
 
+from app.core.config import settings
+from app.services.ats.semantic_adjustment import (
+    SEMANTIC_WEIGHT,
+    semantic_adjustments,
+    semantic_token,
+)
 from app.services.ats.structure_analyzer import analyze_resume_structure as analyze_structure
 
 # Import extracted ATS modules
@@ -1281,6 +1288,9 @@ class EnhancedATSChecker:
             calculated_score = result["overall_score"]
 
             # Apply AI agent semantic quality adjustment if available
+            semantic_token_value = None
+            deferred_adjustment = None
+            deferred_analysis = None
             try:
                 from app.core.dependencies import ats_scoring_agent
 
@@ -1310,22 +1320,37 @@ class EnhancedATSChecker:
 
                     # Only run agent if we have keyword data
                     if keyword_matches or missing_keywords:
-                        # Use await directly since we're now in an async context
-                        semantic_analysis = await ats_scoring_agent.analyze_semantic_quality(
+                        analyze_semantics = functools.partial(
+                            ats_scoring_agent.analyze_semantic_quality,
                             resume_data=resume_data,
                             job_description=job_description,
                             extracted_keywords=extracted_keywords,
                             keyword_matches=keyword_matches,
                             missing_keywords=missing_keywords,
                         )
-
-                        # Apply semantic adjustment (30% of adjustment to prevent over-correction)
-                        adjustment = semantic_analysis.get("adjustment", 0) * 0.3
-                        calculated_score = max(0, min(100, calculated_score + adjustment))
-
-                        # Add semantic analysis to details
-                        result["semantic_analysis"] = semantic_analysis
-                        logger.debug(f"Applied semantic adjustment: {adjustment:.2f} (quality_score: {semantic_analysis.get('quality_score', 50)})")
+                        if settings.defer_semantic_adjustment:
+                            # Cached adjustment for this exact content, else
+                            # compute it in the background (applied below,
+                            # after the rule engine)
+                            semantic_token_value = semantic_token(
+                                resume_text_to_use, job_description, extracted_keywords
+                            )
+                            cached = semantic_adjustments.get(semantic_token_value)
+                            if cached is not None and cached["status"] == "ready":
+                                deferred_adjustment = cached["adjustment"]
+                                result["semantic_analysis"] = cached["semantic_analysis"]
+                            else:
+                                deferred_analysis = analyze_semantics
+                        else:
+                            semantic_analysis = await analyze_semantics()
+
+                            # Apply semantic adjustment (30% of adjustment to prevent over-correction)
+                            adjustment = semantic_analysis.get("adjustment", 0) * SEMANTIC_WEIGHT
+                            calculated_score = max(0, min(100, calculated_score + adjustment))
+
+                            # Add semantic analysis to details
+                            result["semantic_analysis"] = semantic_analysis
+                            logger.debug(f"Applied semantic adjustment: {adjustment:.2f} (quality_score: {semantic_analysis.get('quality_score', 50)})")
 
             except Exception as e:
                 # Non-critical: if agent fails, continue with rule-based score
@@ -1358,6 +1383,14 @@ class EnhancedATSChecker:
                 # Non-critical: if rule engine fails, continue without rule adjustments
                 logger.warning(f"Rule engine evaluation failed, continuing without rule adjustments: {e}")
 
+            semantic_pending = None
+            if deferred_adjustment is not None:
+                calculated_score = max(0, min(100, calculated_score + deferred_adjustment))
+            elif deferred_analysis is not None and semantic_adjustments.schedule(
+                semantic_token_value, round(calculated_score, 1), deferred_analysis
+            ):
+                semantic_pending = semantic_token_value
+
             response = {
                 "success": True,
                 "score": round(calculated_score, 1),
@@ -1365,6 +1398,7 @@ class EnhancedATSChecker:
                 "suggestions": result["suggestions"],
                 "ai_improvements": result.get("ai_improvements", []),
                 "method": result.get("method", "comprehensive"),
+                "semantic_pending": semantic_pending,
             }
             
             # Add rule engine results if available
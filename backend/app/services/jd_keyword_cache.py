@@ -0,0 +1,315 @@
+"""Near-duplicate cache for LLM keyword extraction from job descriptions.
+
+The extension sends the same LinkedIn/Indeed postings again and again, often
+with small differences (tracking links, "posted 3 days ago", reordered
+benefits). Each job description is normalized (lowercased, URLs and emails
+dropped, punctuation stripped) and fingerprinted with a 64-bit SimHash over
+word 3-shingles. A lookup returns the stored LLM keywords for the same
+normalized text or for any posting within ``jd_keyword_near_duplicate_distance``
+bits. Fingerprints are indexed in ``distance + 1`` bands, so every posting
+within the distance shares at least one band with the query and candidates
+are found without scanning the cache. Stored keywords are re-validated
+against the incoming text, so a near-duplicate never returns a keyword its
+own posting lacks.
+
+``jd_keyword_local_policy`` decides which postings skip the LLM for the
+in-process ``KeywordExtractor``: ``never``, ``low_value`` (fewer than
+``jd_keyword_min_llm_words`` words) or ``always``. Only OpenAI results are
+cached; extractions by the local model (see ``model_router``) are counted in
+``local_model_calls`` but never stored, so a near-duplicate posting is not
+served local-model keywords as OpenAI output. ``stats()`` reports the hit rate
+and the tokens stored results saved.
+"""
+
+from __future__ import annotations
+
+import copy
+import hashlib
+import logging
+import re
+import threading
+import time
+from collections import Counter, OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+SIMHASH_BITS = 64
+SHINGLE_SIZE = 3
+LOCAL_POLICIES = ("never", "low_value", "always")
+
+_NOISE_RE = re.compile(r"(?:https?://|www\.)\S+|\S+@\S+")
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#.]*")
+_EDUCATION_RE = re.compile(r"bachelor|master|phd|doctorate|mba", re.IGNORECASE)
+
+KEYWORD_FIELDS = (
+    "technical_keywords",
+    "soft_skills",
+    "general_keywords",
+    "priority_keywords",
+    "education",
+    "experience",
+)
+
+
+@dataclass(frozen=True)
+class JDFingerprint:
+    key: str        # SHA-256 of the normalized text
+    simhash: int
+    words: int
+
+
+@dataclass
+class CachedKeywords:
+    keywords_data: dict[str, Any]
+    match: str      # 'exact' | 'near'
+    distance: int
+    tokens_saved: int
+
+
+@dataclass
+class _Entry:
+    expires_at: float
+    simhash: int
+    keywords_data: dict[str, Any]
+    tokens: int
+
+
+def normalize_job_description(text: str) -> list[str]:
+    """Lowercased word tokens with URLs, emails and punctuation removed."""
+    tokens = _TOKEN_RE.findall(_NOISE_RE.sub(" ", (text or "").lower()))
+    return [token.rstrip(".") for token in tokens]
+
+
+def simhash(tokens: list[str]) -> int:
+    if len(tokens) < SHINGLE_SIZE:
+        shingles = Counter([" ".join(tokens)])
+    else:
+        shingles = Counter(
+            " ".join(tokens[i:i + SHINGLE_SIZE]) for i in range(len(tokens) - SHINGLE_SIZE + 1)
+        )
+    weights = [0] * SIMHASH_BITS
+    for shingle, count in shingles.items():
+        value = int.from_bytes(hashlib.blake2b(shingle.encode(), digest_size=8).digest(), "big")
+        for bit in range(SIMHASH_BITS):
+            weights[bit] += count if value >> bit & 1 else -count
+    return sum(1 << bit for bit, weight in enumerate(weights) if weight > 0)
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+
+def fingerprint_job_description(text: str) -> JDFingerprint:
+    tokens = normalize_job_description(text)
+    key = hashlib.sha256(" ".join(tokens).encode()).hexdigest()
+    return JDFingerprint(key=key, simhash=simhash(tokens), words=len(tokens))
+
+
+def use_local_extraction(fingerprint: JDFingerprint) -> bool:
+    """Whether ``jd_keyword_local_policy`` sends this posting to KeywordExtractor."""
+    policy = settings.jd_keyword_local_policy
+    if policy == "always":
+        return True
+    if policy == "low_value":
+        return fingerprint.words < settings.jd_keyword_min_llm_words
+    if policy != "never":
+        logger.warning(f"Unknown JD_KEYWORD_LOCAL_POLICY {policy!r}, using 'never'")
+    return False
+
+
+def local_keyword_data(extractor, job_description: str) -> dict[str, Any]:
+    """KeywordExtractor output in the shape of the LLM's JSON response."""
+    result = extractor.extract_keywords(job_description)
+    technical = result.get("technical_keywords", [])
+    frequent = [item["keyword"] for item in result.get("high_frequency_keywords", [])]
+    ats_focused = result.get("ats_focused_keywords", [])
+    return {
+        "technical_keywords": technical,
+        "soft_skills": result.get("soft_skills", []),
+        "general_keywords": result.get("general_keywords", []),
+        "priority_keywords": list(dict.fromkeys(technical + frequent))[:20],
+        "education": [keyword for keyword in ats_focused if _EDUCATION_RE.search(keyword)],
+        "experience": [keyword for keyword in ats_focused if "years" in keyword.lower()],
+    }
+
+
+def build_keyword_response(keywords_data: dict[str, Any], job_description: str) -> dict[str, Any]:
+    """Keep only keywords present in the job description and add the derived fields."""
+    jd_lower = job_description.lower()
+
+    def present(values: Any) -> list[str]:
+        if not isinstance(values, list):
+            return []
+        return [
+            keyword for keyword in values
+            if isinstance(keyword, str) and keyword.strip() and keyword.lower().strip() in jd_lower
+        ]
+
+    technical_keywords, soft_skills, general_keywords, priority_keywords, education_keywords, \
+        experience_keywords = (present(keywords_data.get(name)) for name in KEYWORD_FIELDS)
+
+    # Earlier priority keywords rank higher
+    high_frequency_keywords = [
+        {
+            "keyword": keyword,
+            "frequency": len(priority_keywords) - idx,
+            "importance": "high" if idx < 5 else "medium" if idx < 10 else "low",
+        }
+        for idx, keyword in enumerate(priority_keywords[:20])
+    ]
+
+    all_keywords = (
+        technical_keywords + general_keywords + soft_skills + education_keywords + experience_keywords
+    )
+    return {
+        "technical_keywords": technical_keywords,
+        "soft_skills": soft_skills,
+        "general_keywords": general_keywords,
+        "priority_keywords": priority_keywords,
+        "high_frequency_keywords": high_frequency_keywords,
+        "education_keywords": education_keywords,
+        "experience_keywords": experience_keywords,
+        "total_keywords": len(set(all_keywords)),
+    }
+
+
+def _band_ranges(max_distance: int) -> list[tuple[int, int]]:
+    count = max(1, min(max_distance + 1, SIMHASH_BITS))
+    edges = [SIMHASH_BITS * i // count for i in range(count + 1)]
+    # Consecutive edges bound each band, so the shifted copy is one shorter
+    return list(zip(edges, edges[1:], strict=False))
+
+
+class JDKeywordCache:
+    """Thread-safe TTL + LRU map of job description to LLM keywords, with near-duplicate lookup."""
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_seconds: float,
+        max_distance: int,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_distance = max_distance
+        self._clock = clock
+        self._ranges = _band_ranges(max_distance)
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._bands: dict[tuple[int, int], set[str]] = {}
+        self._lock = threading.Lock()
+        self._counts = {
+            "lookups": 0,
+            "exact_hits": 0,
+            "near_hits": 0,
+            "misses": 0,
+            "local_extractions": 0,
+            "local_model_calls": 0,
+            "llm_calls": 0,
+            "tokens_used": 0,
+            "tokens_saved": 0,
+        }
+
+    def _band_keys(self, value: int) -> list[tuple[int, int]]:
+        return [
+            (index, (value >> start) & ((1 << (end - start)) - 1))
+            for index, (start, end) in enumerate(self._ranges)
+        ]
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for band in self._band_keys(entry.simhash):
+            members = self._bands.get(band)
+            if members is not None:
+                members.discard(key)
+                if not members:
+                    del self._bands[band]
+
+    def _live(self, key: str, now: float) -> _Entry | None:
+        entry = self._entries.get(key)
+        if entry is not None and entry.expires_at <= now:
+            self._remove(key)
+            return None
+        return entry
+
+    def lookup(self, fingerprint: JDFingerprint) -> CachedKeywords | None:
+        with self._lock:
+            self._counts["lookups"] += 1
+            now = self._clock()
+            key, match, distance = fingerprint.key, "exact", 0
+            entry = self._live(key, now)
+
+            if entry is None:
+                candidates = set()
+                for band in self._band_keys(fingerprint.simhash):
+                    candidates.update(self._bands.get(band, ()))
+                best = None
+                for candidate in candidates:
+                    candidate_entry = self._live(candidate, now)
+                    if candidate_entry is None:
+                        continue
+                    candidate_distance = hamming_distance(fingerprint.simhash, candidate_entry.simhash)
+                    if candidate_distance <= self.max_distance and (
+                        best is None or candidate_distance < best[0]
+                    ):
+                        best = (candidate_distance, candidate, candidate_entry)
+                if best is None:
+                    self._counts["misses"] += 1
+                    return None
+                distance, key, entry = best
+                match = "near"
+
+            self._entries.move_to_end(key)
+            self._counts[f"{match}_hits"] += 1
+            self._counts["tokens_saved"] += entry.tokens
+            return CachedKeywords(copy.deepcopy(entry.keywords_data), match, distance, entry.tokens)
+
+    def store(self, fingerprint: JDFingerprint, keywords_data: dict[str, Any], tokens: int) -> None:
+        """Record an OpenAI extraction that used ``tokens`` and keep its result."""
+        with self._lock:
+            self._counts["llm_calls"] += 1
+            self._counts["tokens_used"] += tokens
+            if self.max_entries <= 0:
+                return
+            self._remove(fingerprint.key)
+            self._entries[fingerprint.key] = _Entry(
+                self._clock() + self.ttl_seconds, fingerprint.simhash, copy.deepcopy(keywords_data), tokens
+            )
+            for band in self._band_keys(fingerprint.simhash):
+                self._bands.setdefault(band, set()).add(fingerprint.key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def record_local(self) -> None:
+        with self._lock:
+            self._counts["local_extractions"] += 1
+
+    def record_local_model(self) -> None:
+        """Count an extraction served by the local model; its result is not cached."""
+        with self._lock:
+            self._counts["local_model_calls"] += 1
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            counts = dict(self._counts)
+            entries = len(self._entries)
+        hits = counts["exact_hits"] + counts["near_hits"]
+        return {
+            "entries": entries,
+            **counts,
+            "hit_rate": round(hits / counts["lookups"], 4) if counts["lookups"] else 0.0,
+        }
+
+
+jd_keyword_cache = JDKeywordCache(
+    max_entries=settings.jd_keyword_cache_max_entries,
+    ttl_seconds=settings.jd_keyword_cache_ttl_seconds,
+    max_distance=settings.jd_keyword_near_duplicate_distance,
+)
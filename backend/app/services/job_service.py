@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import base64
 import json
 import logging
 import secrets
@@ -9,7 +10,8 @@ from datetime import datetime
 from typing import Any
 
 from fastapi import HTTPException
-from sqlalchemy import or_, text
+from sqlalchemy import Select, func, literal, or_, select, text, true, tuple_, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.core.dependencies import keyword_extractor
@@ -450,6 +452,131 @@ def create_or_update_job_description(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _job_description_list_item(
+    it: JobDescription, resume_links: list[JobResumeVersion]
+) -> dict[str, Any]:
+    """Build the job board payload for one job description"""
+    try:
+        priority_kw = it.priority_keywords
+        if priority_kw is not None:
+            if isinstance(priority_kw, str):
+                try:
+                    priority_kw = json.loads(priority_kw)
+                except Exception:
+                    priority_kw = []
+            elif not isinstance(priority_kw, list):
+                priority_kw = []
+
+        resume_versions_payload: list[dict[str, Any]] = []
+        best_link_payload: dict[str, Any] | None = None
+        for link in resume_links:
+            link_payload = {
+                "id": link.id,
+                "score": link.ats_score or 0,
+                "resume_id": link.resume_id,
+                "resume_name": link.resume_name,
+                "resume_version_id": link.resume_version_id,
+                "resume_version_label": link.resume_version_label,
+                "keyword_coverage": link.keyword_coverage,
+                "matched_keywords": link.matched_keywords or [],
+                "missing_keywords": link.missing_keywords or [],
+                "created_at": (
+                    link.created_at.isoformat() if link.created_at else None
+                ),
+                "updated_at": (
+                    link.updated_at.isoformat() if link.updated_at else None
+                ),
+            }
+            resume_versions_payload.append(link_payload)
+            if not best_link_payload or (link_payload["score"] or 0) > (
+                best_link_payload["score"] or 0
+            ):
+                best_link_payload = link_payload
+
+        return {
+            "id": it.id,
+            "title": it.title or "",
+            "company": it.company or "",
+            "source": it.source or "",
+            "url": it.url or "",
+            "easy_apply_url": it.easy_apply_url or "",
+            "location": it.location or "",
+            "work_type": it.work_type or "",
+            "job_type": it.job_type or "",
+            "created_at": (
+                it.created_at.isoformat() if it.created_at else None
+            ),
+            "priority_keywords": priority_kw or [],
+            "soft_skills": it.soft_skills or [],
+            "high_frequency_keywords": it.high_frequency_keywords or [],
+            "ats_insights": it.ats_insights or {},
+            "max_salary": getattr(it, "max_salary", None),
+            "status": getattr(it, "status", "bookmarked"),
+            "follow_up_date": getattr(it, "follow_up_date", None),
+            "importance": getattr(it, "importance", 0),
+            "notes": getattr(it, "notes", None),
+            "best_resume_version": best_link_payload,
+            "resume_versions": resume_versions_payload,
+            "last_match": best_link_payload,
+            "all_matches": resume_versions_payload,
+        }
+    except Exception as e:
+        logger.error(f"Error processing JD {it.id}: {e}", exc_info=True)
+        return {
+            "id": it.id,
+            "title": it.title or "",
+            "company": it.company or "",
+            "source": it.source or "",
+            "url": it.url or "",
+            "easy_apply_url": it.easy_apply_url or "",
+            "location": it.location or "",
+            "work_type": it.work_type or "",
+            "job_type": it.job_type or "",
+            "created_at": (
+                it.created_at.isoformat() if it.created_at else None
+            ),
+            "priority_keywords": [],
+            "soft_skills": [],
+            "high_frequency_keywords": [],
+            "ats_insights": {},
+            "max_salary": getattr(it, "max_salary", None),
+            "status": getattr(it, "status", "bookmarked"),
+            "follow_up_date": getattr(it, "follow_up_date", None),
+            "importance": getattr(it, "importance", 0),
+            "notes": getattr(it, "notes", None),
+            "best_resume_version": None,
+            "resume_versions": [],
+            "last_match": None,
+            "all_matches": [],
+        }
+
+
+def _job_list_stmt(user_id: int | None) -> Select:
+    """Newest 100 jobs visible to ``user_id`` (their own and unowned ones)"""
+    if user_id is not None:
+        owner = or_(JobDescription.user_id == user_id, JobDescription.user_id.is_(None))
+    else:
+        owner = JobDescription.user_id.is_(None)
+    return (
+        select(JobDescription)
+        .where(owner)
+        .order_by(JobDescription.created_at.desc())
+        .limit(100)
+    )
+
+
+def _job_resume_links_stmt(job_ids: list[int]) -> Select:
+    """Resume links of ``job_ids``, most recently updated and best scored first"""
+    return (
+        select(JobResumeVersion)
+        .where(JobResumeVersion.job_description_id.in_(job_ids))
+        .order_by(
+            JobResumeVersion.updated_at.desc().nullslast(),
+            JobResumeVersion.ats_score.desc().nullslast(),
+        )
+    )
+
+
 def list_user_job_descriptions(
     user_email: str | None, db: Session
 ) -> list[dict[str, Any]]:
@@ -460,28 +587,17 @@ def list_user_job_descriptions(
 
         if new_columns_exist:
             # Columns exist - use normal SQLAlchemy query
-            q = db.query(JobDescription)
+            user_id = None
             if user_email:
                 user = db.query(User).filter(User.email == user_email).first()
                 if user:
                     logger.info(f"Found user {user_email} with id {user.id}, filtering jobs")
-                    q = q.filter(
-                        or_(
-                            JobDescription.user_id == user.id,
-                            JobDescription.user_id.is_(None),
-                        )
-                    )
+                    user_id = user.id
                 else:
                     logger.warning(f"User {user_email} not found in database, returning only jobs with user_id IS NULL")
-                    q = q.filter(JobDescription.user_id.is_(None))
             else:
                 logger.warning("No user_email provided - Firebase auth may have failed. Returning jobs with user_id IS NULL only.")
-                q = q.filter(JobDescription.user_id.is_(None))
-            items = (
-                q.order_by(JobDescription.created_at.desc())
-                .limit(100)
-                .all()
-            )
+            items = db.scalars(_job_list_stmt(user_id)).all()
             logger.info(f"Found {len(items)} job descriptions for user_email: {user_email}")
 
             # Load resume_versions separately to avoid potential N+1 or timeout issues
@@ -489,15 +605,7 @@ def list_user_job_descriptions(
             job_ids = [it.id for it in items if getattr(it, "id", None)]
             if job_ids:
                 try:
-                    resume_links = (
-                        db.query(JobResumeVersion)
-                        .filter(JobResumeVersion.job_description_id.in_(job_ids))
-                        .order_by(
-                            JobResumeVersion.updated_at.desc().nullslast(),
-                            JobResumeVersion.ats_score.desc().nullslast(),
-                        )
-                        .all()
-                    )
+                    resume_links = db.scalars(_job_resume_links_stmt(job_ids))
                     for link in resume_links:
                         resume_links_map.setdefault(link.job_description_id, []).append(link)
                 except Exception as e:
@@ -560,15 +668,7 @@ def list_user_job_descriptions(
             resume_links_map: dict[int, list[JobResumeVersion]] = {}
             if job_ids:
                 try:
-                    resume_links = (
-                        db.query(JobResumeVersion)
-                        .filter(JobResumeVersion.job_description_id.in_(job_ids))
-                        .order_by(
-                            JobResumeVersion.updated_at.desc().nullslast(),
-                            JobResumeVersion.ats_score.desc().nullslast(),
-                        )
-                        .all()
-                    )
+                    resume_links = db.scalars(_job_resume_links_stmt(job_ids))
                     for link in resume_links:
                         resume_links_map.setdefault(link.job_description_id, []).append(
                             link
@@ -578,111 +678,332 @@ def list_user_job_descriptions(
                         f"Failed to load resume links for jobs: {e}", exc_info=True
                     )
 
-        result = []
-        for it in items:
+        return [
+            _job_description_list_item(it, resume_links_map.get(it.id, []))
+            for it in items
+        ]
+    except Exception as e:
+        logger.exception("Failed to list job descriptions")
+        raise HTTPException(status_code=500, detail=str(e)) from e
+
+
+async def list_user_job_descriptions_async(
+    user_email: str | None, db: AsyncSession
+) -> list[dict[str, Any]]:
+    """List job descriptions for a user without blocking the event loop"""
+    try:
+        new_columns_exist = await db.run_sync(_check_new_columns_exist)
+        if not new_columns_exist:
+            # Legacy schema - reuse the raw SQL path on the async connection
+            return await db.run_sync(
+                lambda session: list_user_job_descriptions(user_email, session)
+            )
+
+        user_id = None
+        if user_email:
+            user_id = await db.scalar(select(User.id).where(User.email == user_email))
+            if user_id is None:
+                logger.warning(f"User {user_email} not found in database, returning only jobs with user_id IS NULL")
+        else:
+            logger.warning("No user_email provided - Firebase auth may have failed. Returning jobs with user_id IS NULL only.")
+
+        items = (await db.scalars(_job_list_stmt(user_id))).all()
+        logger.info(f"Found {len(items)} job descriptions for user_email: {user_email}")
+
+        resume_links_map: dict[int, list[JobResumeVersion]] = {}
+        job_ids = [it.id for it in items]
+        if job_ids:
             try:
-                priority_kw = it.priority_keywords
-                if priority_kw is not None:
-                    if isinstance(priority_kw, str):
-                        try:
-                            priority_kw = json.loads(priority_kw)
-                        except Exception:
-                            priority_kw = []
-                    elif not isinstance(priority_kw, list):
-                        priority_kw = []
-
-                resume_links = resume_links_map.get(it.id, [])
-                resume_versions_payload: list[dict[str, Any]] = []
-                best_link_payload: dict[str, Any] | None = None
+                resume_links = await db.scalars(_job_resume_links_stmt(job_ids))
                 for link in resume_links:
-                    link_payload = {
-                        "id": link.id,
-                        "score": link.ats_score or 0,
-                        "resume_id": link.resume_id,
-                        "resume_name": link.resume_name,
-                        "resume_version_id": link.resume_version_id,
-                        "resume_version_label": link.resume_version_label,
-                        "keyword_coverage": link.keyword_coverage,
-                        "matched_keywords": link.matched_keywords or [],
-                        "missing_keywords": link.missing_keywords or [],
-                        "created_at": (
-                            link.created_at.isoformat() if link.created_at else None
-                        ),
-                        "updated_at": (
-                            link.updated_at.isoformat() if link.updated_at else None
-                        ),
-                    }
-                    resume_versions_payload.append(link_payload)
-                    if not best_link_payload or (link_payload["score"] or 0) > (
-                        best_link_payload["score"] or 0
-                    ):
-                        best_link_payload = link_payload
-
-                item_data = {
-                    "id": it.id,
-                    "title": it.title or "",
-                    "company": it.company or "",
-                    "source": it.source or "",
-                    "url": it.url or "",
-                    "easy_apply_url": it.easy_apply_url or "",
-                    "location": it.location or "",
-                    "work_type": it.work_type or "",
-                    "job_type": it.job_type or "",
-                    "created_at": (
-                        it.created_at.isoformat() if it.created_at else None
-                    ),
-                    "priority_keywords": priority_kw or [],
-                    "soft_skills": it.soft_skills or [],
-                    "high_frequency_keywords": it.high_frequency_keywords or [],
-                    "ats_insights": it.ats_insights or {},
-                    "max_salary": getattr(it, "max_salary", None),
-                    "status": getattr(it, "status", "bookmarked"),
-                    "follow_up_date": getattr(it, "follow_up_date", None),
-                    "importance": getattr(it, "importance", 0),
-                    "notes": getattr(it, "notes", None),
-                    "best_resume_version": best_link_payload,
-                    "resume_versions": resume_versions_payload,
-                    "last_match": best_link_payload,
-                    "all_matches": resume_versions_payload,
-                }
-
-                result.append(item_data)
+                    resume_links_map.setdefault(link.job_description_id, []).append(link)
             except Exception as e:
-                logger.error(f"Error processing JD {it.id}: {e}", exc_info=True)
-                result.append(
-                    {
-                        "id": it.id,
-                        "title": it.title or "",
-                        "company": it.company or "",
-                        "source": it.source or "",
-                        "url": it.url or "",
-                        "easy_apply_url": it.easy_apply_url or "",
-                        "location": it.location or "",
-                        "work_type": it.work_type or "",
-                        "job_type": it.job_type or "",
-                        "created_at": (
-                            it.created_at.isoformat() if it.created_at else None
-                        ),
-                        "priority_keywords": [],
-                        "soft_skills": [],
-                        "high_frequency_keywords": [],
-                        "ats_insights": {},
-                        "max_salary": getattr(it, "max_salary", None),
-                        "status": getattr(it, "status", "bookmarked"),
-                        "follow_up_date": getattr(it, "follow_up_date", None),
-                        "importance": getattr(it, "importance", 0),
-                        "notes": getattr(it, "notes", None),
-                        "best_resume_version": None,
-                        "resume_versions": [],
-                        "last_match": None,
-                        "all_matches": [],
-                    }
-                )
+                logger.warning(f"Failed to load resume links for jobs: {e}", exc_info=True)
 
-        return result
+        return [
+            _job_description_list_item(it, resume_links_map.get(it.id, []))
+            for it in items
+        ]
     except Exception as e:
         logger.exception("Failed to list job descriptions")
-        raise HTTPException(status_code=500, detail=str(e))
+        raise HTTPException(status_code=500, detail=str(e)) from e
+
+
+JOB_LIST_PAGE_DEFAULT = 50
+JOB_LIST_PAGE_MAX = 200
+
+
+def encode_job_list_cursor(created_at: datetime | None, jd_id: int) -> str:
+    """Opaque keyset cursor for the job list: ``created_at|id``"""
+    raw = f"{created_at.isoformat() if created_at else ''}|{jd_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_job_list_cursor(cursor: str) -> tuple[datetime | None, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_raw, _, id_raw = base64.urlsafe_b64decode(padded).decode().partition("|")
+        return (datetime.fromisoformat(created_raw) if created_raw else None, int(id_raw))
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from None
+
+
+def _keyset_branches(owner: Any, after: tuple[datetime | None, int] | None, limit: int) -> list:
+    """Keys of one owner's next ``limit + 1`` jobs, newest first with undated jobs last.
+
+    After a dated cursor the rest of the order is the older dated jobs and
+    then every undated one; each is its own range of the index.
+    """
+    ordered = (JobDescription.created_at.desc().nullslast(), JobDescription.id.desc())
+    base = select(JobDescription.id, JobDescription.created_at).where(owner)
+    undated = base.where(JobDescription.created_at.is_(None))
+    if after is None:
+        ranges = [base]
+    elif after[0] is None:
+        ranges = [undated.where(JobDescription.id < after[1])]
+    else:
+        older = base.where(
+            tuple_(JobDescription.created_at, JobDescription.id) < tuple_(after[0], after[1])
+        )
+        ranges = [older, undated]
+    return [stmt.order_by(*ordered).limit(limit + 1).subquery() for stmt in ranges]
+
+
+def _job_list_page_keys(
+    user_email: str | None,
+    after: tuple[datetime | None, int] | None,
+    limit: int,
+):
+    """``(id, created_at)`` of the candidates for a page of the job board.
+
+    A user sees their own jobs and unowned ones. ``user_id = :uid OR user_id
+    IS NULL`` cannot be read in index order, so each owner (and, past a dated
+    cursor, each of the dated and undated ranges) is a separate keyset scan
+    of ``idx_job_descriptions_user_created_nulls_last``, and the short scans
+    are merged with UNION ALL.
+    """
+    branches = _keyset_branches(JobDescription.user_id.is_(None), after, limit)
+    if user_email:
+        user_id = select(User.id).where(User.email == user_email).limit(1).scalar_subquery()
+        branches += _keyset_branches(JobDescription.user_id == user_id, after, limit)
+    if len(branches) == 1:
+        return branches[0]
+    return union_all(*(select(branch.c.id, branch.c.created_at) for branch in branches)).subquery(
+        "page_keys"
+    )
+
+
+def _job_list_page_stmt(
+    user_email: str | None,
+    new_columns_exist: bool,
+    after: tuple[datetime | None, int] | None,
+    limit: int,
+):
+    """One statement for a page of the job board.
+
+    The page's rows are picked by ``_job_list_page_keys`` first, so the
+    per-job subqueries below only run for them. The best resume version per job (highest ATS score, newest first on ties)
+    comes from a LATERAL subquery and the user is resolved in a scalar
+    subquery, so the whole page is a single round trip. Only the columns the
+    list view renders are selected; keyword arrays are left to
+    ``get_job_description_keywords``.
+    """
+    keys = _job_list_page_keys(user_email, after, limit)
+    best = (
+        select(
+            JobResumeVersion.id,
+            JobResumeVersion.ats_score,
+            JobResumeVersion.resume_id,
+            JobResumeVersion.resume_name,
+            JobResumeVersion.resume_version_id,
+            JobResumeVersion.resume_version_label,
+            JobResumeVersion.keyword_coverage,
+            JobResumeVersion.updated_at,
+        )
+        .where(JobResumeVersion.job_description_id == JobDescription.id)
+        .order_by(
+            JobResumeVersion.ats_score.desc().nullslast(),
+            JobResumeVersion.updated_at.desc().nullslast(),
+        )
+        .limit(1)
+        .lateral("best")
+    )
+    version_count = (
+        select(func.count(JobResumeVersion.id))
+        .where(JobResumeVersion.job_description_id == JobDescription.id)
+        .scalar_subquery()
+    )
+    if new_columns_exist:
+        tracking_columns = [
+            JobDescription.max_salary,
+            JobDescription.status,
+            JobDescription.follow_up_date,
+            JobDescription.importance,
+        ]
+    else:
+        tracking_columns = [
+            literal(None).label("max_salary"),
+            literal("bookmarked").label("status"),
+            literal(None).label("follow_up_date"),
+            literal(0).label("importance"),
+        ]
+
+    stmt = (
+        select(
+            JobDescription.id,
+            JobDescription.title,
+            JobDescription.company,
+            JobDescription.source,
+            JobDescription.url,
+            JobDescription.easy_apply_url,
+            JobDescription.location,
+            JobDescription.work_type,
+            JobDescription.job_type,
+            JobDescription.created_at,
+            *tracking_columns,
+            version_count.label("resume_version_count"),
+            best.c.id.label("best_id"),
+            best.c.ats_score.label("best_score"),
+            best.c.resume_id.label("best_resume_id"),
+            best.c.resume_name.label("best_resume_name"),
+            best.c.resume_version_id.label("best_resume_version_id"),
+            best.c.resume_version_label.label("best_resume_version_label"),
+            best.c.keyword_coverage.label("best_keyword_coverage"),
+            best.c.updated_at.label("best_updated_at"),
+        )
+        .select_from(keys)
+        .join(JobDescription, JobDescription.id == keys.c.id)
+        .outerjoin(best, true())
+    )
+
+    return stmt.order_by(keys.c.created_at.desc().nullslast(), keys.c.id.desc()).limit(limit + 1)
+
+
+def _job_list_page_item(row: Any) -> dict[str, Any]:
+    best_link_payload = None
+    if row.best_id is not None:
+        best_link_payload = {
+            "id": row.best_id,
+            "score": row.best_score or 0,
+            "resume_id": row.best_resume_id,
+            "resume_name": row.best_resume_name,
+            "resume_version_id": row.best_resume_version_id,
+            "resume_version_label": row.best_resume_version_label,
+            "keyword_coverage": row.best_keyword_coverage,
+            "updated_at": row.best_updated_at.isoformat() if row.best_updated_at else None,
+        }
+    return {
+        "id": row.id,
+        "title": row.title or "",
+        "company": row.company or "",
+        "source": row.source or "",
+        "url": row.url or "",
+        "easy_apply_url": row.easy_apply_url or "",
+        "location": row.location or "",
+        "work_type": row.work_type or "",
+        "job_type": row.job_type or "",
+        "created_at": row.created_at.isoformat() if row.created_at else None,
+        "max_salary": row.max_salary,
+        "status": row.status or "bookmarked",
+        "follow_up_date": row.follow_up_date,
+        "importance": row.importance or 0,
+        "resume_version_count": row.resume_version_count or 0,
+        "best_resume_version": best_link_payload,
+    }
+
+
+async def list_user_job_descriptions_page(
+    user_email: str | None,
+    db: AsyncSession,
+    cursor: str | None = None,
+    limit: int = JOB_LIST_PAGE_DEFAULT,
+) -> dict[str, Any]:
+    """Keyset-paginated job board listing.
+
+    Returns ``{"items": [...], "next_cursor": str | None}``; pass
+    ``next_cursor`` back as ``cursor`` to fetch the following page.
+    """
+    limit = max(1, min(limit, JOB_LIST_PAGE_MAX))
+    after = decode_job_list_cursor(cursor) if cursor else None
+    try:
+        new_columns_exist = await db.run_sync(_check_new_columns_exist)
+        rows = (
+            await db.execute(_job_list_page_stmt(user_email, new_columns_exist, after, limit))
+        ).all()
+    except Exception as e:
+        logger.exception("Failed to list job descriptions page")
+        raise HTTPException(status_code=500, detail=str(e)) from e
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_job_list_cursor(rows[-1].created_at, rows[-1].id)
+
+    return {
+        "items": [_job_list_page_item(row) for row in rows],
+        "next_cursor": next_cursor,
+    }
+
+
+def get_job_description_keywords(
+    jd_id: int, user_email: str | None, db: Session
+) -> dict[str, Any]:
+    """Full keyword data for one job, loaded lazily by the job board"""
+    user_id = None
+    if user_email:
+        user_id = db.query(User.id).filter(User.email == user_email).scalar()
+
+    jd = (
+        db.query(
+            JobDescription.id,
+            JobDescription.user_id,
+            JobDescription.extracted_keywords,
+            JobDescription.priority_keywords,
+            JobDescription.soft_skills,
+            JobDescription.high_frequency_keywords,
+            JobDescription.ats_insights,
+        )
+        .filter(JobDescription.id == jd_id)
+        .first()
+    )
+    if not jd or (user_id is not None and jd.user_id is not None and jd.user_id != user_id):
+        raise HTTPException(status_code=404, detail="Job description not found")
+
+    links = (
+        db.query(
+            JobResumeVersion.id,
+            JobResumeVersion.ats_score,
+            JobResumeVersion.keyword_coverage,
+            JobResumeVersion.matched_keywords,
+            JobResumeVersion.missing_keywords,
+        )
+        .filter(JobResumeVersion.job_description_id == jd_id)
+        .order_by(
+            JobResumeVersion.updated_at.desc().nullslast(),
+            JobResumeVersion.ats_score.desc().nullslast(),
+        )
+        .all()
+    )
+
+    priority_kw = _normalize_json_field(jd.priority_keywords)
+    return {
+        "id": jd.id,
+        "extracted_keywords": _normalize_json_field(jd.extracted_keywords) or {},
+        "priority_keywords": priority_kw if isinstance(priority_kw, list) else [],
+        "soft_skills": jd.soft_skills or [],
+        "high_frequency_keywords": jd.high_frequency_keywords or [],
+        "ats_insights": jd.ats_insights or {},
+        "resume_versions": [
+            {
+                "id": link.id,
+                "score": link.ats_score or 0,
+                "keyword_coverage": link.keyword_coverage,
+                "matched_keywords": link.matched_keywords or [],
+                "missing_keywords": link.missing_keywords or [],
+            }
+            for link in links
+        ],
+    }
 
 
 def _cover_letter_to_dict(letter: JobCoverLetter) -> dict[str, Any]:
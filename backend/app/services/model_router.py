@@ -0,0 +1,180 @@
+"""Routing of low-stakes AI tasks to a local Ollama-compatible model.
+
+Keyword extraction, section classification for the structured parser and
+bullet polishing are high-volume and forgiving of a smaller model.
+``local_inference_tasks`` lists the tasks sent to the local endpoint, each
+optionally with its own model (``keyword_extraction,bullet_polish=qwen2.5:7b``);
+everything else, and every routed task whose local call is not possible,
+stays on OpenAI.
+
+Call sites build their OpenAI chat completion payload as before and offer it
+to ``model_router.complete_locally`` first. It returns ``None`` (and the
+caller continues to OpenAI) when the task is not routed, the server or model
+is unavailable, the prompt would not fit ``ollama_num_ctx``, or the call
+fails or returns invalid JSON for a JSON-mode payload. Per task, ``stats()``
+reports local calls, fallbacks, latency, tokens and the OpenAI cost the
+local calls avoided.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any
+
+import httpx
+
+from app.core.config import settings
+from app.core.ollama_client import OllamaClient, ollama_client
+
+logger = logging.getLogger(__name__)
+
+LOCAL_TASKS = ("keyword_extraction", "section_classification", "bullet_polish")
+
+# USD per million input / output tokens, for the savings estimate
+OPENAI_PRICES_PER_MTOK = {
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4.1-mini": (0.40, 1.60),
+    "gpt-4.1": (2.00, 8.00),
+}
+
+CHARS_PER_TOKEN = 4
+
+
+@dataclass
+class LocalCompletion:
+    content: str
+    model: str
+    prompt_tokens: int
+    completion_tokens: int
+    latency_ms: float
+
+    @property
+    def tokens_used(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+
+def parse_routing_rules(spec: str, default_model: str) -> dict[str, str]:
+    """``"task,task=model"`` to ``{task: model}``; unknown tasks are ignored with a warning."""
+    rules: dict[str, str] = {}
+    for entry in spec.split(","):
+        task, _, model = entry.strip().partition("=")
+        task = task.strip()
+        if not task:
+            continue
+        if task not in LOCAL_TASKS:
+            logger.warning(f"Ignoring unknown local inference task {task!r}; known: {', '.join(LOCAL_TASKS)}")
+            continue
+        rules[task] = model.strip() or default_model
+    return rules
+
+
+def openai_cost(model: str, prompt_tokens: int, completion_tokens: int) -> float:
+    prices = OPENAI_PRICES_PER_MTOK.get(model)
+    if prices is None:
+        # Dated snapshots ("gpt-4o-mini-2024-07-18") cost the same as their base model
+        base = max((name for name in OPENAI_PRICES_PER_MTOK if model.startswith(name)), key=len, default=None)
+        prices = OPENAI_PRICES_PER_MTOK.get(base, (0.0, 0.0))
+    return (prompt_tokens * prices[0] + completion_tokens * prices[1]) / 1_000_000
+
+
+class ModelRouter:
+    """Sends routed tasks to the local model and keeps per-task accounting."""
+
+    def __init__(self, client: OllamaClient, rules: dict[str, str], num_ctx: int):
+        self.client = client
+        self.rules = rules
+        self.num_ctx = num_ctx
+        self._lock = threading.Lock()
+        self._stats: dict[str, dict[str, float]] = {}
+
+    def routes_locally(self, task: str) -> bool:
+        return task in self.rules
+
+    def _record(self, task: str, **values: float) -> None:
+        with self._lock:
+            stats = self._stats.setdefault(task, {
+                "local_calls": 0, "fallbacks": 0, "unavailable": 0, "oversize": 0,
+                "latency_ms_total": 0.0, "prompt_tokens": 0, "completion_tokens": 0,
+                "openai_cost_avoided_usd": 0.0,
+            })
+            for key, value in values.items():
+                stats[key] += value
+
+    async def complete_locally(self, task: str, data: dict[str, Any]) -> LocalCompletion | None:
+        """Answer an OpenAI chat completion payload locally, or ``None`` to use OpenAI."""
+        model = self.rules.get(task)
+        if model is None:
+            return None
+        if not await self.client.is_available(model):
+            self._record(task, unavailable=1)
+            return None
+
+        messages = [{"role": m["role"], "content": m["content"]} for m in data["messages"]]
+        max_tokens = int(data.get("max_tokens", 500))
+        prompt_estimate = sum(len(m["content"]) for m in messages) // CHARS_PER_TOKEN
+        if prompt_estimate + max_tokens > self.num_ctx:
+            self._record(task, oversize=1)
+            return None
+
+        json_mode = (data.get("response_format") or {}).get("type") == "json_object"
+        started = time.perf_counter()
+        try:
+            result = await self.client.chat(
+                messages,
+                model=model,
+                temperature=data.get("temperature", 0.3),
+                max_tokens=max_tokens,
+                json_mode=json_mode,
+                num_ctx=self.num_ctx,
+            )
+            content = (result.get("message") or {}).get("content", "").strip()
+            if not content:
+                raise ValueError("empty response")
+            if json_mode and not isinstance(json.loads(content), dict):
+                raise ValueError("expected a JSON object")
+        except (httpx.HTTPError, ValueError, AttributeError) as e:
+            if isinstance(e, httpx.TransportError):
+                self.client.mark_unavailable()
+            logger.warning(f"Local {task} with {model} failed, using OpenAI: {e}")
+            self._record(task, fallbacks=1)
+            return None
+
+        completion = LocalCompletion(
+            content=content,
+            model=model,
+            prompt_tokens=int(result.get("prompt_eval_count") or prompt_estimate),
+            completion_tokens=int(result.get("eval_count") or len(content) // CHARS_PER_TOKEN),
+            latency_ms=(time.perf_counter() - started) * 1000,
+        )
+        self._record(
+            task,
+            local_calls=1,
+            latency_ms_total=completion.latency_ms,
+            prompt_tokens=completion.prompt_tokens,
+            completion_tokens=completion.completion_tokens,
+            openai_cost_avoided_usd=openai_cost(
+                data.get("model", ""), completion.prompt_tokens, completion.completion_tokens
+            ),
+        )
+        return completion
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            tasks = {task: dict(values) for task, values in self._stats.items()}
+        for values in tasks.values():
+            calls = values["local_calls"]
+            values["avg_latency_ms"] = round(values["latency_ms_total"] / calls, 1) if calls else 0.0
+            values["openai_cost_avoided_usd"] = round(values["openai_cost_avoided_usd"], 6)
+        return {"rules": dict(self.rules), "server": self.client.status(), "tasks": tasks}
+
+
+model_router = ModelRouter(
+    ollama_client,
+    parse_routing_rules(settings.local_inference_tasks, settings.ollama_model),
+    num_ctx=settings.ollama_num_ctx,
+)
@@ -0,0 +1,414 @@
+"""Background queue for resume parses with stage-level progress.
+
+``POST /api/resume/parse-jobs`` stores the upload and returns a job id
+straight away; a bounded pool of worker tasks runs ``parse_resume`` and
+records each stage it reports (extracting, analyzing_layout, ai_parsing,
+validating). Clients poll ``GET /api/resume/parse-jobs/{id}`` or stream the
+stages over SSE from ``/events``. Finished jobs are kept for
+``parse_job_ttl_seconds``.
+
+``parse_job_backend`` selects the store:
+
+* ``memory``: a dict and an ``asyncio.Queue`` in this process (single worker);
+* ``database``: the ``resume_parse_jobs`` table. Workers in every process
+  claim queued rows with ``FOR UPDATE SKIP LOCKED`` and any process can serve
+  a job's status, so Postgres stands in for a broker in multi-worker
+  deployments.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import uuid
+from collections.abc import AsyncIterator
+from datetime import datetime, timedelta
+from typing import Any
+
+from app.core.config import settings
+from app.services.resume_parsing import parse_resume
+from app.services.resume_parsing.progress import progress_reporter
+
+logger = logging.getLogger(__name__)
+
+FINISHED_STATUSES = ("done", "failed")
+# How often database workers look for queued jobs and SSE streams re-read a job
+POLL_INTERVAL_SECONDS = 0.5
+PURGE_INTERVAL = timedelta(minutes=1)
+SSE_KEEPALIVE_SECONDS = 15.0
+
+
+class ParseQueueFull(Exception):
+    """Raised when ``parse_job_max_pending`` jobs are already waiting."""
+
+
+def _now() -> datetime:
+    return datetime.utcnow()
+
+
+def _stage_event(stage: str) -> dict[str, str]:
+    return {"stage": stage, "at": _now().isoformat()}
+
+
+def _public_job(job: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "job_id": job["id"],
+        "status": job["status"],
+        "stage": job["stages"][-1]["stage"] if job["stages"] else "queued",
+        "stages": job["stages"],
+        "filename": job["filename"],
+        "created_at": job["created_at"].isoformat(),
+        "result": job.get("result"),
+        "error": job.get("error"),
+    }
+
+
+class MemoryJobStore:
+    """Jobs for a single process."""
+
+    def __init__(self, max_pending: int, ttl: timedelta):
+        self.ttl = ttl
+        self._jobs: dict[str, dict[str, Any]] = {}
+        self._files: dict[str, tuple[bytes, bool]] = {}
+        self._queue: asyncio.Queue[str] = asyncio.Queue(maxsize=max_pending)
+
+    async def create(self, filename: str, file_bytes: bytes, bypass_cache: bool) -> dict[str, Any]:
+        job_id = str(uuid.uuid4())
+        try:
+            self._queue.put_nowait(job_id)
+        except asyncio.QueueFull:
+            raise ParseQueueFull() from None
+        job = {
+            "id": job_id,
+            "status": "queued",
+            "stages": [_stage_event("queued")],
+            "filename": filename,
+            "created_at": _now(),
+            "expires_at": _now() + self.ttl,
+        }
+        self._jobs[job_id] = job
+        self._files[job_id] = (file_bytes, bypass_cache)
+        return dict(job)
+
+    async def claim(self) -> dict[str, Any] | None:
+        job_id = await self._queue.get()
+        job = self._jobs.get(job_id)
+        if job is None:
+            return None
+        job["status"] = "running"
+        file_bytes, bypass_cache = self._files.pop(job_id)
+        return {**job, "file_bytes": file_bytes, "bypass_cache": bypass_cache}
+
+    async def update(
+        self,
+        job_id: str,
+        status: str,
+        stages: list[dict[str, str]],
+        result: dict[str, Any] | None = None,
+        error: str | None = None,
+    ) -> None:
+        job = self._jobs.get(job_id)
+        if job is None:
+            return
+        job.update(status=status, stages=stages, result=result, error=error)
+        if status in FINISHED_STATUSES:
+            job["expires_at"] = _now() + self.ttl
+
+    async def get(self, job_id: str) -> dict[str, Any] | None:
+        job = self._jobs.get(job_id)
+        if job is None or job["expires_at"] <= _now():
+            return None
+        return dict(job)
+
+    async def purge_expired(self) -> None:
+        now = _now()
+        for job_id in [job_id for job_id, job in self._jobs.items() if job["expires_at"] <= now]:
+            del self._jobs[job_id]
+            self._files.pop(job_id, None)
+
+
+class DatabaseJobStore:
+    """Jobs in ``resume_parse_jobs``, shared by every process."""
+
+    def __init__(self, max_pending: int, ttl: timedelta, stale_after: timedelta):
+        self.max_pending = max_pending
+        self.ttl = ttl
+        self.stale_after = stale_after
+
+    @staticmethod
+    def _as_dict(row: Any) -> dict[str, Any]:
+        return {
+            "id": row.id,
+            "status": row.status,
+            "stages": list(row.stages or []),
+            "filename": row.filename,
+            "created_at": row.created_at,
+            "expires_at": row.expires_at,
+            "result": row.result,
+            "error": row.error,
+        }
+
+    def _create(self, filename: str, file_bytes: bytes, bypass_cache: bool) -> dict[str, Any]:
+        from app.core.db import SessionLocal
+        from app.models.parse_job import ResumeParseJob
+
+        db = SessionLocal()
+        try:
+            pending = db.query(ResumeParseJob).filter(ResumeParseJob.status == "queued").count()
+            if pending >= self.max_pending:
+                raise ParseQueueFull()
+            now = _now()
+            row = ResumeParseJob(
+                id=str(uuid.uuid4()),
+                status="queued",
+                stage="queued",
+                stages=[_stage_event("queued")],
+                filename=filename,
+                file_bytes=file_bytes,
+                bypass_cache=bypass_cache,
+                created_at=now,
+                updated_at=now,
+                expires_at=now + self.ttl,
+            )
+            db.add(row)
+            db.commit()
+            return self._as_dict(row)
+        finally:
+            db.close()
+
+    def _claim(self) -> dict[str, Any] | None:
+        from app.core.db import SessionLocal
+        from app.models.parse_job import ResumeParseJob
+
+        db = SessionLocal()
+        try:
+            row = (
+                db.query(ResumeParseJob)
+                .filter(ResumeParseJob.status == "queued")
+                .order_by(ResumeParseJob.created_at)
+                .with_for_update(skip_locked=True)
+                .first()
+            )
+            if row is None:
+                return None
+            row.status = "running"
+            row.updated_at = _now()
+            job = {**self._as_dict(row), "file_bytes": row.file_bytes, "bypass_cache": row.bypass_cache}
+            db.commit()
+            return job
+        finally:
+            db.close()
+
+    def _update(
+        self,
+        job_id: str,
+        status: str,
+        stages: list[dict[str, str]],
+        result: dict[str, Any] | None,
+        error: str | None,
+    ) -> None:
+        from app.core.db import SessionLocal
+        from app.models.parse_job import ResumeParseJob
+
+        now = _now()
+        values: dict[str, Any] = {
+            "status": status,
+            "stage": stages[-1]["stage"],
+            "stages": stages,
+            "updated_at": now,
+        }
+        if status in FINISHED_STATUSES:
+            values.update(result=result, error=error, file_bytes=None, expires_at=now + self.ttl)
+        db = SessionLocal()
+        try:
+            db.query(ResumeParseJob).filter(ResumeParseJob.id == job_id).update(values)
+            db.commit()
+        finally:
+            db.close()
+
+    def _get(self, job_id: str) -> dict[str, Any] | None:
+        from app.core.db import SessionLocal
+        from app.models.parse_job import ResumeParseJob
+
+        db = SessionLocal()
+        try:
+            row = (
+                db.query(ResumeParseJob)
+                .filter(ResumeParseJob.id == job_id, ResumeParseJob.expires_at > _now())
+                .first()
+            )
+            return self._as_dict(row) if row is not None else None
+        finally:
+            db.close()
+
+    def _purge_expired(self) -> None:
+        from app.core.db import SessionLocal
+        from app.models.parse_job import ResumeParseJob
+
+        now = _now()
+        db = SessionLocal()
+        try:
+            db.query(ResumeParseJob).filter(ResumeParseJob.expires_at <= now).delete()
+            # Requeue jobs whose worker died mid-parse
+            db.query(ResumeParseJob).filter(
+                ResumeParseJob.status == "running",
+                ResumeParseJob.updated_at < now - self.stale_after,
+            ).update({"status": "queued", "updated_at": now})
+            db.commit()
+        finally:
+            db.close()
+
+    async def create(self, filename: str, file_bytes: bytes, bypass_cache: bool) -> dict[str, Any]:
+        return await asyncio.to_thread(self._create, filename, file_bytes, bypass_cache)
+
+    async def claim(self) -> dict[str, Any] | None:
+        job = await asyncio.to_thread(self._claim)
+        if job is None:
+            await asyncio.sleep(POLL_INTERVAL_SECONDS)
+        return job
+
+    async def update(
+        self,
+        job_id: str,
+        status: str,
+        stages: list[dict[str, str]],
+        result: dict[str, Any] | None = None,
+        error: str | None = None,
+    ) -> None:
+        await asyncio.to_thread(self._update, job_id, status, stages, result, error)
+
+    async def get(self, job_id: str) -> dict[str, Any] | None:
+        return await asyncio.to_thread(self._get, job_id)
+
+    async def purge_expired(self) -> None:
+        await asyncio.to_thread(self._purge_expired)
+
+
+class ParseJobQueue:
+    """Bounded pool of worker tasks draining a job store."""
+
+    def __init__(self, store: MemoryJobStore | DatabaseJobStore, workers: int):
+        self.store = store
+        self.workers = workers
+        self._tasks: list[asyncio.Task] = []
+
+    def start(self) -> None:
+        if not self._tasks:
+            self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+            self._tasks.append(asyncio.create_task(self._purger()))
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def submit(self, filename: str, file_bytes: bytes, bypass_cache: bool = False) -> dict[str, Any]:
+        job = await self.store.create(filename, file_bytes, bypass_cache)
+        logger.info(f"Queued parse job {job['id']} for {filename}")
+        return _public_job(job)
+
+    async def get(self, job_id: str) -> dict[str, Any] | None:
+        job = await self.store.get(job_id)
+        return _public_job(job) if job is not None else None
+
+    async def _worker(self) -> None:
+        while True:
+            try:
+                job = await self.store.claim()
+                if job is not None:
+                    await self._run(job)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Parse job worker error: {e}", exc_info=True)
+                await asyncio.sleep(POLL_INTERVAL_SECONDS)
+
+    async def _purger(self) -> None:
+        while True:
+            await asyncio.sleep(PURGE_INTERVAL.total_seconds())
+            try:
+                await self.store.purge_expired()
+            except Exception as e:
+                logger.warning(f"Parse job purge failed: {e}")
+
+    async def _run(self, job: dict[str, Any]) -> None:
+        job_id = job["id"]
+        stages = list(job["stages"])
+        changed = asyncio.Event()
+        finished = False
+
+        def on_stage(stage: str) -> None:
+            stages.append(_stage_event(stage))
+            changed.set()
+
+        async def flush_stages() -> None:
+            # Serializes progress writes so a late write never overwrites the final one
+            while True:
+                await changed.wait()
+                changed.clear()
+                if finished:
+                    return
+                await self.store.update(job_id, "running", list(stages))
+
+        flusher = asyncio.create_task(flush_stages())
+        result = error = None
+        try:
+            with progress_reporter(on_stage):
+                result = await parse_resume(
+                    job["file_bytes"], job["filename"], bypass_cache=job["bypass_cache"]
+                )
+            if not result.get("success"):
+                error = result.get("error", "Failed to parse resume")
+        except Exception as e:
+            logger.error(f"Parse job {job_id} failed: {e}", exc_info=True)
+            error = str(e)
+        finally:
+            finished = True
+            changed.set()
+            await flusher
+
+        stages.append(_stage_event("failed" if error else "done"))
+        await self.store.update(job_id, "failed" if error else "done", stages, result, error)
+        logger.info(f"Parse job {job_id} {'failed' if error else 'done'}")
+
+    async def events(self, job_id: str) -> AsyncIterator[str]:
+        """Server-sent events: one ``stage`` event per stage, then ``done`` or ``failed``."""
+        sent = 0
+        idle = 0.0
+        while True:
+            job = await self.get(job_id)
+            if job is None:
+                yield f"event: failed\ndata: {json.dumps({'error': 'Job not found or expired'})}\n\n"
+                return
+            for stage in job["stages"][sent:]:
+                yield f"event: stage\ndata: {json.dumps(stage)}\n\n"
+                idle = 0.0
+            sent = len(job["stages"])
+            if job["status"] in FINISHED_STATUSES:
+                yield f"event: {job['status']}\ndata: {json.dumps(job, default=str)}\n\n"
+                return
+            if idle >= SSE_KEEPALIVE_SECONDS:
+                yield ": keepalive\n\n"
+                idle = 0.0
+            await asyncio.sleep(POLL_INTERVAL_SECONDS)
+            idle += POLL_INTERVAL_SECONDS
+
+
+_parse_job_queue: ParseJobQueue | None = None
+
+
+def get_parse_job_queue() -> ParseJobQueue:
+    global _parse_job_queue
+    if _parse_job_queue is None:
+        ttl = timedelta(seconds=settings.parse_job_ttl_seconds)
+        if settings.parse_job_backend == "database":
+            stale_after = timedelta(seconds=settings.max_parsing_time_seconds * 3)
+            store = DatabaseJobStore(settings.parse_job_max_pending, ttl, stale_after)
+        elif settings.parse_job_backend == "memory":
+            store = MemoryJobStore(settings.parse_job_max_pending, ttl)
+        else:
+            raise ValueError(f"Unknown PARSE_JOB_BACKEND: {settings.parse_job_backend}")
+        _parse_job_queue = ParseJobQueue(store, settings.parse_job_workers)
+    return _parse_job_queue
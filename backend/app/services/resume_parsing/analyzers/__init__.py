@@ -1,8 +1,10 @@
 """Analyzers for layout analysis and complexity scoring."""
 from .complexity_scorer import calculate_complexity_score
 from .layout_analyzer import analyze_layout
+from .region_router import route_regions
 
 __all__ = [
     'analyze_layout',
     'calculate_complexity_score',
+    'route_regions',
 ]
@@ -5,6 +5,10 @@ from __future__ import annotations
 import logging
 from typing import Any
 
+import numpy as np
+
+from ..extractors.page_words import PageWords
+
 logger = logging.getLogger(__name__)
 
 
@@ -80,12 +84,10 @@ def calculate_complexity_score(
     font_sizes = []
     if file_type == 'pdf':
         pages = extracted_data.get('pages', [])
-        for page in pages:
-            words = page.get('words', [])
-            for word in words:
-                size = word.get('size', 0)
-                if size > 0:
-                    font_sizes.append(size)
+        page_sizes = [PageWords.coerce(page.get('words')).size for page in pages]
+        if page_sizes:
+            sizes = np.concatenate(page_sizes)
+            font_sizes = sizes[sizes > 0].astype(np.float64)
     elif file_type == 'docx':
         paragraphs = extracted_data.get('paragraphs', [])
         for para in paragraphs:
@@ -93,28 +95,15 @@ def calculate_complexity_score(
             if size > 0:
                 font_sizes.append(size)
 
-    if font_sizes:
-        try:
-            import numpy as np
-            variance = np.var(font_sizes)
-            std_dev = np.std(font_sizes)
-            mean_size = np.mean(font_sizes)
-            
-            # High variance indicates mixed font sizes
-            coefficient_of_variation = std_dev / mean_size if mean_size > 0 else 0
-            if coefficient_of_variation > 0.3:  # More than 30% variation
-                factors['font_variance'] = float(coefficient_of_variation)
-                score += 0.15
-        except ImportError:
-            # Simple variance calculation without numpy
-            if len(font_sizes) > 1:
-                mean = sum(font_sizes) / len(font_sizes)
-                variance = sum((x - mean) ** 2 for x in font_sizes) / len(font_sizes)
-                std_dev = variance ** 0.5
-                coefficient_of_variation = std_dev / mean if mean > 0 else 0
-                factors['font_variance'] = float(coefficient_of_variation)
-                if coefficient_of_variation > 0.3:
-                    score += 0.15
+    if len(font_sizes):
+        std_dev = np.std(font_sizes)
+        mean_size = np.mean(font_sizes)
+
+        # High variance indicates mixed font sizes
+        coefficient_of_variation = std_dev / mean_size if mean_size > 0 else 0
+        if coefficient_of_variation > 0.3:  # More than 30% variation
+            factors['font_variance'] = float(coefficient_of_variation)
+            score += 0.15
 
     # Check for non-standard layout (many headers, complex structure)
     headers = layout_data.get('headers', [])
@@ -5,6 +5,10 @@ from __future__ import annotations
 import logging
 from typing import Any
 
+import numpy as np
+
+from ..extractors.page_words import PageWords
+
 logger = logging.getLogger(__name__)
 
 
@@ -44,13 +48,6 @@ def analyze_layout(extracted_data: dict[str, Any], file_type: str) -> dict[str,
             'reading_order': [list of block indices in correct order]
         }
     """
-    try:
-        from sklearn.cluster import DBSCAN
-        import numpy as np
-    except ImportError:
-        logger.warning("scikit-learn not available, using simplified layout analysis")
-        return _analyze_layout_simple(extracted_data, file_type)
-
     if file_type == 'pdf':
         return _analyze_pdf_layout(extracted_data)
     elif file_type == 'docx':
@@ -59,11 +56,118 @@ def analyze_layout(extracted_data: dict[str, Any], file_type: str) -> dict[str,
         return _analyze_layout_simple(extracted_data, file_type)
 
 
+# Column detection parameters (formerly DBSCAN eps / min_samples)
+COLUMN_GAP = 50.0
+COLUMN_MIN_WORDS = 5
+# Words whose top is within this distance of the block's top or bottom join it
+LINE_TOLERANCE = 5.0
+
+
+def detect_column_regions(
+    x0: np.ndarray,
+    x1: np.ndarray,
+    gap: float = COLUMN_GAP,
+    min_words: int = COLUMN_MIN_WORDS,
+) -> list[tuple[float, float]]:
+    """Find column x-ranges from word left edges.
+
+    Same clusters as ``DBSCAN(eps=gap, min_samples=min_words)`` on 1-D data,
+    computed on the sorted coordinates: a word is a core word when at least
+    ``min_words`` left edges (itself included) lie within ``gap`` of it, core
+    words split into columns wherever consecutive ones are more than ``gap``
+    apart, and other words within ``gap`` of a core word join the nearest
+    column (left one on ties) instead of whichever DBSCAN happened to reach
+    first. Returns ``(min x0, max x1)`` per column, left to right.
+    """
+    if len(x0) == 0:
+        return []
+    order = np.argsort(x0, kind='stable')
+    xs = x0[order]
+    counts = np.searchsorted(xs, xs + gap, side='right') - np.searchsorted(xs, xs - gap, side='left')
+    core = counts >= min_words
+    if not core.any():
+        return []
+
+    core_x = xs[core]
+    core_labels = np.concatenate(([0], np.cumsum(np.diff(core_x) > gap)))
+    labels = np.full(len(xs), -1, dtype=np.int64)
+    labels[core] = core_labels
+
+    border = np.flatnonzero(~core)
+    if len(border):
+        bx = xs[border]
+        right = np.searchsorted(core_x, bx, side='left')
+        left = right - 1
+        left_dist = np.where(left >= 0, bx - core_x[np.maximum(left, 0)], np.inf)
+        right_dist = np.where(right < len(core_x), core_x[np.minimum(right, len(core_x) - 1)] - bx, np.inf)
+        use_left = left_dist <= right_dist
+        nearest = np.where(use_left, left, right)
+        within = np.minimum(left_dist, right_dist) <= gap
+        labels[border[within]] = core_labels[nearest[within]]
+
+    members = labels >= 0
+    member_labels = labels[members]
+    column_count = int(core_labels[-1]) + 1
+    starts = np.full(column_count, np.inf)
+    ends = np.full(column_count, -np.inf)
+    np.minimum.at(starts, member_labels, xs[members])
+    np.maximum.at(ends, member_labels, x1[order][members])
+    return [(float(start), float(end)) for start, end in zip(starts, ends, strict=True)]
+
+
+def build_line_blocks(
+    words: PageWords, tolerance: float = LINE_TOLERANCE
+) -> list[tuple[list[int], tuple[float, float, float, float]]]:
+    """Group words into blocks of nearby lines.
+
+    Words are visited in (y0, x0) order. A word joins the current block when
+    its top is within ``tolerance`` of the block's top or of its bottom (the
+    running max of y1); otherwise it starts a new block. Words sharing the
+    block's first line are taken in one ``searchsorted`` step and the rest in
+    vectorized runs, so the Python loop is per block rather than per word.
+
+    Returns ``(word indices in reading order, bbox)`` per block.
+    """
+    n = len(words)
+    if not n:
+        return []
+    order = np.lexsort((words.x0, words.y0))
+    ys0 = words.y0[order]
+    ys1 = words.y1[order]
+    xs0 = words.x0[order]
+    xs1 = words.x1[order]
+
+    blocks = []
+    start = 0
+    while start < n:
+        block_top = ys0[start]
+        end = int(np.searchsorted(ys0, block_top + tolerance, side='left'))
+        end = max(end, start + 1)
+        bottom = ys1[start:end].max()
+        while end < n:
+            # Running bottom before each candidate joins
+            window = slice(end, min(n, end + 64))
+            running = np.maximum.accumulate(np.concatenate(([bottom], ys1[window])))[:-1]
+            joins = np.abs(ys0[window] - running) < tolerance
+            taken = int(np.argmin(joins)) if not joins.all() else len(joins)
+            if taken:
+                bottom = max(bottom, ys1[end:end + taken].max())
+                end += taken
+            if taken < len(joins) or end >= n:
+                break
+        bbox = (
+            float(xs0[start:end].min()),
+            float(block_top),
+            float(xs1[start:end].max()),
+            float(bottom),
+        )
+        blocks.append((order[start:end].tolist(), bbox))
+        start = end
+    return blocks
+
+
 def _analyze_pdf_layout(pdf_data: dict[str, Any]) -> dict[str, Any]:
     """Analyze PDF layout using word positions."""
-    from sklearn.cluster import DBSCAN
-    import numpy as np
-
     columns = []
     headers = []
     blocks = []
@@ -71,28 +175,18 @@ def _analyze_pdf_layout(pdf_data: dict[str, Any]) -> dict[str, Any]:
 
     for page_data in pdf_data.get('pages', []):
         page_num = page_data['page_num']
-        words = page_data.get('words', [])
+        words = PageWords.coerce(page_data.get('words'))
 
-        if not words:
+        if not len(words):
             continue
 
-        # Column detection: cluster x-coordinates
-        x_coords = np.array([[word['x0']] for word in words])
-        if len(x_coords) > 1:
-            clustering = DBSCAN(eps=50, min_samples=5).fit(x_coords)
-            unique_labels = set(clustering.labels_)
-            unique_labels.discard(-1)  # Remove noise
-
-            column_regions = []
-            for label in unique_labels:
-                cluster_xs = [words[i]['x0'] for i, l in enumerate(clustering.labels_) if l == label]
-                if cluster_xs:
-                    x_start = min(cluster_xs)
-                    x_end = max([words[i]['x1'] for i, l in enumerate(clustering.labels_) if l == label])
-                    column_regions.append((x_start, x_end))
+        texts = words.texts()
+
+        # Column detection: 1-D density clustering of x-coordinates
+        if len(words) > 1:
+            column_regions = detect_column_regions(words.x0, words.x1)
 
             if column_regions:
-                column_regions.sort(key=lambda x: x[0])
                 columns.append({
                     'page': page_num,
                     'regions': column_regions
@@ -104,74 +198,47 @@ def _analyze_pdf_layout(pdf_data: dict[str, Any]) -> dict[str, Any]:
                     'regions': [(0, 1000)]  # Default width
                 })
 
-        # Section header detection
-        font_sizes = [word.get('size', 0) for word in words if word.get('size', 0) > 0]
-        avg_font_size = np.mean(font_sizes) if font_sizes else 10
-
-        for word in words:
-            font_size = word.get('size', 0)
-            text = word.get('text', '').strip()
+        # Section header detection: larger font or ALL CAPS
+        sized = words.size[words.size > 0]
+        avg_font_size = float(sized.mean()) if len(sized) else 10.0
+        is_large = words.size > avg_font_size * 1.2
+        is_level_one = words.size > avg_font_size * 1.5
 
-            # Header indicators: larger font, ALL CAPS, bold
+        for index, raw_text in enumerate(texts):
+            text = raw_text.strip()
             if text and len(text) < 50:
-                is_large = font_size > avg_font_size * 1.2
                 is_all_caps = text.isupper() and len(text.split()) <= 5
-                
-                if is_large or is_all_caps:
+
+                if is_large[index] or is_all_caps:
                     headers.append({
                         'text': text,
-                        'position': (word['x0'], word['y0']),
+                        'position': (float(words.x0[index]), float(words.y0[index])),
                         'page': page_num,
-                        'level': 1 if font_size > avg_font_size * 1.5 else 2
+                        'level': 1 if is_level_one[index] else 2
                     })
 
-        # Text block grouping
-        current_block = None
-        for word in sorted(words, key=lambda w: (w['y0'], w['x0'])):
-            if current_block is None:
-                current_block = {
-                    'text': word['text'],
-                    'bbox': (word['x0'], word['y0'], word['x1'], word['y1']),
-                    'page': page_num,
-                    'column': 0  # Will be determined by x position
-                }
-            else:
-                # Check if word belongs to current block (same line or nearby)
-                block_y0, block_y1 = current_block['bbox'][1], current_block['bbox'][3]
-                word_y = word['y0']
-                
-                if abs(word_y - block_y0) < 5 or abs(word_y - block_y1) < 5:
-                    # Same line or very close - add to block
-                    current_block['text'] += ' ' + word['text']
-                    current_block['bbox'] = (
-                        min(current_block['bbox'][0], word['x0']),
-                        min(current_block['bbox'][1], word['y0']),
-                        max(current_block['bbox'][2], word['x1']),
-                        max(current_block['bbox'][3], word['y1'])
-                    )
-                else:
-                    # New block
-                    blocks.append(current_block)
-                    current_block = {
-                        'text': word['text'],
-                        'bbox': (word['x0'], word['y0'], word['x1'], word['y1']),
-                        'page': page_num,
-                        'column': 0
-                    }
-
-        if current_block:
-            blocks.append(current_block)
-
-        # Determine column for each block
+        # Text block grouping in (y0, x0) order
+        page_blocks = [
+            {
+                'text': ' '.join(texts[index] for index in members),
+                'bbox': bbox,
+                'page': page_num,
+                'column': 0  # Will be determined by x position
+            }
+            for members, bbox in build_line_blocks(words)
+        ]
+
+        # Determine column for each block on this page
         page_columns = next((c for c in columns if c['page'] == page_num), None)
         if page_columns:
-            for block in blocks:
-                if block['page'] == page_num:
-                    block_x = block['bbox'][0]
-                    for col_idx, (x_start, x_end) in enumerate(page_columns['regions']):
-                        if x_start <= block_x <= x_end:
-                            block['column'] = col_idx
-                            break
+            for block in page_blocks:
+                block_x = block['bbox'][0]
+                for col_idx, (x_start, x_end) in enumerate(page_columns['regions']):
+                    if x_start <= block_x <= x_end:
+                        block['column'] = col_idx
+                        break
+
+        blocks.extend(page_blocks)
 
     # Reading order: sort by page, then by y (top to bottom), then by x (left to right)
     reading_order = sorted(
@@ -0,0 +1,142 @@
+"""Split a PDF into layout regions and route each to the text or vision path."""
+
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+import numpy as np
+
+from ..extractors.page_words import PageWords
+from ..validators.confidence_scorer import score_region
+from .layout_analyzer import build_line_blocks
+
+logger = logging.getLogger(__name__)
+
+# Column regions closer than this (in points) are one column split by the
+# detector (e.g. right-aligned dates), not separate columns
+MIN_GUTTER = 12.0
+# Images smaller than this (in square points) are icons/bullets, not content
+MIN_GRAPHIC_AREA = 2500.0
+
+
+def _merge_columns(column_regions: list[tuple[float, float]]) -> list[tuple[float, float]]:
+    merged: list[tuple[float, float]] = []
+    for start, end in sorted(column_regions):
+        if merged and start - merged[-1][1] < MIN_GUTTER:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def _assign_columns(words: PageWords, column_regions: list[tuple[float, float]]) -> np.ndarray:
+    """Column index per word: the column containing its left edge, else the nearest start."""
+    starts = np.array([start for start, _ in column_regions], dtype=np.float32)
+    return np.clip(np.searchsorted(starts, words.x0, side='right') - 1, 0, len(starts) - 1)
+
+
+def _image_boxes(page: dict[str, Any]) -> list[tuple[float, float, float, float]]:
+    boxes = []
+    for image in page.get('images', []):
+        try:
+            boxes.append((
+                float(image['x0']), float(image['top']), float(image['x1']), float(image['bottom'])
+            ))
+        except (KeyError, TypeError, ValueError):
+            continue
+    return boxes
+
+
+def route_regions(
+    extracted_data: dict[str, Any],
+    layout_data: dict[str, Any],
+    min_confidence: float,
+) -> list[dict[str, Any]]:
+    """
+    Build one region per (page, column) from the layout columns, group its
+    words into blocks with ``build_line_blocks`` (blocks from
+    ``analyze_layout`` can straddle columns that share a baseline), score it
+    with ``score_region`` and route it to 'text' or 'vision'. Large images
+    outside every text region become 'graphic' regions routed to vision.
+
+    Returns regions in reading order (page, top, left):
+        [
+            {
+                'page': int,
+                'column': int,            # -1 for graphics
+                'kind': 'text' | 'graphic',
+                'bbox': (x0, y0, x1, y1),
+                'text': str,              # blocks joined top to bottom
+                'confidence': float,
+                'issues': [str],
+                'route': 'text' | 'vision'
+            }
+        ]
+    """
+    page_columns = {
+        column['page']: column.get('regions', []) for column in layout_data.get('columns', [])
+    }
+    regions = []
+
+    for page in extracted_data.get('pages', []):
+        page_num = page['page_num']
+        words = PageWords.coerce(page.get('words'))
+        if not len(words):
+            continue
+        image_boxes = _image_boxes(page)
+        column_regions = _merge_columns(page_columns.get(page_num) or [(0.0, float(words.x1.max()))])
+        columns = _assign_columns(words, column_regions)
+
+        for column in range(len(column_regions)):
+            column_words = words.select(np.flatnonzero(columns == column))
+            if not len(column_words):
+                continue
+            texts = column_words.texts()
+            blocks = [
+                {'text': ' '.join(texts[index] for index in members), 'bbox': bbox}
+                for members, bbox in build_line_blocks(column_words)
+            ]
+            bbox = (
+                float(column_words.x0.min()),
+                float(column_words.y0.min()),
+                float(column_words.x1.max()),
+                float(column_words.y1.max()),
+            )
+            confidence, issues = score_region(blocks, bbox, page.get('width', 0.0), image_boxes)
+            regions.append({
+                'page': page_num,
+                'column': column,
+                'kind': 'text',
+                'bbox': bbox,
+                'text': '\n'.join(block['text'] for block in blocks),
+                'confidence': confidence,
+                'issues': issues,
+                'route': 'text' if confidence >= min_confidence else 'vision',
+            })
+
+        covered = [region['bbox'] for region in regions if region['page'] == page_num]
+        for box in image_boxes:
+            x0, y0, x1, y1 = box
+            if (x1 - x0) * (y1 - y0) < MIN_GRAPHIC_AREA:
+                continue
+            if any(
+                cx0 <= x0 and cy0 <= y0 and x1 <= cx1 and y1 <= cy1
+                for cx0, cy0, cx1, cy1 in covered
+            ):
+                continue
+            regions.append({
+                'page': page_num,
+                'column': -1,
+                'kind': 'graphic',
+                'bbox': box,
+                'text': '',
+                'confidence': 0.0,
+                'issues': ['Image outside text regions'],
+                'route': 'vision',
+            })
+
+    regions.sort(key=lambda region: (region['page'], region['bbox'][1], region['bbox'][0]))
+    vision_count = sum(1 for region in regions if region['route'] == 'vision')
+    logger.info(f"Region routing: {len(regions) - vision_count} text, {vision_count} vision")
+    return regions
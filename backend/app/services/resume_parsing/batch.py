@@ -0,0 +1,351 @@
+"""Concurrent parsing of many resumes for batch import.
+
+Uploads (single files or zip archives) are expanded and deduplicated by the
+SHA-256 of their bytes. Each unique file is extracted in a process pool
+(``batch_parse_extraction_workers``) and then handed to ``parse_resume``
+while holding one of ``batch_parse_ai_concurrency`` slots, shared by every
+batch in the worker, so the next file's extraction overlaps the AI calls of
+the files before it. ``parse_batch`` yields one result per uploaded file as
+soon as it finishes and ends with a summary of aggregate throughput.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+import zipfile
+from collections.abc import AsyncIterator
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass
+from io import BytesIO
+from pathlib import PurePosixPath
+from typing import Any, BinaryIO
+
+from app.core.config import settings
+
+from .cache import cache_key, parse_cache
+from .orchestrator import _detect_file_type, extract_document, parse_resume
+
+logger = logging.getLogger(__name__)
+
+MAX_FILE_BYTES = 10 * 1024 * 1024
+SUPPORTED_EXTENSIONS = ('.pdf', '.docx', '.doc')
+
+_extraction_pool: Executor | None = None
+_ai_slots: asyncio.Semaphore | None = None
+
+
+@dataclass
+class BatchFile:
+    """One resume in a batch; ``error`` is set when it was rejected before parsing."""
+
+    filename: str
+    content: bytes = b""
+    error: str | None = None
+
+
+class BatchTooLarge(Exception):
+    """The upload holds more files or bytes than one batch may."""
+
+
+class _BatchBudget:
+    """File and byte allowance for one batch, checked before anything is read."""
+
+    def __init__(self, max_files: int | None, max_bytes: int | None):
+        self.max_files = max_files
+        self.max_bytes = max_bytes
+        self.files = 0
+        self.bytes = 0
+
+    def add_files(self, count: int) -> None:
+        self.files += count
+        if self.max_files is not None and self.files > self.max_files:
+            raise BatchTooLarge(f"Too many files. Maximum is {self.max_files} per batch")
+
+    def check_bytes(self, size: int) -> None:
+        """Reject when ``size`` more bytes (declared or read) would pass the byte budget."""
+        if self.max_bytes is not None and self.bytes + size > self.max_bytes:
+            limit_mb = self.max_bytes / (1024 * 1024)
+            raise BatchTooLarge(f"Batch too large. Maximum is {limit_mb:g}MB of resumes per batch")
+
+    def consume_bytes(self, size: int) -> None:
+        self.check_bytes(size)
+        self.bytes += size
+
+
+def _read_capped(source: BinaryIO, budget: _BatchBudget) -> bytes | None:
+    """Read at most ``MAX_FILE_BYTES``; ``None`` if there is more, whatever was declared."""
+    content = source.read(MAX_FILE_BYTES + 1)
+    if len(content) > MAX_FILE_BYTES:
+        return None
+    budget.consume_bytes(len(content))
+    return content
+
+
+def _source_size(source: bytes | BinaryIO) -> int:
+    if isinstance(source, bytes):
+        return len(source)
+    size = source.seek(0, 2)
+    source.seek(0)
+    return size
+
+
+def _expand_file(filename: str, source: bytes | BinaryIO, budget: _BatchBudget) -> BatchFile:
+    budget.add_files(1)
+    declared = _source_size(source)
+    if declared > MAX_FILE_BYTES:
+        return BatchFile(filename, error="File too large. Maximum size is 10MB")
+    budget.check_bytes(declared)
+    content = _read_capped(BytesIO(source) if isinstance(source, bytes) else source, budget)
+    if content is None:
+        return BatchFile(filename, error="File too large. Maximum size is 10MB")
+    return BatchFile(filename, content)
+
+
+def _expand_zip(filename: str, source: bytes | BinaryIO, budget: _BatchBudget) -> list[BatchFile]:
+    try:
+        archive = zipfile.ZipFile(BytesIO(source) if isinstance(source, bytes) else source)
+    except zipfile.BadZipFile:
+        budget.add_files(1)
+        return [BatchFile(filename, error="Not a valid zip archive")]
+
+    with archive:
+        entries = []
+        for info in archive.infolist():
+            name = PurePosixPath(info.filename).name
+            if info.is_dir() or info.filename.startswith('__MACOSX/') or name.startswith('.'):
+                continue
+            entries.append(info)
+
+        # Judge the archive by its directory before decompressing any member
+        budget.add_files(len(entries))
+        budget.check_bytes(sum(
+            info.file_size for info in entries
+            if info.file_size <= MAX_FILE_BYTES
+            and info.filename.lower().endswith(SUPPORTED_EXTENSIONS)
+        ))
+
+        files = []
+        for info in entries:
+            entry_name = f"{filename}/{info.filename}"
+            if not info.filename.lower().endswith(SUPPORTED_EXTENSIONS):
+                files.append(
+                    BatchFile(entry_name, error="Unsupported file type. Please upload PDF or DOCX.")
+                )
+                continue
+            if info.file_size > MAX_FILE_BYTES:
+                files.append(BatchFile(entry_name, error="File too large. Maximum size is 10MB"))
+                continue
+            try:
+                # Headers can understate a member's size, so the read is capped as well
+                with archive.open(info) as member:
+                    content = _read_capped(member, budget)
+            except (zipfile.BadZipFile, RuntimeError, NotImplementedError) as e:
+                files.append(BatchFile(entry_name, error=f"Could not read archive entry: {e}"))
+                continue
+            if content is None:
+                files.append(BatchFile(entry_name, error="File too large. Maximum size is 10MB"))
+            else:
+                files.append(BatchFile(entry_name, content))
+    return files
+
+
+def expand_uploads(
+    uploads: list[tuple[str, bytes | BinaryIO]],
+    max_files: int | None = None,
+    max_total_bytes: int | None = None,
+) -> list[BatchFile]:
+    """
+    Flatten uploaded files and zip archives into the resumes to parse.
+
+    Uploads may be bytes or seekable binary files (read only as needed).
+    Raises ``BatchTooLarge`` as soon as the upload is known to hold more than
+    ``max_files`` resumes or ``max_total_bytes`` of resume content, counting
+    zip members by their declared size before they are decompressed.
+    """
+    budget = _BatchBudget(max_files, max_total_bytes)
+    files: list[BatchFile] = []
+    for filename, source in uploads:
+        if filename.lower().endswith('.zip'):
+            files.extend(_expand_zip(filename, source, budget))
+        else:
+            files.append(_expand_file(filename, source, budget))
+    return files
+
+
+def _get_extraction_pool() -> Executor | None:
+    global _extraction_pool
+    if _extraction_pool is None and settings.batch_parse_extraction_workers > 0:
+        _extraction_pool = ProcessPoolExecutor(max_workers=settings.batch_parse_extraction_workers)
+    return _extraction_pool
+
+
+def shutdown_extraction_pool() -> None:
+    global _extraction_pool
+    if _extraction_pool is not None:
+        _extraction_pool.shutdown(wait=False, cancel_futures=True)
+        _extraction_pool = None
+
+
+def _get_ai_slots() -> asyncio.Semaphore:
+    global _ai_slots
+    if _ai_slots is None:
+        _ai_slots = asyncio.Semaphore(max(1, settings.batch_parse_ai_concurrency))
+    return _ai_slots
+
+
+def _failure(error: str, parsing_method: str) -> dict[str, Any]:
+    return {
+        'success': False,
+        'error': error,
+        'metadata': {
+            'processing_time_ms': 0,
+            'complexity_score': 0.0,
+            'confidence_score': 0.0,
+            'parsing_method': parsing_method,
+            'issues': [error]
+        }
+    }
+
+
+async def _parse_one(
+    file: BatchFile,
+    bypass_cache: bool,
+    pool: Executor | None,
+    ai_slots: asyncio.Semaphore,
+) -> tuple[dict[str, Any], dict[str, int]]:
+    """Extract in the pool, then parse under an AI slot; never raises."""
+    loop = asyncio.get_running_loop()
+    timings = {'extraction_ms': 0, 'queued_ms': 0, 'parse_ms': 0}
+    file_type = _detect_file_type(file.content, file.filename)
+    extraction = None
+
+    try:
+        if file_type in ('pdf', 'docx') and (bypass_cache or cache_key(file.content) not in parse_cache):
+            started = time.perf_counter()
+            try:
+                extraction = await loop.run_in_executor(pool, extract_document, file.content, file_type)
+            except Exception as e:
+                logger.warning(f"Batch extraction failed for {file.filename}: {e}")
+                return _failure(f'Extraction failed: {e}', 'extraction_failed'), timings
+            finally:
+                timings['extraction_ms'] = int((time.perf_counter() - started) * 1000)
+
+        queued = time.perf_counter()
+        async with ai_slots:
+            started = time.perf_counter()
+            timings['queued_ms'] = int((started - queued) * 1000)
+            result = await parse_resume(
+                file.content, file.filename, bypass_cache=bypass_cache, extraction=extraction
+            )
+            timings['parse_ms'] = int((time.perf_counter() - started) * 1000)
+        return result, timings
+    except Exception as e:
+        logger.error(f"Batch parse failed for {file.filename}: {e}", exc_info=True)
+        return _failure(str(e), 'error'), timings
+
+
+def _file_line(
+    index: int,
+    file: BatchFile,
+    content_hash: str | None,
+    result: dict[str, Any],
+    timings: dict[str, int] | None = None,
+    duplicate_of: str | None = None,
+) -> dict[str, Any]:
+    return {
+        'type': 'file',
+        'index': index,
+        'filename': file.filename,
+        'content_hash': content_hash,
+        'duplicate_of': duplicate_of,
+        'success': bool(result.get('success')),
+        'result': result,
+        'timings': timings or {'extraction_ms': 0, 'queued_ms': 0, 'parse_ms': 0},
+    }
+
+
+async def parse_batch(
+    files: list[BatchFile],
+    bypass_cache: bool = False,
+    ai_slots: asyncio.Semaphore | None = None,
+) -> AsyncIterator[dict[str, Any]]:
+    """
+    Parse ``files`` concurrently, yielding each result as it completes.
+
+    Rejected files are yielded first; a duplicate is yielded together with
+    the first file that has the same content, with ``duplicate_of`` set to
+    that file's name. The last item is the summary:
+        {
+            'type': 'summary',
+            'files': int,
+            'unique_files': int,
+            'duplicates': int,
+            'succeeded': int,
+            'failed': int,
+            'elapsed_ms': int,
+            'files_per_minute': float,
+            'extraction_ms': int,      # summed over files
+            'parse_ms': int            # summed over files
+        }
+    """
+    started = time.perf_counter()
+    pool = _get_extraction_pool()
+    ai_slots = ai_slots or _get_ai_slots()
+    counts = {'succeeded': 0, 'failed': 0, 'extraction_ms': 0, 'parse_ms': 0}
+
+    groups: dict[str, list[tuple[int, BatchFile]]] = {}
+    for index, file in enumerate(files):
+        if file.error is not None:
+            counts['failed'] += 1
+            yield _file_line(index, file, None, _failure(file.error, 'rejected'))
+            continue
+        groups.setdefault(hashlib.sha256(file.content).hexdigest(), []).append((index, file))
+
+    async def run(content_hash: str, file: BatchFile):
+        return content_hash, *(await _parse_one(file, bypass_cache, pool, ai_slots))
+
+    tasks = [
+        asyncio.ensure_future(run(content_hash, members[0][1]))
+        for content_hash, members in groups.items()
+    ]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            content_hash, result, timings = await next_done
+            counts['extraction_ms'] += timings['extraction_ms']
+            counts['parse_ms'] += timings['parse_ms']
+            (first_index, first), *duplicates = groups[content_hash]
+            outcome = 'succeeded' if result.get('success') else 'failed'
+            counts[outcome] += 1 + len(duplicates)
+            yield _file_line(first_index, first, content_hash, result, timings)
+            for index, file in duplicates:
+                yield _file_line(index, file, content_hash, result, duplicate_of=first.filename)
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+
+    elapsed = time.perf_counter() - started
+    duplicates = sum(len(members) - 1 for members in groups.values())
+    summary = {
+        'type': 'summary',
+        'files': len(files),
+        'unique_files': len(groups),
+        'duplicates': duplicates,
+        'succeeded': counts['succeeded'],
+        'failed': counts['failed'],
+        'elapsed_ms': int(elapsed * 1000),
+        'files_per_minute': round(len(files) / elapsed * 60, 1) if elapsed > 0 else 0.0,
+        'extraction_ms': counts['extraction_ms'],
+        'parse_ms': counts['parse_ms'],
+    }
+    logger.info(f"Batch parse complete: {summary}")
+    yield summary
+
+
+async def iter_ndjson(items: AsyncIterator[dict[str, Any]]) -> AsyncIterator[str]:
+    async for item in items:
+        yield json.dumps(item, default=str) + "\n"
@@ -0,0 +1,115 @@
+"""In-process cache of resume parse results keyed by file content.
+
+The key is the SHA-256 of the uploaded bytes plus a fingerprint of the parser
+version and the settings that change parsing output, so a settings change or
+a parser release never serves stale results. Entries expire after
+``parse_cache_ttl_seconds`` and the least recently used entry is evicted once
+``parse_cache_max_entries`` is reached.
+"""
+
+from __future__ import annotations
+
+import copy
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Any
+
+from app.core.config import settings
+
+# Bump when parser changes alter output for the same input
+PARSER_VERSION = "2026.10"
+
+# Settings that influence the parse result
+FINGERPRINT_SETTINGS = (
+    "use_vision_parser",
+    "complexity_threshold",
+    "min_confidence_score",
+    "openai_model_text",
+    "openai_model_vision",
+    "vision_image_format",
+    "vision_image_max_bytes",
+    "vision_grayscale",
+    "enable_legacy_parser",
+    "prefer_pymupdf_fonts",
+    "enable_hybrid_parsing",
+    "hybrid_region_min_confidence",
+    "structured_parse_mode",
+)
+
+
+def settings_fingerprint(variant: str = "orchestrator") -> str:
+    values = [PARSER_VERSION, variant]
+    values.extend(f"{name}={getattr(settings, name, None)!r}" for name in FINGERPRINT_SETTINGS)
+    return hashlib.sha256("|".join(values).encode()).hexdigest()[:16]
+
+
+def cache_key(file_bytes: bytes, variant: str = "orchestrator") -> str:
+    return f"{hashlib.sha256(file_bytes).hexdigest()}:{settings_fingerprint(variant)}"
+
+
+class ParseCache:
+    """Thread-safe TTL + LRU map of cache key to parse result."""
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[float, dict[str, Any]]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and entry[0] > self._clock()
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= self._clock():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+        return copy.deepcopy(value)
+
+    def set(self, key: str, value: dict[str, Any]) -> None:
+        if self.max_entries <= 0:
+            return
+        stored = copy.deepcopy(value)
+        with self._lock:
+            self._entries[key] = (self._clock() + self.ttl_seconds, stored)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+parse_cache = ParseCache(
+    max_entries=settings.parse_cache_max_entries if settings.enable_parse_cache else 0,
+    ttl_seconds=settings.parse_cache_ttl_seconds,
+)
+
+
+def mark_cached(result: dict[str, Any], started: float) -> dict[str, Any]:
+    """Flag a cache hit in the result metadata."""
+    metadata = result.setdefault("metadata", {})
+    metadata["cached_parsing_method"] = metadata.get("parsing_method")
+    metadata["parsing_method"] = "cached"
+    metadata["processing_time_ms"] = int((time.time() - started) * 1000)
+    return result
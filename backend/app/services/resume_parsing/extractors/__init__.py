@@ -1,7 +1,8 @@
 """Extractors for PDF, DOCX, and Vision-based extraction."""
 from .docx_extractor import extract_docx_text_only, extract_docx_with_structure
+from .page_words import PageWords, PageWordsBuilder
 from .pdf_extractor import extract_pdf_text_only, extract_pdf_with_structure
-from .vision_extractor import extract_with_vision
+from .vision_extractor import extract_with_vision, stream_vision_pages
 
 __all__ = [
     'extract_pdf_with_structure',
@@ -9,4 +10,7 @@ __all__ = [
     'extract_docx_with_structure',
     'extract_docx_text_only',
     'extract_with_vision',
+    'stream_vision_pages',
+    'PageWords',
+    'PageWordsBuilder',
 ]
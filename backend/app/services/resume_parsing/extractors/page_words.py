@@ -0,0 +1,169 @@
+"""Columnar storage for the words on one PDF page."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator, Mapping
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class PageWords:
+    """Word geometry for one page as parallel arrays.
+
+    Coordinates and font sizes are float32 arrays, font names are indices into
+    ``fonts`` (``fonts[0]`` is the empty/unknown font) and the word texts are
+    slices of a single ``text`` buffer delimited by ``offsets`` (length
+    ``len(self) + 1``). Analyzers work on the arrays directly; iterating yields
+    the legacy per-word dicts for code that still expects them.
+    """
+
+    x0: np.ndarray
+    y0: np.ndarray
+    x1: np.ndarray
+    y1: np.ndarray
+    size: np.ndarray
+    font_ids: np.ndarray
+    fonts: tuple[str, ...]
+    text: str
+    offsets: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.x0)
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        for index in range(len(self)):
+            yield self.word(index)
+
+    def word_text(self, index: int) -> str:
+        return self.text[self.offsets[index]:self.offsets[index + 1]]
+
+    def texts(self) -> list[str]:
+        bounds = self.offsets.tolist()
+        # offsets has one more entry than there are words, so the shifted copy is shorter
+        return [self.text[start:end] for start, end in zip(bounds, bounds[1:], strict=False)]
+
+    def fontnames(self) -> list[str]:
+        return [self.fonts[font_id] for font_id in self.font_ids.tolist()]
+
+    def word(self, index: int) -> dict[str, Any]:
+        return {
+            'text': self.word_text(index),
+            'x0': float(self.x0[index]),
+            'y0': float(self.y0[index]),
+            'x1': float(self.x1[index]),
+            'y1': float(self.y1[index]),
+            'fontname': self.fonts[self.font_ids[index]],
+            'size': float(self.size[index]),
+        }
+
+    def select(self, indices: np.ndarray | list[int]) -> PageWords:
+        """Copy holding only the words at ``indices``, in that order."""
+        indices = np.asarray(indices, dtype=np.int64)
+        starts = self.offsets[indices]
+        ends = self.offsets[indices + 1]
+        offsets = np.zeros(len(indices) + 1, dtype=np.int32)
+        np.cumsum(ends - starts, out=offsets[1:])
+        return PageWords(
+            x0=self.x0[indices],
+            y0=self.y0[indices],
+            x1=self.x1[indices],
+            y1=self.y1[indices],
+            size=self.size[indices],
+            font_ids=self.font_ids[indices],
+            fonts=self.fonts,
+            text=''.join(self.text[start:end] for start, end in zip(starts.tolist(), ends.tolist(), strict=True)),
+            offsets=offsets,
+        )
+
+    def with_fonts(self, font_ids: np.ndarray, fonts: tuple[str, ...], size: np.ndarray) -> PageWords:
+        """Copy with replaced font metadata (geometry and text are shared)."""
+        return PageWords(
+            x0=self.x0,
+            y0=self.y0,
+            x1=self.x1,
+            y1=self.y1,
+            size=size.astype(np.float32, copy=False),
+            font_ids=font_ids.astype(np.int32, copy=False),
+            fonts=fonts,
+            text=self.text,
+            offsets=self.offsets,
+        )
+
+    @classmethod
+    def from_words(cls, words: Iterable[Mapping[str, Any]]) -> PageWords:
+        builder = PageWordsBuilder()
+        for word in words:
+            builder.append(
+                word.get('text', ''),
+                word.get('x0', 0.0),
+                word.get('y0', 0.0),
+                word.get('x1', 0.0),
+                word.get('y1', 0.0),
+                word.get('fontname', ''),
+                word.get('size', 0.0),
+            )
+        return builder.build()
+
+    @classmethod
+    def coerce(cls, words: PageWords | Iterable[Mapping[str, Any]] | None) -> PageWords:
+        """Accept either representation (DOCX and tests still pass dict lists)."""
+        if isinstance(words, PageWords):
+            return words
+        return cls.from_words(words or [])
+
+
+class PageWordsBuilder:
+    """Accumulates words into flat lists and packs them into a ``PageWords``."""
+
+    def __init__(self) -> None:
+        self._coords: list[float] = []
+        self._sizes: list[float] = []
+        self._font_ids: list[int] = []
+        self._font_index: dict[str, int] = {'': 0}
+        self._texts: list[str] = []
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    def font_id(self, fontname: str | None) -> int:
+        fontname = fontname or ''
+        font_id = self._font_index.get(fontname)
+        if font_id is None:
+            font_id = self._font_index[fontname] = len(self._font_index)
+        return font_id
+
+    def append(
+        self,
+        text: str,
+        x0: float,
+        y0: float,
+        x1: float,
+        y1: float,
+        fontname: str | None = '',
+        size: float | None = 0.0,
+    ) -> None:
+        self._texts.append(text or '')
+        self._coords.extend((x0 or 0.0, y0 or 0.0, x1 or 0.0, y1 or 0.0))
+        self._sizes.append(size or 0.0)
+        self._font_ids.append(self.font_id(fontname))
+
+    def build(self) -> PageWords:
+        coords = np.asarray(self._coords, dtype=np.float32).reshape(-1, 4)
+        lengths = np.fromiter((len(text) for text in self._texts), dtype=np.int32, count=len(self._texts))
+        offsets = np.zeros(len(self._texts) + 1, dtype=np.int32)
+        np.cumsum(lengths, out=offsets[1:])
+        fonts = tuple(sorted(self._font_index, key=self._font_index.__getitem__))
+        return PageWords(
+            x0=np.ascontiguousarray(coords[:, 0]),
+            y0=np.ascontiguousarray(coords[:, 1]),
+            x1=np.ascontiguousarray(coords[:, 2]),
+            y1=np.ascontiguousarray(coords[:, 3]),
+            size=np.asarray(self._sizes, dtype=np.float32),
+            font_ids=np.asarray(self._font_ids, dtype=np.int32),
+            fonts=fonts,
+            text=''.join(self._texts),
+            offsets=offsets,
+        )
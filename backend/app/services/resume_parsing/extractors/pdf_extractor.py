@@ -3,9 +3,16 @@
 from __future__ import annotations
 
 import logging
+from collections import defaultdict
 from io import BytesIO
 from typing import Any
 
+import numpy as np
+
+from app.core.config import settings
+
+from .page_words import PageWords, PageWordsBuilder
+
 logger = logging.getLogger(__name__)
 
 
@@ -22,15 +29,11 @@ def extract_pdf_with_structure(file_bytes: bytes) -> dict[str, Any]:
             'pages': [
                 {
                     'page_num': int,
-                    'words': [
-                        {
-                            'text': str,
-                            'x0': float, 'y0': float,
-                            'x1': float, 'y1': float,
-                            'fontname': str,
-                            'size': float
-                        }
-                    ],
+                    'width': float,   # points
+                    'height': float,
+                    'words': PageWords,  # columnar; iterating yields
+                                         # {'text', 'x0', 'y0', 'x1', 'y1',
+                                         #  'fontname', 'size'} dicts
                     'tables': [list of extracted tables],
                     'images': [list of image positions]
                 }
@@ -54,8 +57,8 @@ def extract_pdf_with_structure(file_bytes: bytes) -> dict[str, Any]:
             logger.info(f"Extracting PDF with {total_pages} pages")
 
             for page_num, page in enumerate(pdf.pages, 1):
-                page_words = []
-                
+                page_words = PageWordsBuilder()
+
                 # Extract words with positions using pdfplumber
                 words = page.extract_words(
                     x_tolerance=3,
@@ -64,16 +67,15 @@ def extract_pdf_with_structure(file_bytes: bytes) -> dict[str, Any]:
                 )
 
                 for word in words:
-                    word_data = {
-                        'text': word.get('text', ''),
-                        'x0': word.get('x0', 0.0),
-                        'y0': word.get('top', 0.0),  # pdfplumber uses 'top' for y0
-                        'x1': word.get('x1', 0.0),
-                        'y1': word.get('bottom', 0.0),  # pdfplumber uses 'bottom' for y1
-                        'fontname': word.get('fontname', ''),
-                        'size': word.get('size', 0.0),
-                    }
-                    page_words.append(word_data)
+                    page_words.append(
+                        word.get('text', ''),
+                        word.get('x0', 0.0),
+                        word.get('top', 0.0),  # pdfplumber uses 'top' for y0
+                        word.get('x1', 0.0),
+                        word.get('bottom', 0.0),  # pdfplumber uses 'bottom' for y1
+                        word.get('fontname', ''),
+                        word.get('size', 0.0),
+                    )
 
                 # Extract tables
                 tables = page.extract_tables()
@@ -88,26 +90,27 @@ def extract_pdf_with_structure(file_bytes: bytes) -> dict[str, Any]:
 
                 pages_data.append({
                     'page_num': page_num,
-                    'words': page_words,
+                    'width': float(page.width),
+                    'height': float(page.height),
+                    'words': page_words.build(),
                     'tables': extracted_tables,
                     'images': page.images if page.images else [],
                 })
 
-            # Fallback to PyMuPDF for font metadata if pdfplumber doesn't provide it
+            # Join PyMuPDF spans onto words for font metadata pdfplumber lacks
             try:
                 import fitz  # PyMuPDF
                 doc = fitz.open(stream=file_bytes, filetype="pdf")
                 if len(doc) == total_pages:
-                    for page_idx, (page, pdf_page) in enumerate(zip(pages_data, doc)):
-                        for span in pdf_page.get_text("dict")["blocks"]:
-                            if "spans" in span:
-                                for span_item in span["spans"]:
-                                    # Update font information if missing
-                                    for word in page["words"]:
-                                        if not word.get("fontname") and span_item.get("font"):
-                                            word["fontname"] = span_item["font"]
-                                        if not word.get("size") and span_item.get("size"):
-                                            word["size"] = span_item["size"]
+                    prefer_spans = settings.prefer_pymupdf_fonts
+                    for page, pdf_page in zip(pages_data, doc, strict=True):
+                        spans = [
+                            span_item
+                            for block in pdf_page.get_text("dict")["blocks"]
+                            for line in block.get("lines", [])
+                            for span_item in line.get("spans", [])
+                        ]
+                        page["words"] = _join_span_fonts(page["words"], spans, prefer_spans)
                 doc.close()
             except ImportError:
                 logger.warning("PyMuPDF not available for font metadata fallback")
@@ -132,6 +135,92 @@ def extract_pdf_with_structure(file_bytes: bytes) -> dict[str, Any]:
         raise
 
 
+# Height of the horizontal bands spans are bucketed into for the spatial join
+_SPAN_GRID_ROW = 4.0
+
+
+def match_words_to_spans(words: PageWords, span_boxes: np.ndarray) -> np.ndarray:
+    """Index of the span each word falls in, or -1.
+
+    Spans are bucketed into horizontal bands of ``_SPAN_GRID_ROW`` points. A
+    word is looked up in the band holding its vertical centre and matched to
+    the span there that contains the centre and overlaps the word most
+    horizontally. Each band holds the spans of roughly one line, so the join
+    is linear in words + spans instead of words x spans.
+    """
+    matches = np.full(len(words), -1, dtype=np.int64)
+    if not len(words) or not len(span_boxes):
+        return matches
+
+    grid: dict[int, list[int]] = defaultdict(list)
+    first_rows = np.floor(span_boxes[:, 1] / _SPAN_GRID_ROW).astype(np.int64)
+    last_rows = np.floor(span_boxes[:, 3] / _SPAN_GRID_ROW).astype(np.int64)
+    for span_index, (first, last) in enumerate(zip(first_rows.tolist(), last_rows.tolist(), strict=True)):
+        for row in range(first, last + 1):
+            grid[row].append(span_index)
+
+    centre_y = (words.y0 + words.y1) / 2
+    word_rows = np.floor(centre_y / _SPAN_GRID_ROW).astype(np.int64).tolist()
+    for word_index, row in enumerate(word_rows):
+        candidates = grid.get(row)
+        if not candidates:
+            continue
+        boxes = span_boxes[candidates]
+        y = centre_y[word_index]
+        overlap = np.minimum(boxes[:, 2], words.x1[word_index]) - np.maximum(boxes[:, 0], words.x0[word_index])
+        overlap[(boxes[:, 1] > y) | (boxes[:, 3] < y)] = -np.inf
+        best = int(np.argmax(overlap))
+        if overlap[best] > 0:
+            matches[word_index] = candidates[best]
+    return matches
+
+
+def _join_span_fonts(words: PageWords, spans: list[dict[str, Any]], prefer_spans: bool = False) -> PageWords:
+    """Take font name/size from the PyMuPDF span each word lies in.
+
+    By default only values pdfplumber left empty are filled; with
+    ``prefer_spans`` every matched word uses the span's metadata.
+    """
+    if not len(words) or not spans:
+        return words
+    missing_font = words.font_ids == 0
+    missing_size = words.size == 0
+    if not prefer_spans and not (missing_font.any() or missing_size.any()):
+        return words
+
+    span_boxes = np.asarray([span.get("bbox", (0, 0, 0, 0)) for span in spans], dtype=np.float32).reshape(-1, 4)
+    matches = match_words_to_spans(words, span_boxes)
+    matched = matches >= 0
+    if not matched.any():
+        return words
+
+    fonts = list(words.fonts)
+    font_index = {font: font_id for font_id, font in enumerate(fonts)}
+    span_font_ids = np.zeros(len(spans), dtype=np.int32)
+    for span_index, span in enumerate(spans):
+        font = span.get("font") or ""
+        if font not in font_index:
+            font_index[font] = len(fonts)
+            fonts.append(font)
+        span_font_ids[span_index] = font_index[font]
+    span_sizes = np.asarray([span.get("size") or 0.0 for span in spans], dtype=np.float32)
+
+    safe_matches = np.where(matched, matches, 0)
+    candidate_fonts = span_font_ids[safe_matches]
+    candidate_sizes = span_sizes[safe_matches]
+    take_font = matched & (candidate_fonts != 0)
+    take_size = matched & (candidate_sizes > 0)
+    if not prefer_spans:
+        take_font &= missing_font
+        take_size &= missing_size
+
+    return words.with_fonts(
+        np.where(take_font, candidate_fonts, words.font_ids),
+        tuple(fonts),
+        np.where(take_size, candidate_sizes, words.size),
+    )
+
+
 def extract_pdf_text_only(file_bytes: bytes) -> str:
     """Extract plain text from PDF (fallback method)."""
     try:
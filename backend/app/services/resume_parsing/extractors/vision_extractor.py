@@ -1,66 +1,305 @@
-"""Convert PDF pages to images for vision-based extraction."""
+"""Rasterize PDF pages for vision-based extraction.
+
+Each page is rendered with PyMuPDF at a DPI chosen from its size and text
+density, converted to grayscale and encoded as JPEG/WebP/PNG within
+``vision_image_max_bytes`` (stepping quality down, then scale). Rendering
+runs in a process pool (PyMuPDF holds the GIL while rasterizing) and
+``stream_vision_pages`` yields each page as soon as it is encoded so the
+vision call for page 1 can start while later pages are still rendering.
+
+Every page dict carries its measurements: ``dpi``, ``raster_bytes`` (the
+decoded bitmap), ``image_bytes`` (the encoded payload) and ``render_ms``.
+"""
 
 from __future__ import annotations
 
+import asyncio
 import base64
 import logging
+import math
+import time
+from collections.abc import AsyncIterator
+from concurrent.futures import Executor, ProcessPoolExecutor
 from io import BytesIO
 from typing import Any
 
+from app.core.config import settings
+
 logger = logging.getLogger(__name__)
 
+# GPT-4o scales "high" detail images so the short side is at most 768 px;
+# rendering beyond that only grows the upload
+VISION_MAX_SHORT_SIDE_PX = 768
+MIN_DPI = 72
+MAX_DPI = 200
+# Characters per square inch at which a page gets the full resolution cap
+DENSE_CHARS_PER_SQ_INCH = 30.0
+SPARSE_SCALE = 0.6
 
-def extract_with_vision(file_bytes: bytes) -> list[dict[str, Any]]:
+# Margin added around cropped regions, in points
+REGION_PADDING = 6.0
+
+QUALITY_STEPS = (85, 70, 55, 40)
+DOWNSCALE_STEP = 0.75
+MAX_DOWNSCALES = 3
+
+IMAGE_FORMATS = {
+    'jpeg': ('JPEG', 'image/jpeg'),
+    'webp': ('WEBP', 'image/webp'),
+    'png': ('PNG', 'image/png'),
+}
+
+_render_pool: Executor | None = None
+
+
+def choose_dpi(width_pt: float, height_pt: float, text_chars: int) -> int:
+    """DPI for a page: capped by the vision model's input size, lower for sparse pages."""
+    short_side_in = max(min(width_pt, height_pt) / 72.0, 1e-3)
+    area_sq_in = max(width_pt * height_pt / 5184.0, 1e-3)
+    cap = min(MAX_DPI, VISION_MAX_SHORT_SIDE_PX / short_side_in)
+    density = text_chars / area_sq_in
+    scale = SPARSE_SCALE + (1.0 - SPARSE_SCALE) * min(density / DENSE_CHARS_PER_SQ_INCH, 1.0)
+    return int(round(min(cap, max(MIN_DPI, cap * scale))))
+
+
+def estimate_image_tokens(width: int, height: int) -> int:
+    """Input tokens GPT-4o bills for a "high" detail image of this size.
+
+    The image is scaled to fit 2048x2048, then so its short side is at most
+    768 px, and costs 85 tokens plus 170 per 512 px tile.
     """
-    Convert PDF pages to images for vision-based parsing.
-    
-    Returns:
-        [
-            {
-                'page_num': int,
-                'image_base64': str,
-                'width': int,
-                'height': int
-            }
-        ]
+    if width <= 0 or height <= 0:
+        return 0
+    scale = min(1.0, 2048 / max(width, height))
+    width, height = width * scale, height * scale
+    scale = min(1.0, 768 / min(width, height))
+    width, height = width * scale, height * scale
+    tiles = math.ceil(width / 512) * math.ceil(height / 512)
+    return 85 + 170 * tiles
+
+
+def encode_within_budget(
+    image: Any, image_format: str, max_bytes: int
+) -> tuple[bytes, int, int]:
+    """Encode a PIL image, lowering quality then scale until it fits ``max_bytes``.
+
+    Returns (payload, width, height). The smallest attempt is returned with a
+    warning if nothing fits.
     """
+    pil_format, _ = IMAGE_FORMATS[image_format]
+    qualities = (None,) if pil_format == 'PNG' else QUALITY_STEPS
+    best: tuple[bytes, int, int] | None = None
+    for _ in range(MAX_DOWNSCALES + 1):
+        for quality in qualities:
+            buffered = BytesIO()
+            options = {'optimize': True} if quality is None else {'quality': quality}
+            image.save(buffered, format=pil_format, **options)
+            payload = buffered.getvalue()
+            if best is None or len(payload) < len(best[0]):
+                best = (payload, image.width, image.height)
+            if len(payload) <= max_bytes:
+                return best
+        image = image.resize(
+            (max(1, int(image.width * DOWNSCALE_STEP)), max(1, int(image.height * DOWNSCALE_STEP)))
+        )
+    logger.warning(f"Page image is {len(best[0])} bytes, above the {max_bytes} byte budget")
+    return best
+
+
+def render_page(
+    file_bytes: bytes,
+    page_index: int,
+    image_format: str,
+    max_bytes: int,
+    grayscale: bool,
+    clip: tuple[float, float, float, float] | None = None,
+) -> dict[str, Any]:
+    """Render and encode one page, or the ``clip`` box of it (runs in a pool worker)."""
+    import fitz  # PyMuPDF
+    from PIL import Image
+
+    started = time.perf_counter()
+    with fitz.open(stream=file_bytes, filetype="pdf") as doc:
+        page = doc[page_index]
+        area = page.rect
+        if clip is not None:
+            x0, y0, x1, y1 = clip
+            area = fitz.Rect(
+                x0 - REGION_PADDING, y0 - REGION_PADDING, x1 + REGION_PADDING, y1 + REGION_PADDING
+            ) & page.rect
+        dpi = choose_dpi(area.width, area.height, len(page.get_text("text", clip=area)))
+        pixmap = page.get_pixmap(
+            dpi=dpi,
+            colorspace=fitz.csGRAY if grayscale else fitz.csRGB,
+            alpha=False,
+            clip=None if clip is None else area,
+        )
+        mode = 'L' if grayscale else 'RGB'
+        image = Image.frombytes(mode, (pixmap.width, pixmap.height), pixmap.samples)
+        raster_bytes = len(pixmap.samples)
+        del pixmap
+
+    payload, width, height = encode_within_budget(image, image_format, max_bytes)
+    return {
+        'page_num': page_index + 1,
+        'image': payload,
+        'mime_type': IMAGE_FORMATS[image_format][1],
+        'width': width,
+        'height': height,
+        'dpi': dpi,
+        'raster_bytes': raster_bytes,
+        'image_bytes': len(payload),
+        'render_ms': int((time.perf_counter() - started) * 1000),
+    }
+
+
+def _require_dependencies() -> None:
     try:
-        from pdf2image import convert_from_bytes
-        from PIL import Image
+        import fitz  # noqa: F401
+        from PIL import Image  # noqa: F401
     except ImportError as e:
         logger.error(f"Vision extraction dependencies not installed: {e}")
-        logger.error("Please install: pip install pdf2image Pillow")
-        logger.error("On Linux, you may also need: sudo apt-get install poppler-utils")
         raise ImportError(
-            "pdf2image and Pillow are required for vision extraction. "
-            "Install with: pip install pdf2image Pillow"
-        )
+            "PyMuPDF and Pillow are required for vision extraction. "
+            "Install with: pip install PyMuPDF Pillow"
+        ) from e
+
 
+def _page_count(file_bytes: bytes) -> int:
+    import fitz  # PyMuPDF
+
+    with fitz.open(stream=file_bytes, filetype="pdf") as doc:
+        return doc.page_count
+
+
+def _image_format() -> str:
+    image_format = settings.vision_image_format.lower()
+    if image_format not in IMAGE_FORMATS:
+        raise ValueError(f"Unsupported VISION_IMAGE_FORMAT: {settings.vision_image_format}")
+    return image_format
+
+
+def _get_render_pool() -> Executor | None:
+    global _render_pool
+    if _render_pool is None and settings.vision_render_workers > 0:
+        _render_pool = ProcessPoolExecutor(max_workers=settings.vision_render_workers)
+    return _render_pool
+
+
+def shutdown_render_pool() -> None:
+    global _render_pool
+    if _render_pool is not None:
+        _render_pool.shutdown(wait=False, cancel_futures=True)
+        _render_pool = None
+
+
+def _finish_page(page: dict[str, Any]) -> dict[str, Any]:
+    page['image_base64'] = base64.b64encode(page.pop('image')).decode('ascii')
+    logger.info(
+        f"Rasterized page {page['page_num']}: {page['width']}x{page['height']} at {page['dpi']} dpi, "
+        f"{page['image_bytes']} bytes {page['mime_type']} "
+        f"(raster {page['raster_bytes']} bytes, {page['render_ms']} ms)"
+    )
+    return page
+
+
+def stream_vision_pages(file_bytes: bytes) -> AsyncIterator[dict[str, Any]]:
+    """Render pages in parallel and yield each one as soon as it is ready.
+
+    Dependencies are checked eagerly so a missing install surfaces as
+    ImportError at the call site rather than inside the consumer.
+    """
+    _require_dependencies()
+    image_format = _image_format()
+    return _stream_pages(file_bytes, image_format)
+
+
+async def _stream_pages(file_bytes: bytes, image_format: str) -> AsyncIterator[dict[str, Any]]:
+    loop = asyncio.get_running_loop()
+    pool = _get_render_pool()
+    page_count = await asyncio.to_thread(_page_count, file_bytes)
+    futures = [
+        loop.run_in_executor(
+            pool,
+            render_page,
+            file_bytes,
+            page_index,
+            image_format,
+            settings.vision_image_max_bytes,
+            settings.vision_grayscale,
+        )
+        for page_index in range(page_count)
+    ]
     try:
-        images = convert_from_bytes(
+        for future in asyncio.as_completed(futures):
+            yield _finish_page(await future)
+    finally:
+        for future in futures:
+            future.cancel()
+
+
+async def render_regions(
+    file_bytes: bytes, regions: list[tuple[int, tuple[float, float, float, float]]]
+) -> list[dict[str, Any]]:
+    """Render ``(page_num, bbox)`` crops in parallel, in the order given."""
+    _require_dependencies()
+    image_format = _image_format()
+    loop = asyncio.get_running_loop()
+    pool = _get_render_pool()
+    pages = await asyncio.gather(*(
+        loop.run_in_executor(
+            pool,
+            render_page,
             file_bytes,
-            dpi=200,  # Good balance between quality and size
-            fmt='PNG',
+            page_num - 1,
+            image_format,
+            settings.vision_image_max_bytes,
+            settings.vision_grayscale,
+            bbox,
         )
+        for page_num, bbox in regions
+    ))
+    return [_finish_page(page) for page in pages]
 
-        pages_data = []
-        for page_num, image in enumerate(images, 1):
-            # Convert PIL Image to base64
-            buffered = BytesIO()
-            image.save(buffered, format="PNG")
-            image_base64 = base64.b64encode(buffered.getvalue()).decode('utf-8')
 
-            pages_data.append({
-                'page_num': page_num,
-                'image_base64': image_base64,
-                'width': image.width,
-                'height': image.height,
-            })
+def extract_with_vision(file_bytes: bytes) -> list[dict[str, Any]]:
+    """
+    Convert PDF pages to images for vision-based parsing.
 
+    Returns:
+        [
+            {
+                'page_num': int,
+                'image_base64': str,
+                'mime_type': str,
+                'width': int,
+                'height': int,
+                'dpi': int,
+                'raster_bytes': int,
+                'image_bytes': int,
+                'render_ms': int
+            }
+        ]
+    """
+    _require_dependencies()
+    image_format = _image_format()
+    try:
+        pages_data = [
+            _finish_page(
+                render_page(
+                    file_bytes,
+                    page_index,
+                    image_format,
+                    settings.vision_image_max_bytes,
+                    settings.vision_grayscale,
+                )
+            )
+            for page_index in range(_page_count(file_bytes))
+        ]
         logger.info(
-            f"Vision extraction complete: {len(pages_data)} pages converted to images"
+            f"Vision extraction complete: {len(pages_data)} pages, "
+            f"{sum(page['image_bytes'] for page in pages_data)} bytes"
         )
-
         return pages_data
 
     except Exception as e:
@@ -71,8 +310,6 @@ def extract_with_vision(file_bytes: bytes) -> list[dict[str, Any]]:
 def convert_image_to_base64(image: Any) -> str:
     """Convert PIL Image to base64 string."""
     try:
-        from io import BytesIO
-        import base64
         buffered = BytesIO()
         image.save(buffered, format="PNG")
         return base64.b64encode(buffered.getvalue()).decode('utf-8')
@@ -0,0 +1,56 @@
+"""Per-parse accounting of LLM round trips and tokens.
+
+``parse_resume`` installs an ``LLMUsage`` with ``llm_usage_tracker`` around
+the AI stage; the structured parser calls ``record_llm_call`` after every
+chat completion with the ``usage`` block OpenAI returns. Without a tracker,
+recording is a no-op.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any
+
+
+@dataclass
+class LLMUsage:
+    calls: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    by_purpose: dict[str, int] = field(default_factory=dict)
+
+    def record(self, purpose: str, usage: dict[str, Any] | None) -> None:
+        self.calls += 1
+        self.by_purpose[purpose] = self.by_purpose.get(purpose, 0) + 1
+        if usage:
+            self.input_tokens += int(usage.get('prompt_tokens') or 0)
+            self.output_tokens += int(usage.get('completion_tokens') or 0)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            'calls': self.calls,
+            'input_tokens': self.input_tokens,
+            'output_tokens': self.output_tokens,
+            'by_purpose': dict(self.by_purpose),
+        }
+
+
+_usage: ContextVar[LLMUsage | None] = ContextVar('parse_llm_usage', default=None)
+
+
+def record_llm_call(purpose: str, usage: dict[str, Any] | None) -> None:
+    tracker = _usage.get()
+    if tracker is not None:
+        tracker.record(purpose, usage)
+
+
+@contextmanager
+def llm_usage_tracker(usage: LLMUsage) -> Iterator[LLMUsage]:
+    token = _usage.set(usage)
+    try:
+        yield usage
+    finally:
+        _usage.reset(token)
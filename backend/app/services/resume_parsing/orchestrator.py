@@ -7,21 +7,41 @@ import logging
 import time
 from typing import Any
 
+from app.core.circuit_breaker import openai_breakers
 from app.core.config import settings
+from app.core.deadline import DeadlineExceeded, can_finish, deadline_budget
 
-from .analyzers import analyze_layout, calculate_complexity_score
+from .analyzers import analyze_layout, calculate_complexity_score, route_regions
+from .cache import cache_key, mark_cached, parse_cache
 from .extractors import (
     extract_docx_text_only,
     extract_docx_with_structure,
     extract_pdf_text_only,
     extract_pdf_with_structure,
-    extract_with_vision,
+    stream_vision_pages,
 )
-from .parsers import parse_with_structured_ai, parse_with_vision
+from .llm_usage import LLMUsage, llm_usage_tracker
+from .parsers import parse_hybrid, parse_with_structured_ai, parse_with_vision
+from .progress import report_stage
+from .speculation import race_with_legacy, should_speculate
 from .validators import validate_and_score
 
 logger = logging.getLogger(__name__)
 
+# Degraded results (timeouts, fallbacks) are not cached so the next upload
+# of the same file gets a fresh attempt at the full pipeline
+UNCACHED_PARSING_METHODS = frozenset({
+    'vision_fallback',
+    'vision_timeout_fallback',
+    'text_structured_fallback',
+    'legacy_fallback',
+    'legacy_speculative',
+})
+
+# Fallbacks are only started with at least this much of the request deadline left
+VISION_FALLBACK_MIN_SECONDS = 20.0
+LEGACY_FALLBACK_MIN_SECONDS = 5.0
+
 # Check if vision dependencies are available at module load time
 _VISION_DEPENDENCIES_AVAILABLE = None
 
@@ -30,25 +50,33 @@ def _check_vision_dependencies() -> bool:
     global _VISION_DEPENDENCIES_AVAILABLE
     if _VISION_DEPENDENCIES_AVAILABLE is None:
         try:
-            import pdf2image  # noqa: F401
+            import fitz  # noqa: F401
             from PIL import Image  # noqa: F401
             _VISION_DEPENDENCIES_AVAILABLE = True
-            logger.info("Vision parser dependencies (pdf2image, Pillow) are available")
+            logger.info("Vision parser dependencies (PyMuPDF, Pillow) are available")
         except ImportError:
             _VISION_DEPENDENCIES_AVAILABLE = False
             logger.warning(
-                "Vision parser dependencies (pdf2image, Pillow) not installed. "
-                "Complex resumes may have parsing issues. Install with: pip install pdf2image Pillow"
+                "Vision parser dependencies (PyMuPDF, Pillow) not installed. "
+                "Complex resumes may have parsing issues. Install with: pip install PyMuPDF Pillow"
             )
     return _VISION_DEPENDENCIES_AVAILABLE
 
 
-async def parse_resume(file_bytes: bytes, filename: str) -> dict[str, Any]:
+async def parse_resume(
+    file_bytes: bytes,
+    filename: str,
+    bypass_cache: bool = False,
+    extraction: tuple[dict[str, Any], str] | None = None,
+) -> dict[str, Any]:
     """
     Complete parsing flow:
     
+    0. Return the cached result for identical bytes and parser settings
+       (unless bypass_cache); cache hits report parsing_method 'cached'
     1. Detect file format (PDF, DOCX, DOC)
-    2. Extract with structure preservation
+    2. Extract with structure preservation, unless ``extraction`` already
+       holds the (extracted_data, raw_text) from ``extract_document``
     3. Analyze layout complexity
     4. Choose parsing method based on complexity
     5. Validate results and calculate confidence
@@ -72,35 +100,58 @@ async def parse_resume(file_bytes: bytes, filename: str) -> dict[str, Any]:
                 'confidence_score': float,
                 'parsing_method': str,
                 'processing_time_ms': int,
-                'issues': [str]
+                'issues': [str],
+                'llm_usage': {...}   # structured parser calls/tokens, if any
             },
             'raw_text': str
         }
     """
     start_time = time.time()
-    
+    key = cache_key(file_bytes)
+
+    if not bypass_cache:
+        cached = parse_cache.get(key)
+        if cached is not None:
+            logger.info(f"Parse cache hit for {filename}")
+            return mark_cached(cached, start_time)
+
+    result = await _parse_resume_uncached(file_bytes, filename, start_time, extraction)
+    method = result.get('metadata', {}).get('parsing_method')
+    if result.get('success') and method not in UNCACHED_PARSING_METHODS:
+        parse_cache.set(key, result)
+    return result
+
+
+async def _parse_resume_uncached(
+    file_bytes: bytes,
+    filename: str,
+    start_time: float,
+    extraction: tuple[dict[str, Any], str] | None = None,
+) -> dict[str, Any]:
+    # Add timeout protection, within the request deadline
+    max_time = getattr(settings, 'max_parsing_time_seconds', 60)
     try:
-        # Add timeout protection
-        max_time = getattr(settings, 'max_parsing_time_seconds', 60)
         result = await asyncio.wait_for(
-            _parse_resume_internal(file_bytes, filename, start_time),
-            timeout=max_time
+            _parse_resume_internal(file_bytes, filename, start_time, extraction),
+            timeout=deadline_budget(max_time)
         )
         return result
         
-    except asyncio.TimeoutError:
-        logger.error(f"Parsing timeout after {max_time} seconds")
+    except TimeoutError as timeout_error:
+        if isinstance(timeout_error, DeadlineExceeded):
+            logger.error(f"Parsing stopped at the request deadline: {timeout_error}")
+        else:
+            logger.error(f"Parsing timeout after {max_time} seconds")
         enable_legacy = getattr(settings, 'enable_legacy_parser', False)
         
-        # Try vision parser as fallback if available
+        # Try vision parser as fallback if available and it can finish before the deadline
         use_vision = getattr(settings, 'use_vision_parser', True)
         file_type = _detect_file_type(file_bytes, filename)
         
-        if use_vision and file_type == 'pdf':
+        if use_vision and file_type == 'pdf' and can_finish(VISION_FALLBACK_MIN_SECONDS):
             try:
                 logger.info("Timeout occurred, trying vision parser as fallback")
-                vision_pages = extract_with_vision(file_bytes)
-                parsed_data = await parse_with_vision(vision_pages)
+                parsed_data = await parse_with_vision(stream_vision_pages(file_bytes))
                 validation_result = validate_and_score(parsed_data)
                 
                 return {
@@ -126,7 +177,7 @@ async def parse_resume(file_bytes: bytes, filename: str) -> dict[str, Any]:
             except Exception as vision_error:
                 logger.error(f"Vision parser fallback also failed: {vision_error}")
         
-        if enable_legacy:
+        if enable_legacy and can_finish(LEGACY_FALLBACK_MIN_SECONDS):
             return await _fallback_to_legacy(file_bytes, filename, start_time)
         else:
             return {
@@ -143,7 +194,7 @@ async def parse_resume(file_bytes: bytes, filename: str) -> dict[str, Any]:
     except Exception as e:
         logger.error(f"Parsing failed: {e}", exc_info=True)
         enable_legacy = getattr(settings, 'enable_legacy_parser', False)
-        if enable_legacy:
+        if enable_legacy and can_finish(LEGACY_FALLBACK_MIN_SECONDS):
             return await _fallback_to_legacy(file_bytes, filename, start_time)
         else:
             return {
@@ -159,10 +210,20 @@ async def parse_resume(file_bytes: bytes, filename: str) -> dict[str, Any]:
             }
 
 
+def extract_document(file_bytes: bytes, file_type: str) -> tuple[dict[str, Any], str]:
+    """Structured extraction and plain text for a PDF or DOCX (CPU-bound, picklable)."""
+    if file_type == 'pdf':
+        return extract_pdf_with_structure(file_bytes), extract_pdf_text_only(file_bytes)
+    if file_type == 'docx':
+        return extract_docx_with_structure(file_bytes), extract_docx_text_only(file_bytes)
+    return {}, ""
+
+
 async def _parse_resume_internal(
     file_bytes: bytes,
     filename: str,
-    start_time: float
+    start_time: float,
+    extraction: tuple[dict[str, Any], str] | None = None,
 ) -> dict[str, Any]:
     """Internal parsing implementation."""
     
@@ -184,16 +245,12 @@ async def _parse_resume_internal(
         }
     
     # 2. Extract with structure preservation
+    report_stage('extracting')
     try:
-        if file_type == 'pdf':
-            extracted_data = extract_pdf_with_structure(file_bytes)
-            raw_text = extract_pdf_text_only(file_bytes)
-        elif file_type == 'docx':
-            extracted_data = extract_docx_with_structure(file_bytes)
-            raw_text = extract_docx_text_only(file_bytes)
-        else:
-            raw_text = ""
-            extracted_data = {}
+        if extraction is None:
+            # Off the event loop, so a client disconnect can cancel the request meanwhile
+            extraction = await asyncio.to_thread(extract_document, file_bytes, file_type)
+        extracted_data, raw_text = extraction
         
         if not raw_text.strip():
             return {
@@ -223,12 +280,47 @@ async def _parse_resume_internal(
         }
     
     # 3. Analyze layout complexity
+    report_stage('analyzing_layout')
     layout_data = analyze_layout(extracted_data, file_type)
     complexity_result = calculate_complexity_score(extracted_data, layout_data, file_type)
     complexity_score = complexity_result['complexity_score']
-    recommended_method = complexity_result['recommended_method']
-    
+
+    with llm_usage_tracker(LLMUsage()) as usage:
+        ai_pipeline = _parse_with_ai(
+            file_bytes,
+            filename,
+            start_time,
+            file_type,
+            extracted_data,
+            raw_text,
+            layout_data,
+            complexity_result,
+        )
+        if should_speculate(complexity_score):
+            logger.info(f"Speculative parsing (complexity={complexity_score:.2f}): racing regex parser")
+            result = await race_with_legacy(ai_pipeline, raw_text, complexity_score, start_time)
+        else:
+            result = await ai_pipeline
+    if usage.calls:
+        result.setdefault('metadata', {})['llm_usage'] = usage.as_dict()
+    return result
+
+
+async def _parse_with_ai(
+    file_bytes: bytes,
+    filename: str,
+    start_time: float,
+    file_type: str,
+    extracted_data: dict[str, Any],
+    raw_text: str,
+    layout_data: dict[str, Any],
+    complexity_result: dict[str, Any],
+) -> dict[str, Any]:
+    """Steps 4-8: pick the AI parser, validate, retry and format the result."""
+    complexity_score = complexity_result['complexity_score']
+
     # 4. Choose parsing method
+    report_stage('ai_parsing')
     use_vision = getattr(settings, 'use_vision_parser', True)
     complexity_threshold = getattr(settings, 'complexity_threshold', 0.35)
     min_confidence = getattr(settings, 'min_confidence_score', 0.6)
@@ -241,6 +333,7 @@ async def _parse_resume_internal(
     
     parsing_method = 'unknown'
     parsed_data = None
+    hybrid_report = None
     
     # Check if resume has complex features
     has_columns = complexity_result.get('factors', {}).get('has_columns', False)
@@ -250,25 +343,42 @@ async def _parse_resume_internal(
     if (has_columns or complexity_score >= 0.30) and not vision_available and enable_legacy:
         logger.info(f"Complex resume (complexity={complexity_score:.2f}, has_columns={has_columns}) - using legacy parser (vision not available)")
         return await _fallback_to_legacy(file_bytes, filename, start_time)
+
+    # OpenAI is failing: skip the AI parsers instead of failing through each of them
+    if enable_legacy and openai_breakers.rejecting(getattr(settings, 'openai_model_text', 'gpt-4o-mini')):
+        logger.warning("OpenAI circuit open for the text model - using legacy parser")
+        return await _fallback_to_legacy(file_bytes, filename, start_time)
     
     # Decision logic: Use vision parser for complex resumes (has columns OR complexity >= 0.30)
     # Lower threshold to avoid timeout issues with structured parser on complex resumes
     # But only if vision dependencies are available
     if file_type == 'pdf' and use_vision and vision_available and (has_columns or complexity_score >= 0.30):
-        logger.info(f"Using vision parser (complexity={complexity_score:.2f}, has_columns={has_columns})")
         parsing_method = 'vision'
         try:
-            vision_pages = extract_with_vision(file_bytes)
-            parsed_data = await parse_with_vision(vision_pages)
+            regions = (
+                route_regions(extracted_data, layout_data, settings.hybrid_region_min_confidence)
+                if settings.enable_hybrid_parsing
+                else []
+            )
+            if any(region['route'] == 'text' for region in regions):
+                # Only the low-confidence regions go through vision
+                logger.info(f"Using hybrid parser (complexity={complexity_score:.2f}, has_columns={has_columns})")
+                parsing_method = 'hybrid'
+                parsed_data, hybrid_report = await parse_hybrid(
+                    file_bytes, extracted_data, layout_data, regions
+                )
+            else:
+                logger.info(f"Using vision parser (complexity={complexity_score:.2f}, has_columns={has_columns})")
+                parsed_data = await parse_with_vision(stream_vision_pages(file_bytes))
         except ImportError as e:
             logger.error(f"Vision parser dependencies not available: {e}")
-            logger.info("Falling back to structured parser (install pdf2image and Pillow for better results)")
+            logger.info("Falling back to structured parser (install PyMuPDF and Pillow for better results)")
             parsing_method = 'text_structured_fallback'
             # Wrap in timeout to prevent hanging
             try:
                 parsed_data = await asyncio.wait_for(
                     parse_with_structured_ai(extracted_data, layout_data, raw_text),
-                    timeout=45.0
+                    timeout=deadline_budget(45.0)
                 )
             except asyncio.TimeoutError:
                 logger.error("Structured parser also timed out")
@@ -284,7 +394,7 @@ async def _parse_resume_internal(
             try:
                 parsed_data = await asyncio.wait_for(
                     parse_with_structured_ai(extracted_data, layout_data, raw_text),
-                    timeout=45.0
+                    timeout=deadline_budget(45.0)
                 )
             except asyncio.TimeoutError:
                 logger.error("Structured parser also timed out")
@@ -301,18 +411,17 @@ async def _parse_resume_internal(
         try:
             parsed_data = await asyncio.wait_for(
                 parse_with_structured_ai(extracted_data, layout_data, raw_text),
-                timeout=45.0
+                timeout=deadline_budget(45.0)
             )
         except asyncio.TimeoutError:
                 logger.error("Structured parser timed out after 45 seconds")
-                # Try vision as fallback (only if dependencies available)
-                if use_vision and vision_available:
+                # Try vision as fallback (only if dependencies available and it can finish in time)
+                if use_vision and vision_available and can_finish(VISION_FALLBACK_MIN_SECONDS):
                     try:
-                        vision_pages = extract_with_vision(file_bytes)
-                        parsed_data = await parse_with_vision(vision_pages)
+                        parsed_data = await parse_with_vision(stream_vision_pages(file_bytes))
                         parsing_method = 'vision_timeout_fallback'
                     except ImportError:
-                        logger.error("Vision parser dependencies (pdf2image/Pillow) not installed")
+                        logger.error("Vision parser dependencies (PyMuPDF/Pillow) not installed")
                         logger.info("Falling back to legacy parser")
                         enable_legacy = getattr(settings, 'enable_legacy_parser', True)
                         if enable_legacy:
@@ -341,7 +450,7 @@ async def _parse_resume_internal(
         try:
             parsed_data = await asyncio.wait_for(
                 parse_with_structured_ai(extracted_data, layout_data, raw_text),
-                timeout=45.0
+                timeout=deadline_budget(45.0)
             )
         except asyncio.TimeoutError:
             logger.error("DOCX structured parser timed out")
@@ -357,7 +466,7 @@ async def _parse_resume_internal(
         try:
             parsed_data = await asyncio.wait_for(
                 parse_with_structured_ai(extracted_data, layout_data, raw_text),
-                timeout=45.0
+                timeout=deadline_budget(45.0)
             )
         except asyncio.TimeoutError:
             logger.error("Fallback structured parser timed out")
@@ -368,6 +477,7 @@ async def _parse_resume_internal(
             parsed_data = _create_empty_parsed_data()
     
     # 5. Validate and calculate confidence
+    report_stage('validating')
     validation_result = validate_and_score(parsed_data)
     confidence_score = validation_result['overall_confidence']
     issues = validation_result['issues']
@@ -378,11 +488,11 @@ async def _parse_resume_internal(
         parsing_method != 'vision_timeout_fallback' and
         file_type == 'pdf' and 
         use_vision and
-        vision_available):
+        vision_available and
+        can_finish(VISION_FALLBACK_MIN_SECONDS)):
         logger.info(f"Low confidence ({confidence_score:.2f}), retrying with vision parser")
         try:
-            vision_pages = extract_with_vision(file_bytes)
-            parsed_data = await parse_with_vision(vision_pages)
+            parsed_data = await parse_with_vision(stream_vision_pages(file_bytes))
             validation_result = validate_and_score(parsed_data)
             confidence_score = validation_result['overall_confidence']
             issues = validation_result['issues']
@@ -419,7 +529,7 @@ async def _parse_resume_internal(
             # Return error instead of empty data
             return {
                 'success': False,
-                'error': 'Could not extract meaningful content from resume. The resume may be too complex. Install vision parser dependencies (pip install pdf2image Pillow) or enable legacy parser (ENABLE_LEGACY_PARSER=true).',
+                'error': 'Could not extract meaningful content from resume. The resume may be too complex. Install vision parser dependencies (pip install PyMuPDF Pillow) or enable legacy parser (ENABLE_LEGACY_PARSER=true).',
                 'metadata': {
                     'processing_time_ms': int((time.time() - start_time) * 1000),
                     'complexity_score': complexity_score,
@@ -450,6 +560,8 @@ async def _parse_resume_internal(
         },
         'raw_text': raw_text[:1000]  # First 1000 chars for debugging
     }
+    if hybrid_report is not None and parsing_method == 'hybrid':
+        result['metadata']['hybrid'] = hybrid_report
     
     logger.info(
         f"Parsing complete: method={parsing_method}, "
@@ -507,6 +619,8 @@ async def _fallback_to_legacy(
     start_time: float | None = None
 ) -> dict[str, Any]:
     """Fallback to legacy parser if enabled."""
+    if not can_finish(LEGACY_FALLBACK_MIN_SECONDS):
+        raise DeadlineExceeded("Not enough of the request deadline left for the legacy parser")
     try:
         from app.services.resume_upload_legacy import upload_and_parse_resume
         logger.info("Falling back to legacy parser")
@@ -535,7 +649,7 @@ async def _fallback_to_legacy(
         processing_time = int((time.time() - start_time) * 1000) if start_time else 0
         return {
             'success': False,
-            'error': 'Legacy parser not available. Please install vision parser dependencies (pip install pdf2image Pillow) or contact support.',
+            'error': 'Legacy parser not available. Please install vision parser dependencies (pip install PyMuPDF Pillow) or contact support.',
             'metadata': {
                 'processing_time_ms': processing_time,
                 'complexity_score': 0.0,
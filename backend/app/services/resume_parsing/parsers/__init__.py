@@ -1,8 +1,10 @@
 """Parsers for structured and vision-based resume parsing."""
+from .hybrid_parser import parse_hybrid
 from .structured_parser import parse_with_structured_ai
 from .vision_parser import parse_with_vision
 
 __all__ = [
+    'parse_hybrid',
     'parse_with_structured_ai',
     'parse_with_vision',
 ]
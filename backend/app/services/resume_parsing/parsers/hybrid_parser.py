@@ -0,0 +1,102 @@
+"""Hybrid parsing: text path for clean regions, vision only for ambiguous ones."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any
+
+from app.core.config import settings
+from app.core.deadline import deadline_budget
+
+from ..extractors.page_words import PageWords
+from ..extractors.vision_extractor import choose_dpi, estimate_image_tokens, render_regions
+from .structured_parser import parse_with_structured_ai
+from .vision_parser import _process_page_with_vision, merge_page_results
+
+logger = logging.getLogger(__name__)
+
+# Rough OpenAI tokenizer ratio for English resume text
+TEXT_CHARS_PER_TOKEN = 4
+# Times parse_with_structured_ai sends the text, per structured_parse_mode
+STRUCTURED_TEXT_PASSES = {'single_pass': 1, 'two_phase': 2}
+
+
+def full_vision_tokens(extracted_data: dict[str, Any]) -> int:
+    """Image tokens the whole-document vision path would send."""
+    total = 0
+    for page in extracted_data.get('pages', []):
+        width, height = page.get('width', 612.0), page.get('height', 792.0)
+        chars = sum(len(text) for text in PageWords.coerce(page.get('words')).texts())
+        dpi = choose_dpi(width, height, chars)
+        total += estimate_image_tokens(round(width * dpi / 72), round(height * dpi / 72))
+    return total
+
+
+async def parse_hybrid(
+    file_bytes: bytes,
+    extracted_data: dict[str, Any],
+    layout_data: dict[str, Any],
+    regions: list[dict[str, Any]],
+) -> tuple[dict[str, Any], dict[str, Any]]:
+    """
+    Parse text-routed regions with the structured parser and send crops of
+    vision-routed regions to the vision model, concurrently, then merge the
+    results (text first, then regions in reading order).
+
+    Returns (parsed resume data in standard format, report):
+        {
+            'regions': int,
+            'text_regions': int,
+            'vision_regions': int,
+            'text_tokens': int,          # estimated, structured parser input
+            'vision_tokens': int,        # estimated, cropped region images
+            'full_vision_tokens': int,   # estimated, whole-document vision
+            'tokens_saved': int          # full_vision_tokens - text - vision
+        }
+    """
+    text_regions = [region for region in regions if region['route'] == 'text']
+    vision_regions = [region for region in regions if region['route'] == 'vision']
+    text = '\n\n'.join(region['text'] for region in text_regions)
+    model = getattr(settings, 'openai_model_vision', 'gpt-4o')
+
+    crops = await render_regions(
+        file_bytes, [(region['page'], region['bbox']) for region in vision_regions]
+    )
+
+    async def parse_text() -> dict[str, Any]:
+        if not text.strip():
+            return {}
+        return await asyncio.wait_for(
+            parse_with_structured_ai(extracted_data, layout_data, text), timeout=deadline_budget(45.0)
+        )
+
+    results = await asyncio.wait_for(
+        asyncio.gather(
+            parse_text(),
+            *(
+                _process_page_with_vision(crop['image_base64'], model, crop['page_num'], crop['mime_type'])
+                for crop in crops
+            ),
+            return_exceptions=True,
+        ),
+        timeout=deadline_budget(90.0),
+    )
+    if all(isinstance(result, BaseException) for result in results):
+        raise results[0]
+
+    passes = STRUCTURED_TEXT_PASSES.get(settings.structured_parse_mode, 2)
+    text_tokens = passes * len(text) // TEXT_CHARS_PER_TOKEN
+    vision_tokens = sum(estimate_image_tokens(crop['width'], crop['height']) for crop in crops)
+    full_tokens = full_vision_tokens(extracted_data)
+    report = {
+        'regions': len(regions),
+        'text_regions': len(text_regions),
+        'vision_regions': len(vision_regions),
+        'text_tokens': text_tokens,
+        'vision_tokens': vision_tokens,
+        'full_vision_tokens': full_tokens,
+        'tokens_saved': full_tokens - text_tokens - vision_tokens,
+    }
+    logger.info(f"Hybrid parsing report: {report}")
+    return merge_page_results(list(results)), report
@@ -1,4 +1,4 @@
-"""Two-phase AI parsing for text-based resume extraction."""
+"""Schema-driven single-pass or two-phase AI parsing for text-based resume extraction."""
 
 from __future__ import annotations
 
@@ -11,10 +11,72 @@ from typing import Any
 import httpx
 
 from app.core.config import settings
+from app.core.deadline import deadline_budget
 from app.core.openai_client import get_httpx_client, openai_client
+from app.services.model_router import model_router
+
+from ..llm_usage import record_llm_call
 
 logger = logging.getLogger(__name__)
 
+# Resume text sent to the single-pass call (same window as the batch extraction)
+SINGLE_PASS_MAX_CHARS = 12000
+# A section whose extracted text is below this share of its source is re-extracted
+MIN_SECTION_COVERAGE = 0.5
+
+_STRING = {'type': 'string'}
+
+
+def _object_schema(properties: dict[str, Any]) -> dict[str, Any]:
+    # Strict structured outputs require every property and no extras
+    return {
+        'type': 'object',
+        'properties': properties,
+        'required': list(properties),
+        'additionalProperties': False,
+    }
+
+
+RESUME_SCHEMA = _object_schema({
+    'name': _STRING,
+    'title': _STRING,
+    'email': _STRING,
+    'phone': _STRING,
+    'location': _STRING,
+    'summary': _STRING,
+    'sections': {
+        'type': 'array',
+        'items': _object_schema({
+            'title': _STRING,
+            'type': {
+                'type': 'string',
+                'enum': ['experience', 'education', 'skills', 'projects', 'summary', 'other'],
+            },
+            'experience': {
+                'type': 'array',
+                'items': _object_schema({
+                    'company': _STRING,
+                    'title': _STRING,
+                    'location': _STRING,
+                    'dates': _object_schema({'start': _STRING, 'end': _STRING}),
+                    'bullets': {'type': 'array', 'items': _STRING},
+                }),
+            },
+            'education': {
+                'type': 'array',
+                'items': _object_schema({
+                    'institution': _STRING,
+                    'degree': _STRING,
+                    'field': _STRING,
+                    'graduation_date': _STRING,
+                }),
+            },
+            'skills': {'type': 'array', 'items': _STRING},
+            'text': _STRING,
+        }),
+    },
+})
+
 
 async def parse_with_structured_ai(
     extracted_data: dict[str, Any],
@@ -22,8 +84,14 @@ async def parse_with_structured_ai(
     raw_text: str
 ) -> dict[str, Any]:
     """
-    Two-phase AI parsing:
+    AI parsing in ``structured_parse_mode``:
+
+    single_pass: one call constrained by ``RESUME_SCHEMA``, a local check of
+    every section and section-scoped repair calls (in parallel) only for
+    the sections that fail it; falls back to two_phase if the response
+    cannot be used at all.
     
+    two_phase:
     Phase 1: Structure Detection - identify section boundaries and types
     Phase 2: Content Extraction - extract structured content per section
     
@@ -34,6 +102,12 @@ async def parse_with_structured_ai(
         return _create_empty_result()
 
     try:
+        if settings.structured_parse_mode == 'single_pass':
+            parsed_data = await _parse_single_pass(raw_text)
+            if parsed_data is not None:
+                return parsed_data
+            logger.warning("Single-pass parsing unusable, falling back to two-phase parsing")
+
         # Phase 1: Structure Detection
         structure_map = await _detect_structure(raw_text, layout_data)
         
@@ -85,8 +159,18 @@ Return ONLY valid JSON (no markdown code blocks):
 }}"""
 
     model = getattr(settings, 'openai_model_text', 'gpt-4o-mini')
-    
-    response = await _call_openai(prompt, model, temperature=0.1)
+
+    local = await model_router.complete_locally(
+        'section_classification',
+        _chat_payload(prompt, model, 0.1, 2000, {'type': 'json_object'}),
+    )
+    if local is not None:
+        record_llm_call('detect_structure_local', {
+            'prompt_tokens': local.prompt_tokens, 'completion_tokens': local.completion_tokens,
+        })
+        response = local.content
+    else:
+        response = await _call_openai(prompt, model, temperature=0.1, purpose='detect_structure')
     
     # Clean and parse JSON
     response_text = response.strip()
@@ -109,7 +193,16 @@ async def _extract_content(
 ) -> dict[str, Any]:
     """Phase 2: Extract structured content for all sections in one optimized call."""
     sections_map = structure_map.get('sections', [])
-    
+    all_content = await _extract_all_sections_batch(text, sections_map) if sections_map else {}
+    return _assemble_content(text, sections_map, all_content)
+
+
+def _assemble_content(
+    text: str,
+    sections_map: list[dict[str, Any]],
+    all_content: dict[str, Any]
+) -> dict[str, Any]:
+    """Convert extracted section content into the standard resume format."""
     result = {
         'name': '',
         'title': '',
@@ -157,10 +250,7 @@ async def _extract_content(
                 result['summary'] = ' '.join(summary_lines)
                 break
     
-    # Batch extract all sections in one API call for efficiency
     if sections_map:
-        all_content = await _extract_all_sections_batch(text, sections_map)
-        
         # Extract summary first (from top-level or summary section)
         extracted_summary = all_content.get('summary', '')
         if extracted_summary:
@@ -318,6 +408,186 @@ async def _extract_content(
     return result
 
 
+def _section_slices(text: str, titles: list[str]) -> list[str | None]:
+    """Source text of each section (header line to the next header), in order; None if not found."""
+    lines = text.split('\n')
+    starts: list[int | None] = []
+    cursor = 0
+    for title in titles:
+        wanted = title.strip().lower()
+        found = None
+        if wanted:
+            for index in range(cursor, len(lines)):
+                if lines[index].strip().lower().startswith(wanted):
+                    found = index
+                    break
+        starts.append(found)
+        if found is not None:
+            cursor = found + 1
+
+    slices: list[str | None] = []
+    for position, start in enumerate(starts):
+        if start is None:
+            slices.append(None)
+            continue
+        end = next((later for later in starts[position + 1:] if later is not None), len(lines))
+        slices.append('\n'.join(lines[start:end]))
+    return slices
+
+
+def _validate_section(section: dict[str, Any], source: str | None) -> list[str]:
+    """Local checks on one single-pass section; an empty list means it is usable."""
+    kind = section.get('type', 'other')
+    problems = []
+    if kind == 'experience':
+        entries = section.get('experience') or []
+        if not entries:
+            problems.append('no experience entries')
+        elif any(not (entry.get('company') or entry.get('title')) for entry in entries):
+            problems.append('experience entry without company or title')
+        extracted = sum(
+            len(entry.get('company', '')) + len(entry.get('title', ''))
+            + sum(len(bullet) for bullet in entry.get('bullets', []))
+            for entry in entries
+        )
+    elif kind == 'education':
+        entries = section.get('education') or []
+        if not entries:
+            problems.append('no education entries')
+        elif any(not (entry.get('institution') or entry.get('degree')) for entry in entries):
+            problems.append('education entry without institution or degree')
+        return problems
+    elif kind == 'skills':
+        if not section.get('skills'):
+            problems.append('no skills')
+        return problems
+    else:
+        if not section.get('text', '').strip():
+            problems.append('no text')
+        extracted = len(section.get('text', ''))
+
+    # Long sections are where a single response runs out of room and starts
+    # summarizing; compare against what the source actually contains
+    if source and not problems and extracted < MIN_SECTION_COVERAGE * len(source):
+        problems.append(f'extracted {extracted} of {len(source)} source characters')
+    return problems
+
+
+def _section_content(section: dict[str, Any]) -> dict[str, Any]:
+    """Single-pass section in the shape ``_assemble_content`` expects."""
+    kind = section.get('type', 'other')
+    if kind == 'experience':
+        return {'type': kind, 'entries': section.get('experience', [])}
+    if kind == 'education':
+        return {'type': kind, 'entries': section.get('education', [])}
+    if kind == 'skills':
+        return {'type': kind, 'skills': section.get('skills', [])}
+    return {'type': kind, 'text': section.get('text', '')}
+
+
+async def _repair_section(
+    section: dict[str, Any],
+    source: str | None,
+    text: str
+) -> dict[str, Any]:
+    """Re-extract one section from its own source text only."""
+    kind = section.get('type', 'other')
+    scope = source or text
+    info = {'title': section.get('title', '')}
+    if kind == 'experience':
+        return {'type': kind, 'entries': await _extract_experience_section(scope, info)}
+    if kind == 'education':
+        return {'type': kind, 'entries': await _extract_education_section(scope, info)}
+    if kind == 'skills':
+        return {'type': kind, 'skills': await _extract_skills_section(scope, info)}
+    if source:
+        # Free-text sections are repaired locally: the source minus its header
+        return {'type': kind, 'text': '\n'.join(source.split('\n')[1:]).strip()}
+    return _section_content(section)
+
+
+async def _parse_single_pass(text: str) -> dict[str, Any] | None:
+    """One schema-constrained call plus targeted repairs; None if the response is unusable."""
+    prompt = f"""Extract this resume into the JSON schema provided.
+
+Resume Text:
+{text[:SINGLE_PASS_MAX_CHARS]}
+
+Rules:
+- Extract exactly as written, no paraphrasing
+- One item in "sections" per resume section, in document order, with the title exactly as it appears
+- The professional summary/objective goes in "summary", not in "sections"
+- experience sections: fill "experience"; entries are identified by COMPANY NAME + JOB TITLE, dates are optional (use empty strings), include all bullets
+- education sections: fill "education"; skills sections: fill "skills"; any other section: copy its content into "text"
+- Leave fields that do not apply as empty strings or empty arrays"""
+
+    model = getattr(settings, 'openai_model_text', 'gpt-4o-mini')
+    try:
+        response = await _call_openai(
+            prompt, model, temperature=0.1, max_tokens=settings.openai_max_tokens,
+            purpose='single_pass',
+            response_format={
+                'type': 'json_schema',
+                'json_schema': {'name': 'resume', 'strict': True, 'schema': RESUME_SCHEMA},
+            },
+        )
+    except (TimeoutError, httpx.ReadTimeout):
+        raise
+    except Exception as e:
+        logger.warning(f"Single-pass extraction call failed: {e}")
+        return None
+
+    try:
+        response_text = response.strip()
+        response_text = re.sub(r"^```json\s*", "", response_text)
+        response_text = re.sub(r"\s*```$", "", response_text)
+        data = json.loads(response_text)
+    except json.JSONDecodeError as e:
+        logger.warning(f"Failed to parse single-pass response: {e}")
+        return None
+    if not isinstance(data, dict) or not isinstance(data.get('sections'), list):
+        return None
+
+    sections = [section for section in data['sections'] if isinstance(section, dict)]
+    slices = _section_slices(text, [section.get('title', '') for section in sections])
+    contents = [_section_content(section) for section in sections]
+    failing = []
+    for index, section in enumerate(sections):
+        problems = _validate_section(section, slices[index])
+        if problems:
+            logger.info(f"Single-pass section '{section.get('title', '')}' needs repair: {problems}")
+            failing.append(index)
+
+    if failing:
+        repairs = await asyncio.gather(
+            *(_repair_section(sections[index], slices[index], text) for index in failing),
+            return_exceptions=True,
+        )
+        for index, repaired in zip(failing, repairs, strict=True):
+            if isinstance(repaired, (TimeoutError, httpx.ReadTimeout)):
+                raise repaired
+            if isinstance(repaired, Exception):
+                logger.warning(f"Repair of section '{sections[index].get('title', '')}' failed: {repaired}")
+                continue
+            contents[index] = repaired
+
+    sections_map = [
+        {'title': section.get('title', ''), 'type': section.get('type', 'other')}
+        for section in sections
+    ]
+    all_content = {
+        'summary': data.get('summary', ''),
+        'sections': {item['title']: content for item, content in zip(sections_map, contents, strict=True)},
+    }
+    result = _assemble_content(text, sections_map, all_content)
+    for field in ('name', 'title', 'email', 'phone', 'location'):
+        value = data.get(field)
+        if isinstance(value, str) and value.strip():
+            result[field] = value.strip()
+    logger.info(f"Single-pass parsing: {len(sections)} sections, {len(failing)} repaired")
+    return result
+
+
 async def _extract_all_sections_batch(
     text: str,
     sections_map: list[dict[str, Any]]
@@ -366,8 +636,11 @@ Rules:
     try:
         # Add timeout to individual API call
         response = await asyncio.wait_for(
-            _call_openai(prompt, model, temperature=0.1, max_tokens=settings.openai_max_tokens),
-            timeout=45.0  # 45 second timeout for this call
+            _call_openai(
+                prompt, model, temperature=0.1, max_tokens=settings.openai_max_tokens,
+                purpose='extract_content',
+            ),
+            timeout=deadline_budget(45.0)  # 45 second timeout for this call, within the request deadline
         )
     except asyncio.TimeoutError:
         logger.error("Batch extraction API call timed out")
@@ -428,7 +701,7 @@ IMPORTANT RULES:
 Return ONLY valid JSON (no markdown code blocks)."""
 
     model = getattr(settings, 'openai_model_text', 'gpt-4o-mini')
-    response = await _call_openai(prompt, model, temperature=0.1)
+    response = await _call_openai(prompt, model, temperature=0.1, purpose='extract_section')
     
     try:
         response_text = response.strip()
@@ -469,7 +742,7 @@ Return JSON array:
 Return ONLY valid JSON (no markdown code blocks)."""
 
     model = getattr(settings, 'openai_model_text', 'gpt-4o-mini')
-    response = await _call_openai(prompt, model, temperature=0.1)
+    response = await _call_openai(prompt, model, temperature=0.1, purpose='extract_section')
     
     try:
         response_text = response.strip()
@@ -501,7 +774,7 @@ Return JSON array:
 Return ONLY valid JSON (no markdown code blocks)."""
 
     model = getattr(settings, 'openai_model_text', 'gpt-4o-mini')
-    response = await _call_openai(prompt, model, temperature=0.1)
+    response = await _call_openai(prompt, model, temperature=0.1, purpose='extract_section')
     
     try:
         response_text = response.strip()
@@ -539,16 +812,14 @@ async def _extract_generic_section(
     return []
 
 
-async def _call_openai(prompt: str, model: str, temperature: float = 0.1, max_tokens: int = 2000) -> str:
-    """Call OpenAI API and return response text."""
-    if not openai_client:
-        raise ValueError("OpenAI client not available")
-    
-    headers = {
-        "Authorization": f"Bearer {openai_client['api_key']}",
-        "Content-Type": "application/json",
-    }
-    
+def _chat_payload(
+    prompt: str,
+    model: str,
+    temperature: float,
+    max_tokens: int,
+    response_format: dict[str, Any] | None = None,
+) -> dict[str, Any]:
+    """Chat completion payload with the parser's system prompt."""
     data = {
         "model": model,
         "messages": [
@@ -561,7 +832,29 @@ async def _call_openai(prompt: str, model: str, temperature: float = 0.1, max_to
         "temperature": temperature,
         "max_tokens": max_tokens,
     }
+    if response_format is not None:
+        data["response_format"] = response_format
+    return data
+
+
+async def _call_openai(
+    prompt: str,
+    model: str,
+    temperature: float = 0.1,
+    max_tokens: int = 2000,
+    purpose: str = 'structured',
+    response_format: dict[str, Any] | None = None,
+) -> str:
+    """Call OpenAI API and return response text; usage is recorded under ``purpose``."""
+    if not openai_client:
+        raise ValueError("OpenAI client not available")
     
+    headers = {
+        "Authorization": f"Bearer {openai_client['api_key']}",
+        "Content-Type": "application/json",
+    }
+    data = _chat_payload(prompt, model, temperature, max_tokens, response_format)
+
     httpx_client = get_httpx_client()
     if httpx_client:
         # Use shorter timeout for individual calls
@@ -574,6 +867,7 @@ async def _call_openai(prompt: str, model: str, temperature: float = 0.1, max_to
         )
         if response.status_code == 200:
             result = response.json()
+            record_llm_call(purpose, result.get("usage"))
             return result["choices"][0]["message"]["content"].strip()
         else:
             raise Exception(f"OpenAI API error: {response.status_code}")
@@ -3,13 +3,14 @@
 from __future__ import annotations
 
 import asyncio
-import base64
 import json
 import logging
 import re
+from collections.abc import AsyncIterator
 from typing import Any
 
 from app.core.config import settings
+from app.core.deadline import deadline_budget
 from app.core.openai_client import get_httpx_client, openai_client
 
 logger = logging.getLogger(__name__)
@@ -51,13 +52,14 @@ def _assign_unique_ids(sections: list[dict[str, Any]]) -> list[dict[str, Any]]:
 
 
 async def parse_with_vision(
-    vision_pages: list[dict[str, Any]]
+    vision_pages: list[dict[str, Any]] | AsyncIterator[dict[str, Any]]
 ) -> dict[str, Any]:
     """
     Use GPT-4o Vision to extract structured content from resume images.
     
     Args:
-        vision_pages: List of page data with base64 images from vision extractor
+        vision_pages: Page data with base64 images from the vision extractor,
+            either a list or the stream from ``stream_vision_pages``
         
     Returns:
         Parsed resume data in standard format
@@ -68,123 +70,155 @@ async def parse_with_vision(
 
     try:
         model = getattr(settings, 'openai_model_vision', 'gpt-4o')
-        
-        # Process all pages in parallel for faster parsing
-        logger.info(f"Processing {len(vision_pages)} pages in parallel with vision")
-        page_tasks = [
-            _process_page_with_vision(
-                page_data['image_base64'],
-                model,
-                page_data['page_num']
-            )
-            for page_data in vision_pages
-        ]
-        
-        # Wait for all pages to complete in parallel with timeout
+
+        # Each page's vision call starts as soon as that page is rasterized
         # Each page gets 90 seconds (reduced from 120), total should be ~90s for all pages
         try:
             page_results = await asyncio.wait_for(
-                asyncio.gather(*page_tasks, return_exceptions=True),
-                timeout=90.0
+                _process_pages(vision_pages, model),
+                timeout=deadline_budget(90.0)
             )
         except asyncio.TimeoutError:
-            logger.error(f"Vision parsing timed out after 90 seconds processing {len(vision_pages)} pages")
+            logger.error("Vision parsing timed out (90 seconds or the request deadline)")
             raise
         
-        # Merge results from all pages
-        all_sections = []
-        contact_info = {
-            'name': '',
-            'title': '',
-            'email': '',
-            'phone': '',
-            'location': ''
-        }
-        summary = ''
-        
-        for idx, result in enumerate(page_results):
-            if isinstance(result, Exception):
-                logger.error(f"Error processing page {idx + 1}: {result}")
-                continue
-                
-            # Merge contact info (use first non-empty value)
-            if result.get('name') and not contact_info['name']:
-                contact_info['name'] = result.get('name', '')
-            if result.get('title') and not contact_info['title']:
-                contact_info['title'] = result.get('title', '')
-            if result.get('email') and not contact_info['email']:
-                contact_info['email'] = result.get('email', '')
-            if result.get('phone') and not contact_info['phone']:
-                contact_info['phone'] = result.get('phone', '')
-            if result.get('location') and not contact_info['location']:
-                contact_info['location'] = result.get('location', '')
-            
-            if result.get('summary') and not summary:
-                summary = result.get('summary', '')
-            
-            # Merge sections (avoid duplicates)
-            for section in result.get('sections', []):
-                # Normalize section title for matching
-                section_title_lower = _normalize_section_title(section.get('title', ''))
-                
-                # Check if section already exists (case-insensitive)
-                existing = next(
-                    (
-                        s for s in all_sections
-                        if _normalize_section_title(s.get('title', '')) == section_title_lower
-                    ),
-                    None
-                )
-                if existing:
-                    # Merge bullets and deduplicate
-                    existing_bullet_texts = {
-                        bullet['text'].strip().lower() 
-                        for bullet in existing['bullets'] 
-                        if bullet.get('text', '').strip()
-                    }
-                    
-                    duplicate_count = 0
-                    for bullet in section.get('bullets', []):
-                        bullet_text = bullet.get('text', '').strip()
-                        if bullet_text:
-                            bullet_lower = bullet_text.lower()
-                            # Only add if not duplicate (case-insensitive)
-                            if bullet_lower not in existing_bullet_texts:
-                                existing['bullets'].append(bullet)
-                                existing_bullet_texts.add(bullet_lower)
-                            else:
-                                duplicate_count += 1
-                    
-                    if duplicate_count > 0:
-                        logger.debug(
-                            f"Merged section '{section['title']}': "
-                            f"skipped {duplicate_count} duplicate bullets"
-                        )
-                else:
-                    all_sections.append(section)
-        
-        logger.info(
-            f"Vision parsing complete: {len(all_sections)} sections, "
-            f"{sum(len(s.get('bullets', [])) for s in all_sections)} total bullets"
-        )
+        return merge_page_results(page_results)
 
-        all_sections = _assign_unique_ids(all_sections)
-
-        return {
-            **contact_info,
-            'summary': summary,
-            'sections': all_sections
-        }
-        
     except Exception as e:
         logger.error(f"Vision parsing failed: {e}", exc_info=True)
         return _create_empty_result()
 
 
+def merge_page_results(page_results: list[dict[str, Any] | BaseException]) -> dict[str, Any]:
+    """Merge per-page (or per-region) vision results in order.
+
+    Contact fields and summary take the first non-empty value; sections with
+    the same normalized title are merged with duplicate bullets dropped.
+    """
+    all_sections = []
+    contact_info = {
+        'name': '',
+        'title': '',
+        'email': '',
+        'phone': '',
+        'location': ''
+    }
+    summary = ''
+
+    for idx, result in enumerate(page_results):
+        if isinstance(result, Exception):
+            logger.error(f"Error processing page {idx + 1}: {result}")
+            continue
+
+        # Merge contact info (use first non-empty value)
+        if result.get('name') and not contact_info['name']:
+            contact_info['name'] = result.get('name', '')
+        if result.get('title') and not contact_info['title']:
+            contact_info['title'] = result.get('title', '')
+        if result.get('email') and not contact_info['email']:
+            contact_info['email'] = result.get('email', '')
+        if result.get('phone') and not contact_info['phone']:
+            contact_info['phone'] = result.get('phone', '')
+        if result.get('location') and not contact_info['location']:
+            contact_info['location'] = result.get('location', '')
+
+        if result.get('summary') and not summary:
+            summary = result.get('summary', '')
+
+        # Merge sections (avoid duplicates)
+        for section in result.get('sections', []):
+            # Normalize section title for matching
+            section_title_lower = _normalize_section_title(section.get('title', ''))
+
+            # Check if section already exists (case-insensitive)
+            existing = next(
+                (
+                    s for s in all_sections
+                    if _normalize_section_title(s.get('title', '')) == section_title_lower
+                ),
+                None
+            )
+            if existing:
+                # Merge bullets and deduplicate
+                existing_bullet_texts = {
+                    bullet['text'].strip().lower()
+                    for bullet in existing['bullets']
+                    if bullet.get('text', '').strip()
+                }
+
+                duplicate_count = 0
+                for bullet in section.get('bullets', []):
+                    bullet_text = bullet.get('text', '').strip()
+                    if bullet_text:
+                        bullet_lower = bullet_text.lower()
+                        # Only add if not duplicate (case-insensitive)
+                        if bullet_lower not in existing_bullet_texts:
+                            existing['bullets'].append(bullet)
+                            existing_bullet_texts.add(bullet_lower)
+                        else:
+                            duplicate_count += 1
+
+                if duplicate_count > 0:
+                    logger.debug(
+                        f"Merged section '{section['title']}': "
+                        f"skipped {duplicate_count} duplicate bullets"
+                    )
+            else:
+                all_sections.append(section)
+
+    logger.info(
+        f"Vision parsing complete: {len(all_sections)} sections, "
+        f"{sum(len(s.get('bullets', [])) for s in all_sections)} total bullets"
+    )
+
+    all_sections = _assign_unique_ids(all_sections)
+
+    return {
+        **contact_info,
+        'summary': summary,
+        'sections': all_sections
+    }
+
+
+async def _process_pages(
+    vision_pages: list[dict[str, Any]] | AsyncIterator[dict[str, Any]],
+    model: str,
+) -> list[dict[str, Any] | BaseException]:
+    """Start one vision call per page as pages arrive; results in page order."""
+    tasks: dict[int, asyncio.Task] = {}
+
+    def start(page_data: dict[str, Any]) -> None:
+        tasks[page_data['page_num']] = asyncio.create_task(
+            _process_page_with_vision(
+                page_data['image_base64'],
+                model,
+                page_data['page_num'],
+                page_data.get('mime_type', 'image/png'),
+            )
+        )
+
+    try:
+        if isinstance(vision_pages, list):
+            for page_data in vision_pages:
+                start(page_data)
+        else:
+            async for page_data in vision_pages:
+                start(page_data)
+        logger.info(f"Processing {len(tasks)} pages in parallel with vision")
+        return await asyncio.gather(
+            *(tasks[page_num] for page_num in sorted(tasks)),
+            return_exceptions=True,
+        )
+    finally:
+        for task in tasks.values():
+            task.cancel()
+
+
 async def _process_page_with_vision(
     image_base64: str,
     model: str,
-    page_num: int
+    page_num: int,
+    mime_type: str = 'image/png',
 ) -> dict[str, Any]:
     """Process a single page image with vision API."""
     
@@ -241,7 +275,7 @@ CRITICAL RULES:
                     {
                         "type": "image_url",
                         "image_url": {
-                            "url": f"data:image/png;base64,{image_base64}"
+                            "url": f"data:{mime_type};base64,{image_base64}"
                         }
                     }
                 ]
@@ -264,7 +298,7 @@ CRITICAL RULES:
     
     if response.status_code != 200:
         error_text = response.text if hasattr(response, 'text') else str(response.content)
-        logger.error(f"OpenAI Vision API error: {response.status_code} - {error_text}")
+        logger.error(f"OpenAI Vision API error on page {page_num}: {response.status_code} - {error_text}")
         raise Exception(f"Vision API error: {response.status_code}")
     
     result = response.json()
@@ -305,7 +339,7 @@ CRITICAL RULES:
         }
         
     except json.JSONDecodeError as e:
-        logger.error(f"Failed to parse vision response: {e}")
+        logger.error(f"Failed to parse vision response for page {page_num}: {e}")
         logger.debug(f"Response text: {ai_response[:500]}")
         return _create_empty_result()
 
@@ -0,0 +1,31 @@
+"""Stage reporting for long-running parses.
+
+``parse_resume`` calls ``report_stage`` as it moves through the pipeline; a
+caller that wants progress (the parse job queue) installs a callback with
+``progress_reporter`` around the call. Without one, reporting is a no-op.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+STAGES = ('queued', 'extracting', 'analyzing_layout', 'ai_parsing', 'validating', 'done')
+
+_reporter: ContextVar[Callable[[str], None] | None] = ContextVar('parse_progress_reporter', default=None)
+
+
+def report_stage(stage: str) -> None:
+    reporter = _reporter.get()
+    if reporter is not None:
+        reporter(stage)
+
+
+@contextmanager
+def progress_reporter(callback: Callable[[str], None]) -> Iterator[None]:
+    token = _reporter.set(callback)
+    try:
+        yield
+    finally:
+        _reporter.reset(token)
@@ -0,0 +1,145 @@
+"""Speculative regex parse raced against the AI pipeline.
+
+For resumes whose complexity score falls in the speculation band (close to
+the point where the orchestrator switches parsers, so the first choice is
+often wrong), the regex legacy parser starts on a worker thread at the same
+time as the AI pipeline. If the AI pipeline has not finished within
+``speculation_latency_slo_seconds`` (or fails) and the regex result scores at
+least ``speculation_min_legacy_confidence``, the regex result is returned and
+the AI task is cancelled. ``speculation_budget_per_minute`` caps how many
+races start per minute, which bounds the AI calls that get cancelled midway.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from app.core.config import settings
+from app.utils.resume_parsing import normalize_extracted_text, parse_resume_with_regex
+
+from .validators import validate_and_score
+
+logger = logging.getLogger(__name__)
+
+
+class SpeculationBudget:
+    """Allows at most ``per_minute`` races in any sliding 60 second window."""
+
+    def __init__(self, per_minute: int, clock: Callable[[], float] = time.monotonic):
+        self.per_minute = per_minute
+        self._clock = clock
+        self._started: deque[float] = deque()
+        self._lock = threading.Lock()
+
+    def try_acquire(self) -> bool:
+        now = self._clock()
+        with self._lock:
+            while self._started and now - self._started[0] >= 60:
+                self._started.popleft()
+            if len(self._started) >= self.per_minute:
+                return False
+            self._started.append(now)
+            return True
+
+
+speculation_budget = SpeculationBudget(settings.speculation_budget_per_minute)
+
+
+def should_speculate(complexity_score: float) -> bool:
+    if not settings.enable_speculative_parsing or not settings.enable_legacy_parser:
+        return False
+    if not settings.speculation_band_low <= complexity_score <= settings.speculation_band_high:
+        return False
+    if not speculation_budget.try_acquire():
+        logger.info("Speculation budget exhausted, running the AI pipeline alone")
+        return False
+    return True
+
+
+def _parse_with_regex(raw_text: str) -> dict[str, Any]:
+    parsed = parse_resume_with_regex(normalize_extracted_text(raw_text))
+    parsed.pop('detected_variables', None)
+    return parsed
+
+
+def _legacy_result(
+    parsed_data: dict[str, Any],
+    validation_result: dict[str, Any],
+    complexity_score: float,
+    raw_text: str,
+    start_time: float,
+    reason: str,
+) -> dict[str, Any]:
+    return {
+        'success': True,
+        'data': {
+            'name': parsed_data.get('name', ''),
+            'title': parsed_data.get('title', ''),
+            'email': parsed_data.get('email', ''),
+            'phone': parsed_data.get('phone', ''),
+            'location': parsed_data.get('location', ''),
+            'summary': parsed_data.get('summary', ''),
+            'sections': parsed_data.get('sections', [])
+        },
+        'metadata': {
+            'complexity_score': complexity_score,
+            'confidence_score': validation_result['overall_confidence'],
+            'parsing_method': 'legacy_speculative',
+            'processing_time_ms': int((time.time() - start_time) * 1000),
+            'issues': [reason, *validation_result['issues']],
+            'speculation': {'winner': 'legacy'},
+        },
+        'raw_text': raw_text[:1000]
+    }
+
+
+async def race_with_legacy(
+    ai_pipeline: Awaitable[dict[str, Any]],
+    raw_text: str,
+    complexity_score: float,
+    start_time: float,
+) -> dict[str, Any]:
+    """Return the AI result if it arrives within the SLO, else a good enough regex result."""
+    ai_task = asyncio.ensure_future(ai_pipeline)
+    legacy_task = asyncio.ensure_future(asyncio.to_thread(_parse_with_regex, raw_text))
+    slo = settings.speculation_latency_slo_seconds
+    try:
+        await asyncio.wait({ai_task}, timeout=slo)
+        if ai_task.done() and not ai_task.exception() and ai_task.result().get('success'):
+            result = ai_task.result()
+            result.setdefault('metadata', {})['speculation'] = {'winner': 'ai'}
+            return result
+        reason = (
+            'AI parser failed' if ai_task.done()
+            else f'AI parser exceeded the {slo:g}s latency SLO'
+        )
+
+        try:
+            legacy_data = await legacy_task
+        except Exception as e:
+            logger.warning(f"Speculative regex parse failed: {e}")
+            legacy_data = None
+        if legacy_data and (legacy_data.get('name') or legacy_data.get('sections')):
+            validation_result = validate_and_score(legacy_data)
+            if validation_result['overall_confidence'] >= settings.speculation_min_legacy_confidence:
+                logger.info(
+                    f"Speculation: returning regex result ({reason}, "
+                    f"confidence={validation_result['overall_confidence']:.2f})"
+                )
+                return _legacy_result(
+                    legacy_data, validation_result, complexity_score, raw_text, start_time, reason
+                )
+
+        result = await ai_task
+        result.setdefault('metadata', {})['speculation'] = {'winner': 'ai'}
+        return result
+    finally:
+        for task in (ai_task, legacy_task):
+            if not task.done():
+                task.cancel()
@@ -1,6 +1,7 @@
 """Validators for confidence scoring and validation."""
-from .confidence_scorer import validate_and_score
+from .confidence_scorer import score_region, validate_and_score
 
 __all__ = [
+    'score_region',
     'validate_and_score',
 ]
@@ -275,3 +275,61 @@ def _check_format_consistency(
         issues.append("Inconsistent bullet formatting")
     
     return max(0.0, score), issues
+
+
+# Characters pdfplumber emits for glyphs it cannot map to text
+_GARBLED_PATTERN = re.compile(r'\(cid:\d+\)|[\ufffd\ue000-\uf8ff]')
+
+
+def score_region(
+    blocks: list[dict[str, Any]],
+    bbox: tuple[float, float, float, float],
+    page_width: float,
+    image_boxes: list[tuple[float, float, float, float]],
+) -> tuple[float, list[str]]:
+    """
+    Estimate how reliably a layout region was extracted as text (0.0 to 1.0).
+
+    Penalizes the signals that make text extraction of a region unreliable:
+    unmapped glyphs, table/chip-like fragments, sparse text over a large
+    area (graphics), overlap with images and narrow sidebars.
+    Returns (score, list of issues).
+    """
+    issues = []
+    text = ' '.join(block.get('text', '') for block in blocks).strip()
+    if not text:
+        return 0.0, ['Region has no extractable text']
+
+    score = 1.0
+
+    garbled = sum(len(match) for match in _GARBLED_PATTERN.findall(text))
+    if garbled:
+        score -= min(0.6, 3 * garbled / len(text))
+        issues.append(f"{garbled} unmapped glyph characters")
+
+    fragments = sum(1 for block in blocks if len(block.get('text', '').split()) <= 2)
+    fragment_ratio = fragments / len(blocks)
+    if len(blocks) >= 4 and fragment_ratio > 0.5:
+        score -= 0.3 * fragment_ratio
+        issues.append(f"{fragments} of {len(blocks)} blocks are short fragments (table or chips)")
+
+    x0, y0, x1, y1 = bbox
+    area = max((x1 - x0) * (y1 - y0), 1.0)
+    chars_per_sq_inch = len(text) / (area / 5184.0)
+    if chars_per_sq_inch < 8:
+        score -= 0.25
+        issues.append("Sparse text for its area (likely graphics)")
+
+    overlap = sum(
+        max(0.0, min(x1, ix1) - max(x0, ix0)) * max(0.0, min(y1, iy1) - max(y0, iy0))
+        for ix0, iy0, ix1, iy1 in image_boxes
+    )
+    if overlap / area > 0.2:
+        score -= 0.35
+        issues.append("Region overlaps images")
+
+    if page_width > 0 and (x1 - x0) < 0.3 * page_width:
+        score -= 0.15
+        issues.append("Narrow sidebar column")
+
+    return max(0.0, score), issues
@@ -1,21 +1,111 @@
-"""URL scraper service for extracting job description content from job posting URLs"""
-
+"""URL scraper service for extracting job description content from job posting URLs
+
+Scrapes share one pooled ``httpx.AsyncClient``. At most
+``scraper_per_domain_concurrency`` requests run against a host at a time, and
+a page larger than ``scraper_max_page_bytes`` is abandoned mid-download. A
+successful scrape is cached per URL. It is served as is for
+``scraper_cache_ttl_seconds``; after that it is revalidated with a
+conditional GET (ETag / Last-Modified), and a 304 reuses it. HTML is parsed
+in a worker thread. LinkedIn and Indeed pages are first parsed only for the
+elements their extractors read (``SoupStrainer``); the full page is parsed
+only when that finds no description.
+"""
+
+import asyncio
 import logging
 import re
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any
 from urllib.parse import urlparse
 
 import httpx
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
+
+from app.core.config import settings
+from app.core.deadline import DeadlineExceeded, DeadlineTransport
 
 logger = logging.getLogger(__name__)
 
 
+def _strainer(tags: set[str], markers: dict[str, tuple[str, ...]]) -> SoupStrainer:
+    """Keep ``tags`` and any element whose attribute contains one of its markers."""
+
+    def keep(name: str, attrs: dict[str, Any]) -> bool:
+        if name in tags:
+            return True
+        for attr, needles in markers.items():
+            value = attrs.get(attr)
+            if isinstance(value, list):
+                value = " ".join(value)
+            if value and any(needle in value for needle in needles):
+                return True
+        return False
+
+    return SoupStrainer(keep)
+
+
+# The elements the LinkedIn and Indeed extractors select from
+SITE_STRAINERS = {
+    "linkedin.com": _strainer(
+        {"title", "h1"},
+        {
+            "class": (
+                "top-card", "topcard", "company-name", "description",
+                "show-more-less-html", "jobs-box__html-content",
+            ),
+            "data-test-id": ("job-description",),
+            "data-tracking-control-name": ("org-name",),
+            "href": ("/company/",),
+        },
+    ),
+    "indeed.com": _strainer(
+        {"title", "h1", "h2"},
+        {
+            "class": ("jobsearch-",),
+            "id": ("jobDescriptionText",),
+            "data-testid": ("job-title", "inlineHeader-companyName", "job-poster", "job-description"),
+        },
+    ),
+}
+
+
+@dataclass
+class CachedPage:
+    result: dict[str, Any]
+    etag: str | None
+    last_modified: str | None
+    fetched_at: float
+
+
 class URLScraper:
-    def __init__(self, timeout: int = 30):
-        self.timeout = timeout
+    def __init__(
+        self,
+        timeout: float | None = None,
+        max_page_bytes: int | None = None,
+        per_domain_concurrency: int | None = None,
+        cache_ttl: float | None = None,
+        cache_size: int | None = None,
+        max_connections: int | None = None,
+    ):
+        self.timeout = timeout if timeout is not None else settings.scraper_timeout_seconds
+        self.max_page_bytes = max_page_bytes or settings.scraper_max_page_bytes
+        self.per_domain_concurrency = per_domain_concurrency or settings.scraper_per_domain_concurrency
+        self.cache_ttl = cache_ttl if cache_ttl is not None else settings.scraper_cache_ttl_seconds
+        self.cache_size = cache_size if cache_size is not None else settings.scraper_cache_max_entries
+        self.max_connections = max_connections or settings.scraper_max_connections
         self.headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
         }
+        self._client: httpx.AsyncClient | None = None
+        # Per-host semaphore and how many requests hold or wait on it; dropped when idle
+        self._domain_slots: dict[str, asyncio.Semaphore] = {}
+        self._domain_users: dict[str, int] = {}
+        self._cache: OrderedDict[str, CachedPage] = OrderedDict()
+        self.stats = {"fetches": 0, "cache_hits": 0, "revalidated": 0, "too_large": 0}
 
     def is_valid_url(self, url: str) -> bool:
         try:
@@ -274,79 +364,177 @@ class URLScraper:
         text = text.strip()
         return text
 
-    def scrape_url(self, url: str) -> dict:
+    def _site(self, domain: str) -> str | None:
+        return next((site for site in SITE_STRAINERS if site in domain), None)
+
+    def _extract_site(self, soup: BeautifulSoup, site: str | None) -> dict[str, str | None]:
+        if site == "linkedin.com":
+            return {
+                "title": self._extract_linkedin_title(soup),
+                "company": self._extract_linkedin_company(soup),
+                "work_type": self._extract_linkedin_work_type(soup),
+                "content": self._extract_linkedin_content(soup),
+            }
+        if site == "indeed.com":
+            return {
+                "title": self._extract_indeed_title(soup),
+                "company": self._extract_indeed_company(soup),
+                "work_type": self._extract_indeed_work_type(soup),
+                "content": self._extract_indeed_content(soup),
+            }
+        return {"title": None, "company": None, "work_type": None, "content": None}
+
+    def parse_page(self, html: bytes, url: str) -> dict:
+        """Extract the posting from a fetched page (CPU-bound; run off the event loop)."""
+        domain = urlparse(url).netloc.lower()
+        site = self._site(domain)
+
+        fields = None
+        if site:
+            # A page with a job description is not a login page, so the partial parse can stand
+            partial = BeautifulSoup(html, "lxml", parse_only=SITE_STRAINERS[site])
+            fields = self._extract_site(partial, site)
+            if not fields["content"]:
+                fields = None
+
+        if fields is None:
+            soup = BeautifulSoup(html, "lxml")
+
+            # Check if we got a login page
+            if self._is_login_page(soup, url):
+                if "linkedin.com" in domain:
+                    raise ValueError(
+                        "This LinkedIn job posting requires authentication. "
+                        "Please copy and paste the job description text directly, or ensure you're logged into LinkedIn and try again."
+                    )
+                else:
+                    raise ValueError(
+                        "This job posting requires authentication. "
+                        "Please copy and paste the job description text directly."
+                    )
+
+            fields = self._extract_site(soup, site)
+            if not fields["content"]:
+                fields["content"] = self._extract_generic_content(soup)
+                if not fields["title"]:
+                    fields["title"] = self._extract_generic_title(soup)
+                if not fields["company"]:
+                    fields["company"] = self._extract_generic_company(soup)
+                if not fields["work_type"]:
+                    fields["work_type"] = self._extract_generic_work_type(soup)
+
+        content = fields["content"]
+        if not content or len(content.strip()) < 100:
+            raise ValueError("Could not extract sufficient content from the URL")
+
+        result = {
+            "success": True,
+            "content": self._clean_text(content),
+            "url": url
+        }
+        for key in ("title", "company", "work_type"):
+            if fields[key]:
+                result[key] = fields[key]
+        return result
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            limits = httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_connections,
+            )
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                headers=self.headers,
+                follow_redirects=True,
+                transport=DeadlineTransport(httpx.AsyncHTTPTransport(limits=limits)),
+            )
+        return self._client
+
+    @asynccontextmanager
+    async def _domain_slot(self, domain: str) -> AsyncIterator[None]:
+        slot = self._domain_slots.get(domain)
+        if slot is None:
+            slot = self._domain_slots[domain] = asyncio.Semaphore(self.per_domain_concurrency)
+        self._domain_users[domain] = self._domain_users.get(domain, 0) + 1
+        try:
+            async with slot:
+                yield
+        finally:
+            self._domain_users[domain] -= 1
+            if not self._domain_users[domain]:
+                del self._domain_users[domain]
+                del self._domain_slots[domain]
+
+    def _cached(self, url: str) -> CachedPage | None:
+        page = self._cache.get(url)
+        if page is not None:
+            self._cache.move_to_end(url)
+        return page
+
+    def _store(self, url: str, page: CachedPage) -> None:
+        if self.cache_size <= 0:
+            return
+        self._cache[url] = page
+        self._cache.move_to_end(url)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    async def _fetch(
+        self, url: str, cached: CachedPage | None
+    ) -> tuple[bytes | None, str | None, str | None]:
+        """GET ``url`` with a size cap; returns ``(body, etag, last_modified)``, no body if ``cached`` is current."""
+        headers = {}
+        if cached is not None:
+            if cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+
+        self.stats["fetches"] += 1
+        async with self._get_client().stream("GET", url, headers=headers) as response:
+            if response.status_code == 304 and cached is not None:
+                return None, cached.etag, cached.last_modified
+            response.raise_for_status()
+
+            limit_mb = self.max_page_bytes / 1_000_000
+            declared = response.headers.get("Content-Length", "")
+            if declared.isdigit() and int(declared) > self.max_page_bytes:
+                self.stats["too_large"] += 1
+                raise ValueError(f"The page is larger than {limit_mb:g} MB")
+            chunks = []
+            size = 0
+            async for chunk in response.aiter_bytes():
+                size += len(chunk)
+                if size > self.max_page_bytes:
+                    self.stats["too_large"] += 1
+                    raise ValueError(f"The page is larger than {limit_mb:g} MB")
+                chunks.append(chunk)
+            return b"".join(chunks), response.headers.get("ETag"), response.headers.get("Last-Modified")
+
+    async def scrape_url(self, url: str) -> dict:
         if not self.is_valid_url(url):
             raise ValueError(f"Invalid URL: {url}")
 
-        try:
-            with httpx.Client(timeout=self.timeout, headers=self.headers, follow_redirects=True) as client:
-                response = client.get(url)
-                response.raise_for_status()
-
-                soup = BeautifulSoup(response.content, "lxml")
-
-                # Check if we got a login page
-                if self._is_login_page(soup, url):
-                    parsed_url = urlparse(url)
-                    domain = parsed_url.netloc.lower()
-                    if "linkedin.com" in domain:
-                        raise ValueError(
-                            "This LinkedIn job posting requires authentication. "
-                            "Please copy and paste the job description text directly, or ensure you're logged into LinkedIn and try again."
-                        )
-                    else:
-                        raise ValueError(
-                            "This job posting requires authentication. "
-                            "Please copy and paste the job description text directly."
-                        )
-
-                parsed_url = urlparse(url)
-                domain = parsed_url.netloc.lower()
-
-                content = None
-                title = None
-                company = None
-                work_type = None
-
-                if "linkedin.com" in domain:
-                    title = self._extract_linkedin_title(soup)
-                    company = self._extract_linkedin_company(soup)
-                    work_type = self._extract_linkedin_work_type(soup)
-                    content = self._extract_linkedin_content(soup)
-                elif "indeed.com" in domain:
-                    title = self._extract_indeed_title(soup)
-                    company = self._extract_indeed_company(soup)
-                    work_type = self._extract_indeed_work_type(soup)
-                    content = self._extract_indeed_content(soup)
-
-                if not content:
-                    content = self._extract_generic_content(soup)
-                    if not title:
-                        title = self._extract_generic_title(soup)
-                    if not company:
-                        company = self._extract_generic_company(soup)
-                    if not work_type:
-                        work_type = self._extract_generic_work_type(soup)
-
-                if not content or len(content.strip()) < 100:
-                    raise ValueError("Could not extract sufficient content from the URL")
-
-                cleaned_content = self._clean_text(content)
-                result = {
-                    "success": True,
-                    "content": cleaned_content,
-                    "url": url
-                }
-
-                if title:
-                    result["title"] = title
-                if company:
-                    result["company"] = company
-                if work_type:
-                    result["work_type"] = work_type
-
-                return result
+        cached = self._cached(url)
+        if cached is not None and time.monotonic() - cached.fetched_at < self.cache_ttl:
+            self.stats["cache_hits"] += 1
+            return dict(cached.result)
 
+        try:
+            async with self._domain_slot(urlparse(url).netloc.lower()):
+                html, etag, last_modified = await self._fetch(url, cached)
+            if html is None:
+                self.stats["revalidated"] += 1
+                cached.fetched_at = time.monotonic()
+                return dict(cached.result)
+
+            result = await asyncio.to_thread(self.parse_page, html, url)
+            self._store(url, CachedPage(result, etag, last_modified, time.monotonic()))
+            return dict(result)
+
+        except DeadlineExceeded:
+            raise
         except httpx.TimeoutException:
             logger.error(f"Timeout while fetching URL: {url}")
             raise ValueError("Request timed out. The URL may be unreachable or taking too long to respond.")
@@ -360,3 +548,10 @@ class URLScraper:
             logger.error(f"Error scraping URL {url}: {str(e)}", exc_info=True)
             raise ValueError(f"Failed to scrape URL: {str(e)}")
 
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+url_scraper = URLScraper()
@@ -0,0 +1,545 @@
+"""Pre-aggregated AI usage metering.
+
+Limit checks used to run ``COUNT(ai_usage.id)`` over a time window and every
+AI call inserted, committed and refreshed an ``ai_usage`` row before the
+feature could run. The meter replaces that with:
+
+* per-(subject, feature, bucket) counters in ``ai_usage_counters``, maintained
+  with an atomic ``INSERT ... ON CONFLICT DO UPDATE`` upsert;
+* an in-process cache of those counters so the hot limit check is a dict
+  lookup, reloaded from the counter table at most once per TTL;
+* a background flusher that batches counter increments and writes the raw
+  ``ai_usage`` audit events off the request path.
+
+If the database is unreachable, pending counter increments are kept merged per
+bucket (buckets outside every limit window are dropped) and at most
+``max_pending_events`` audit events are kept, oldest dropped first, so an
+outage cannot grow the queues without bound. ``backfill_counters`` seeds an
+empty counter table from the ``ai_usage`` rows of the open windows.
+
+Buckets are hourly, daily and monthly. The ``session`` period (a rolling
+24-hour window) is answered from the last 24 hourly buckets, so it may
+include up to one extra hour of usage compared to an exact window.
+
+Requests that can be abandoned by their client run inside a ``UsageHold``:
+their uses count against the limit at once but are only persisted when the
+hold is committed, so work cancelled on disconnect is not billed.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timedelta
+from typing import Any
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.models import AIUsage, AIUsageCounter
+
+logger = logging.getLogger(__name__)
+
+GRANULARITIES = ("hour", "day", "month")
+
+# Usage period (as used by USAGE_LIMITS) -> (counter granularity, buckets to sum)
+PERIOD_BUCKETS = {
+    "session": ("hour", 24),
+    "daily": ("day", 1),
+    "monthly": ("month", 1),
+}
+
+_SeriesKey = tuple[str, str, str]  # (subject_key, feature_type, granularity)
+_BucketKey = tuple[str, str, str, datetime]
+
+
+class UsageHold:
+    """Uses recorded by one request, persisted only once its work completes."""
+
+    def __init__(self) -> None:
+        self.events: list[dict[str, Any]] = []
+        self.keys: list[_BucketKey] = []
+
+
+_current_hold: ContextVar[UsageHold | None] = ContextVar("usage_hold", default=None)
+
+
+def current_usage_hold() -> UsageHold | None:
+    """The hold the current request records its usage into, if any."""
+    return _current_hold.get()
+
+
+@contextmanager
+def usage_hold_scope(hold: UsageHold) -> Iterator[UsageHold]:
+    """Record usage in the block (and tasks created in it) into ``hold``."""
+    token = _current_hold.set(hold)
+    try:
+        yield hold
+    finally:
+        _current_hold.reset(token)
+
+
+def subject_key(user_id: int | None, session_id: str | None) -> str | None:
+    """Return the counter subject for a user or guest session."""
+    if user_id:
+        return f"user:{user_id}"
+    if session_id:
+        return f"session:{session_id}"
+    return None
+
+
+def bucket_start(granularity: str, moment: datetime) -> datetime:
+    """Truncate ``moment`` to the start of its bucket."""
+    if granularity == "hour":
+        return moment.replace(minute=0, second=0, microsecond=0)
+    if granularity == "day":
+        return moment.replace(hour=0, minute=0, second=0, microsecond=0)
+    if granularity == "month":
+        return moment.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    raise ValueError(f"Unknown granularity: {granularity}")
+
+
+def _window_buckets(period: str, now: datetime) -> tuple[str, list[datetime]]:
+    granularity, span = PERIOD_BUCKETS.get(period, PERIOD_BUCKETS["monthly"])
+    current = bucket_start(granularity, now)
+    if granularity == "hour":
+        return granularity, [current - timedelta(hours=offset) for offset in range(span)]
+    return granularity, [current]
+
+
+def _oldest_live_buckets(now: datetime) -> dict[str, datetime]:
+    """Per granularity, the oldest bucket any limit window still reads."""
+    return {
+        granularity: _window_buckets(period, now)[1][-1]
+        for period, (granularity, _) in PERIOD_BUCKETS.items()
+    }
+
+
+def upsert_counters(
+    session: Session,
+    increments: dict[_BucketKey, int],
+    now: datetime,
+    add: bool = True,
+) -> None:
+    """Atomically add ``increments`` to their counter rows.
+
+    With ``add=False`` existing rows are left alone, so seeding is idempotent.
+    """
+    if not increments:
+        return
+
+    dialect = session.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:  # pragma: no cover - only PostgreSQL is deployed
+        raise RuntimeError(f"Usage counters are not supported on {dialect}")
+
+    table = AIUsageCounter.__table__
+    rows = [
+        {
+            "subject_key": subject,
+            "feature_type": feature_type,
+            "granularity": granularity,
+            "bucket_start": start,
+            "count": amount,
+            "updated_at": now,
+        }
+        for (subject, feature_type, granularity, start), amount in increments.items()
+    ]
+    index_elements = ["subject_key", "feature_type", "granularity", "bucket_start"]
+    stmt = dialect_insert(table).values(rows)
+    if add:
+        stmt = stmt.on_conflict_do_update(
+            index_elements=index_elements,
+            set_={
+                "count": table.c.count + stmt.excluded.count,
+                "updated_at": stmt.excluded.updated_at,
+            },
+        )
+    else:
+        stmt = stmt.on_conflict_do_nothing(index_elements=index_elements)
+    session.execute(stmt)
+
+
+def backfill_counters(session: Session, now: datetime | None = None) -> int:
+    """Seed ``ai_usage_counters`` from ``ai_usage`` for every open limit window.
+
+    Only runs on an empty counter table, and never overwrites a row, so it is
+    safe to run from several workers at startup. Returns the rows written.
+    """
+    if session.query(AIUsageCounter.id).first() is not None:
+        return 0
+
+    now = now or datetime.utcnow()
+    oldest = _oldest_live_buckets(now)
+    since = min(oldest.values())
+    increments: dict[_BucketKey, int] = {}
+    events = (
+        session.query(AIUsage.user_id, AIUsage.session_id, AIUsage.feature_type, AIUsage.created_at)
+        .filter(AIUsage.created_at >= since)
+        .yield_per(1000)
+    )
+    for user_id, session_id, feature_type, created_at in events:
+        subject = subject_key(user_id, session_id)
+        if not subject:
+            continue
+        for granularity in GRANULARITIES:
+            start = bucket_start(granularity, created_at)
+            if start >= oldest[granularity]:
+                key = (subject, feature_type, granularity, start)
+                increments[key] = increments.get(key, 0) + 1
+
+    upsert_counters(session, increments, now, add=False)
+    session.commit()
+    if increments:
+        logger.info(f"Backfilled {len(increments)} AI usage counters from ai_usage")
+    return len(increments)
+
+
+class UsageMeter:
+    """In-memory fast path over the ``ai_usage_counters`` table."""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] | None = None,
+        cache_ttl_seconds: float = 30.0,
+        flush_interval_seconds: float = 1.0,
+        clock: Callable[[], datetime] = datetime.utcnow,
+        max_pending_events: int = 10_000,
+    ) -> None:
+        self._session_factory = session_factory
+        self._cache_ttl = cache_ttl_seconds
+        self._flush_interval = flush_interval_seconds
+        self._clock = clock
+        self._max_pending_events = max_pending_events
+
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._buckets: dict[_BucketKey, int] = {}
+        self._loaded_at: dict[_SeriesKey, float] = {}
+        self._pending: dict[_BucketKey, int] = {}
+        self._inflight: dict[_BucketKey, int] = {}
+        self._held: dict[_BucketKey, int] = {}
+        self._events: list[dict[str, Any]] = []
+
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    # ------------------------------------------------------------------ reads
+
+    def get_count(
+        self,
+        user_id: int | None,
+        feature_type: str,
+        period: str = "session",
+        session_id: str | None = None,
+        db: Session | None = None,
+    ) -> int:
+        """Return usage for ``feature_type`` in the current ``period`` window."""
+        subject = subject_key(user_id, session_id)
+        if not subject:
+            return 0
+
+        now = self._clock()
+        granularity, starts = _window_buckets(period, now)
+        self._ensure_loaded(subject, feature_type, granularity, starts[-1], db)
+        with self._lock:
+            return self._window_count(subject, feature_type, granularity, starts)
+
+    def try_consume(
+        self,
+        user_id: int | None,
+        feature_type: str,
+        period: str,
+        limit: float,
+        session_id: str | None = None,
+        db: Session | None = None,
+        hold: UsageHold | None = None,
+    ) -> tuple[bool, int]:
+        """Check the limit and record one use in a single atomic step.
+
+        The use goes into ``hold`` (by default the request's current hold)
+        when there is one. Returns ``(allowed, usage_before_this_call)``.
+        """
+        subject = subject_key(user_id, session_id)
+        if not subject:
+            self.record(user_id, feature_type, session_id, hold)
+            return True, 0
+
+        now = self._clock()
+        granularity, starts = _window_buckets(period, now)
+        self._ensure_loaded(subject, feature_type, granularity, starts[-1], db)
+        with self._lock:
+            current = self._window_count(subject, feature_type, granularity, starts)
+            if current >= limit:
+                return False, current
+            self._record_locked(subject, user_id, session_id, feature_type, now, hold)
+        self._ensure_flusher()
+        return True, current
+
+    # ----------------------------------------------------------------- writes
+
+    def record(
+        self,
+        user_id: int | None,
+        feature_type: str,
+        session_id: str | None = None,
+        hold: UsageHold | None = None,
+    ) -> None:
+        """Record one AI call; persisted by the background flusher once any hold is committed."""
+        now = self._clock()
+        with self._lock:
+            self._record_locked(
+                subject_key(user_id, session_id), user_id, session_id, feature_type, now, hold
+            )
+        self._ensure_flusher()
+
+    def commit_hold(self, hold: UsageHold) -> None:
+        """Persist the uses held for a request whose work completed."""
+        with self._lock:
+            self._events.extend(hold.events)
+            for key in hold.keys:
+                self._release_held_locked(key)
+                self._pending[key] = self._pending.get(key, 0) + 1
+            hold.events, hold.keys = [], []
+        self._ensure_flusher()
+
+    def release_hold(self, hold: UsageHold) -> None:
+        """Drop the uses held for a request whose work was abandoned."""
+        with self._lock:
+            for key in hold.keys:
+                self._release_held_locked(key)
+                if self._buckets.get(key, 0) > 0:
+                    self._buckets[key] -= 1
+            hold.events, hold.keys = [], []
+
+    def flush(self) -> None:
+        """Write pending counter increments and audit events to the database."""
+        if self._session_factory is None:
+            return
+
+        with self._flush_lock:
+            with self._lock:
+                if not self._pending and not self._events:
+                    return
+                increments, self._pending = self._pending, {}
+                events, self._events = self._events, []
+                self._inflight = increments
+
+            now = self._clock()
+            session: Session | None = None
+            try:
+                session = self._session_factory()
+                upsert_counters(session, increments, now)
+                if events:
+                    session.execute(insert(AIUsage.__table__), events)
+                session.commit()
+            except Exception as exc:
+                if session is not None:
+                    session.rollback()
+                logger.warning(f"Failed to flush AI usage counters: {exc}")
+                with self._lock:
+                    self._requeue_locked(increments, events, now)
+            finally:
+                if session is not None:
+                    session.close()
+                with self._lock:
+                    self._inflight = {}
+                    self._prune(now)
+
+    def start(self) -> None:
+        """Start the background flusher thread if it is not running."""
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._stopped.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="usage-meter-flusher", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the flusher and write everything still pending."""
+        self._stopped.set()
+        self._wakeup.set()
+        thread = self._thread
+        if thread and thread.is_alive():
+            thread.join(timeout=5)
+        self._thread = None
+        self.flush()
+
+    # ---------------------------------------------------------------- helpers
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            self._wakeup.wait(self._flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception as exc:  # noqa: BLE001 - keep the flusher alive
+                logger.warning(f"Usage meter flush loop error: {exc}")
+
+    def _ensure_flusher(self) -> None:
+        if self._session_factory is None or self._stopped.is_set():
+            return
+        if not self._thread or not self._thread.is_alive():
+            self.start()
+
+    def _record_locked(
+        self,
+        subject: str | None,
+        user_id: int | None,
+        session_id: str | None,
+        feature_type: str,
+        now: datetime,
+        hold: UsageHold | None = None,
+    ) -> None:
+        hold = hold if hold is not None else _current_hold.get()
+        event = {
+            "user_id": user_id,
+            "session_id": session_id,
+            "feature_type": feature_type,
+            "created_at": now,
+        }
+        (hold.events if hold is not None else self._events).append(event)
+        if not subject:
+            return
+        for granularity in GRANULARITIES:
+            key = (subject, feature_type, granularity, bucket_start(granularity, now))
+            self._buckets[key] = self._buckets.get(key, 0) + 1
+            if hold is not None:
+                hold.keys.append(key)
+                self._held[key] = self._held.get(key, 0) + 1
+            else:
+                self._pending[key] = self._pending.get(key, 0) + 1
+
+    def _requeue_locked(
+        self, increments: dict[_BucketKey, int], events: list[dict[str, Any]], now: datetime
+    ) -> None:
+        """Put a failed batch back, dropping what no limit reads and the oldest excess events."""
+        oldest = _oldest_live_buckets(now)
+        for key, amount in increments.items():
+            self._pending[key] = self._pending.get(key, 0) + amount
+        for key in [k for k in self._pending if k[3] < oldest[k[2]]]:
+            del self._pending[key]
+
+        self._events = events + self._events
+        excess = len(self._events) - self._max_pending_events
+        if excess > 0:
+            del self._events[:excess]
+            logger.warning(f"Dropped {excess} unflushed AI usage audit events; the queue is full")
+
+    def _release_held_locked(self, key: _BucketKey) -> None:
+        remaining = self._held.get(key, 0) - 1
+        if remaining > 0:
+            self._held[key] = remaining
+        else:
+            self._held.pop(key, None)
+
+    def _window_count(
+        self, subject: str, feature_type: str, granularity: str, starts: list[datetime]
+    ) -> int:
+        return sum(
+            self._buckets.get((subject, feature_type, granularity, start), 0) for start in starts
+        )
+
+    def _ensure_loaded(
+        self,
+        subject: str,
+        feature_type: str,
+        granularity: str,
+        since: datetime,
+        db: Session | None,
+    ) -> None:
+        series = (subject, feature_type, granularity)
+        with self._lock:
+            loaded_at = self._loaded_at.get(series)
+        if loaded_at is not None and time.monotonic() - loaded_at < self._cache_ttl:
+            return
+
+        if db is None and self._session_factory is None:
+            return
+
+        session = db
+        try:
+            if session is None:
+                session = self._session_factory()
+            rows = (
+                session.query(AIUsageCounter.bucket_start, AIUsageCounter.count)
+                .filter(
+                    AIUsageCounter.subject_key == subject,
+                    AIUsageCounter.feature_type == feature_type,
+                    AIUsageCounter.granularity == granularity,
+                    AIUsageCounter.bucket_start >= since,
+                )
+                .all()
+            )
+        except Exception as exc:
+            logger.warning(f"Failed to load AI usage counters: {exc}")
+            return
+        finally:
+            if db is None and session is not None:
+                session.close()
+
+        with self._lock:
+            # Stored rows do not include increments that are still waiting to be
+            # flushed. A row read just after a flush commits may briefly count
+            # the in-flight batch twice; that errs on the side of the limit.
+            for key in [k for k in self._buckets if k[:3] == series]:
+                del self._buckets[key]
+            for start, count in rows:
+                key = (subject, feature_type, granularity, start)
+                self._buckets[key] = count or 0
+            for key in set(self._pending) | set(self._inflight) | set(self._held):
+                if key[:3] == series:
+                    self._buckets[key] = (
+                        self._buckets.get(key, 0)
+                        + self._pending.get(key, 0)
+                        + self._inflight.get(key, 0)
+                        + self._held.get(key, 0)
+                    )
+            self._loaded_at[series] = time.monotonic()
+
+    def _prune(self, now: datetime) -> None:
+        oldest = _oldest_live_buckets(now)
+        for key in [k for k in self._buckets if k[3] < oldest[k[2]]]:
+            del self._buckets[key]
+
+        stale_after = self._cache_ttl * 10
+        cutoff = time.monotonic() - stale_after
+        stale = {series for series, loaded in self._loaded_at.items() if loaded < cutoff}
+        if stale:
+            for series in stale:
+                del self._loaded_at[series]
+            for key in [
+                k for k in self._buckets
+                if k[:3] in stale and k not in self._pending and k not in self._held
+            ]:
+                del self._buckets[key]
+
+
+def _default_session_factory() -> Session:
+    from app.core.db import SessionLocal
+
+    return SessionLocal()
+
+
+def _build_default_meter() -> UsageMeter:
+    from app.core.config import settings
+
+    return UsageMeter(
+        session_factory=_default_session_factory,
+        cache_ttl_seconds=settings.usage_meter_cache_ttl_seconds,
+        flush_interval_seconds=settings.usage_meter_flush_interval_seconds,
+        max_pending_events=settings.usage_meter_max_pending_events,
+    )
+
+
+usage_meter = _build_default_meter()
@@ -11,6 +11,7 @@ from sqlalchemy import and_, func
 from sqlalchemy.orm import Session
 
 from app.models import AIUsage, TrialPeriod, User
+from app.services.usage_metering import UsageHold, usage_meter
 
 logger = logging.getLogger(__name__)
 
@@ -54,6 +55,17 @@ USAGE_LIMITS = {
     },
 }
 
+# Map feature types to limit keys
+LIMIT_KEY_MAP = {
+    "improvement": "ai_improvements",
+    "ats": "ats_scores",
+    "ats_enhanced": "ats_scores",
+    "cover_letter": "cover_letters",
+    "content_generation": "ai_improvements",
+    "section_assistant": "ai_improvements",
+    "job_matching": "ai_improvements",
+}
+
 
 def is_premium_mode_enabled() -> bool:
     """Check if premium mode is enabled via environment variable."""
@@ -143,22 +155,15 @@ def record_ai_usage(
     user_id: int | None,
     feature_type: str,
     session_id: str | None = None,
-    db: Session | None = None
-) -> AIUsage:
-    """Record an AI API call."""
-    if not db:
-        raise ValueError("Database session required")
+    hold: UsageHold | None = None,
+) -> None:
+    """Record an AI API call.
 
-    usage = AIUsage(
-        user_id=user_id,
-        session_id=session_id,
-        feature_type=feature_type,
-        created_at=datetime.utcnow()
-    )
-    db.add(usage)
-    db.commit()
-    db.refresh(usage)
-    return usage
+    The call is counted immediately in the usage meter; the ``ai_usage`` audit
+    row and counter upsert are written by the meter's background flusher,
+    after ``hold`` (or the request's current hold) is committed.
+    """
+    usage_meter.record(user_id, feature_type, session_id, hold)
 
 
 def get_ai_usage_count(
@@ -168,7 +173,11 @@ def get_ai_usage_count(
     session_id: str | None = None,
     db: Session | None = None
 ) -> int:
-    """Get count of AI usage for a specific feature and period."""
+    """Count raw ``ai_usage`` events for a feature and period.
+
+    Limit checks read the pre-aggregated counters through ``usage_meter``; this
+    full COUNT is kept for auditing and reconciling the counters.
+    """
     if not db:
         return 0
 
@@ -200,6 +209,16 @@ def get_ai_usage_count(
     return query.scalar() or 0
 
 
+def _feature_period_and_limit(feature_type: str, plan_tier: str) -> tuple[str, float]:
+    """Return the limiting period and limit for a feature on a plan tier."""
+    limits = USAGE_LIMITS.get(plan_tier, USAGE_LIMITS["free"])
+    limit_key = LIMIT_KEY_MAP.get(feature_type, "ai_improvements")
+    feature_limits = limits.get(limit_key, {})
+
+    period = "session" if "session" in feature_limits else ("daily" if "daily" in feature_limits else "monthly")
+    return period, feature_limits.get(period, 0)
+
+
 def check_usage_limit(
     user_id: int | None,
     feature_type: str,
@@ -221,35 +240,13 @@ def check_usage_limit(
         # Premium mode disabled - allow all features
         return True, {"allowed": True, "reason": "premium_mode_disabled"}
 
-    limits = USAGE_LIMITS.get(plan_tier, USAGE_LIMITS["free"])
-
-    # Map feature types to limit keys
-    limit_key_map = {
-        "improvement": "ai_improvements",
-        "ats": "ats_scores",
-        "ats_enhanced": "ats_scores",
-        "cover_letter": "cover_letters",
-        "content_generation": "ai_improvements",
-        "section_assistant": "ai_improvements",
-        "job_matching": "ai_improvements",
-    }
-
-    limit_key = limit_key_map.get(feature_type, "ai_improvements")
-    feature_limits = limits.get(limit_key, {})
+    period, limit = _feature_period_and_limit(feature_type, plan_tier)
 
     # Check if unlimited
-    if "session" in feature_limits and feature_limits["session"] == float("inf"):
-        return True, {"allowed": True, "reason": "unlimited"}
-    if "daily" in feature_limits and feature_limits["daily"] == float("inf"):
+    if limit == float("inf"):
         return True, {"allowed": True, "reason": "unlimited"}
-    if "monthly" in feature_limits and feature_limits["monthly"] == float("inf"):
-        return True, {"allowed": True, "reason": "unlimited"}
-
-    # Get current usage
-    period = "session" if "session" in feature_limits else ("daily" if "daily" in feature_limits else "monthly")
-    limit = feature_limits.get(period, 0)
 
-    current_usage = get_ai_usage_count(user_id, feature_type, period, session_id, db)
+    current_usage = usage_meter.get_count(user_id, feature_type, period, session_id, db)
 
     allowed = current_usage < limit
 
@@ -263,6 +260,40 @@ def check_usage_limit(
     }
 
 
+def consume_ai_usage(
+    user_id: int | None,
+    feature_type: str,
+    plan_tier: str,
+    session_id: str | None = None,
+    db: Session | None = None,
+    hold: UsageHold | None = None,
+) -> tuple[bool, dict[str, Any]]:
+    """
+    Check the usage limit and, if allowed, record the call in one step.
+
+    Unlike calling ``check_usage_limit`` then ``record_ai_usage``, concurrent
+    requests in the same process cannot both take the last remaining use.
+
+    Returns:
+        Tuple of (allowed: bool, info: dict with usage stats and limit info)
+    """
+    allowed, info = check_usage_limit(user_id, feature_type, plan_tier, session_id, db)
+    if "reason" in info:
+        # Free, unlimited or premium mode disabled - no limit to race against
+        if allowed:
+            try:
+                record_ai_usage(user_id, feature_type, session_id, hold=hold)
+            except Exception as e:
+                logger.warning(f"Failed to record AI usage: {e}")
+        return allowed, info
+
+    allowed, current_usage = usage_meter.try_consume(
+        user_id, feature_type, info["period"], info["limit"], session_id, db, hold
+    )
+    info.update({"allowed": allowed, "current_usage": current_usage})
+    return allowed, info
+
+
 def get_export_count(
     user_id: int | None,
     period: str = "monthly",
@@ -383,22 +414,8 @@ def get_usage_stats(
 
     # Get stats for each feature type
     for feature_type in FEATURE_TYPES:
-        limit_key_map = {
-            "improvement": "ai_improvements",
-            "ats": "ats_scores",
-            "ats_enhanced": "ats_scores",
-            "cover_letter": "cover_letters",
-            "content_generation": "ai_improvements",
-            "section_assistant": "ai_improvements",
-            "job_matching": "ai_improvements",
-        }
-
-        limit_key = limit_key_map.get(feature_type, "ai_improvements")
-        feature_limits = limits.get(limit_key, {})
-
-        period = "session" if "session" in feature_limits else ("daily" if "daily" in feature_limits else "monthly")
-        limit = feature_limits.get(period, 0)
-        current_usage = get_ai_usage_count(user_id, feature_type, period, session_id, db)
+        period, limit = _feature_period_and_limit(feature_type, plan_tier)
+        current_usage = usage_meter.get_count(user_id, feature_type, period, session_id, db)
 
         stats["features"][feature_type] = {
             "current_usage": current_usage,
@@ -408,4 +425,3 @@ def get_usage_stats(
         }
 
     return stats
-
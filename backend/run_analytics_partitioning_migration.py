@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""Convert visitor_analytics and page_engagement_events to monthly partitions.
+
+Each table is renamed to <table>_legacy, recreated as a partitioned table from
+the model definition (with the trimmed index set), given one partition per
+month of existing data, and refilled with INSERT ... SELECT. The legacy table
+is dropped afterwards unless --keep-legacy is passed.
+
+Each table is converted in its own transaction and holds an exclusive lock
+while copying, so run this during a quiet period.
+"""
+
+import argparse
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# Try to load .env file if it exists
+try:
+    from dotenv import load_dotenv
+
+    env_path = Path(__file__).parent.parent / ".env"
+    if env_path.exists():
+        load_dotenv(env_path)
+        print(f"Loaded environment from {env_path}")
+except ImportError:
+    pass
+except Exception as e:
+    print(f"Note: Could not load .env file: {e}")
+
+
+def convert_table(conn, model, keep_legacy: bool) -> None:
+    from sqlalchemy import text
+
+    from app.core.config import settings
+    from app.services.analytics_partitions import (
+        add_months,
+        ensure_partitions,
+        is_partitioned,
+        month_start,
+    )
+
+    table = model.__tablename__
+    legacy = f"{table}_legacy"
+    now = datetime.utcnow()
+    last_month = add_months(month_start(now), settings.analytics_partition_months_ahead)
+
+    if is_partitioned(conn, table):
+        print(f"✓ {table} is already partitioned")
+        return
+
+    exists = conn.execute(text("SELECT to_regclass(:table)"), {"table": table}).scalar()
+    if exists is None:
+        model.__table__.create(bind=conn)
+        ensure_partitions(conn, table, month_start(now), last_month)
+        print(f"✓ Created partitioned table {table}")
+        return
+
+    conn.execute(text(f"LOCK TABLE {table} IN ACCESS EXCLUSIVE MODE"))
+    conn.execute(text(f"ALTER TABLE {table} RENAME TO {legacy}"))
+
+    # Free up the names the new table will use: primary key, sequence,
+    # foreign keys and indexes (the copy below does not need any of them)
+    conn.execute(text(f"ALTER TABLE {legacy} RENAME CONSTRAINT {table}_pkey TO {legacy}_pkey"))
+    sequence = conn.execute(
+        text("SELECT pg_get_serial_sequence(:legacy, 'id')"), {"legacy": legacy}
+    ).scalar()
+    if sequence:
+        conn.execute(text(f"ALTER SEQUENCE {sequence} RENAME TO {legacy}_id_seq"))
+    foreign_keys = conn.execute(
+        text(
+            "SELECT conname FROM pg_constraint "
+            "WHERE conrelid = CAST(:legacy AS regclass) AND contype = 'f'"
+        ),
+        {"legacy": legacy},
+    ).fetchall()
+    for (constraint_name,) in foreign_keys:
+        conn.execute(text(f"ALTER TABLE {legacy} DROP CONSTRAINT {constraint_name}"))
+    indexes = conn.execute(
+        text(
+            "SELECT indexname FROM pg_indexes "
+            "WHERE tablename = :legacy AND indexname <> :pkey"
+        ),
+        {"legacy": legacy, "pkey": f"{legacy}_pkey"},
+    ).fetchall()
+    for (index_name,) in indexes:
+        conn.execute(text(f"DROP INDEX {index_name}"))
+
+    model.__table__.create(bind=conn)
+
+    earliest = conn.execute(text(f"SELECT MIN(created_at) FROM {legacy}")).scalar()
+    latest = conn.execute(text(f"SELECT MAX(created_at) FROM {legacy}")).scalar()
+    first_month = month_start(earliest or now)
+    last_month = max(last_month, month_start(latest or now))
+    ensure_partitions(conn, table, first_month, last_month)
+
+    columns = [column.name for column in model.__table__.columns]
+    select_list = ", ".join(
+        "COALESCE(created_at, now() AT TIME ZONE 'utc')" if name == "created_at" else name
+        for name in columns
+    )
+    copied = conn.execute(
+        text(f"INSERT INTO {table} ({', '.join(columns)}) SELECT {select_list} FROM {legacy}")
+    ).rowcount
+    conn.execute(
+        text(
+            f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+            f"COALESCE((SELECT MAX(id) FROM {table}), 0) + 1, false)"
+        )
+    )
+    print(f"✓ Copied {copied} rows into partitioned {table} ({first_month:%Y-%m} to {last_month:%Y-%m})")
+
+    if keep_legacy:
+        print(f"  Kept {legacy}; drop it once the new table is verified")
+    else:
+        conn.execute(text(f"DROP TABLE {legacy}"))
+        print(f"  Dropped {legacy}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--keep-legacy",
+        action="store_true",
+        help="Keep the original tables as <table>_legacy instead of dropping them",
+    )
+    args = parser.parse_args()
+
+    try:
+        from app.core.db import engine
+        from app.models.analytics import PageEngagementEvent, VisitorAnalytics
+        from app.services.analytics_partitions import maintain_partitions
+
+        print("Connecting to database...")
+
+        for model in (VisitorAnalytics, PageEngagementEvent):
+            with engine.begin() as conn:
+                convert_table(conn, model, args.keep_legacy)
+
+        print("Applying retention policy...")
+        maintain_partitions(engine)
+
+        print("\n✅ Analytics partitioning migration completed successfully!")
+
+    except Exception as e:
+        print(f"❌ Migration failed: {e}")
+        import traceback
+
+        traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""Compare request latency of the sync and async job list under concurrency.
+
+The "sync" run calls ``list_user_job_descriptions`` with a blocking
+``Session`` directly inside the event loop, which is what the ``async def``
+route did before it moved to ``get_async_db``. The "async" run uses
+``list_user_job_descriptions_async`` with an ``AsyncSession``.
+
+While each run is in flight a probe coroutine measures how long the event loop
+takes to schedule a no-op, i.e. the extra latency every other request on the
+worker sees.
+
+Usage (against a database that has job descriptions for the user):
+    DATABASE_URL=postgresql://... python scripts/benchmark_async_db.py \\
+        --email user@example.com --concurrency 50 --requests 500
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add backend directory to path
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+os.environ.setdefault("SKIP_DB_INIT", "1")
+
+from app.core.db import SessionLocal, dispose_async_engine, get_async_sessionmaker  # noqa: E402
+from app.services.job_service import (  # noqa: E402
+    list_user_job_descriptions,
+    list_user_job_descriptions_async,
+)
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def sync_request(email: str) -> None:
+    db = SessionLocal()
+    try:
+        list_user_job_descriptions(email, db)
+    finally:
+        db.close()
+
+
+async def async_request(email: str) -> None:
+    async with get_async_sessionmaker()() as db:
+        await list_user_job_descriptions_async(email, db)
+
+
+async def probe_loop(stop: asyncio.Event, lags: list[float], interval: float = 0.01) -> None:
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(0)
+        lags.append(time.perf_counter() - started)
+        await asyncio.sleep(interval)
+
+
+async def run(mode: str, email: str, concurrency: int, total: int) -> dict[str, float]:
+    request = sync_request if mode == "sync" else async_request
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+    lags: list[float] = []
+
+    async def one() -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            await request(email)
+            latencies.append(time.perf_counter() - started)
+
+    stop = asyncio.Event()
+    probe = asyncio.create_task(probe_loop(stop, lags))
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(total)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await probe
+
+    return {
+        "requests": total,
+        "throughput_rps": total / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "mean_ms": statistics.fmean(latencies) * 1000 if latencies else 0.0,
+        "loop_lag_p99_ms": percentile(lags, 99) * 1000,
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--email", required=True, help="User whose job list is loaded")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=500)
+    args = parser.parse_args()
+
+    # Warm both pools so connection setup is not measured
+    await run("sync", args.email, 1, 2)
+    await run("async", args.email, 1, 2)
+
+    results = {
+        mode: await run(mode, args.email, args.concurrency, args.requests)
+        for mode in ("sync", "async")
+    }
+    await dispose_async_engine()
+
+    print(f"{'metric':<18}{'sync':>12}{'async':>12}")
+    for metric in results["sync"]:
+        print(f"{metric:<18}{results['sync'][metric]:>12.1f}{results['async'][metric]:>12.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
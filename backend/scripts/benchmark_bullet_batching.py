@@ -0,0 +1,131 @@
+"""Compare bullet completion throughput with and without micro-batching.
+
+A fake LLM stands in for OpenAI: every call costs a fixed round trip
+(--base-ms) plus time per completion token (--token-ms), and at most
+--connections calls run at once, like a pooled HTTP client under a rate
+limit. --concurrency simulated users each send bullet improvements
+back to back until --requests have completed. The "direct" run sends every
+payload as its own call; the "batched" run goes through ``BulletBatcher``.
+
+For each run this reports throughput, p50/p95 latency, LLM calls and the
+prompt tokens sent (estimated at 4 characters per token).
+
+Usage:
+    python scripts/benchmark_bullet_batching.py [--concurrency 50] [--requests 500] \\
+        [--window-ms 30] [--max-items 8]
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+# Add backend directory to path
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+os.environ.setdefault("SKIP_DB_INIT", "1")
+
+from app.prompts.improvement_prompts import get_improve_bullet_prompt  # noqa: E402
+from app.services.bullet_batcher import BulletBatcher  # noqa: E402
+
+BULLET = "Worked on the payments service and helped the team migrate it to Kubernetes"
+OUTPUT_TOKENS_PER_BULLET = 40
+
+
+class FakeLLM:
+    def __init__(self, base_ms: float, token_ms: float, connections: int):
+        self.base_ms = base_ms
+        self.token_ms = token_ms
+        self.slots = asyncio.Semaphore(connections)
+        self.calls = 0
+        self.prompt_tokens = 0
+
+    async def __call__(self, data: dict) -> dict:
+        prompt = "\n".join(message["content"] for message in data["messages"])
+        async with self.slots:
+            self.calls += 1
+            self.prompt_tokens += len(prompt) // 4
+            if "response_format" in data:
+                tasks = json.loads(prompt[prompt.index("["):prompt.index("]\n\nRequirements") + 1])
+                output_tokens = OUTPUT_TOKENS_PER_BULLET * len(tasks) + 10
+                content = json.dumps({
+                    "results": [{"id": task["id"], "output": "Improved bullet"} for task in tasks]
+                })
+            else:
+                output_tokens = OUTPUT_TOKENS_PER_BULLET
+                content = "Improved bullet"
+            await asyncio.sleep((self.base_ms + self.token_ms * output_tokens) / 1000)
+        return {
+            "choices": [{"message": {"content": content}}],
+            "usage": {"total_tokens": len(prompt) // 4 + output_tokens},
+        }
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def run(mode: str, args: argparse.Namespace) -> dict[str, float]:
+    llm = FakeLLM(args.base_ms, args.token_ms, args.connections)
+    batcher = BulletBatcher(llm, window_ms=args.window_ms, max_items=args.max_items)
+    send = batcher.complete if mode == "batched" else llm
+    data = {
+        "model": "gpt-4o-mini",
+        "messages": [{"role": "user", "content": get_improve_bullet_prompt(bullet=BULLET, context=None, tone="professional")}],
+        "max_tokens": 150,
+        "temperature": 0.5,
+    }
+    latencies: list[float] = []
+    remaining = args.requests
+
+    async def user() -> None:
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            started = time.perf_counter()
+            await send(data)
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(user() for _ in range(args.concurrency)))
+    elapsed = time.perf_counter() - started
+    return {
+        "requests_per_s": len(latencies) / elapsed,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "llm_calls": llm.calls,
+        "prompt_tokens": llm.prompt_tokens,
+        "mean_batch": (
+            batcher.stats["batched_items"] / batcher.stats["batches"] if batcher.stats["batches"] else 1.0
+        ),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--connections", type=int, default=10, help="Fake LLM calls in flight at once")
+    parser.add_argument("--base-ms", type=float, default=400.0, help="Fake round trip per call")
+    parser.add_argument("--token-ms", type=float, default=5.0, help="Fake time per completion token")
+    parser.add_argument("--window-ms", type=float, default=30.0)
+    parser.add_argument("--max-items", type=int, default=8)
+    args = parser.parse_args()
+
+    print(f"{'mode':<8} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'calls':>7} {'prompt tok':>11} {'batch':>6}")
+    for mode in ("direct", "batched"):
+        result = asyncio.run(run(mode, args))
+        print(
+            f"{mode:<8} {result['requests_per_s']:>8.1f} {result['p50_ms']:>8.0f} {result['p95_ms']:>8.0f} "
+            f"{result['llm_calls']:>7} {result['prompt_tokens']:>11} {result['mean_batch']:>6.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+"""Measure extraction and layout analysis cost of the resume parsing pipeline.
+
+For each PDF in the corpus this runs ``extract_pdf_with_structure`` followed by
+``analyze_layout`` and ``calculate_complexity_score`` and reports wall time
+and peak traced memory (tracemalloc) per stage. It also reports how much
+memory the word geometry takes as ``PageWords`` compared with the per-word
+dicts the extractor used to build.
+
+--per-page times column detection and block building on every page, with
+sklearn's DBSCAN (the detector used before) as the baseline when installed.
+
+--vision reports, per page, the rasterization chosen for the vision parser
+(DPI, encoded payload, decoded raster, peak traced memory) next to the
+previous fixed 200 DPI RGB PNG rendering.
+
+Without --corpus a synthetic corpus is generated with PyMuPDF: one- and
+two-column resumes of 1 and 3 dense pages.
+
+Usage:
+    python scripts/benchmark_resume_parsing.py [--corpus DIR] [--repeat 5] [--per-page | --vision]
+"""
+import argparse
+import logging
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+# Add backend directory to path
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+os.environ.setdefault("SKIP_DB_INIT", "1")
+
+from app.core.config import settings  # noqa: E402
+from app.services.resume_parsing.analyzers import (  # noqa: E402
+    analyze_layout,
+    calculate_complexity_score,
+)
+from app.services.resume_parsing.analyzers.layout_analyzer import (  # noqa: E402
+    COLUMN_GAP,
+    COLUMN_MIN_WORDS,
+    build_line_blocks,
+    detect_column_regions,
+)
+from app.services.resume_parsing.extractors import extract_pdf_with_structure  # noqa: E402
+from app.services.resume_parsing.extractors.vision_extractor import render_page  # noqa: E402
+
+SECTION_TITLES = ["EXPERIENCE", "EDUCATION", "SKILLS", "PROJECTS", "CERTIFICATIONS"]
+FILLER = (
+    "Led cross-functional teams to deliver scalable services, reduced latency by 40%, "
+    "and mentored engineers across Python, PostgreSQL and Kubernetes"
+)
+
+
+def synthetic_resume(pages: int, two_column: bool) -> bytes:
+    import fitz  # PyMuPDF
+
+    doc = fitz.open()
+    for page_index in range(pages):
+        page = doc.new_page(width=612, height=792)
+        if page_index == 0:
+            page.insert_text((50, 60), "JANE DOE", fontsize=22, fontname="hebo")
+            page.insert_text((50, 82), "Senior Software Engineer", fontsize=13)
+        regions = [(50, 280), (320, 562)] if two_column else [(50, 562)]
+        for x_start, x_end in regions:
+            y = 110
+            chars_per_line = int((x_end - x_start) / 5.2)
+            section = 0
+            while y < 750:
+                if (y - 110) % 160 == 0:
+                    page.insert_text(
+                        (x_start, y), SECTION_TITLES[section % len(SECTION_TITLES)],
+                        fontsize=13, fontname="hebo",
+                    )
+                    section += 1
+                else:
+                    page.insert_text((x_start, y), FILLER[:chars_per_line], fontsize=9.5)
+                y += 13
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+def load_corpus(corpus: str | None) -> dict[str, bytes]:
+    if corpus:
+        return {path.name: path.read_bytes() for path in sorted(Path(corpus).glob("*.pdf"))}
+    return {
+        f"{pages}p-{'two' if two_column else 'one'}-column": synthetic_resume(pages, two_column)
+        for pages in (1, 3)
+        for two_column in (False, True)
+    }
+
+
+def measure(fn, repeat: int) -> tuple[float, int, object]:
+    timings = []
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - started)
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(timings), peak, result
+
+
+def words_footprint(pages: list[dict]) -> tuple[int, int]:
+    """Traced bytes of the columnar words vs the equivalent per-word dicts."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    dict_pages = [list(page["words"]) for page in pages]
+    as_dicts = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del dict_pages
+
+    columnar = 0
+    for page in pages:
+        words = page["words"]
+        columnar += sum(
+            array.nbytes
+            for array in (words.x0, words.y0, words.x1, words.y1, words.size, words.font_ids, words.offsets)
+        )
+        columnar += sys.getsizeof(words.text) + sum(sys.getsizeof(font) for font in words.fonts)
+    return columnar, as_dicts
+
+
+def dbscan_columns(words) -> int:
+    from sklearn.cluster import DBSCAN
+
+    labels = DBSCAN(eps=COLUMN_GAP, min_samples=COLUMN_MIN_WORDS).fit(words.x0.reshape(-1, 1)).labels_
+    return len(set(labels.tolist()) - {-1})
+
+
+def per_page(corpus: dict[str, bytes], repeat: int) -> None:
+    try:
+        import sklearn  # noqa: F401
+        baseline = True
+    except ImportError:
+        baseline = False
+
+    print(f"{'page':<28}{'words':>7}{'dbscan ms':>11}{'columns ms':>12}{'blocks ms':>11}")
+    for name, data in corpus.items():
+        extracted = extract_pdf_with_structure(data)
+        for page in extracted["pages"]:
+            words = page["words"]
+            dbscan_s = measure(lambda words=words: dbscan_columns(words), repeat)[0] if baseline else float("nan")
+            columns_s = measure(lambda words=words: detect_column_regions(words.x0, words.x1), repeat)[0]
+            blocks_s = measure(lambda words=words: build_line_blocks(words), repeat)[0]
+            print(
+                f"{name + ' p' + str(page['page_num']):<28}{len(words):>7}"
+                f"{dbscan_s * 1000:>11.2f}{columns_s * 1000:>12.2f}{blocks_s * 1000:>11.2f}"
+            )
+
+
+def png_200dpi(data: bytes, page_index: int) -> tuple[int, int]:
+    """Payload and raster bytes of the previous fixed 200 DPI RGB PNG rendering."""
+    import fitz  # PyMuPDF
+
+    with fitz.open(stream=data, filetype="pdf") as doc:
+        pixmap = doc[page_index].get_pixmap(dpi=200, colorspace=fitz.csRGB, alpha=False)
+        return len(pixmap.tobytes("png")), len(pixmap.samples)
+
+
+def vision(corpus: dict[str, bytes], repeat: int) -> None:
+    import fitz  # PyMuPDF
+
+    print(
+        f"{'page':<28}{'dpi':>5}{'render ms':>11}{'payload KiB':>13}{'raster KiB':>12}"
+        f"{'peak KiB':>10}{'png200 KiB':>12}{'raster200 KiB':>15}"
+    )
+    for name, data in corpus.items():
+        with fitz.open(stream=data, filetype="pdf") as doc:
+            page_count = doc.page_count
+        for page_index in range(page_count):
+            render_s, peak, page = measure(
+                lambda data=data, page_index=page_index: render_page(
+                    data,
+                    page_index,
+                    settings.vision_image_format,
+                    settings.vision_image_max_bytes,
+                    settings.vision_grayscale,
+                ),
+                repeat,
+            )
+            old_payload, old_raster = png_200dpi(data, page_index)
+            print(
+                f"{name + ' p' + str(page_index + 1):<28}{page['dpi']:>5}{render_s * 1000:>11.1f}"
+                f"{page['image_bytes'] / 1024:>13.0f}{page['raster_bytes'] / 1024:>12.0f}"
+                f"{peak / 1024:>10.0f}{old_payload / 1024:>12.0f}{old_raster / 1024:>15.0f}"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", help="Directory of PDF resumes (default: synthetic corpus)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--per-page", action="store_true", help="Time layout stages per page")
+    parser.add_argument("--vision", action="store_true", help="Measure vision page rasterization")
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    corpus = load_corpus(args.corpus)
+    if args.per_page:
+        per_page(corpus, args.repeat)
+        return
+    if args.vision:
+        vision(corpus, args.repeat)
+        return
+
+    print(
+        f"{'document':<24}{'words':>7}{'extract ms':>12}{'analyze ms':>12}"
+        f"{'peak KiB':>10}{'words KiB':>11}{'dicts KiB':>11}"
+    )
+    for name, data in corpus.items():
+        extract_s, _, extracted = measure(lambda data=data: extract_pdf_with_structure(data), args.repeat)
+
+        def analyze(extracted=extracted):
+            layout = analyze_layout(extracted, "pdf")
+            return calculate_complexity_score(extracted, layout, "pdf")
+
+        analyze_s, analyze_peak, _ = measure(analyze, args.repeat)
+        columnar, as_dicts = words_footprint(extracted["pages"])
+        word_count = sum(len(page["words"]) for page in extracted["pages"])
+        print(
+            f"{name:<24}{word_count:>7}{extract_s * 1000:>12.1f}{analyze_s * 1000:>12.1f}"
+            f"{analyze_peak / 1024:>10.0f}{columnar / 1024:>11.0f}{as_dicts / 1024:>11.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -20,3 +20,31 @@ import pytest
 # Fixtures for integration tests (only loaded when needed)
 # Regression tests don't need these, so we don't import app here
 
+
+
+@pytest.fixture
+def postgres_engine():
+    """An engine bound to a throwaway schema on ``TEST_POSTGRES_URL``.
+
+    Tests of Postgres-only SQL (advisory locks, partitions, generate_series)
+    use this and are skipped when no test database is configured.
+    """
+    url = os.environ.get("TEST_POSTGRES_URL")
+    if not url:
+        pytest.skip("TEST_POSTGRES_URL not set")
+    import uuid
+
+    from sqlalchemy import create_engine, text
+
+    schema = f"test_{uuid.uuid4().hex[:12]}"
+    admin = create_engine(url)
+    with admin.begin() as conn:
+        conn.execute(text(f"CREATE SCHEMA {schema}"))
+    engine = create_engine(url, connect_args={"options": f"-csearch_path={schema}"})
+    try:
+        yield engine
+    finally:
+        engine.dispose()
+        with admin.begin() as conn:
+            conn.execute(text(f"DROP SCHEMA {schema} CASCADE"))
+        admin.dispose()
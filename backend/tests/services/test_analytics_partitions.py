@@ -0,0 +1,80 @@
+"""Tests for the analytics partition naming and retention helpers."""
+
+from __future__ import annotations
+
+from datetime import date, datetime
+
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.services.analytics_partitions import (
+    add_months,
+    list_partitions,
+    maintain_partitions,
+    parse_partition_month,
+    partition_name,
+    partitions_to_retire,
+)
+
+
+def test_add_months_crosses_year_boundaries():
+    assert add_months(date(2026, 11, 1), 3) == date(2027, 2, 1)
+    assert add_months(date(2026, 1, 1), -1) == date(2025, 12, 1)
+
+
+def test_partition_name_round_trips():
+    name = partition_name("visitor_analytics", date(2026, 3, 1))
+
+    assert name == "visitor_analytics_p2026_03"
+    assert parse_partition_month("visitor_analytics", name) == date(2026, 3, 1)
+    assert parse_partition_month("visitor_analytics", "visitor_analytics_default") is None
+    assert parse_partition_month("page_engagement_events", name) is None
+
+
+def test_partitions_to_retire_keeps_retention_window():
+    names = [
+        "visitor_analytics_default",
+        "visitor_analytics_p2025_08",
+        "visitor_analytics_p2025_09",
+        "visitor_analytics_p2025_10",
+        "visitor_analytics_p2026_10",
+    ]
+    now = datetime(2026, 10, 18, 12, 0)
+
+    assert partitions_to_retire("visitor_analytics", names, now, 13) == [
+        "visitor_analytics_p2025_08",
+    ]
+    assert partitions_to_retire("visitor_analytics", names, now, 0) == []
+
+
+def test_rows_already_in_default_move_to_the_new_partition(postgres_engine, monkeypatch):
+    monkeypatch.setattr(settings, "analytics_partition_months_ahead", 1)
+    monkeypatch.setattr(settings, "analytics_retention_months", 0)
+    with postgres_engine.begin() as conn:
+        conn.execute(
+            text(
+                "CREATE TABLE visitor_analytics (id serial, created_at timestamp NOT NULL) "
+                "PARTITION BY RANGE (created_at)"
+            )
+        )
+        conn.execute(
+            text("CREATE TABLE visitor_analytics_default PARTITION OF visitor_analytics DEFAULT")
+        )
+        conn.execute(
+            text(
+                "INSERT INTO visitor_analytics (created_at) VALUES "
+                "('2026-11-03'), ('2026-11-20'), ('2027-03-01')"
+            )
+        )
+
+    maintain_partitions(postgres_engine, now=datetime(2026, 10, 18))
+
+    with postgres_engine.begin() as conn:
+        assert sorted(list_partitions(conn, "visitor_analytics")) == [
+            "visitor_analytics_default",
+            "visitor_analytics_p2026_10",
+            "visitor_analytics_p2026_11",
+        ]
+        assert conn.execute(text("SELECT count(*) FROM visitor_analytics_p2026_11")).scalar() == 2
+        assert conn.execute(text("SELECT count(*) FROM visitor_analytics_default")).scalar() == 1
+        assert conn.execute(text("SELECT count(*) FROM visitor_analytics")).scalar() == 3
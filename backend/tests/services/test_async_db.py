@@ -0,0 +1,41 @@
+"""Tests for the asyncpg engine configuration."""
+
+from __future__ import annotations
+
+import ssl
+
+import certifi
+
+from app.core.db import _to_async_url
+
+
+def test_plain_url_switches_driver():
+    url, connect_args = _to_async_url("postgresql://u:p@db.example.com:5432/app")
+
+    assert url.drivername == "postgresql+asyncpg"
+    assert (url.host, url.port, url.database) == ("db.example.com", 5432, "app")
+    assert connect_args == {}
+
+
+def test_libpq_parameters_become_asyncpg_connect_args():
+    url, connect_args = _to_async_url(
+        "postgresql://u:p@db/app?sslmode=require&connect_timeout=10&application_name=api"
+    )
+
+    assert dict(url.query) == {}
+    assert connect_args == {
+        "ssl": "require",
+        "timeout": 10.0,
+        "server_settings": {"application_name": "api"},
+    }
+
+
+def test_root_certificate_builds_a_verifying_context():
+    url, connect_args = _to_async_url(
+        f"postgresql://u:p@db/app?sslmode=verify-full&sslrootcert={certifi.where()}&target_session_attrs=read-write"
+    )
+
+    context = connect_args["ssl"]
+    assert isinstance(context, ssl.SSLContext)
+    assert context.check_hostname and context.verify_mode == ssl.CERT_REQUIRED
+    assert dict(url.query) == {"target_session_attrs": "read-write"}
@@ -0,0 +1,107 @@
+"""Tests for section-scoped, concurrent ATS improvement application."""
+
+from __future__ import annotations
+
+import asyncio
+
+from app.services.ats_improvement_planner import (
+    apply_improvement_plan,
+    plan_improvements,
+    scope_payload,
+)
+
+RESUME = {
+    "name": "Jane Doe",
+    "title": "Engineer",
+    "email": "",
+    "phone": "",
+    "location": "Berlin",
+    "summary": "Engineer.",
+    "sections": [
+        {"id": "0", "title": "Experience", "bullets": [{"id": "0-0", "text": "Built things", "params": {}}]},
+        {"id": "1", "title": "Education", "bullets": [{"id": "1-0", "text": "BSc", "params": {}}]},
+    ],
+}
+
+
+def _improvement(category, title=None):
+    return {"category": category, "title": title or category, "description": "", "specific_suggestion": ""}
+
+
+def test_plan_runs_disjoint_improvements_in_one_wave():
+    improvements = [
+        _improvement("Summary"),
+        _improvement("Achievements"),
+        _improvement("Contact"),
+        _improvement("Leadership"),
+        _improvement("Skills"),
+    ]
+
+    waves = plan_improvements(improvements, RESUME)
+
+    assert [[item.improvement["category"] for item in wave] for wave in waves] == [
+        ["Summary", "Achievements", "Contact", "Skills"],
+        ["Leadership"],
+    ]
+    assert waves[0][1].targets == frozenset({"section:0"})
+    assert scope_payload(RESUME, waves[0][1].targets) == {"sections": [RESUME["sections"][0]]}
+
+
+def test_apply_plan_merges_patches_concurrently_and_drops_out_of_scope_edits():
+    active = {"now": 0, "max": 0}
+    seen_scopes = {}
+
+    async def fake_apply(improvement, scope):
+        active["now"] += 1
+        active["max"] = max(active["max"], active["now"])
+        await asyncio.sleep(0.01)
+        active["now"] -= 1
+        seen_scopes[improvement["category"]] = scope
+        category = improvement["category"]
+        if category == "Summary":
+            return {"summary": "Staff engineer with 10 years of platform work.", "name": "Someone Else"}
+        if category == "Achievements":
+            section = dict(scope["sections"][0], bullets=[{"id": "0-0", "text": "Built things 40% faster"}])
+            return {"sections": [section]}
+        if category == "Skills":
+            return {"sections": [{"id": "", "title": "Skills", "bullets": ["Python", "Go"]}]}
+        if category == "Contact":
+            raise ValueError("model unavailable")
+        return None
+
+    improvements = [
+        _improvement("Summary"), _improvement("Achievements"), _improvement("Skills"), _improvement("Contact"),
+    ]
+    result = asyncio.run(apply_improvement_plan(RESUME, improvements, fake_apply))
+    resume = result["resume"]
+
+    assert result["waves"] == 1
+    assert active["max"] == 4
+    assert "Education" not in str(seen_scopes["Achievements"])
+    assert resume["summary"].startswith("Staff engineer")
+    assert resume["name"] == "Jane Doe"
+    assert resume["sections"][0]["bullets"] == [{"id": "0-0", "text": "Built things 40% faster", "params": {}}]
+    assert resume["sections"][2]["id"] == "ats-skills"
+    assert [bullet["text"] for bullet in resume["sections"][2]["bullets"]] == ["Python", "Go"]
+    assert [item["category"] for item in result["applied"]] == ["Summary", "Achievements", "Skills"]
+    assert [item["category"] for item in result["failed"]] == ["Contact"]
+    assert any("name" in conflict for conflict in result["conflicts"])
+    assert RESUME["summary"] == "Engineer."
+
+
+def test_later_wave_edits_section_added_earlier():
+    async def fake_apply(improvement, scope):
+        if improvement["category"] == "Skills":
+            return {"sections": [{"id": "", "title": "Skills", "bullets": ["Python"]}]}
+        assert [section["id"] for section in scope["sections"]] == ["ats-skills"]
+        section = dict(scope["sections"][0], bullets=["Python", "Kubernetes"])
+        return {"summary": scope["summary"], "sections": [section]}
+
+    result = asyncio.run(
+        apply_improvement_plan(RESUME, [_improvement("Skills"), _improvement("Keywords")], fake_apply)
+    )
+
+    assert result["waves"] == 2
+    skills = [section for section in result["resume"]["sections"] if section["title"] == "Skills"]
+    assert len(skills) == 1
+    assert [bullet["text"] for bullet in skills[0]["bullets"]] == ["Python", "Kubernetes"]
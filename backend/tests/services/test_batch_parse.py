@@ -0,0 +1,153 @@
+"""Tests for concurrent batch resume parsing."""
+
+from __future__ import annotations
+
+import asyncio
+import io
+import json
+import zipfile
+
+import pytest
+
+from app.core.config import settings
+from app.services.resume_parsing import batch
+from app.services.resume_parsing.batch import (
+    BatchFile,
+    BatchTooLarge,
+    expand_uploads,
+    iter_ndjson,
+    parse_batch,
+)
+
+
+@pytest.fixture
+def fake_pipeline(monkeypatch):
+    state = {"active": 0, "max_active": 0, "parsed": [], "extracted": []}
+
+    def fake_extract(file_bytes, _file_type):
+        state["extracted"].append(file_bytes)
+        if file_bytes.endswith(b"corrupt"):
+            raise ValueError("broken xref table")
+        return {"pages": []}, file_bytes.decode(errors="ignore")
+
+    async def fake_parse(file_bytes, filename, **_options):
+        state["active"] += 1
+        state["max_active"] = max(state["max_active"], state["active"])
+        await asyncio.sleep(0.01)
+        state["active"] -= 1
+        state["parsed"].append(filename)
+        if file_bytes.endswith(b"explode"):
+            raise RuntimeError("model unavailable")
+        return {"success": True, "data": {"name": filename}, "metadata": {"parsing_method": "text_structured"}}
+
+    monkeypatch.setattr(settings, "batch_parse_extraction_workers", 0)
+    monkeypatch.setattr(batch, "extract_document", fake_extract)
+    monkeypatch.setattr(batch, "parse_resume", fake_parse)
+    return state
+
+
+def _collect(files, **kwargs):
+    async def run():
+        return [line async for line in parse_batch(files, **kwargs)]
+
+    return asyncio.run(run())
+
+
+def _zip(entries: dict[str, bytes]) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for name, content in entries.items():
+            archive.writestr(name, content)
+    return buffer.getvalue()
+
+
+def test_expand_uploads_flattens_zips_and_rejects_junk():
+    archive = _zip({
+        "clients/a.pdf": b"%PDF-a",
+        "clients/b.docx": b"PK\x03\x04b",
+        "clients/notes.txt": b"hello",
+        "__MACOSX/clients/._a.pdf": b"meta",
+        "clients/.DS_Store": b"meta",
+    })
+
+    files = expand_uploads([("batch.zip", archive), ("c.pdf", b"%PDF-c"), ("broken.zip", b"nope")])
+
+    assert [(file.filename, file.error is None) for file in files] == [
+        ("batch.zip/clients/a.pdf", True),
+        ("batch.zip/clients/b.docx", True),
+        ("batch.zip/clients/notes.txt", False),
+        ("c.pdf", True),
+        ("broken.zip", False),
+    ]
+
+
+def test_oversized_zip_is_rejected_from_its_directory(monkeypatch):
+    many = _zip({f"r{index}.pdf": b"%PDF-x" for index in range(6)})
+    opened = []
+    monkeypatch.setattr(zipfile.ZipFile, "open", lambda _self, *args, **_kwargs: opened.append(args))
+
+    with pytest.raises(BatchTooLarge, match="Too many files"):
+        expand_uploads([("many.zip", many)], max_files=5)
+    with pytest.raises(BatchTooLarge, match="Batch too large"):
+        expand_uploads([("many.zip", many)], max_total_bytes=20)
+    assert opened == []
+
+
+def test_byte_budget_spans_uploads_and_zip_members():
+    archive = io.BytesIO(_zip({"a.pdf": b"%PDF-" + b"a" * 95}))
+    uploads = [("b.pdf", b"%PDF-" + b"b" * 95), ("batch.zip", archive)]
+
+    assert len(expand_uploads(uploads, max_total_bytes=200)) == 2
+    archive.seek(0)
+    with pytest.raises(BatchTooLarge):
+        expand_uploads(uploads, max_total_bytes=150)
+
+
+def test_duplicates_are_parsed_once_and_reported(fake_pipeline):
+    files = [
+        BatchFile("a.pdf", b"%PDF-same"),
+        BatchFile("b.pdf", b"%PDF-other"),
+        BatchFile("a-copy.pdf", b"%PDF-same"),
+    ]
+
+    lines = _collect(files, bypass_cache=True, ai_slots=asyncio.Semaphore(2))
+
+    assert sorted(fake_pipeline["parsed"]) == ["a.pdf", "b.pdf"]
+    copy_line = next(line for line in lines if line.get("filename") == "a-copy.pdf")
+    assert copy_line["duplicate_of"] == "a.pdf"
+    assert copy_line["success"]
+    summary = lines[-1]
+    assert summary["type"] == "summary"
+    assert (summary["files"], summary["unique_files"], summary["duplicates"]) == (3, 2, 1)
+    assert summary["succeeded"] == 3
+
+
+def test_errors_stay_isolated_and_concurrency_is_capped(fake_pipeline):
+    files = [BatchFile(f"r{index}.pdf", f"%PDF-{index}".encode()) for index in range(6)]
+    files += [
+        BatchFile("bad.pdf", b"%PDF-corrupt"),
+        BatchFile("boom.pdf", b"%PDF-explode"),
+        BatchFile("huge.pdf", error="File too large. Maximum size is 10MB"),
+    ]
+
+    lines = _collect(files, bypass_cache=True, ai_slots=asyncio.Semaphore(2))
+    by_name = {line["filename"]: line for line in lines if line["type"] == "file"}
+
+    assert fake_pipeline["max_active"] == 2
+    assert by_name["bad.pdf"]["result"]["metadata"]["parsing_method"] == "extraction_failed"
+    assert by_name["boom.pdf"]["result"]["error"] == "model unavailable"
+    assert by_name["huge.pdf"]["result"]["metadata"]["parsing_method"] == "rejected"
+    assert all(by_name[f"r{index}.pdf"]["success"] for index in range(6))
+    assert (lines[-1]["succeeded"], lines[-1]["failed"]) == (6, 3)
+
+
+@pytest.mark.usefixtures("fake_pipeline")
+def test_iter_ndjson_emits_one_json_object_per_line():
+    async def run():
+        items = parse_batch([BatchFile("a.pdf", b"%PDF-a")], bypass_cache=True, ai_slots=asyncio.Semaphore(1))
+        return [chunk async for chunk in iter_ndjson(items)]
+
+    chunks = asyncio.run(run())
+
+    assert all(chunk.endswith("\n") for chunk in chunks)
+    assert [json.loads(chunk)["type"] for chunk in chunks] == ["file", "summary"]
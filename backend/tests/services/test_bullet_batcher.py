@@ -0,0 +1,116 @@
+"""Tests for micro-batched bullet completions."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+
+from app.services.bullet_batcher import BulletBatcher, parse_batch_outputs
+
+
+def payload(text: str, model: str = "gpt-4o-mini", temperature: float = 0.6) -> dict:
+    return {
+        "model": model,
+        "messages": [{"role": "user", "content": f"Improve: {text}"}],
+        "max_tokens": 150,
+        "temperature": temperature,
+    }
+
+
+def completion(content: str, tokens: int = 100) -> dict:
+    return {"choices": [{"message": {"content": content}}], "usage": {"total_tokens": tokens}}
+
+
+class FakeLLM:
+    """Answers single prompts with their text uppercased and batches per task."""
+
+    def __init__(self, drop: set[str] = frozenset(), fail_batches: bool = False):
+        self.calls: list[dict] = []
+        self.drop = drop
+        self.fail_batches = fail_batches
+
+    async def __call__(self, data: dict) -> dict:
+        self.calls.append(data)
+        await asyncio.sleep(0)
+        prompt = data["messages"][-1]["content"]
+        if "response_format" not in data:
+            return completion(prompt.upper(), tokens=50)
+        if self.fail_batches:
+            raise RuntimeError("upstream error")
+        tasks = json.loads(prompt[prompt.index("["):prompt.index("]\n") + 1])
+        results = [
+            {"id": task["id"], "output": task["instructions"].upper()}
+            for task in tasks
+            if task["id"] not in self.drop
+        ]
+        return completion(json.dumps({"results": results}), tokens=40 * len(tasks))
+
+
+async def test_concurrent_requests_share_one_call():
+    llm = FakeLLM()
+    batcher = BulletBatcher(llm, window_ms=20, max_items=8)
+
+    results = await asyncio.gather(*(batcher.complete(payload(f"bullet {i}")) for i in range(5)))
+
+    assert [r.content for r in results] == [f"IMPROVE: BULLET {i}" for i in range(5)]
+    assert {r.batch_size for r in results} == {5}
+    assert results[0].tokens_used == 40
+    assert len(llm.calls) == 1
+    assert batcher.stats == {"requests": 5, "batches": 1, "batched_items": 5, "fallbacks": 0}
+
+
+async def test_lone_request_is_sent_unchanged_and_full_batch_skips_window():
+    llm = FakeLLM()
+    batcher = BulletBatcher(llm, window_ms=10_000, max_items=2)
+
+    lone = BulletBatcher(llm, window_ms=1, max_items=8)
+    single = await lone.complete(payload("solo"))
+    assert single.batch_size == 1 and llm.calls[0] == payload("solo")
+
+    results = await asyncio.wait_for(
+        asyncio.gather(batcher.complete(payload("a")), batcher.complete(payload("b"))), timeout=1
+    )
+    assert [r.content for r in results] == ["IMPROVE: A", "IMPROVE: B"]
+
+
+async def test_models_and_temperatures_are_batched_separately():
+    llm = FakeLLM()
+    batcher = BulletBatcher(llm, window_ms=10, max_items=8)
+
+    await asyncio.gather(
+        batcher.complete(payload("a")),
+        batcher.complete(payload("b")),
+        batcher.complete(payload("c", temperature=0.5)),
+        batcher.complete(payload("d", temperature=0.5)),
+    )
+
+    assert batcher.stats["batches"] == 2
+    assert sorted(call["temperature"] for call in llm.calls) == [0.5, 0.6]
+
+
+async def test_missing_items_and_failed_batches_fall_back_per_item():
+    llm = FakeLLM(drop={"b1"})
+    batcher = BulletBatcher(llm, window_ms=10, max_items=8)
+    results = await asyncio.gather(*(batcher.complete(payload(f"x{i}")) for i in range(3)))
+    assert [r.content for r in results] == ["IMPROVE: X0", "IMPROVE: X1", "IMPROVE: X2"]
+    assert [r.batch_size for r in results] == [3, 1, 3]
+    assert batcher.stats["fallbacks"] == 1
+
+    llm = FakeLLM(fail_batches=True)
+    batcher = BulletBatcher(llm, window_ms=10, max_items=8)
+    results = await asyncio.gather(*(batcher.complete(payload(f"y{i}")) for i in range(3)))
+    assert [r.content for r in results] == ["IMPROVE: Y0", "IMPROVE: Y1", "IMPROVE: Y2"]
+    assert len(llm.calls) == 4
+
+
+def test_parse_batch_outputs_skips_malformed_entries():
+    content = json.dumps({"results": [
+        {"id": "b0", "output": "  kept  "},
+        {"id": "b1", "output": ""},
+        {"id": "b2", "output": ["one", "two"]},
+        {"id": "zz", "output": "unknown id"},
+        "junk",
+    ]})
+    assert parse_batch_outputs(content, ["b0", "b1", "b2"]) == {"b0": "kept", "b2": '["one", "two"]'}
+    assert parse_batch_outputs("not json", ["b0"]) == {}
+    assert parse_batch_outputs('["a"]', ["b0"]) == {}
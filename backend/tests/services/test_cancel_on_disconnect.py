@@ -0,0 +1,145 @@
+"""Tests for cancelling AI and parsing work when the client disconnects."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+import httpx
+from fastapi import FastAPI
+
+from app.middleware.cancel_on_disconnect import CancelOnDisconnectMiddleware
+from app.services.usage_metering import UsageMeter
+
+
+def build_app(meter: UsageMeter, spend: dict) -> FastAPI:
+    async def slow_llm(_request: httpx.Request) -> httpx.Response:
+        try:
+            await asyncio.sleep(5)
+            spend["llm_completed"] += 1
+            return httpx.Response(200, json={"choices": []})
+        finally:
+            spend["llm_ended_at"] = time.monotonic()
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(slow_llm))
+    app = FastAPI()
+
+    @app.post("/api/ai/generate-work-experience")
+    async def generate():
+        meter.record(1, "work_experience")
+        response = await client.post("https://api.openai.com/v1/chat/completions", json={})
+        return response.json()
+
+    @app.post("/api/resume/parse-file")
+    async def parse_file():
+        meter.record(1, "parse")
+        # Stands in for page jobs the orchestrator schedules one after another
+        while True:
+            spend["pages"] += 1
+            spend["parse_ended_at"] = time.monotonic()
+            await asyncio.sleep(0.01)
+
+    @app.post("/api/ai/quick")
+    async def quick():
+        meter.record(1, "quick")
+        return {"ok": True}
+
+    return app
+
+
+def request_scope(path: str) -> dict:
+    return {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "POST", "scheme": "http", "path": path, "raw_path": path.encode(),
+        "root_path": "", "query_string": b"", "headers": [], "server": ("test", 80),
+        "client": ("test", 1),
+    }
+
+
+async def call(app, meter: UsageMeter, path: str, disconnect_after: float | None):
+    disconnect = asyncio.Event()
+    body = [{"type": "http.request", "body": b"", "more_body": False}]
+    sent: list[dict] = []
+
+    async def receive():
+        if body:
+            return body.pop()
+        await disconnect.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append(message)
+
+    middleware = CancelOnDisconnectMiddleware(app, meter=meter, enabled=True)
+    task = asyncio.ensure_future(middleware(request_scope(path), receive, send))
+    disconnected_at = None
+    if disconnect_after is not None:
+        await asyncio.sleep(disconnect_after)
+        disconnected_at = time.monotonic()
+        disconnect.set()
+    await asyncio.wait_for(task, timeout=2)
+    return sent, disconnected_at
+
+
+async def test_disconnect_stops_llm_and_parse_spend_and_drops_usage():
+    meter = UsageMeter()
+    spend = {"llm_completed": 0, "pages": 0}
+    app = build_app(meter, spend)
+
+    sent, disconnected_at = await call(app, meter, "/api/ai/generate-work-experience", 0.1)
+    assert sent == []
+    assert spend["llm_completed"] == 0
+    assert spend["llm_ended_at"] - disconnected_at < 0.5
+
+    sent, disconnected_at = await call(app, meter, "/api/resume/parse-file", 0.1)
+    pages = spend["pages"]
+    assert sent == [] and pages > 0
+    assert spend["parse_ended_at"] - disconnected_at < 0.5
+    await asyncio.sleep(0.1)
+    assert spend["pages"] == pages
+
+    assert meter._events == [] and meter._held == {}
+    assert meter.get_count(1, "work_experience", "daily") == 0
+    assert meter.get_count(1, "parse", "daily") == 0
+
+
+async def test_completed_request_records_usage():
+    meter = UsageMeter()
+    app = build_app(meter, {"llm_completed": 0, "pages": 0})
+
+    sent, _ = await call(app, meter, "/api/ai/quick", None)
+
+    assert sent[0]["status"] == 200
+    assert [event["feature_type"] for event in meter._events] == ["quick"]
+    assert meter.get_count(1, "quick", "daily") == 1
+    assert sum(meter._pending.values()) == 3
+
+
+async def test_disconnect_during_an_unread_multi_chunk_upload_cancels_the_handler():
+    meter = UsageMeter()
+    spend = {"llm_completed": 0, "pages": 0}
+    app = build_app(meter, spend)
+    app.add_middleware(CancelOnDisconnectMiddleware, meter=meter, enabled=True)
+
+    # The handler never reads the body; the disconnect arrives after 20 chunks
+    chunks = [
+        {"type": "http.request", "body": b"x" * 65536, "more_body": True} for _ in range(20)
+    ]
+    sent: list[dict] = []
+
+    async def receive():
+        if chunks:
+            await asyncio.sleep(0.01)
+            return chunks.pop()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append(message)
+
+    await asyncio.wait_for(app(request_scope("/api/resume/parse-file"), receive, send), timeout=2)
+    pages = spend["pages"]
+    await asyncio.sleep(0.05)
+
+    assert sent == [] and not chunks
+    assert spend["pages"] == pages
+    assert meter.get_count(1, "parse", "daily") == 0
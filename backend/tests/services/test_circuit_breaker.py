@@ -0,0 +1,140 @@
+"""Tests for the OpenAI circuit breakers."""
+
+from __future__ import annotations
+
+import httpx
+import pytest
+
+from app.core.circuit_breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    BreakerRegistry,
+    BreakerTransport,
+    CircuitBreaker,
+    CircuitOpenError,
+    model_from_body,
+)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_opens_after_threshold_and_fails_fast():
+    clock = Clock()
+    breaker = CircuitBreaker("/v1/chat/completions", "gpt-4o-mini", 3, 30.0, clock=clock)
+
+    for _ in range(2):
+        breaker.before_call()
+        breaker.record_failure()
+    breaker.before_call()
+    breaker.record_success()
+    assert breaker.consecutive_failures == 0
+
+    for _ in range(3):
+        breaker.before_call()
+        breaker.record_failure()
+    assert breaker.state == OPEN
+    assert breaker.rejecting()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    assert breaker.snapshot()["rejected"] == 1
+
+
+def test_half_open_allows_one_probe():
+    clock = Clock()
+    breaker = CircuitBreaker("/v1/chat/completions", "gpt-4o-mini", 1, 30.0, clock=clock)
+    breaker.before_call()
+    breaker.record_failure()
+
+    clock.now += 31
+    breaker.before_call()
+    assert breaker.state == HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    clock.now += 31
+    breaker.before_call()
+    breaker.abandon()
+    breaker.before_call()
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    breaker.before_call()
+
+
+def test_model_from_body():
+    assert model_from_body(b'{"model": "gpt-4o", "messages": []}') == "gpt-4o"
+    assert model_from_body(b'{"messages": []}') is None
+
+
+async def test_transport_trips_per_model_and_ignores_other_hosts():
+    status = {"code": 503}
+
+    def handler(_request: httpx.Request) -> httpx.Response:
+        return httpx.Response(status["code"], json={})
+
+    breakers = BreakerRegistry(failure_threshold=2, reset_seconds=30.0, slow_call_seconds=20.0)
+    client = httpx.AsyncClient(transport=BreakerTransport(httpx.MockTransport(handler), breakers))
+    url = "https://api.openai.com/v1/chat/completions"
+
+    for _ in range(2):
+        response = await client.post(url, json={"model": "gpt-4o-mini", "messages": []})
+        assert response.status_code == 503
+    with pytest.raises(CircuitOpenError):
+        await client.post(url, json={"model": "gpt-4o-mini", "messages": []})
+    assert breakers.rejecting("gpt-4o-mini")
+
+    status["code"] = 200
+    response = await client.post(url, json={"model": "gpt-4o", "messages": []})
+    assert response.status_code == 200
+    assert not breakers.rejecting("gpt-4o")
+
+    status["code"] = 500
+    for _ in range(3):
+        await client.post("https://example.com/api", json={"model": "gpt-4o"})
+    assert {(b["model"], b["state"]) for b in breakers.snapshot()} == {
+        ("gpt-4o-mini", OPEN),
+        ("gpt-4o", CLOSED),
+    }
+    await client.aclose()
+
+
+async def test_transport_counts_timeouts_as_failures():
+    def handler(request: httpx.Request) -> httpx.Response:
+        raise httpx.ReadTimeout("timed out", request=request)
+
+    breakers = BreakerRegistry(failure_threshold=1, reset_seconds=30.0, slow_call_seconds=20.0)
+    client = httpx.AsyncClient(transport=BreakerTransport(httpx.MockTransport(handler), breakers))
+
+    with pytest.raises(httpx.ReadTimeout):
+        await client.post("https://api.openai.com/v1/chat/completions", json={"model": "gpt-4o-mini"})
+    assert breakers.rejecting("gpt-4o-mini")
+    await client.aclose()
+
+
+async def test_health_reports_breakers_and_every_service():
+    from app.features.ai.routes import health_check
+
+    health = await health_check()
+
+    assert health["openai_circuit"] in ("open", "closed")
+    assert {
+        "job_matching_agent",
+        "ats_checker",
+        "enhanced_ats_checker",
+        "ai_improvement_engine",
+        "ats_scoring_agent",
+        "content_generation_agent",
+        "cover_letter_agent",
+        "improvement_agent",
+    } <= health.keys()
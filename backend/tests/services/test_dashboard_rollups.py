@@ -0,0 +1,157 @@
+"""Tests for the dashboard rollups and their freshness state."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine, insert, text
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from app.features.dashboard.routes import _rollup_state
+from app.models import (
+    DashboardDailyRollup,
+    DashboardHourlyCountryVisits,
+    DashboardRollupState,
+    DashboardUserActivity,
+    Resume,
+    ResumeVersion,
+    User,
+    VisitorAnalytics,
+)
+from app.services.dashboard_rollups import (
+    ADVISORY_LOCK_KEY,
+    STATE_NAME,
+    RollupsNotReady,
+    refresh_rollups,
+    rollup_state,
+)
+
+NOW = datetime(2026, 10, 18, 12, 0)
+
+# The live queries the rollups replaced, with windows aligned to UTC days the
+# way the rollup endpoints align them
+LIVE_STATS_SQL = """
+    SELECT
+        (SELECT COUNT(*) FROM users) AS total_users,
+        (SELECT COUNT(*) FROM users WHERE is_premium = true) AS total_subscriptions,
+        (SELECT COUNT(*) FROM users WHERE created_at >= :last_30) AS users_last_30,
+        (SELECT COUNT(*) FROM users WHERE created_at >= :previous_30 AND created_at < :last_30)
+            AS users_previous_30,
+        (SELECT COUNT(*) FROM users WHERE is_premium = true
+            AND COALESCE(premium_purchased_at, created_at) >= :last_30) AS subscriptions_last_30,
+        (SELECT COALESCE(SUM(tokens_used), 0) FROM resume_versions) AS total_tokens,
+        (SELECT COALESCE(SUM(tokens_used), 0) FROM resume_versions WHERE created_at >= :last_30)
+            AS tokens_last_30
+"""
+
+ROLLUP_STATS_SQL = """
+    SELECT
+        COALESCE(SUM(new_users), 0) + s.undated_users AS total_users,
+        COALESCE(SUM(new_subscriptions), 0) + s.undated_subscriptions AS total_subscriptions,
+        COALESCE(SUM(new_users) FILTER (WHERE day > :thirty_days_ago), 0) AS users_last_30,
+        COALESCE(SUM(new_users) FILTER (WHERE day > :sixty_days_ago AND day <= :thirty_days_ago), 0)
+            AS users_previous_30,
+        COALESCE(SUM(new_subscriptions) FILTER (WHERE day > :thirty_days_ago), 0) AS subscriptions_last_30,
+        COALESCE(SUM(tokens_used), 0) + s.undated_tokens AS total_tokens,
+        COALESCE(SUM(tokens_used) FILTER (WHERE day > :thirty_days_ago), 0) AS tokens_last_30
+    FROM dashboard_daily_rollups CROSS JOIN dashboard_rollup_state s
+    GROUP BY s.undated_users, s.undated_subscriptions, s.undated_tokens
+"""
+
+
+def test_rollups_are_not_ready_before_the_first_refresh():
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    DashboardRollupState.__table__.create(bind=engine)
+
+    with Session(engine) as db:
+        with pytest.raises(RollupsNotReady):
+            rollup_state(db)
+        with pytest.raises(HTTPException) as exc_info:
+            _rollup_state(db)
+        assert exc_info.value.status_code == 503
+
+        db.add(DashboardRollupState(name=STATE_NAME, refreshed_at=NOW))
+        db.commit()
+        assert rollup_state(db).refreshed_at == NOW
+
+
+@pytest.fixture
+def dashboard_db(postgres_engine):
+    for model in (
+        User, Resume, ResumeVersion, VisitorAnalytics, DashboardDailyRollup,
+        DashboardHourlyCountryVisits, DashboardUserActivity, DashboardRollupState,
+    ):
+        model.__table__.create(bind=postgres_engine)
+    users, resumes, versions = [], [], []
+    for i in range(1, 61):
+        # Spread over 90 days; every seventh user predates created_at tracking
+        created_at = None if i % 7 == 0 else NOW - timedelta(days=(i * 3) % 90, hours=i % 5)
+        premium = i % 3 == 0
+        purchased_at = NOW - timedelta(days=i % 40) if premium and i % 2 == 0 else None
+        users.append({
+            "id": i, "email": f"u{i}@example.com", "name": f"User {i}", "password": "x",
+            "is_premium": premium, "created_at": created_at, "premium_purchased_at": purchased_at,
+        })
+        resumes.append({"id": i, "user_id": i, "name": f"Resume {i}", "created_at": created_at})
+        versions.append({
+            "id": i, "resume_id": i, "user_id": i, "version_number": 1, "resume_data": {},
+            "tokens_used": 100 * i, "created_at": created_at,
+        })
+    with postgres_engine.begin() as conn:
+        conn.execute(insert(User.__table__), users)
+        conn.execute(insert(Resume.__table__), resumes)
+        conn.execute(insert(ResumeVersion.__table__), versions)
+    with Session(postgres_engine) as db:
+        yield db
+
+
+def assert_parity(db: Session, now: datetime) -> None:
+    today = now.date()
+    live = db.execute(
+        text(LIVE_STATS_SQL),
+        {"last_30": today - timedelta(days=29), "previous_30": today - timedelta(days=59)},
+    ).mappings().one()
+    rolled = db.execute(
+        text(ROLLUP_STATS_SQL),
+        {"thirty_days_ago": today - timedelta(days=30), "sixty_days_ago": today - timedelta(days=60)},
+    ).mappings().one()
+    assert dict(rolled) == dict(live)
+
+
+def test_refresh_matches_the_live_queries(dashboard_db):
+    assert refresh_rollups(dashboard_db, now=NOW)
+    assert_parity(dashboard_db, NOW)
+    state = rollup_state(dashboard_db)
+    assert state.refreshed_at == state.full_refreshed_at == NOW
+    assert state.undated_users == 8
+
+    # An incremental refresh picks up rows written since
+    later = NOW + timedelta(minutes=5)
+    dashboard_db.execute(
+        insert(User.__table__).values(
+            id=100, email="new@example.com", name="New", password="x",
+            is_premium=True, created_at=later, premium_purchased_at=later,
+        )
+    )
+    dashboard_db.commit()
+    assert refresh_rollups(dashboard_db, now=later)
+    assert_parity(dashboard_db, later)
+    state = rollup_state(dashboard_db)
+    assert state.refreshed_at == later and state.full_refreshed_at == NOW
+
+
+def test_refresh_skips_while_another_worker_holds_the_lock(dashboard_db, postgres_engine):
+    with postgres_engine.connect() as other:
+        other.execute(text("SELECT pg_advisory_lock(:key)"), {"key": ADVISORY_LOCK_KEY})
+        try:
+            assert refresh_rollups(dashboard_db, now=NOW) is False
+        finally:
+            other.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": ADVISORY_LOCK_KEY})
+
+    with pytest.raises(RollupsNotReady):
+        rollup_state(dashboard_db)
+    assert refresh_rollups(dashboard_db, now=NOW)
+    assert rollup_state(dashboard_db).refreshed_at == NOW
@@ -0,0 +1,88 @@
+"""Tests for region routing and hybrid text/vision parsing."""
+
+from __future__ import annotations
+
+import asyncio
+
+import fitz
+
+from app.services.resume_parsing.analyzers import analyze_layout, route_regions
+from app.services.resume_parsing.extractors import extract_pdf_with_structure
+from app.services.resume_parsing.extractors.vision_extractor import estimate_image_tokens
+from app.services.resume_parsing.parsers import hybrid_parser
+from app.services.resume_parsing.validators import score_region
+
+LINE = "Built billing services in Python and PostgreSQL for enterprise customers"
+
+
+def _two_column_resume() -> bytes:
+    doc = fitz.open()
+    page = doc.new_page(width=612, height=792)
+    for row in range(40):
+        page.insert_text((200, 60 + row * 16), LINE[:60], fontsize=9)
+    # Sidebar of short skill chips
+    for row, skill in enumerate(["Python", "SQL", "Go", "AWS", "Docker", "Redis"] * 3):
+        page.insert_text((40, 60 + row * 36), skill, fontsize=9)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+def _regions(data: bytes) -> tuple[dict, dict, list[dict]]:
+    extracted = extract_pdf_with_structure(data)
+    layout = analyze_layout(extracted, "pdf")
+    return extracted, layout, route_regions(extracted, layout, min_confidence=0.6)
+
+
+def test_sidebar_goes_to_vision_and_body_stays_text():
+    _, _, regions = _regions(_two_column_resume())
+
+    routes = {region["bbox"][0] < 100: region["route"] for region in regions}
+    assert routes == {True: "vision", False: "text"}
+    sidebar = next(region for region in regions if region["route"] == "vision")
+    assert any("fragments" in issue for issue in sidebar["issues"])
+
+
+def test_garbled_region_scores_low():
+    clean = [{"text": LINE}] * 3
+    garbled = [{"text": "(cid:12)(cid:40)(cid:7) " + LINE[:20]}] * 3
+    bbox = (50.0, 50.0, 560.0, 110.0)
+
+    assert score_region(clean, bbox, 612.0, [])[0] == 1.0
+    assert score_region(garbled, bbox, 612.0, [])[0] < 0.6
+
+
+def test_image_tokens_follow_high_detail_tiling():
+    assert estimate_image_tokens(512, 512) == 85 + 170
+    assert estimate_image_tokens(765, 990) == 85 + 170 * 4
+    assert estimate_image_tokens(1700, 2200) == estimate_image_tokens(768, 994)
+
+
+def test_hybrid_merges_text_and_vision_regions(monkeypatch):
+    data = _two_column_resume()
+    extracted, layout, regions = _regions(data)
+    sent_text = []
+
+    async def fake_structured(_extracted_data, _layout_data, raw_text):
+        sent_text.append(raw_text)
+        return {
+            "name": "Jane Doe",
+            "email": "jane@example.com",
+            "sections": [{"title": "Experience", "bullets": [{"text": LINE}]}],
+        }
+
+    async def fake_vision(_image_base64, _model, _page_num, _mime_type="image/png"):
+        return {"sections": [{"title": "Skills", "bullets": [{"text": "Python, SQL, Go"}]}]}
+
+    monkeypatch.setattr(hybrid_parser, "parse_with_structured_ai", fake_structured)
+    monkeypatch.setattr(hybrid_parser, "_process_page_with_vision", fake_vision)
+    parsed, report = asyncio.run(hybrid_parser.parse_hybrid(data, extracted, layout, regions))
+
+    assert "Docker" not in sent_text[0]
+    assert parsed["name"] == "Jane Doe"
+    assert [section["title"] for section in parsed["sections"]] == ["Experience", "Skills"]
+    assert report["vision_regions"] == 1 and report["text_regions"] == 1
+    assert report["tokens_saved"] == (
+        report["full_vision_tokens"] - report["text_tokens"] - report["vision_tokens"]
+    )
+    assert report["vision_tokens"] < report["full_vision_tokens"]
@@ -0,0 +1,141 @@
+import json
+from unittest.mock import patch
+
+from app.api.models import ExtractKeywordsPayload
+from app.services import jd_keyword_cache as jd_keyword_cache_module
+from app.services.jd_keyword_cache import (
+    JDKeywordCache,
+    build_keyword_response,
+    fingerprint_job_description,
+    hamming_distance,
+    local_keyword_data,
+    normalize_job_description,
+    use_local_extraction,
+)
+from app.services.keyword_service import KeywordExtractor
+
+JOB = (
+    "Senior Backend Engineer. We are looking for an engineer with 5+ years of experience "
+    "building Python services on AWS. You will design REST APIs with FastAPI, own PostgreSQL "
+    "schemas, and mentor teammates. Strong communication and collaboration skills required. "
+    "Experience with Docker, Kubernetes and Terraform is a plus. Bachelor's degree in Computer "
+    "Science or equivalent experience. We offer remote work, equity, and a learning budget. "
+    "Our team ships weekly and values ownership, clear writing, and pragmatic testing."
+)
+REPOST = JOB + " Apply at https://jobs.example.com/123?ref=linkedin. Posted 3 days ago."
+OTHER = (
+    "Registered nurse for a busy pediatric ward. Night shifts, patient triage, medication "
+    "administration and family education. BLS and PALS certification required, two years "
+    "of acute care experience preferred. Compassion and calm under pressure are essential."
+)
+KEYWORDS = {
+    "technical_keywords": ["Python", "AWS", "FastAPI", "Kubernetes", "Rust"],
+    "soft_skills": ["communication"],
+    "general_keywords": [],
+    "priority_keywords": ["Python", "FastAPI"],
+    "education": ["Bachelor's degree"],
+    "experience": ["5+ years"],
+}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_normalization_ignores_urls_case_and_punctuation():
+    assert normalize_job_description("Python, AWS! see https://x.io/a?b=c") == ["python", "aws", "see"]
+    assert fingerprint_job_description("Python AWS.").key == fingerprint_job_description("python, aws").key
+
+
+def test_repost_is_near_duplicate_and_other_job_is_not():
+    job, repost, other = (fingerprint_job_description(t) for t in (JOB, REPOST, OTHER))
+    assert hamming_distance(job.simhash, repost.simhash) < hamming_distance(job.simhash, other.simhash)
+
+    cache = JDKeywordCache(max_entries=10, ttl_seconds=60, max_distance=12)
+    cache.store(job, KEYWORDS, tokens=900)
+
+    exact = cache.lookup(fingerprint_job_description(JOB.upper()))
+    near = cache.lookup(repost)
+    assert exact.match == "exact" and exact.tokens_saved == 900
+    assert near.match == "near" and near.keywords_data == KEYWORDS
+    assert cache.lookup(other) is None
+
+    stats = cache.stats()
+    assert stats["exact_hits"] == 1 and stats["near_hits"] == 1 and stats["misses"] == 1
+    assert stats["tokens_saved"] == 1800 and stats["tokens_used"] == 900
+    assert stats["hit_rate"] == round(2 / 3, 4)
+
+
+def test_entries_expire_and_evict_least_recently_used():
+    clock = FakeClock()
+    cache = JDKeywordCache(max_entries=1, ttl_seconds=60, max_distance=3, clock=clock)
+    job, other = fingerprint_job_description(JOB), fingerprint_job_description(OTHER)
+
+    cache.store(job, KEYWORDS, tokens=100)
+    cache.store(other, KEYWORDS, tokens=100)
+    assert cache.lookup(job) is None
+    assert cache.lookup(other) is not None
+
+    clock.now = 61
+    assert cache.lookup(other) is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_response_keeps_only_keywords_in_the_posting():
+    response = build_keyword_response(KEYWORDS, JOB)
+    assert response["technical_keywords"] == ["Python", "AWS", "FastAPI", "Kubernetes"]
+    assert response["high_frequency_keywords"][0] == {"keyword": "Python", "frequency": 2, "importance": "high"}
+    assert response["total_keywords"] == 7
+
+
+def test_local_policy():
+    short = fingerprint_job_description("Python developer, remote")
+    long = fingerprint_job_description(JOB)
+    with patch("app.services.jd_keyword_cache.settings") as settings:
+        settings.jd_keyword_min_llm_words = 60
+        settings.jd_keyword_local_policy = "low_value"
+        assert use_local_extraction(short) and not use_local_extraction(long)
+        settings.jd_keyword_local_policy = "never"
+        assert not use_local_extraction(short)
+        settings.jd_keyword_local_policy = "always"
+        assert use_local_extraction(long)
+
+
+def test_local_keyword_data_has_llm_shape():
+    data = local_keyword_data(KeywordExtractor(), JOB)
+    assert set(data) == {
+        "technical_keywords", "soft_skills", "general_keywords",
+        "priority_keywords", "education", "experience",
+    }
+    assert build_keyword_response(data, JOB)["total_keywords"] > 0
+
+
+async def test_local_model_keywords_are_not_cached_or_counted_as_openai(monkeypatch):
+    from app.features.ai.routes import extract_keywords_llm
+    from app.services.model_router import LocalCompletion, model_router
+
+    cache = JDKeywordCache(max_entries=10, ttl_seconds=60, max_distance=12)
+    monkeypatch.setattr(jd_keyword_cache_module, "jd_keyword_cache", cache)
+    monkeypatch.setattr(jd_keyword_cache_module.settings, "jd_keyword_local_policy", "never")
+
+    async def complete_locally(_task, _data):
+        return LocalCompletion(
+            content=json.dumps(KEYWORDS), model="llama3.2:3b",
+            prompt_tokens=400, completion_tokens=100, latency_ms=5.0,
+        )
+
+    monkeypatch.setattr(model_router, "complete_locally", complete_locally)
+
+    for text in (JOB, REPOST):
+        result = await extract_keywords_llm(ExtractKeywordsPayload(job_description=text))
+        assert result["method"] == "local_llm"
+        assert result["cache"]["match"] == "miss"
+
+    stats = cache.stats()
+    assert stats["entries"] == 0
+    assert stats["local_model_calls"] == 2
+    assert stats["llm_calls"] == 0 and stats["tokens_used"] == 0
@@ -0,0 +1,119 @@
+"""Tests for the job board list, its keyset cursor and page keys."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from app.models import JobDescription, JobResumeVersion, User
+from app.services import job_service
+from app.services.job_service import (
+    _job_list_page_keys,
+    decode_job_list_cursor,
+    encode_job_list_cursor,
+    list_user_job_descriptions,
+)
+
+
+def test_cursor_round_trips():
+    created_at = datetime(2026, 10, 18, 9, 30, 15, 123456)
+
+    assert decode_job_list_cursor(encode_job_list_cursor(created_at, 42)) == (created_at, 42)
+    assert decode_job_list_cursor(encode_job_list_cursor(None, 7)) == (None, 7)
+
+
+def test_invalid_cursor_is_rejected():
+    with pytest.raises(HTTPException) as exc_info:
+        decode_job_list_cursor("not-a-cursor")
+
+    assert exc_info.value.status_code == 400
+
+
+@pytest.fixture
+def job_db():
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    User.__table__.create(bind=engine)
+    JobDescription.__table__.create(bind=engine)
+    start = datetime(2026, 10, 1, 12)
+    with engine.begin() as conn:
+        conn.execute(
+            insert(User.__table__),
+            [
+                {"id": 1, "email": "me@example.com", "name": "Me", "password": "x"},
+                {"id": 2, "email": "other@example.com", "name": "Other", "password": "x"},
+            ],
+        )
+        rows = []
+        for jd_id in range(1, 41):
+            # Owners cycle through me / unowned / someone else; timestamps tie in
+            # threes and every fifth job has no created_at
+            created_at = None if jd_id % 5 == 0 else start + timedelta(hours=jd_id // 3)
+            owner = (1, None, 2)[jd_id % 3]
+            rows.append({
+                "id": jd_id,
+                "user_id": owner,
+                "title": f"Job {jd_id}",
+                "content": "x",
+                "created_at": created_at,
+            })
+        conn.execute(insert(JobDescription.__table__), rows)
+    return engine, rows
+
+
+def _page(conn, user_email, cursor, limit):
+    keys = _job_list_page_keys(user_email, decode_job_list_cursor(cursor) if cursor else None, limit)
+    rows = conn.execute(
+        select(keys.c.id, keys.c.created_at)
+        .order_by(keys.c.created_at.desc().nullslast(), keys.c.id.desc())
+        .limit(limit + 1)
+    ).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_job_list_cursor(rows[-1].created_at, rows[-1].id)
+    return [row.id for row in rows], next_cursor
+
+
+@pytest.mark.parametrize("user_email, owners", [("me@example.com", {1, None}), (None, {None})])
+@pytest.mark.parametrize("limit", [1, 4, 7, 50])
+def test_pages_cover_ties_and_undated_jobs_once(job_db, user_email, owners, limit):
+    engine, rows = job_db
+    visible = [row for row in rows if row["user_id"] in owners]
+    dated = sorted(
+        (row for row in visible if row["created_at"]),
+        key=lambda row: (row["created_at"], row["id"]),
+        reverse=True,
+    )
+    undated = sorted((row for row in visible if not row["created_at"]), key=lambda row: -row["id"])
+    expected = [row["id"] for row in dated + undated]
+
+    seen, cursor = [], None
+    with engine.connect() as conn:
+        while True:
+            ids, cursor = _page(conn, user_email, cursor, limit)
+            seen += ids
+            if cursor is None:
+                break
+
+    assert seen == expected
+
+
+@pytest.mark.parametrize("user_email, owners", [("me@example.com", {1, None}), (None, {None})])
+def test_job_list_returns_own_and_unowned_jobs_newest_first(job_db, monkeypatch, user_email, owners):
+    engine, rows = job_db
+    JobResumeVersion.__table__.create(bind=engine)
+    monkeypatch.setattr(job_service, "_SCHEMA_CHECK_CACHE", True)
+
+    with Session(engine) as db:
+        items = list_user_job_descriptions(user_email, db)
+
+    assert sorted(item["id"] for item in items) == sorted(
+        row["id"] for row in rows if row["user_id"] in owners
+    )
+    dated = [item["created_at"] for item in items if item["created_at"]]
+    assert dated == sorted(dated, reverse=True)
@@ -0,0 +1,59 @@
+"""Parity tests for the histogram column detector and line block builder.
+
+``fixtures/layout_parity.json`` holds word geometry for a one-column, a
+two-column and a sparse page together with the layout the previous
+DBSCAN-based analyzer produced for them.
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from app.services.resume_parsing.analyzers.layout_analyzer import (
+    _analyze_pdf_layout,
+    detect_column_regions,
+)
+from app.services.resume_parsing.extractors.page_words import PageWords
+
+FIXTURES = json.loads((Path(__file__).parent / "fixtures" / "layout_parity.json").read_text())
+FIELDS = ('text', 'x0', 'y0', 'x1', 'y1', 'fontname', 'size')
+
+
+def _rounded(value):
+    if isinstance(value, float):
+        return round(value, 2)
+    if isinstance(value, (list, tuple)):
+        return [_rounded(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _rounded(item) for key, item in value.items()}
+    return value
+
+
+@pytest.mark.parametrize("fixture", FIXTURES, ids=[fixture["name"] for fixture in FIXTURES])
+def test_matches_previous_layout_output(fixture):
+    words = PageWords.from_words(dict(zip(FIELDS, row, strict=True)) for row in fixture["words"])
+
+    result = _analyze_pdf_layout({'pages': [{'page_num': 1, 'words': words}]})
+
+    assert _rounded(result) == fixture["expected"]
+
+
+def test_noise_words_do_not_form_columns():
+    x0 = np.array([50, 52, 55, 58, 60, 200, 400, 402, 404, 406, 408], dtype=np.float32)
+
+    regions = detect_column_regions(x0, x0 + 20)
+
+    assert regions == [(50.0, 80.0), (400.0, 428.0)]
+
+
+def test_border_words_join_nearest_column():
+    # 130 is not a core word; it is only within reach of the right column
+    x0 = np.array([0, 10, 20, 30, 40, 130, 170, 175, 180, 185, 190], dtype=np.float32)
+
+    regions = detect_column_regions(x0, x0 + 5)
+
+    assert regions == [(0.0, 45.0), (130.0, 195.0)]
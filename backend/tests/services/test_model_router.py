@@ -0,0 +1,136 @@
+"""Tests for local inference routing against a stub Ollama server."""
+
+from __future__ import annotations
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app.core.ollama_client import OllamaClient
+from app.services.model_router import ModelRouter, openai_cost, parse_routing_rules
+
+
+class StubOllama(BaseHTTPRequestHandler):
+    """Speaks the subset of the Ollama API the client uses."""
+
+    models = ["llama3.2:3b"]
+    reply = "Polished bullet"
+    requests: list[dict] = []
+
+    def do_GET(self):
+        if self.path != "/api/tags":
+            self.send_error(404)
+            return
+        self._json({"models": [{"name": name} for name in self.models]})
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.requests.append(body)
+        self._json({
+            "model": body["model"],
+            "message": {"role": "assistant", "content": self.reply},
+            "done": True,
+            "prompt_eval_count": 42,
+            "eval_count": 7,
+        })
+
+    def _json(self, payload: dict) -> None:
+        data = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_url():
+    StubOllama.requests = []
+    StubOllama.reply = "Polished bullet"
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubOllama)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def payload(content: str, json_mode: bool = False) -> dict:
+    data = {
+        "model": "gpt-4o-mini",
+        "messages": [{"role": "user", "content": content}],
+        "max_tokens": 150,
+        "temperature": 0.5,
+    }
+    if json_mode:
+        data["response_format"] = {"type": "json_object"}
+    return data
+
+
+def test_parse_routing_rules():
+    rules = parse_routing_rules(" keyword_extraction, bullet_polish=qwen2.5:7b,unknown,", "llama3.2:3b")
+    assert rules == {"keyword_extraction": "llama3.2:3b", "bullet_polish": "qwen2.5:7b"}
+    assert parse_routing_rules("", "llama3.2:3b") == {}
+
+
+def test_openai_cost_matches_dated_snapshots():
+    assert openai_cost("gpt-4o-mini", 1_000_000, 0) == pytest.approx(0.15)
+    assert openai_cost("gpt-4o-2024-08-06", 0, 1_000_000) == pytest.approx(10.0)
+    assert openai_cost("other", 1000, 1000) == 0.0
+
+
+async def test_routed_task_runs_locally_with_accounting(stub_url):
+    client = OllamaClient(stub_url, "llama3.2:3b")
+    router = ModelRouter(client, {"bullet_polish": "llama3.2"}, num_ctx=4096)
+
+    completion = await router.complete_locally("bullet_polish", payload("Improve: did stuff"))
+
+    assert completion.content == "Polished bullet"
+    assert completion.tokens_used == 49
+    sent = StubOllama.requests[0]
+    assert sent["stream"] is False and "format" not in sent
+    assert sent["options"] == {"temperature": 0.5, "num_predict": 150, "num_ctx": 4096}
+    stats = router.stats()["tasks"]["bullet_polish"]
+    assert stats["local_calls"] == 1 and stats["openai_cost_avoided_usd"] > 0
+
+    assert await router.complete_locally("keyword_extraction", payload("x")) is None
+    await client.aclose()
+
+
+async def test_falls_back_on_bad_json_oversize_and_missing_model(stub_url):
+    client = OllamaClient(stub_url, "llama3.2:3b")
+    router = ModelRouter(
+        client, {"keyword_extraction": "llama3.2:3b", "bullet_polish": "mistral"}, num_ctx=1000
+    )
+
+    StubOllama.reply = "not json"
+    assert await router.complete_locally("keyword_extraction", payload("jd", json_mode=True)) is None
+    assert StubOllama.requests[-1]["format"] == "json"
+    StubOllama.reply = '{"technical_keywords": ["python"]}'
+    assert await router.complete_locally("keyword_extraction", payload("jd", json_mode=True)) is not None
+
+    assert await router.complete_locally("keyword_extraction", payload("word " * 4000)) is None
+    assert await router.complete_locally("bullet_polish", payload("x")) is None
+
+    tasks = router.stats()["tasks"]
+    assert tasks["keyword_extraction"]["fallbacks"] == 1
+    assert tasks["keyword_extraction"]["oversize"] == 1
+    assert tasks["bullet_polish"]["unavailable"] == 1
+    await client.aclose()
+
+
+async def test_unreachable_server_is_cached_as_unavailable():
+    client = OllamaClient("http://127.0.0.1:9", "llama3.2:3b", health_ttl=60)
+    router = ModelRouter(client, {"bullet_polish": "llama3.2:3b"}, num_ctx=4096)
+
+    assert await router.complete_locally("bullet_polish", payload("x")) is None
+    checked = client.status()["checked_seconds_ago"]
+    assert checked is not None
+    assert await router.complete_locally("bullet_polish", payload("x")) is None
+    assert router.stats()["tasks"]["bullet_polish"]["unavailable"] == 2
+    await client.aclose()
@@ -0,0 +1,48 @@
+"""Tests for the columnar PageWords representation."""
+
+from __future__ import annotations
+
+import numpy as np
+
+from app.services.resume_parsing.extractors.page_words import PageWords
+
+WORDS = [
+    {'text': 'EXPERIENCE', 'x0': 50.0, 'y0': 100.0, 'x1': 130.0, 'y1': 113.0, 'fontname': 'Helvetica-Bold', 'size': 13.0},
+    {'text': 'Led', 'x0': 50.0, 'y0': 120.0, 'x1': 66.5, 'y1': 129.5, 'fontname': 'Helvetica', 'size': 9.5},
+    {'text': 'teams', 'x0': 70.0, 'y0': 120.0, 'x1': 96.0, 'y1': 129.5, 'fontname': 'Helvetica', 'size': 9.5},
+    {'text': '', 'x0': 0.0, 'y0': 0.0, 'x1': 0.0, 'y1': 0.0, 'fontname': '', 'size': 0.0},
+]
+
+
+def test_round_trips_legacy_word_dicts():
+    words = PageWords.from_words(WORDS)
+
+    assert len(words) == 4
+    assert list(words) == WORDS
+    assert words.texts() == ['EXPERIENCE', 'Led', 'teams', '']
+    assert words.x0.dtype == np.float32
+
+
+def test_interns_font_names():
+    words = PageWords.from_words(WORDS)
+
+    assert words.fonts == ('', 'Helvetica-Bold', 'Helvetica')
+    assert words.font_ids.tolist() == [1, 2, 2, 0]
+    assert words.fontnames() == ['Helvetica-Bold', 'Helvetica', 'Helvetica', '']
+
+
+def test_coerce_accepts_both_representations():
+    words = PageWords.from_words(WORDS)
+
+    assert PageWords.coerce(words) is words
+    assert len(PageWords.coerce(None)) == 0
+    assert PageWords.coerce(WORDS).texts() == words.texts()
+
+
+def test_select_keeps_chosen_words_in_order():
+    words = PageWords.from_words(WORDS)
+
+    subset = words.select([2, 0])
+
+    assert list(subset) == [WORDS[2], WORDS[0]]
+    assert len(words.select([])) == 0
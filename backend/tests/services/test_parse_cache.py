@@ -0,0 +1,128 @@
+"""Tests for the resume parse-result cache."""
+
+from __future__ import annotations
+
+import asyncio
+import io
+
+import pytest
+from fastapi import UploadFile
+
+from app.core.config import settings
+from app.features.resume_management import routes as resume_routes
+from app.services.resume_parsing import cache as cache_module
+from app.services.resume_parsing import orchestrator
+from app.services.resume_parsing.cache import ParseCache, cache_key
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_entries_expire_and_evict_least_recently_used():
+    clock = FakeClock()
+    cache = ParseCache(max_entries=2, ttl_seconds=10, clock=clock)
+    cache.set("a", {"value": 1})
+    cache.set("b", {"value": 2})
+    assert cache.get("a") == {"value": 1}
+
+    cache.set("c", {"value": 3})
+    assert cache.get("b") is None
+    assert cache.get("a") == {"value": 1}
+
+    clock.now = 11
+    assert cache.get("a") is None
+    assert len(cache) == 1
+
+
+def test_cached_values_are_copies():
+    cache = ParseCache(max_entries=4, ttl_seconds=10)
+    value = {"data": {"sections": []}}
+    cache.set("key", value)
+    value["data"]["sections"].append("mutated")
+
+    cache.get("key")["data"]["sections"].append("also mutated")
+    assert cache.get("key") == {"data": {"sections": []}}
+
+
+def test_key_depends_on_content_and_settings(monkeypatch):
+    key = cache_key(b"resume")
+    assert cache_key(b"resume") == key
+    assert cache_key(b"other resume") != key
+    assert cache_key(b"resume", variant="regex") != key
+
+    monkeypatch.setattr(settings, "use_vision_parser", not settings.use_vision_parser)
+    assert cache_key(b"resume") != key
+
+    before = cache_key(b"resume")
+    monkeypatch.setattr(settings, "vision_image_max_bytes", settings.vision_image_max_bytes + 1)
+    assert cache_key(b"resume") != before
+
+    before = cache_key(b"resume")
+    monkeypatch.setattr(settings, "hybrid_region_min_confidence", 0.9)
+    assert cache_key(b"resume") != before
+
+
+def test_parse_resume_serves_cache_hits(monkeypatch):
+    calls = []
+
+    async def fake_parse(_file_bytes, filename, _start_time, _extraction=None):
+        calls.append(filename)
+        return {"success": True, "data": {"name": "Jane"}, "metadata": {"parsing_method": "structured_ai"}}
+
+    monkeypatch.setattr(orchestrator, "_parse_resume_uncached", fake_parse)
+    monkeypatch.setattr(orchestrator, "parse_cache", ParseCache(max_entries=4, ttl_seconds=60))
+
+    first = asyncio.run(orchestrator.parse_resume(b"%PDF-same", "a.pdf"))
+    second = asyncio.run(orchestrator.parse_resume(b"%PDF-same", "b.pdf"))
+    third = asyncio.run(orchestrator.parse_resume(b"%PDF-same", "c.pdf", bypass_cache=True))
+
+    assert calls == ["a.pdf", "c.pdf"]
+    assert first["metadata"]["parsing_method"] == "structured_ai"
+    assert second["metadata"]["parsing_method"] == "cached"
+    assert second["metadata"]["cached_parsing_method"] == "structured_ai"
+    assert second["data"] == {"name": "Jane"}
+    assert third["metadata"]["parsing_method"] == "structured_ai"
+
+
+@pytest.mark.parametrize("method", sorted(orchestrator.UNCACHED_PARSING_METHODS))
+def test_degraded_results_are_not_cached(monkeypatch, method):
+    async def fake_parse(_file_bytes, _filename, _start_time, _extraction=None):
+        return {"success": True, "data": {"name": "Jane"}, "metadata": {"parsing_method": method}}
+
+    cache = ParseCache(max_entries=4, ttl_seconds=60)
+    monkeypatch.setattr(orchestrator, "_parse_resume_uncached", fake_parse)
+    monkeypatch.setattr(orchestrator, "parse_cache", cache)
+
+    result = asyncio.run(orchestrator.parse_resume(b"%PDF-degraded", "a.pdf"))
+
+    assert result["metadata"]["parsing_method"] == method
+    assert len(cache) == 0
+
+
+def test_parse_file_route_serves_cache_hits(monkeypatch):
+    calls = []
+
+    def fake_regex(text):
+        calls.append(text)
+        return {"name": "Jane", "sections": []}
+
+    monkeypatch.setattr(resume_routes, "parse_resume_with_regex", fake_regex)
+    monkeypatch.setattr(cache_module, "parse_cache", ParseCache(max_entries=4, ttl_seconds=60))
+    text = b"Jane Doe\nSoftware Engineer\nBuilt Python services on AWS for five years."
+
+    def upload():
+        return UploadFile(file=io.BytesIO(text), filename="resume.txt", size=len(text))
+
+    first = asyncio.run(resume_routes.parse_file(upload(), refresh=False))
+    second = asyncio.run(resume_routes.parse_file(upload(), refresh=False))
+    third = asyncio.run(resume_routes.parse_file(upload(), refresh=True))
+
+    assert len(calls) == 2
+    assert first["success"] and "cached" not in first
+    assert second["cached"] and second["data"] == first["data"]
+    assert "cached" not in third
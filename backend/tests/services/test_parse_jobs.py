@@ -0,0 +1,95 @@
+"""Tests for the background resume parse job queue."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core import db as core_db
+from app.models.parse_job import ResumeParseJob
+from app.services import parse_jobs
+from app.services.parse_jobs import (
+    DatabaseJobStore,
+    MemoryJobStore,
+    ParseJobQueue,
+    ParseQueueFull,
+)
+from app.services.resume_parsing.progress import report_stage
+
+
+async def fake_parse_resume(file_bytes, _filename, **_options):
+    for stage in ("extracting", "analyzing_layout", "ai_parsing", "validating"):
+        report_stage(stage)
+        await asyncio.sleep(0)
+    if file_bytes == b"broken":
+        return {"success": False, "error": "Could not extract text"}
+    return {"success": True, "data": {"name": "Jane Doe"}, "metadata": {"parsing_method": "text_structured"}}
+
+
+async def _run_to_completion(queue: ParseJobQueue, file_bytes: bytes) -> tuple[dict, list[str]]:
+    queue.start()
+    try:
+        job = await queue.submit("resume.pdf", file_bytes)
+        events = [event async for event in queue.events(job["job_id"])]
+        return await queue.get(job["job_id"]), events
+    finally:
+        await queue.stop()
+
+
+@pytest.fixture(autouse=True)
+def _fast_parse(monkeypatch):
+    monkeypatch.setattr(parse_jobs, "parse_resume", fake_parse_resume)
+    monkeypatch.setattr(parse_jobs, "POLL_INTERVAL_SECONDS", 0.01)
+
+
+def test_memory_queue_records_stages_and_result():
+    queue = ParseJobQueue(MemoryJobStore(max_pending=5, ttl=timedelta(minutes=5)), workers=2)
+
+    job, events = asyncio.run(_run_to_completion(queue, b"%PDF-1.4"))
+
+    assert job["status"] == "done"
+    assert [stage["stage"] for stage in job["stages"]] == [
+        "queued", "extracting", "analyzing_layout", "ai_parsing", "validating", "done",
+    ]
+    assert job["result"]["data"]["name"] == "Jane Doe"
+    assert events[0].startswith("event: stage")
+    assert events[-1].startswith("event: done")
+
+
+def test_failed_parse_marks_job_failed():
+    queue = ParseJobQueue(MemoryJobStore(max_pending=5, ttl=timedelta(minutes=5)), workers=1)
+
+    job, events = asyncio.run(_run_to_completion(queue, b"broken"))
+
+    assert job["status"] == "failed"
+    assert job["error"] == "Could not extract text"
+    assert events[-1].startswith("event: failed")
+
+
+def test_memory_queue_rejects_when_full():
+    async def run():
+        store = MemoryJobStore(max_pending=1, ttl=timedelta(minutes=5))
+        await store.create("a.pdf", b"a", False)
+        with pytest.raises(ParseQueueFull):
+            await store.create("b.pdf", b"b", False)
+
+    asyncio.run(run())
+
+
+def test_database_store_round_trip(monkeypatch, tmp_path):
+    # A file database gives each worker thread its own connection
+    engine = create_engine(f"sqlite:///{tmp_path / 'jobs.db'}")
+    ResumeParseJob.__table__.create(bind=engine)
+    monkeypatch.setattr(core_db, "SessionLocal", sessionmaker(bind=engine))
+    store = DatabaseJobStore(max_pending=5, ttl=timedelta(minutes=5), stale_after=timedelta(minutes=3))
+
+    job, _ = asyncio.run(_run_to_completion(ParseJobQueue(store, workers=1), b"%PDF-1.4"))
+
+    assert job["status"] == "done"
+    assert job["stages"][-1]["stage"] == "done"
+    with core_db.SessionLocal() as session:
+        assert session.get(ResumeParseJob, job["job_id"]).file_bytes is None
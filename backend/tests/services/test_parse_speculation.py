@@ -0,0 +1,91 @@
+"""Tests for the speculative regex-vs-AI parse race."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+from app.core.config import settings
+from app.services.resume_parsing import speculation
+from app.services.resume_parsing.speculation import SpeculationBudget, race_with_legacy
+
+RAW_TEXT = """Jane Doe
+Senior Software Engineer
+jane@example.com | +1 555 123 4567
+EXPERIENCE
+Acme Corp / Staff Engineer / 2019 - 2024
+• Led migration of billing services to Kubernetes
+EDUCATION
+State University / BSc Computer Science / 2015
+"""
+
+AI_RESULT = {"success": True, "data": {"name": "Jane Doe"}, "metadata": {"parsing_method": "text_structured"}}
+
+
+def test_budget_allows_limited_races_per_minute():
+    now = [0.0]
+    budget = SpeculationBudget(per_minute=2, clock=lambda: now[0])
+
+    assert [budget.try_acquire() for _ in range(3)] == [True, True, False]
+    now[0] = 60.0
+    assert budget.try_acquire()
+
+
+def test_fast_ai_result_wins(monkeypatch):
+    monkeypatch.setattr(settings, "speculation_latency_slo_seconds", 1.0)
+
+    async def ai():
+        return dict(AI_RESULT)
+
+    result = asyncio.run(race_with_legacy(ai(), RAW_TEXT, 0.3, time.time()))
+
+    assert result["metadata"]["parsing_method"] == "text_structured"
+    assert result["metadata"]["speculation"] == {"winner": "ai"}
+
+
+def test_slow_ai_loses_to_good_regex_result_and_is_cancelled(monkeypatch):
+    monkeypatch.setattr(settings, "speculation_latency_slo_seconds", 0.05)
+    monkeypatch.setattr(settings, "speculation_min_legacy_confidence", 0.3)
+    cancelled = []
+
+    async def slow_ai():
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+        return dict(AI_RESULT)
+
+    async def run():
+        result = await race_with_legacy(slow_ai(), RAW_TEXT, 0.3, time.time())
+        await asyncio.sleep(0)
+        return result
+
+    result = asyncio.run(run())
+
+    assert result["metadata"]["parsing_method"] == "legacy_speculative"
+    assert result["data"]["name"] == "Jane Doe"
+    assert "latency SLO" in result["metadata"]["issues"][0]
+    assert cancelled == [True]
+
+
+def test_weak_regex_result_waits_for_ai(monkeypatch):
+    monkeypatch.setattr(settings, "speculation_latency_slo_seconds", 0.01)
+    monkeypatch.setattr(settings, "speculation_min_legacy_confidence", 0.5)
+
+    async def slow_ai():
+        await asyncio.sleep(0.1)
+        return dict(AI_RESULT)
+
+    result = asyncio.run(race_with_legacy(slow_ai(), "Jane Doe\nsome notes", 0.3, time.time()))
+
+    assert result["metadata"]["speculation"] == {"winner": "ai"}
+
+
+def test_only_band_scores_speculate(monkeypatch):
+    monkeypatch.setattr(speculation, "speculation_budget", SpeculationBudget(per_minute=10))
+    monkeypatch.setattr(settings, "enable_speculative_parsing", True)
+    monkeypatch.setattr(settings, "enable_legacy_parser", True)
+
+    assert speculation.should_speculate(settings.speculation_band_low)
+    assert not speculation.should_speculate(settings.speculation_band_high + 0.01)
@@ -0,0 +1,49 @@
+"""Tests for joining PyMuPDF span fonts onto pdfplumber words."""
+
+from __future__ import annotations
+
+import numpy as np
+
+from app.services.resume_parsing.extractors.page_words import PageWords
+from app.services.resume_parsing.extractors.pdf_extractor import (
+    _join_span_fonts,
+    match_words_to_spans,
+)
+
+SPANS = [
+    {'bbox': (50.0, 98.0, 140.0, 114.0), 'font': 'Helvetica-Bold', 'size': 13.0},
+    {'bbox': (50.0, 118.0, 100.0, 131.0), 'font': 'Helvetica', 'size': 9.5},
+    {'bbox': (100.0, 118.0, 200.0, 131.0), 'font': 'Helvetica-Oblique', 'size': 9.5},
+]
+
+
+def _words(fontname: str = '', size: float = 0.0) -> PageWords:
+    return PageWords.from_words([
+        {'text': 'EXPERIENCE', 'x0': 50.0, 'y0': 100.0, 'x1': 130.0, 'y1': 113.0, 'fontname': fontname, 'size': size},
+        {'text': 'Led', 'x0': 50.0, 'y0': 120.0, 'x1': 66.5, 'y1': 129.5, 'fontname': fontname, 'size': size},
+        {'text': 'teams', 'x0': 95.0, 'y0': 120.0, 'x1': 125.0, 'y1': 129.5, 'fontname': fontname, 'size': size},
+        {'text': 'footer', 'x0': 50.0, 'y0': 700.0, 'x1': 80.0, 'y1': 709.0, 'fontname': fontname, 'size': size},
+    ])
+
+
+def test_words_match_the_span_they_overlap_most():
+    boxes = np.asarray([span['bbox'] for span in SPANS], dtype=np.float32)
+
+    assert match_words_to_spans(_words(), boxes).tolist() == [0, 1, 2, -1]
+
+
+def test_fills_only_missing_font_data_by_default():
+    words = _join_span_fonts(_words(), SPANS)
+
+    assert words.fontnames() == ['Helvetica-Bold', 'Helvetica', 'Helvetica-Oblique', '']
+    assert words.size.tolist() == [13.0, 9.5, 9.5, 0.0]
+
+    coarse = _join_span_fonts(_words('ArialMT', 10.0), SPANS)
+    assert coarse.fontnames() == ['ArialMT'] * 4
+
+
+def test_prefer_spans_overrides_matched_words():
+    words = _join_span_fonts(_words('ArialMT', 10.0), SPANS, prefer_spans=True)
+
+    assert words.fontnames() == ['Helvetica-Bold', 'Helvetica', 'Helvetica-Oblique', 'ArialMT']
+    assert words.size.tolist() == [13.0, 9.5, 9.5, 10.0]
@@ -0,0 +1,111 @@
+"""Tests for token-budgeted prompt assembly."""
+
+from __future__ import annotations
+
+from app.prompts import prompt_budget
+from app.prompts.content_generation_prompts import (
+    get_bullet_from_keywords_prompt,
+    get_bullets_from_keywords_prompt,
+    get_relevant_keywords_for_bullet_prompt,
+)
+from app.prompts.prompt_budget import (
+    PromptPart,
+    allocate,
+    assemble_prompt,
+    compress_text,
+    count_tokens,
+    truncate_to_tokens,
+)
+
+JOB = " ".join(f"Requirement {i}: build reliable Python services on AWS." for i in range(200))
+
+
+def render(parts: dict[str, str]) -> str:
+    return f"Instructions for the task.\n\nKeywords:\n{parts['keywords']}\n\nContext:\n{parts['context']}"
+
+
+def test_truncate_respects_budget_and_word_boundaries():
+    text = truncate_to_tokens(JOB, 50)
+    assert count_tokens(text) <= 51
+    assert text.endswith("...")
+    assert JOB.startswith(text[:-3])
+    assert truncate_to_tokens("short", 50) == "short"
+    assert truncate_to_tokens(JOB, 0) == ""
+
+
+def test_compress_drops_stopword_lines_and_repeated_bullets():
+    text = "- Built Python APIs\n\n\n- and the\n---\n• built python   APIs\n- Cut costs 30%"
+    assert compress_text(text) == "- Built Python APIs\n\n- Cut costs 30%"
+
+
+def test_allocate_serves_parts_by_priority():
+    parts = [
+        PromptPart("context", JOB, priority=3),
+        PromptPart("keywords", "python, aws, kubernetes", priority=1),
+        PromptPart("empty", "", priority=2, placeholder="None"),
+    ]
+    texts, _ = allocate(parts, available=60)
+
+    assert texts["keywords"] == "python, aws, kubernetes"
+    assert texts["empty"] == "None"
+    assert count_tokens(texts["context"]) <= 60 - count_tokens("python, aws, kubernetes") + 1
+
+
+def test_min_tokens_are_held_back_from_earlier_parts():
+    parts = [
+        PromptPart("keywords", JOB, priority=1),
+        PromptPart("context", "Build reliable Python services on AWS.", priority=3, min_tokens=20),
+    ]
+    texts, _ = allocate(parts, available=100)
+
+    assert texts["context"] == "Build reliable Python services on AWS."
+    assert count_tokens(texts["keywords"]) <= 81
+
+
+def test_assemble_prompt_fits_budget_and_records_savings():
+    before = prompt_budget.prompt_budget_stats().get("test_feature", {}).get("tokens_saved", 0)
+    prompt = assemble_prompt(
+        "test_feature",
+        [
+            PromptPart("keywords", "python, aws", priority=1),
+            PromptPart("context", JOB, priority=2, max_tokens=200),
+        ],
+        render,
+        budget=300,
+    )
+
+    assert count_tokens(prompt) <= 300
+    assert "Keywords:\npython, aws" in prompt
+    stats = prompt_budget.prompt_budget_stats()["test_feature"]
+    assert stats["tokens_saved"] > before
+    assert stats["prompt_tokens"] <= stats["full_tokens"]
+
+
+def test_agent_prompt_keeps_keywords_and_caps_job_description():
+    prompt = get_bullet_from_keywords_prompt(
+        company_title="Acme",
+        job_title="Engineer",
+        jd_excerpt=JOB,
+        keywords_str="python, aws",
+        resume_excerpt=None,
+        count=3,
+    )
+    assert "python, aws" in prompt
+    assert "Limited additional context provided" in prompt
+    assert count_tokens(prompt) <= prompt_budget.PROMPT_TOKEN_BUDGETS["bullet_from_keywords"]
+
+
+def test_long_keyword_lists_stay_in_budget_and_keep_the_job_description():
+    keywords = [f"keyword number {i} skill" for i in range(90)]
+    jd = "Own the Kubernetes deployment platform. " * 100
+
+    prompt = get_relevant_keywords_for_bullet_prompt("Deployed apps with Kubernetes", keywords, jd)
+    assert count_tokens(prompt) <= prompt_budget.PROMPT_TOKEN_BUDGETS["bullet_keywords_analysis"]
+    assert "Own the Kubernetes deployment platform." in prompt
+    assert "keyword number 0 skill" in prompt
+
+    prompt = get_bullets_from_keywords_prompt(
+        "Deployed apps", ", ".join(keywords), "Acme", "Engineer", jd, keywords[:5]
+    )
+    assert count_tokens(prompt) <= prompt_budget.PROMPT_TOKEN_BUDGETS["bullets_from_keywords"]
+    assert "Own the Kubernetes deployment platform." in prompt
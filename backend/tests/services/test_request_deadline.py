@@ -0,0 +1,97 @@
+"""Tests for request deadline propagation."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.deadline import (
+    DEADLINE_HEADER,
+    DeadlineExceeded,
+    DeadlineTransport,
+    can_finish,
+    deadline_budget,
+    deadline_scope,
+    parse_deadline_header,
+    time_left,
+    without_deadline,
+)
+from app.middleware.request_deadline import RequestDeadlineMiddleware
+
+
+def test_parse_deadline_header_formats():
+    now = 1_800_000_000.0
+    assert parse_deadline_header("1800000030", now) == pytest.approx(30)
+    assert parse_deadline_header("1800000030500", now) == pytest.approx(30.5)
+    assert parse_deadline_header("2027-01-15T08:00:30Z", 1_800_000_000.0) == pytest.approx(30)
+    assert parse_deadline_header("soon", now) is None
+
+
+def test_budget_is_cut_to_the_innermost_deadline():
+    assert time_left() is None
+    assert deadline_budget(45.0) == 45.0
+    with deadline_scope(10):
+        assert deadline_budget(45.0) <= 10
+        assert deadline_budget(5.0) == 5.0
+        assert not can_finish(20)
+        with deadline_scope(60):
+            assert time_left() <= 10
+        with deadline_scope(-1), pytest.raises(DeadlineExceeded):
+            deadline_budget(45.0)
+    assert time_left() is None
+
+
+async def test_background_work_can_leave_the_deadline():
+    async def left():
+        return time_left()
+
+    with deadline_scope(10):
+        assert await asyncio.create_task(left()) is not None
+        assert await asyncio.create_task(without_deadline(left())) is None
+        assert time_left() is not None
+
+
+async def test_transport_stops_calls_at_the_deadline():
+    async def handler(_request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(1)
+        return httpx.Response(200, json={})
+
+    client = httpx.AsyncClient(transport=DeadlineTransport(httpx.MockTransport(handler)))
+    started = time.monotonic()
+    with deadline_scope(0.05), pytest.raises(DeadlineExceeded):
+        await client.post("https://api.openai.com/v1/chat/completions", json={})
+    assert time.monotonic() - started < 0.5
+
+    response = await client.post("https://api.openai.com/v1/chat/completions", json={})
+    assert response.status_code == 200
+    await client.aclose()
+
+
+def test_middleware_applies_header_and_route_defaults():
+    app = FastAPI()
+    app.add_middleware(RequestDeadlineMiddleware)
+
+    @app.get("/api/ai/left")
+    async def ai_left():
+        return {"left": time_left()}
+
+    @app.get("/api/other")
+    async def other():
+        return {"left": time_left()}
+
+    @app.get("/api/ai/slow")
+    async def slow():
+        raise DeadlineExceeded("out of time")
+
+    client = TestClient(app)
+    assert 0 < client.get("/api/ai/left").json()["left"] <= 60
+    assert client.get("/api/other").json()["left"] is None
+    soon = str(time.time() + 5)
+    assert client.get("/api/other", headers={DEADLINE_HEADER: soon}).json()["left"] <= 5
+    assert client.get("/api/other", headers={DEADLINE_HEADER: str(time.time() - 1)}).status_code == 504
+    assert client.get("/api/ai/slow").status_code == 504
@@ -0,0 +1,126 @@
+"""Tests for the deferred ATS semantic adjustment."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from app.core import dependencies
+from app.core.config import settings
+from app.services.ats.semantic_adjustment import SemanticAdjustmentStore, semantic_token
+from app.services.enhanced_ats_service import EnhancedATSChecker
+
+RESUME = {
+    "name": "Jane Doe",
+    "title": "Backend Engineer",
+    "email": "jane@example.com",
+    "phone": "555 0100",
+    "location": "Berlin",
+    "summary": "Backend engineer building Python services and PostgreSQL data platforms.",
+    "sections": [
+        {
+            "id": "0",
+            "title": "Experience",
+            "bullets": [{"id": "0-0", "text": "Built Python APIs serving 2M requests per day", "params": {}}],
+        },
+        {"id": "1", "title": "Skills", "bullets": [{"id": "1-0", "text": "Python, PostgreSQL", "params": {}}]},
+    ],
+}
+JOB = "Senior backend engineer with Python, PostgreSQL and Kubernetes experience."
+KEYWORDS = {"total_keywords": 3, "technical_keywords": ["python", "postgresql", "kubernetes"]}
+
+
+class FakeAgent:
+    def __init__(self):
+        self.calls = 0
+        self.release = asyncio.Event()
+
+    async def analyze_semantic_quality(self, **_kwargs):
+        self.calls += 1
+        await self.release.wait()
+        return {"quality_score": 80, "adjustment": 10, "reasoning": "strong match"}
+
+
+def test_store_runs_each_token_once_and_caches_result():
+    store = SemanticAdjustmentStore(max_entries=10, ttl_seconds=60, max_in_flight=4)
+    calls = []
+
+    async def analyze():
+        calls.append(1)
+        await asyncio.sleep(0)
+        return {"adjustment": -5}
+
+    async def run():
+        assert store.schedule("t", 70.0, analyze)
+        assert store.schedule("t", 70.0, analyze)
+        assert store.get("t")["status"] == "pending"
+        return await store.wait("t", timeout=1)
+
+    entry = asyncio.run(run())
+
+    assert len(calls) == 1
+    assert entry["status"] == "ready"
+    assert entry["adjustment"] == pytest.approx(-1.5)
+    assert entry["score"] == 68.5
+
+
+def test_store_refuses_work_beyond_in_flight_limit():
+    store = SemanticAdjustmentStore(max_entries=10, ttl_seconds=60, max_in_flight=1)
+
+    async def run():
+        blocker = asyncio.Event()
+
+        async def analyze():
+            await blocker.wait()
+            return {"adjustment": 0}
+
+        first = store.schedule("a", 50.0, analyze)
+        second = store.schedule("b", 50.0, analyze)
+        blocker.set()
+        await store.wait("a", timeout=1)
+        return first, second
+
+    assert asyncio.run(run()) == (True, False)
+    assert store.get("b") is None
+
+
+def test_token_changes_with_resume_or_job():
+    base = semantic_token("resume text", JOB, KEYWORDS)
+
+    assert base == semantic_token("resume text", JOB, dict(reversed(list(KEYWORDS.items()))))
+    assert base != semantic_token("resume text!", JOB, KEYWORDS)
+    assert base != semantic_token("resume text", JOB + " Go", KEYWORDS)
+
+
+def test_score_returns_before_semantic_review_and_reuses_it(monkeypatch):
+    agent = FakeAgent()
+    store = SemanticAdjustmentStore(max_entries=10, ttl_seconds=60, max_in_flight=4)
+    monkeypatch.setattr(dependencies, "ats_scoring_agent", agent)
+    monkeypatch.setattr(settings, "defer_semantic_adjustment", True)
+    monkeypatch.setattr("app.services.enhanced_ats_service.semantic_adjustments", store)
+    try:
+        checker = EnhancedATSChecker()
+    except LookupError:
+        pytest.skip("NLTK corpora not installed")
+
+    async def run():
+        first = await checker.get_enhanced_ats_score(
+            RESUME, JOB, use_industry_standard=True, extracted_keywords=KEYWORDS
+        )
+        token = first["semantic_pending"]
+        agent.release.set()
+        entry = await store.wait(token, timeout=1)
+        second = await checker.get_enhanced_ats_score(
+            RESUME, JOB, use_industry_standard=True, extracted_keywords=KEYWORDS
+        )
+        return first, entry, second
+
+    first, entry, second = asyncio.run(run())
+
+    assert first["success"] and first["semantic_pending"]
+    assert entry["status"] == "ready" and entry["base_score"] == first["score"]
+    assert second["semantic_pending"] is None
+    assert second["score"] == entry["score"]
+    assert second["details"]["semantic_analysis"]["reasoning"] == "strong match"
+    assert agent.calls == 1
@@ -0,0 +1,136 @@
+"""Tests for single-pass structured parsing with local validation and repair."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+
+import pytest
+
+from app.core.config import settings
+from app.services.resume_parsing.llm_usage import LLMUsage, llm_usage_tracker, record_llm_call
+from app.services.resume_parsing.parsers import structured_parser
+from app.services.resume_parsing.parsers.structured_parser import (
+    _section_slices,
+    parse_with_structured_ai,
+)
+
+RESUME_TEXT = """Jane Doe
+Staff Engineer
+jane@example.com
+Experience
+Acme Corp / Staff Engineer / 2020 - Present
+- Led the billing platform rewrite
+- Cut p99 latency by 40%
+Education
+State University / BSc Computer Science / 2012
+Skills
+Python, Go, PostgreSQL"""
+
+
+def _section(title, kind, **fields):
+    section = {"title": title, "type": kind, "experience": [], "education": [], "skills": [], "text": ""}
+    section.update(fields)
+    return section
+
+
+def _response(sections):
+    return json.dumps({
+        "name": "Jane Doe",
+        "title": "Staff Engineer",
+        "email": "jane@example.com",
+        "phone": "",
+        "location": "",
+        "summary": "",
+        "sections": sections,
+    })
+
+
+EXPERIENCE = _section("Experience", "experience", experience=[{
+    "company": "Acme Corp",
+    "title": "Staff Engineer",
+    "location": "",
+    "dates": {"start": "2020", "end": "Present"},
+    "bullets": ["Led the billing platform rewrite", "Cut p99 latency by 40%"],
+}])
+EDUCATION = _section("Education", "education", education=[{
+    "institution": "State University", "degree": "BSc", "field": "Computer Science", "graduation_date": "2012",
+}])
+SKILLS = _section("Skills", "skills", skills=["Python", "Go", "PostgreSQL"])
+
+
+@pytest.fixture
+def fake_openai(monkeypatch):
+    calls = []
+    responses = {}
+
+    async def fake_call(prompt, _model, purpose="structured", response_format=None, **_options):
+        calls.append({"purpose": purpose, "prompt": prompt, "response_format": response_format})
+        record_llm_call(purpose, {"prompt_tokens": len(prompt) // 4, "completion_tokens": 50})
+        return responses[purpose]
+
+    monkeypatch.setattr(structured_parser, "openai_client", {"api_key": "test"})
+    monkeypatch.setattr(structured_parser, "_call_openai", fake_call)
+    monkeypatch.setattr(settings, "structured_parse_mode", "single_pass")
+    return calls, responses
+
+
+def _parse():
+    async def run():
+        with llm_usage_tracker(LLMUsage()) as usage:
+            parsed = await parse_with_structured_ai({}, {}, RESUME_TEXT)
+        return parsed, usage
+
+    return asyncio.run(run())
+
+
+def test_valid_response_takes_one_call(fake_openai):
+    calls, responses = fake_openai
+    responses["single_pass"] = _response([EXPERIENCE, EDUCATION, SKILLS])
+
+    parsed, usage = _parse()
+
+    assert [call["purpose"] for call in calls] == ["single_pass"]
+    assert calls[0]["response_format"]["json_schema"]["strict"] is True
+    assert parsed["name"] == "Jane Doe"
+    assert [section["title"] for section in parsed["sections"]] == ["Experience", "Education", "Skills"]
+    assert parsed["sections"][0]["bullets"][0]["text"].startswith("**Acme Corp")
+    assert usage.as_dict()["by_purpose"] == {"single_pass": 1}
+
+
+def test_failing_section_is_repaired_from_its_own_text(fake_openai):
+    calls, responses = fake_openai
+    responses["single_pass"] = _response([_section("Experience", "experience"), EDUCATION, SKILLS])
+    responses["extract_section"] = json.dumps({"entries": EXPERIENCE["experience"]})
+
+    parsed, usage = _parse()
+
+    repair = [call for call in calls if call["purpose"] == "extract_section"]
+    assert len(repair) == 1
+    assert "Acme Corp" in repair[0]["prompt"]
+    assert "State University" not in repair[0]["prompt"]
+    assert parsed["sections"][0]["bullets"][1]["text"] == "• Led the billing platform rewrite"
+    assert usage.calls == 2
+
+
+def test_unusable_response_falls_back_to_two_phase(fake_openai):
+    calls, responses = fake_openai
+    responses["single_pass"] = '{"name": "Jane'
+    responses["detect_structure"] = json.dumps({"sections": [{"title": "Skills", "type": "skills"}]})
+    responses["extract_content"] = json.dumps({
+        "summary": "", "sections": {"Skills": {"type": "skills", "skills": ["Python"]}},
+    })
+
+    parsed, _ = _parse()
+
+    assert [call["purpose"] for call in calls] == ["single_pass", "detect_structure", "extract_content"]
+    assert parsed["sections"][0]["bullets"][0]["text"] == "Python"
+
+
+def test_section_slices_follow_document_order():
+    slices = _section_slices(RESUME_TEXT, ["Experience", "Education", "Awards", "Skills"])
+
+    assert slices[0].startswith("Experience") and "State University" not in slices[0]
+    assert slices[1].startswith("Education") and "Python" not in slices[1]
+    assert slices[2] is None
+    assert slices[3] == "Skills\nPython, Go, PostgreSQL"
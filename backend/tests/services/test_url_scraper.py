@@ -0,0 +1,150 @@
+"""Tests for the job URL scraper against a local HTTP fixture server."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app.services.url_scraper import URLScraper
+
+DESCRIPTION = "Build and operate data pipelines in Python and SQL. " * 5
+
+POSTING = f"""<html><head><title>Data Engineer - Acme</title></head><body>
+<main><h1 class="job-title">Data Engineer</h1>
+<div class="company-name">Acme</div>
+<div class="job-description">{DESCRIPTION} Fully remote.</div></main>
+</body></html>""".encode()
+
+LINKEDIN_POSTING = f"""<html><head><title>Acme hiring Data Engineer</title></head><body>
+<nav>{"<a href='/feed'>Feed</a>" * 500}</nav>
+<div class="topcard"><h1 class="topcard__title">Data Engineer</h1>
+<a class="topcard__org-name-link" href="/company/acme">Acme</a><span>Remote</span></div>
+<div class="show-more-less-html__markup">{DESCRIPTION}</div>
+</body></html>""".encode()
+
+LINKEDIN_LOGIN = b"""<html><head><title>LinkedIn Login, Sign in</title></head><body>
+<form><input name="session_key"><input type="password" name="session_password"></form>
+</body></html>"""
+
+
+class FixtureSite(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    requests: list[tuple[str, str | None]] = []
+    active = 0
+    max_active = 0
+    lock = threading.Lock()
+
+    def do_GET(self):
+        FixtureSite.requests.append((self.path, self.headers.get("If-None-Match")))
+        if self.path == "/posting":
+            if self.headers.get("If-None-Match") == '"v1"':
+                self.send_response(304)
+                self.send_header("ETag", '"v1"')
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            self._html(POSTING, etag='"v1"')
+        elif self.path.startswith("/slow"):
+            with FixtureSite.lock:
+                FixtureSite.active += 1
+                FixtureSite.max_active = max(FixtureSite.max_active, FixtureSite.active)
+            time.sleep(0.1)
+            with FixtureSite.lock:
+                FixtureSite.active -= 1
+            self._html(POSTING)
+        elif self.path == "/huge":
+            # Chunked, so the cap has to be enforced while streaming
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            chunk = b"<p>" + b"x" * 8192 + b"</p>"
+            try:
+                for _ in range(200):
+                    self.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+                self.wfile.write(b"0\r\n\r\n")
+            except OSError:
+                pass
+        else:
+            self.send_error(404)
+
+    def _html(self, body: bytes, etag: str | None = None) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(body)))
+        if etag:
+            self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def site_url():
+    FixtureSite.requests = []
+    FixtureSite.active = FixtureSite.max_active = 0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FixtureSite)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+async def test_cached_posting_is_revalidated_with_etag(site_url):
+    scraper = URLScraper(cache_ttl=0)
+
+    first = await scraper.scrape_url(f"{site_url}/posting")
+    second = await scraper.scrape_url(f"{site_url}/posting")
+
+    assert first == second
+    assert first["title"] == "Data Engineer" and first["work_type"] == "Remote"
+    assert FixtureSite.requests == [("/posting", None), ("/posting", '"v1"')]
+    assert scraper.stats["revalidated"] == 1
+
+    fresh = URLScraper(cache_ttl=60)
+    await fresh.scrape_url(f"{site_url}/posting")
+    await fresh.scrape_url(f"{site_url}/posting")
+    assert fresh.stats == {"fetches": 1, "cache_hits": 1, "revalidated": 0, "too_large": 0}
+    await scraper.aclose()
+    await fresh.aclose()
+
+
+async def test_oversized_page_is_abandoned_while_streaming(site_url):
+    scraper = URLScraper(max_page_bytes=100_000)
+
+    with pytest.raises(ValueError, match="larger than 0.1 MB"):
+        await scraper.scrape_url(f"{site_url}/huge")
+    assert scraper.stats["too_large"] == 1
+    await scraper.aclose()
+
+
+async def test_requests_to_one_domain_are_limited(site_url):
+    scraper = URLScraper(per_domain_concurrency=1, cache_size=0)
+
+    results = await asyncio.gather(*(scraper.scrape_url(f"{site_url}/slow/{i}") for i in range(3)))
+
+    assert len(results) == 3
+    assert FixtureSite.max_active == 1
+    assert scraper._domain_slots == {} and scraper._domain_users == {}
+    await scraper.aclose()
+
+
+def test_linkedin_posting_and_login_page():
+    scraper = URLScraper()
+    url = "https://www.linkedin.com/jobs/view/123"
+
+    result = scraper.parse_page(LINKEDIN_POSTING, url)
+    assert result["title"] == "Data Engineer"
+    assert result["company"] == "Acme"
+    assert result["work_type"] == "Remote"
+    assert result["content"].startswith("Build and operate")
+
+    with pytest.raises(ValueError, match="requires authentication"):
+        scraper.parse_page(LINKEDIN_LOGIN, url)
@@ -0,0 +1,216 @@
+"""Tests for the pre-aggregated AI usage meter."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, func
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.models import AIUsage, AIUsageCounter
+from app.services.usage_metering import (
+    UsageHold,
+    UsageMeter,
+    backfill_counters,
+    bucket_start,
+    subject_key,
+    usage_hold_scope,
+)
+
+
+class FakeClock:
+    def __init__(self, now: datetime):
+        self.now = now
+
+    def __call__(self) -> datetime:
+        return self.now
+
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    AIUsage.__table__.create(bind=engine)
+    AIUsageCounter.__table__.create(bind=engine)
+    return sessionmaker(bind=engine)
+
+
+@pytest.fixture
+def clock():
+    return FakeClock(datetime(2026, 3, 15, 10, 30))
+
+
+@pytest.fixture
+def meter(session_factory, clock):
+    meter = UsageMeter(session_factory=session_factory, cache_ttl_seconds=0, clock=clock)
+    # Keep flushing deterministic: the tests call flush() explicitly
+    meter._stopped.set()
+    return meter
+
+
+def test_subject_key_prefers_user():
+    assert subject_key(7, "abc") == "user:7"
+    assert subject_key(None, "abc") == "session:abc"
+    assert subject_key(None, None) is None
+
+
+def test_bucket_start_truncates():
+    moment = datetime(2026, 3, 15, 10, 30, 45)
+    assert bucket_start("hour", moment) == datetime(2026, 3, 15, 10)
+    assert bucket_start("day", moment) == datetime(2026, 3, 15)
+    assert bucket_start("month", moment) == datetime(2026, 3, 1)
+
+
+def test_record_is_counted_before_flush(meter):
+    meter.record(1, "improvement")
+    meter.record(1, "improvement")
+
+    assert meter.get_count(1, "improvement", "daily") == 2
+    assert meter.get_count(1, "cover_letter", "daily") == 0
+
+
+def test_flush_upserts_counters_and_writes_audit_events(meter, session_factory):
+    for _ in range(3):
+        meter.record(None, "improvement", session_id="guest-1")
+    meter.flush()
+    meter.record(None, "improvement", session_id="guest-1")
+    meter.flush()
+
+    with session_factory() as session:
+        assert session.query(func.count(AIUsage.id)).scalar() == 4
+        rows = {
+            row.granularity: row.count
+            for row in session.query(AIUsageCounter).filter(
+                AIUsageCounter.subject_key == "session:guest-1"
+            )
+        }
+    assert rows == {"hour": 4, "day": 4, "month": 4}
+
+
+def test_counts_reload_from_counter_table(meter, session_factory, clock):
+    meter.record(5, "cover_letter")
+    meter.flush()
+
+    fresh = UsageMeter(session_factory=session_factory, cache_ttl_seconds=0, clock=clock)
+    assert fresh.get_count(5, "cover_letter", "monthly") == 1
+
+
+def test_session_period_uses_last_24_hourly_buckets(meter, clock):
+    meter.record(1, "improvement")
+    meter.flush()
+
+    clock.now += timedelta(hours=23)
+    assert meter.get_count(1, "improvement", "session") == 1
+
+    clock.now += timedelta(hours=2)
+    assert meter.get_count(1, "improvement", "session") == 0
+
+
+def test_try_consume_enforces_limit(meter):
+    results = [meter.try_consume(1, "improvement", "session", 2) for _ in range(3)]
+
+    assert results == [(True, 0), (True, 1), (False, 2)]
+    assert meter.get_count(1, "improvement", "session") == 2
+
+
+def test_failed_flush_keeps_pending_increments(clock):
+    def broken_factory():
+        raise RuntimeError("database unavailable")
+
+    meter = UsageMeter(session_factory=broken_factory, cache_ttl_seconds=60, clock=clock)
+    meter._stopped.set()
+    meter.record(1, "improvement")
+
+    meter.flush()
+
+    assert meter.get_count(1, "improvement", "daily") == 1
+    assert sum(meter._pending.values()) == 3
+    assert len(meter._events) == 1
+
+
+def test_failed_flushes_do_not_grow_the_queues_without_bound(clock):
+    def broken_factory():
+        raise RuntimeError("database unavailable")
+
+    meter = UsageMeter(
+        session_factory=broken_factory, cache_ttl_seconds=60, clock=clock, max_pending_events=5
+    )
+    meter._stopped.set()
+    for _ in range(3):
+        for _ in range(4):
+            meter.record(1, "improvement")
+        meter.flush()
+        clock.now += timedelta(days=1)
+
+    # Only the newest events are kept, and increments merge per live bucket
+    assert len(meter._events) == 5
+    assert meter._events[-1]["created_at"] == datetime(2026, 3, 17, 10, 30)
+    assert {key[2] for key in meter._pending if key[3] < datetime(2026, 3, 17)} == {"month"}
+    assert meter._pending[("user:1", "improvement", "month", datetime(2026, 3, 1))] == 12
+
+
+def test_backfill_seeds_open_windows_from_audit_rows(session_factory, clock):
+    rows = [
+        (1, None, clock.now - timedelta(minutes=10)),
+        (1, None, clock.now - timedelta(hours=20)),
+        (1, None, clock.now - timedelta(days=10)),
+        (1, None, clock.now - timedelta(days=40)),
+        (None, "guest-1", clock.now),
+        (None, None, clock.now),
+    ]
+    with session_factory() as session:
+        session.add_all(
+            AIUsage(user_id=user_id, session_id=session_id, feature_type="improvement", created_at=at)
+            for user_id, session_id, at in rows
+        )
+        session.commit()
+        assert backfill_counters(session, now=clock.now) > 0
+        # Already populated: a second run (another worker) writes nothing
+        assert backfill_counters(session, now=clock.now) == 0
+
+    meter = UsageMeter(session_factory=session_factory, cache_ttl_seconds=0, clock=clock)
+    assert meter.get_count(1, "improvement", "session") == 2
+    assert meter.get_count(1, "improvement", "daily") == 1
+    assert meter.get_count(1, "improvement", "monthly") == 3
+    assert meter.get_count(None, "improvement", "daily", session_id="guest-1") == 1
+
+
+def test_held_usage_counts_but_is_only_written_on_commit(meter, session_factory):
+    kept, dropped = UsageHold(), UsageHold()
+    with usage_hold_scope(kept):
+        meter.record(1, "improvement")
+    assert meter.try_consume(1, "improvement", "daily", 5, hold=dropped) == (True, 1)
+    meter.flush()
+
+    # Held uses survive a reload of the counters
+    assert meter.get_count(1, "improvement", "daily") == 2
+    meter.release_hold(dropped)
+    meter.commit_hold(kept)
+    meter.flush()
+
+    assert meter.get_count(1, "improvement", "daily") == 1
+    with session_factory() as session:
+        assert session.query(func.count(AIUsage.id)).scalar() == 1
+
+
+class BrokenMeter:
+    def get_count(self, *_args, **_kwargs):
+        raise RuntimeError("counter table unavailable")
+
+    record = try_consume = get_count
+
+
+def test_limit_check_failures_deny_but_audit_failures_do_not(monkeypatch):
+    from app.services import usage_service
+
+    monkeypatch.setattr(usage_service, "usage_meter", BrokenMeter())
+    monkeypatch.setenv("NEXT_PUBLIC_PREMIUM_MODE", "true")
+    with pytest.raises(RuntimeError):
+        usage_service.consume_ai_usage(1, "work_experience", "free")
+
+    monkeypatch.setenv("NEXT_PUBLIC_PREMIUM_MODE", "false")
+    allowed, info = usage_service.consume_ai_usage(1, "work_experience", "free")
+    assert allowed and info["reason"] == "premium_mode_disabled"
@@ -0,0 +1,89 @@
+"""Tests for adaptive page rasterization used by the vision parser."""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+from io import BytesIO
+
+import fitz
+import pytest
+from PIL import Image
+
+from app.core.config import settings
+from app.services.resume_parsing.extractors.vision_extractor import (
+    MAX_DPI,
+    MIN_DPI,
+    VISION_MAX_SHORT_SIDE_PX,
+    choose_dpi,
+    encode_within_budget,
+    stream_vision_pages,
+)
+from app.services.resume_parsing.parsers import vision_parser
+
+LETTER = (612.0, 792.0)
+
+
+def _pdf(pages: int) -> bytes:
+    doc = fitz.open()
+    for _ in range(pages):
+        page = doc.new_page(width=LETTER[0], height=LETTER[1])
+        for y in range(60, 760, 12):
+            page.insert_text((40, y), "Shipped resilient services in Python " * 3, fontsize=9)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+def test_dpi_is_capped_by_vision_input_size_and_lower_for_sparse_pages():
+    dense = choose_dpi(*LETTER, text_chars=6000)
+    sparse = choose_dpi(*LETTER, text_chars=100)
+
+    assert dense == round(VISION_MAX_SHORT_SIDE_PX / (LETTER[0] / 72))
+    assert MIN_DPI <= sparse < dense
+    assert choose_dpi(144, 144, text_chars=6000) == MAX_DPI
+
+
+@pytest.mark.parametrize("image_format", ["jpeg", "webp"])
+def test_encoding_fits_byte_budget(image_format):
+    image = Image.effect_noise((800, 1000), 60).convert("L")
+
+    payload, width, height = encode_within_budget(image, image_format, max_bytes=60_000)
+
+    assert len(payload) <= 60_000
+    assert Image.open(BytesIO(payload)).size == (width, height)
+
+
+def test_stream_yields_every_page_with_measurements(monkeypatch):
+    monkeypatch.setattr(settings, "vision_render_workers", 0)
+
+    async def collect():
+        return [page async for page in stream_vision_pages(_pdf(3))]
+
+    pages = asyncio.run(collect())
+
+    assert sorted(page["page_num"] for page in pages) == [1, 2, 3]
+    for page in pages:
+        assert page["mime_type"] == "image/jpeg"
+        assert page["image_bytes"] == len(base64.b64decode(page["image_base64"]))
+        assert page["image_bytes"] <= settings.vision_image_max_bytes
+        assert page["raster_bytes"] == page["width"] * page["height"]
+
+
+def test_vision_calls_start_as_pages_arrive_and_merge_in_page_order(monkeypatch):
+    started = []
+
+    async def fake_page_call(_image_base64, _model, page_num, _mime_type="image/png"):
+        started.append(page_num)
+        return {"page": page_num}
+
+    async def pages():
+        for page_num in (2, 1, 3):
+            yield {"page_num": page_num, "image_base64": "", "mime_type": "image/jpeg"}
+            await asyncio.sleep(0)
+
+    monkeypatch.setattr(vision_parser, "_process_page_with_vision", fake_page_call)
+    results = asyncio.run(vision_parser._process_pages(pages(), "model"))
+
+    assert started[0] == 2
+    assert results == [{"page": 1}, {"page": 2}, {"page": 3}]